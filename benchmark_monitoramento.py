@@ -0,0 +1,1007 @@
+"""Benchmarks do Sistema de Monitoramento de Logs
+
+Uso:
+    python benchmark_monitoramento.py consultas --linhas 200000
+    python benchmark_monitoramento.py parquet --linhas 500000 --dias 7
+    python benchmark_monitoramento.py leitura --linhas 1000000
+    python benchmark_monitoramento.py extracao --linhas 500000
+    python benchmark_monitoramento.py memoria --linhas 200000
+    python benchmark_monitoramento.py registros --linhas 500000
+    python benchmark_monitoramento.py suite --linhas 1000000 --json suite.json
+    python benchmark_monitoramento.py suite --linhas 1000000 --comparar suite.json
+    python benchmark_monitoramento.py gerar server.log --linhas 5000000 --usuarios 5000 --ips 20000 --rajadas 50
+    python benchmark_monitoramento.py rede --linhas 200000 --protocolo syslog-tcp --conexoes 8
+    python benchmark_monitoramento.py rede --destino 10.0.0.5:5514 --protocolo syslog-udp --taxa 5000
+"""
+import argparse
+import datetime
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import re
+import resource
+import socket
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from motor_monitoramento import (
+    FORMATOS_LINHA_LOG,
+    NIVEIS_LINHA_SIMPLES,
+    PADRAO_DATA_HORA_SIMPLES,
+    PADRAO_IP_MENSAGEM,
+    PADRAO_IP_SIMPLES,
+    PADRAO_URL_MENSAGEM,
+    PADRAO_URL_SIMPLES,
+    PADRAO_USUARIO_MENSAGEM,
+    REGRAS_OPERACAO,
+    REGRAS_STATUS,
+    ColetorLogs,
+    MotorMonitoramento,
+    ParserLogs,
+    compactar_logs,
+    carregar_logs_parquet,
+    exportar_logs_parquet,
+    intervalo_dia_ms,
+    ip_para_int,
+    ler_linhas_mmap,
+    memoria_logs,
+    migrar_schema_logs,
+    montar_consulta_logs,
+    registros_logs,
+    tabela_logs,
+)
+
+# Schema original da tabela logs (antes das colunas tipadas)
+SCHEMA_LEGADO = '''
+CREATE TABLE logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT,
+    hora TEXT,
+    nivel TEXT,
+    categoria TEXT,
+    servidor TEXT,
+    thread TEXT,
+    mensagem TEXT,
+    usuario TEXT,
+    ip TEXT,
+    url TEXT,
+    operacao TEXT,
+    status TEXT,
+    timestamp TEXT
+)
+'''
+
+INDICES_LEGADOS = [
+    'CREATE INDEX idx_logs_data ON logs (data)',
+    'CREATE INDEX idx_logs_usuario ON logs (usuario)',
+    'CREATE INDEX idx_logs_ip ON logs (ip)',
+    'CREATE INDEX idx_logs_url ON logs (url)',
+]
+
+def criar_banco_legado(caminho, linhas, dias=30, semente=42):
+    """Cria um logs_cache.db no schema antigo com linhas sintéticas"""
+    aleatorio = random.Random(semente)
+    usuarios = [f"usuario{i}" for i in range(200)]
+    ips = [f"10.0.{i // 256}.{i % 256}" for i in range(500)]
+    urls = ["/app/dashboard", "/app/users", "/api/data", "/api/auth/login", "/api/admin/config"]
+    agora = datetime.datetime.now()
+
+    conn = sqlite3.connect(caminho)
+    conn.execute(SCHEMA_LEGADO)
+    for indice in INDICES_LEGADOS:
+        conn.execute(indice)
+
+    registros = []
+    for _ in range(linhas):
+        momento = agora - datetime.timedelta(seconds=aleatorio.randint(0, dias * 86400))
+        usuario = aleatorio.choice(usuarios)
+        ip = aleatorio.choice(ips)
+        url = aleatorio.choice(urls)
+        registros.append((
+            momento.strftime('%Y-%m-%d'),
+            momento.strftime('%H:%M:%S'),
+            aleatorio.choice(["INFO", "INFO", "INFO", "WARN", "ERROR", "DEBUG"]),
+            "Application",
+            aleatorio.choice(["jboss1", "jboss2", "jboss3"]),
+            f"Thread-{aleatorio.randint(1, 100)}",
+            f"User {usuario} accessed URL={url} from IP={ip}",
+            usuario,
+            ip,
+            url,
+            aleatorio.choice(["LOGIN", "LOGOUT", "VIEW", "UPDATE", "DELETE"]),
+            aleatorio.choice(["SUCCESS", "SUCCESS", "SUCCESS", "FAILED"]),
+            agora.strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+
+    conn.executemany('''
+    INSERT INTO logs (data, hora, nivel, categoria, servidor, thread, mensagem, usuario, ip, url, operacao, status, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', registros)
+    conn.commit()
+    conn.close()
+
+def medir_consulta(conn, filtros, schema_tipado, repeticoes=5):
+    """Executa a consulta de carregar_logs_db e retorna a mediana em milissegundos"""
+    query, params = montar_consulta_logs(filtros, 1000, schema_tipado=schema_tipado, fts_disponivel=False)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+def benchmark_consultas(linhas):
+    """Compara as consultas de carregar_logs_db antes e depois da migração do schema"""
+    hoje = datetime.datetime.now().strftime('%Y-%m-%d')
+    cenarios = {
+        "ultimos_1000": None,
+        "por_data": {'data': hoje},
+        "nivel_error": {'nivel': 'ERROR'},
+        "data_status_failed": {'data': hoje, 'status': 'FAILED'},
+        "nivel_status": {'nivel': 'ERROR', 'status': 'FAILED'},
+    }
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "logs_cache.db")
+        criar_banco_legado(caminho, linhas)
+
+        conn = sqlite3.connect(caminho)
+        conn.execute('PRAGMA journal_mode=WAL')
+
+        antes = {nome: medir_consulta(conn, filtros, False) for nome, filtros in cenarios.items()}
+
+        inicio = time.perf_counter()
+        migrar_schema_logs(conn)
+        tempo_migracao = time.perf_counter() - inicio
+
+        depois = {nome: medir_consulta(conn, filtros, True) for nome, filtros in cenarios.items()}
+        conn.close()
+
+    resultado = {
+        "linhas": linhas,
+        "migracao_s": round(tempo_migracao, 2),
+        "consultas": {
+            nome: {
+                "legado_ms": round(antes[nome], 2),
+                "tipado_ms": round(depois[nome], 2),
+                "ganho": round(antes[nome] / depois[nome], 1) if depois[nome] else None,
+            }
+            for nome in cenarios
+        },
+    }
+
+    print(f"Linhas: {linhas}  |  Migração online: {tempo_migracao:.2f}s")
+    print(f"{'Consulta':<22}{'Legado (ms)':>14}{'Tipado (ms)':>14}{'Ganho':>8}")
+    for nome, valores in resultado["consultas"].items():
+        print(f"{nome:<22}{valores['legado_ms']:>14.2f}{valores['tipado_ms']:>14.2f}{valores['ganho']:>7}x")
+
+    return resultado
+
+def benchmark_parquet(linhas, dias):
+    """Compara a análise histórica via SELECT * no SQLite com a leitura colunar do Parquet"""
+    colunas = ["ts_evento", "usuario", "ip", "status"]
+    inicio_janela = intervalo_dia_ms((datetime.datetime.now() - datetime.timedelta(days=dias - 1)).strftime('%Y-%m-%d'))[0]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "logs_cache.db")
+        criar_banco_legado(caminho, linhas)
+
+        conn = sqlite3.connect(caminho)
+        migrar_schema_logs(conn)
+
+        inicio = time.perf_counter()
+        exportar_logs_parquet(conn, os.path.join(diretorio, "parquet"))
+        tempo_exportacao = time.perf_counter() - inicio
+
+        # Caminho atual: todas as colunas como objetos Python, filtro e projeção em memória
+        inicio = time.perf_counter()
+        df_sql = pd.read_sql_query("SELECT * FROM logs", conn)
+        memoria_sql = df_sql.memory_usage(deep=True).sum()
+        df_sql = df_sql[df_sql['ts_evento'] >= inicio_janela][colunas]
+        tempo_sql = time.perf_counter() - inicio
+        conn.close()
+
+        # Parquet: projeção de colunas e poda por dia/ts_evento na leitura
+        inicio = time.perf_counter()
+        df_parquet = carregar_logs_parquet(os.path.join(diretorio, "parquet"), colunas, ts_inicio=inicio_janela)
+        tempo_parquet = time.perf_counter() - inicio
+        memoria_parquet = df_parquet.memory_usage(deep=True).sum()
+
+        tamanho_parquet = sum(
+            os.path.getsize(os.path.join(raiz, arquivo))
+            for raiz, _, arquivos in os.walk(os.path.join(diretorio, "parquet"))
+            for arquivo in arquivos
+        )
+
+    resultado = {
+        "linhas": linhas,
+        "dias": dias,
+        "linhas_janela": len(df_parquet),
+        "exportacao_s": round(tempo_exportacao, 2),
+        "parquet_mb": round(tamanho_parquet / 1e6, 1),
+        "sql": {"tempo_s": round(tempo_sql, 3), "memoria_mb": round(memoria_sql / 1e6, 1)},
+        "parquet": {"tempo_s": round(tempo_parquet, 3), "memoria_mb": round(memoria_parquet / 1e6, 1)},
+    }
+
+    print(f"Linhas: {linhas}  |  Janela: {dias} dias ({len(df_parquet)} linhas)  |  "
+          f"Exportação: {tempo_exportacao:.2f}s, {tamanho_parquet / 1e6:.1f} MB")
+    print(f"{'Caminho':<12}{'Tempo (s)':>12}{'Memória (MB)':>15}")
+    print(f"{'SQLite':<12}{tempo_sql:>12.3f}{memoria_sql / 1e6:>15.1f}")
+    print(f"{'Parquet':<12}{tempo_parquet:>12.3f}{memoria_parquet / 1e6:>15.1f}")
+
+    return resultado
+
+def criar_arquivo_log_grande(caminho, linhas, fracao_stack=0.3, semente=42):
+    """Escreve um server.log sintético com uma fração de linhas de stack trace"""
+    aleatorio = random.Random(semente)
+    with open(caminho, 'w') as f:
+        for _ in range(linhas):
+            if aleatorio.random() < fracao_stack:
+                f.write(f"\tat org.jboss.as.ejb3.component.invocation.Handler.invoke(Handler.java:{aleatorio.randint(1, 999)})\n")
+            else:
+                f.write(linha_jboss_sintetica(aleatorio).replace(" [org.jboss.security] ", " [jboss1] [INFO] [org.jboss.security] - ", 1) + "\n")
+
+def medir_leitura(caminho, modo, interpretar, resultado):
+    """Executado em um processo novo para medir tempo e pico de RSS de cada leitor isoladamente"""
+    inicio = time.perf_counter()
+    if modo == "readlines":
+        with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
+            linhas = f.readlines()
+    else:
+        linhas = ler_linhas_mmap(caminho)
+    
+    if interpretar:
+        quantidade = len(ParserLogs().processar_linhas(linhas))
+    else:
+        quantidade = sum(1 for linha in linhas if linha.strip())
+    
+    resultado.put({
+        "tempo_s": round(time.perf_counter() - inicio, 2),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "linhas": quantidade,
+    })
+
+def benchmark_leitura(linhas):
+    """Compara a carga inicial de um server.log grande via readlines() e via mmap com pré-filtro em bytes"""
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "server.log")
+        criar_arquivo_log_grande(caminho, linhas)
+        tamanho = os.path.getsize(caminho)
+        
+        # Só leitura (linhas entregues ao parser) e carga completa (leitura + parse)
+        medidas = {}
+        for etapa, interpretar in (("leitura", False), ("completo", True)):
+            for modo in ("readlines", "mmap"):
+                fila = contexto.Queue()
+                processo = contexto.Process(target=medir_leitura, args=(caminho, modo, interpretar, fila))
+                processo.start()
+                medidas[f"{etapa}_{modo}"] = fila.get()
+                processo.join()
+    
+    resultado = {"linhas": linhas, "arquivo_mb": round(tamanho / 1e6, 1), **medidas}
+    
+    print(f"Linhas: {linhas}  |  Arquivo: {tamanho / 1e6:.1f} MB")
+    print(f"{'Etapa/leitor':<20}{'Tempo (s)':>12}{'Pico RSS (MB)':>16}{'Linhas':>10}")
+    for nome, valores in medidas.items():
+        print(f"{nome:<20}{valores['tempo_s']:>12.2f}{valores['pico_rss_mb']:>16.1f}{valores['linhas']:>10}")
+    
+    return resultado
+
+def medir_extracao(caminho, modo, resultado):
+    """Executado em um processo novo: extração de campos de um arquivo já lido, por modo do parser"""
+    linhas = list(ler_linhas_mmap(caminho))
+    inicio = time.perf_counter()
+    if modo == "linha_a_linha":
+        logs = tabela_logs(ParserLogs().processar_linhas(linhas))
+    else:
+        logs = ParserLogs().processar_lote(linhas)
+    tempo = time.perf_counter() - inicio
+    
+    resultado.put({
+        "tempo_s": round(tempo, 2),
+        "linhas_por_s": round(len(linhas) / tempo),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "dataframe_mb": round(logs.memory_usage(deep=True).sum() / 1e6, 1),
+        "logs": len(logs),
+    })
+
+def benchmark_extracao(linhas, amostra=20000):
+    """Compara a extração de campos linha a linha (dict por registro) com a extração em lote (pyarrow)"""
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "server.log")
+        criar_arquivo_log_grande(caminho, linhas)
+        
+        # Os dois modos devem produzir exatamente os mesmos registros
+        conteudo = list(ler_linhas_mmap(caminho))[:amostra]
+        esperado = tabela_logs(ParserLogs().processar_linhas(conteudo))
+        obtido = ParserLogs().processar_lote(conteudo)
+        iguais = esperado.astype(object).where(esperado.notna(), None).equals(
+            obtido.astype(object).where(obtido.notna(), None))
+        
+        medidas = {}
+        for modo in ("linha_a_linha", "lote"):
+            fila = contexto.Queue()
+            processo = contexto.Process(target=medir_extracao, args=(caminho, modo, fila))
+            processo.start()
+            medidas[modo] = fila.get()
+            processo.join()
+    
+    resultado = {"linhas": linhas, "resultados_iguais": iguais, **medidas}
+    
+    print(f"Linhas: {linhas}  |  Resultados iguais (amostra de {len(conteudo)}): {'sim' if iguais else 'NÃO'}")
+    print(f"{'Modo':<16}{'Tempo (s)':>12}{'Linhas/s':>12}{'Pico RSS (MB)':>16}{'DataFrame (MB)':>16}")
+    for modo, valores in medidas.items():
+        print(f"{modo:<16}{valores['tempo_s']:>12.2f}{valores['linhas_por_s']:>12}"
+              f"{valores['pico_rss_mb']:>16.1f}{valores['dataframe_mb']:>16.1f}")
+    
+    return resultado
+
+def medir_operacoes_memoria(logs, ip, repeticoes=20):
+    """Tempo médio (ms) do filtro de falhas de login por usuário/IP e do value_counts de usuários"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        len(logs[(logs['operacao'] == 'LOGIN') & (logs['status'] == 'FAILED') & (logs['ip'] == ip)])
+    filtro = (time.perf_counter() - inicio) / repeticoes * 1000
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        logs['usuario'].value_counts().head(5)
+    contagem = (time.perf_counter() - inicio) / repeticoes * 1000
+    return round(filtro, 2), round(contagem, 2)
+
+def benchmark_memoria(linhas):
+    """Memória por coluna e custo de filtros dos logs em memória: colunas object vs. representação compacta"""
+    aleatorio = random.Random(42)
+    registros = []
+    for _ in range(linhas):
+        usuario = f"usuario{aleatorio.randint(0, 199)}"
+        registros.append({
+            "data": f"2026-10-{aleatorio.randint(1, 28):02d}",
+            "hora": f"{aleatorio.randint(0, 23):02d}:{aleatorio.randint(0, 59):02d}:{aleatorio.randint(0, 59):02d}",
+            "nivel": aleatorio.choice(["INFO", "INFO", "WARN", "ERROR"]),
+            "categoria": "org.jboss.security",
+            "servidor": f"jboss{aleatorio.randint(1, 4)}",
+            "thread": f"default task-{aleatorio.randint(1, 64)}",
+            "mensagem": linha_jboss_sintetica(aleatorio),
+            "usuario": usuario,
+            "ip": f"10.0.{aleatorio.randint(0, 3)}.{aleatorio.randint(1, 254)}",
+            "url": aleatorio.choice(["/app/login", "/app/home", "/api/admin", "/app/relatorios"]),
+            "operacao": aleatorio.choice(["LOGIN", "VIEW", "UPDATE"]),
+            "status": aleatorio.choice(["SUCCESS", "SUCCESS", "FAILED"]),
+        })
+    
+    objeto = pd.DataFrame(registros).astype(object)
+    compacto = compactar_logs(objeto)
+    
+    resultado = {"linhas": linhas}
+    for nome, logs, ip in (("object", objeto, "10.0.1.7"), ("compacto", compacto, ip_para_int("10.0.1.7"))):
+        colunas = memoria_logs(logs)
+        total = sum(coluna["bytes"] for coluna in colunas.values())
+        filtro_ms, contagem_ms = medir_operacoes_memoria(logs, ip)
+        resultado[nome] = {"bytes": total, "bytes_por_log": round(total / linhas, 1), "filtro_ms": filtro_ms,
+                           "value_counts_ms": contagem_ms, "colunas": colunas}
+    
+    print(f"Linhas: {linhas}")
+    print(f"{'Coluna':<12}{'object (B/log)':>16}{'compacto (B/log)':>18}  Tipo compacto")
+    for coluna, valores in resultado["compacto"]["colunas"].items():
+        anterior = resultado["object"]["colunas"].get(coluna, {}).get("bytes_por_log", 0)
+        print(f"{coluna:<12}{anterior:>16.1f}{valores['bytes_por_log']:>18.1f}  {valores['tipo']}")
+    for nome in ("object", "compacto"):
+        valores = resultado[nome]
+        print(f"{nome:<10} total {valores['bytes'] / 1e6:>8.1f} MB ({valores['bytes_por_log']} B/log)  "
+              f"filtro {valores['filtro_ms']} ms  value_counts {valores['value_counts_ms']} ms")
+    
+    return resultado
+
+def linha_simples_legado(parser, linha):
+    """Versão em dict de ParserLogs.extrair_info_linha_simples"""
+    match_data_hora = re.search(PADRAO_DATA_HORA_SIMPLES, linha)
+    if not match_data_hora:
+        return None
+    
+    data, hora, ts_evento = parser.normalizar_tempo(*match_data_hora.groups())
+    minusculas = linha.lower()
+    log_info = {
+        "data": data, "hora": hora,
+        "nivel": next((nivel for nivel in NIVEIS_LINHA_SIMPLES if nivel in linha), "UNKNOWN"),
+        "categoria": "desconhecido", "servidor": "desconhecido", "thread": "desconhecido",
+        "mensagem": linha, "usuario": "desconhecido", "ip": "desconhecido", "url": "desconhecido",
+        "operacao": "desconhecido",
+        "status": "SUCCESS" if "success" in minusculas else "FAILED" if "fail" in minusculas or "error" in minusculas else "UNKNOWN",
+        "ts_evento": ts_evento,
+    }
+    match_ip = re.search(PADRAO_IP_SIMPLES, linha)
+    if match_ip:
+        log_info["ip"] = match_ip.group(1)
+    match_url = re.search(PADRAO_URL_SIMPLES, linha)
+    if match_url:
+        log_info["url"] = match_url.group(0)
+    return log_info
+
+def processar_linhas_legado(parser, linhas):
+    """Parser linha a linha anterior ao RegistroLog: um dict novo (e strings novas) por linha"""
+    logs = []
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha:
+            continue
+        
+        for padrao, campos in FORMATOS_LINHA_LOG:
+            match = re.match(padrao, linha)
+            if match:
+                break
+        else:
+            log_info = linha_simples_legado(parser, linha)
+            if log_info:
+                logs.append(log_info)
+            continue
+        
+        campos = dict(zip(campos, match.groups()))
+        mensagem = campos["mensagem"]
+        log_info = {"usuario": "desconhecido", "ip": "desconhecido", "url": "desconhecido",
+                    "operacao": "desconhecido", "status": "desconhecido"}
+        for campo, padrao_campo in (("usuario", PADRAO_USUARIO_MENSAGEM), ("ip", PADRAO_IP_MENSAGEM),
+                                    ("url", PADRAO_URL_MENSAGEM)):
+            match_campo = re.search(padrao_campo, mensagem, re.IGNORECASE)
+            if match_campo:
+                log_info[campo] = match_campo.group(1)
+        log_info["operacao"] = next((valor for valor, padrao_regra in REGRAS_OPERACAO
+                                     if re.search(padrao_regra, mensagem, re.IGNORECASE)), "desconhecido")
+        log_info["status"] = next((valor for valor, padrao_regra in REGRAS_STATUS
+                                   if re.search(padrao_regra, mensagem, re.IGNORECASE)), "desconhecido")
+        
+        data, hora, ts_evento = parser.normalizar_tempo(campos["data"], campos["hora"])
+        log_info.update({"data": data, "hora": hora, "nivel": campos["nivel"], "categoria": campos["categoria"],
+                         "servidor": campos.get("servidor", "desconhecido"),
+                         "thread": campos.get("thread", "desconhecido"), "mensagem": mensagem,
+                         "ts_evento": ts_evento})
+        logs.append(log_info)
+    return logs
+
+def medir_registros(caminho, modo, resultado):
+    """Executado em um processo novo: parse até a gravação no banco com dicts ou com RegistroLog"""
+    linhas = list(ler_linhas_mmap(caminho))
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    coletas_iniciais = sum(estatistica["collections"] for estatistica in gc.get_stats())
+    
+    inicio = time.perf_counter()
+    parser = ParserLogs()
+    logs = processar_linhas_legado(parser, linhas) if modo == "dict" else parser.processar_linhas(linhas)
+    tempo_parse = time.perf_counter() - inicio
+    coletas = sum(estatistica["collections"] for estatistica in gc.get_stats()) - coletas_iniciais
+    rss_parse = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        motor = MotorMonitoramento(os.path.join(diretorio, "registros.db"))
+        motor.parar_manutencao()
+        # A migração do schema roda em segundo plano; não medir a gravação concorrendo com ela
+        while not motor.schema_tipado:
+            time.sleep(0.05)
+        inicio = time.perf_counter()
+        motor.salvar_logs_db(logs)
+        tempo_gravacao = time.perf_counter() - inicio
+    
+    resultado.put({
+        "logs": len(logs),
+        "parse_s": round(tempo_parse, 2),
+        "linhas_por_s": round(len(linhas) / tempo_parse),
+        "coletas_gc": coletas,
+        "memoria_registros_mb": round((rss_parse - rss_inicial) / 1024, 1),
+        "gravacao_s": round(tempo_gravacao, 2),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+
+def benchmark_registros(linhas):
+    """Compara o caminho parser -> gravação no banco com um dict por linha e com RegistroLog (__slots__)"""
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "server.log")
+        criar_arquivo_log_grande(caminho, linhas)
+        
+        medidas = {}
+        for modo in ("dict", "registro"):
+            fila = contexto.Queue()
+            processo = contexto.Process(target=medir_registros, args=(caminho, modo, fila))
+            processo.start()
+            medidas[modo] = fila.get()
+            processo.join()
+    
+    resultado = {"linhas": linhas, **medidas}
+    
+    print(f"Linhas: {linhas}")
+    print(f"{'Modo':<10}{'Parse (s)':>11}{'Linhas/s':>11}{'Coletas GC':>12}{'Registros (MB)':>16}"
+          f"{'Gravação (s)':>14}{'Pico RSS (MB)':>15}")
+    for modo, valores in medidas.items():
+        print(f"{modo:<10}{valores['parse_s']:>11.2f}{valores['linhas_por_s']:>11}{valores['coletas_gc']:>12}"
+              f"{valores['memoria_registros_mb']:>16.1f}{valores['gravacao_s']:>14.2f}{valores['pico_rss_mb']:>15.1f}")
+    
+    return resultado
+
+def linha_jboss_sintetica(aleatorio):
+    """Gera uma linha no formato padrão de log do JBoss"""
+    usuario = f"usuario{aleatorio.randint(0, 199)}"
+    ip = f"10.0.{aleatorio.randint(0, 3)}.{aleatorio.randint(1, 254)}"
+    agora = datetime.datetime.now()
+    return (f"{agora:%Y-%m-%d %H:%M:%S},{agora.microsecond // 1000:03d} "
+            f"{aleatorio.choice(['INFO', 'INFO', 'WARN', 'ERROR'])} [org.jboss.security] "
+            f"(default task-{aleatorio.randint(1, 64)}) User {usuario} login "
+            f"{aleatorio.choice(['SUCCESS', 'SUCCESS', 'FAILED'])} URL=/app/login IP={ip}")
+
+def enquadrar_mensagem(linha, protocolo):
+    """Codifica uma linha para o protocolo do receptor"""
+    if protocolo == "tcp-linhas":
+        return linha.encode() + b"\n"
+    
+    mensagem = f"<134>1 {datetime.datetime.now().astimezone().isoformat()} jboss01 jboss - - - {linha}".encode()
+    if protocolo == "syslog-tcp":
+        # Contagem de octetos (RFC 6587)
+        return str(len(mensagem)).encode() + b" " + mensagem
+    return mensagem
+
+def gerar_carga_rede(host, porta, protocolo, linhas, conexoes=4, taxa=None, semente=42):
+    """Gerador de carga: envia linhas JBoss sintéticas a um receptor; retorna o tempo de envio (s)"""
+    por_conexao = [linhas // conexoes + (1 if i < linhas % conexoes else 0) for i in range(conexoes)]
+    
+    def enviar(indice, quantidade):
+        aleatorio = random.Random(semente + indice)
+        intervalo = conexoes / taxa if taxa else 0
+        udp = protocolo == "syslog-udp"
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM if udp else socket.SOCK_STREAM)
+        if not udp:
+            sock.connect((host, porta))
+        
+        pendente = []
+        proximo = time.perf_counter()
+        for _ in range(quantidade):
+            dados = enquadrar_mensagem(linha_jboss_sintetica(aleatorio), protocolo)
+            if udp:
+                sock.sendto(dados, (host, porta))
+            else:
+                pendente.append(dados)
+                if len(pendente) >= 200:
+                    sock.sendall(b"".join(pendente))
+                    pendente = []
+            
+            if intervalo:
+                proximo += intervalo
+                espera = proximo - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+        
+        if pendente:
+            sock.sendall(b"".join(pendente))
+        sock.close()
+    
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=enviar, args=(i, n)) for i, n in enumerate(por_conexao)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - inicio
+
+def benchmark_rede(linhas, protocolo, conexoes, taxa=None):
+    """Mede a vazão do receptor de rede do ColetorLogs via loopback"""
+    chave = protocolo.replace("-", "_")
+    fila = queue.Queue(maxsize=256)
+    coletor = ColetorLogs(fila, {"endereco_receptor": "127.0.0.1", chave: 0})
+    coletor.iniciar([])
+    porta = coletor.portas[chave]
+    
+    # Consumidor no lugar do pipeline: apenas conta as linhas entregues
+    recebidas = [0]
+    def consumir():
+        while True:
+            lote = fila.get()
+            if lote is None:
+                break
+            recebidas[0] += len(lote[1])
+    consumidor = threading.Thread(target=consumir, daemon=True)
+    consumidor.start()
+    
+    inicio = time.perf_counter()
+    tempo_envio = gerar_carga_rede("127.0.0.1", porta, protocolo, linhas, conexoes, taxa)
+    
+    # Aguardar a entrega (UDP pode descartar sob saturação)
+    limite = time.perf_counter() + 10
+    while recebidas[0] < linhas and time.perf_counter() < limite:
+        estatisticas = coletor.estatisticas()
+        if recebidas[0] + sum(e["descartadas"] for e in estatisticas.values()) >= linhas:
+            break
+        time.sleep(0.05)
+    tempo_total = time.perf_counter() - inicio
+    
+    estatisticas = next(iter(coletor.estatisticas().values()))
+    coletor.parar()
+    fila.put(None)
+    
+    resultado = {
+        "protocolo": protocolo,
+        "linhas": linhas,
+        "conexoes": conexoes,
+        "recebidas": recebidas[0],
+        "descartadas": estatisticas["descartadas"],
+        "envio_s": round(tempo_envio, 3),
+        "total_s": round(tempo_total, 3),
+        "linhas_por_s": round(recebidas[0] / tempo_total),
+    }
+    
+    print(f"Protocolo: {protocolo}  |  Conexões: {conexoes}  |  Enviadas: {linhas}")
+    print(f"Recebidas: {recebidas[0]}  |  Descartadas: {estatisticas['descartadas']}  |  "
+          f"{tempo_total:.2f}s  |  {resultado['linhas_por_s']} linhas/s")
+    
+    return resultado
+
+# Gerador sintético: os três formatos de linha reconhecidos pelo ParserLogs (ver FORMATOS_LINHA_LOG)
+FORMATOS_SINTETICOS = ("colchetes", "servidor", "jboss")
+
+# Eventos comuns: (peso, nível, categoria, modelo da mensagem)
+EVENTOS_SINTETICOS = (
+    (30, "INFO", "org.jboss.security", "Login successful user={usuario} IP={ip} URL=/app/login"),
+    (5, "WARN", "org.jboss.security", "Login failed user={usuario} IP={ip} URL=/app/login"),
+    (35, "INFO", "org.jboss.as.web", "GET request user={usuario} IP={ip} URL={url} status=200"),
+    (15, "INFO", "org.jboss.as.web", "POST request user={usuario} IP={ip} URL={url} status=200"),
+    (3, "INFO", "org.jboss.as.web", "DELETE request user={usuario} IP={ip} URL={url} status=403"),
+    (7, "INFO", "org.jboss.security", "Logout user={usuario} IP={ip}"),
+    (5, "ERROR", "org.jboss.as.ejb3", "Exception processing request user={usuario} IP={ip} URL={url}"),
+)
+URLS_SINTETICAS = ("/app/dashboard", "/app/users", "/app/reports", "/app/settings", "/api/data",
+                   "/app/products", "/app/orders", "/admin/config")
+EXCECOES_SINTETICAS = (
+    "java.lang.NullPointerException",
+    "java.lang.IllegalStateException: Transaction is not active",
+    "javax.persistence.PersistenceException: org.hibernate.exception.JDBCConnectionException",
+)
+QUADROS_STACK_SINTETICOS = (
+    "org.jboss.as.ejb3.component.invocation.Handler.invoke(Handler.java:{linha})",
+    "org.hibernate.internal.SessionImpl.flush(SessionImpl.java:{linha})",
+    "org.jboss.resteasy.core.MethodInjectorImpl.invoke(MethodInjectorImpl.java:{linha})",
+    "io.undertow.servlet.handlers.ServletHandler.handleRequest(ServletHandler.java:{linha})",
+)
+
+# Métricas comparadas entre execuções da suíte: (etapa, métrica, maior é melhor)
+METRICAS_SUITE = (
+    ("parse", "linhas_por_s", True),
+    ("banco", "linhas_por_s", True),
+    ("alertas", "p50_ms", False),
+    ("alertas", "p95_ms", False),
+    ("dashboard", "mediana_ms", False),
+    (None, "pico_rss_mb", False),
+)
+
+def formatar_linha_sintetica(formato, momento, nivel, categoria, servidor, thread, mensagem):
+    """Monta uma linha de log JBoss em um dos FORMATOS_SINTETICOS"""
+    agora = datetime.datetime.fromtimestamp(momento)
+    data = f"{agora:%Y-%m-%d}"
+    hora = f"{agora:%H:%M:%S},{agora.microsecond // 1000:03d}"
+    if formato == "colchetes":
+        return f"[{data}] [{hora}] [{nivel}] [{categoria}] {mensagem}"
+    if formato == "servidor":
+        return f"{data} {hora} [{servidor}] [{nivel}] [{categoria}] - {mensagem}"
+    return f"{data} {hora} {nivel} [{categoria}] ({thread}) {mensagem}"
+
+def escrever_logs_sinteticos(caminho, linhas, usuarios=200, ips=1000, formatos=FORMATOS_SINTETICOS,
+                             rajadas=10, tamanho_rajada=30, fracao_stack=0.2, horas=24, fim=None, semente=42):
+    """Escreve um server.log sintético e reprodutível (mesma semente e mesmo `fim`, mesmo arquivo); retorna um resumo
+
+    Usuários e IPs vêm de conjuntos com a cardinalidade pedida. As rajadas de ataque
+    alternam força bruta (um usuário) e credential stuffing (vários usuários), cada
+    uma de um IP fora desse conjunto; uma fração dos eventos ERROR traz stack trace.
+    Os horários crescem de forma uniforme ao longo das últimas `horas` até `fim`.
+    """
+    aleatorio = random.Random(semente)
+    fim = time.time() if fim is None else fim
+    inicio = fim - horas * 3600
+    passo = horas * 3600 / max(linhas, 1)
+    
+    nomes_usuarios = [f"usuario{i}" for i in range(usuarios)]
+    enderecos = [f"10.{i // 65024 % 256}.{i // 254 % 256}.{i % 254 + 1}" for i in range(ips)]
+    servidores = [f"jboss{i}" for i in range(1, 4)]
+    pesos = [sum(evento[0] for evento in EVENTOS_SINTETICOS[:i + 1]) for i in range(len(EVENTOS_SINTETICOS))]
+    # Posições de início das rajadas (disparam na primeira linha escrita a partir de cada uma)
+    posicoes_rajada = sorted(aleatorio.sample(range(linhas), min(rajadas, linhas)), reverse=True)
+    
+    resumo = {"linhas": 0, "eventos": 0, "linhas_stack": 0, "linhas_ataque": 0, "rajadas": [],
+              "formatos": list(formatos), "usuarios": usuarios, "ips": ips, "semente": semente}
+    pendentes = []
+    
+    def escrever(linha):
+        pendentes.append(linha)
+        resumo["linhas"] += 1
+        if len(pendentes) >= 10000:
+            f.write("\n".join(pendentes) + "\n")
+            pendentes.clear()
+    
+    with open(caminho, 'w', encoding='utf-8') as f:
+        while resumo["linhas"] < linhas:
+            indice = resumo["linhas"]
+            formato = aleatorio.choice(formatos)
+            servidor = aleatorio.choice(servidores)
+            thread = f"default task-{aleatorio.randint(1, 64)}"
+            
+            if posicoes_rajada and indice >= posicoes_rajada[-1]:
+                posicoes_rajada.pop()
+                # Rajada de logins falhos de um IP atacante, em linhas consecutivas
+                numero = len(resumo["rajadas"])
+                ip_ataque = f"203.0.113.{numero % 254 + 1}"
+                forca_bruta = numero % 2 == 0
+                alvo = aleatorio.choice(nomes_usuarios)
+                quantidade = min(tamanho_rajada, linhas - indice)
+                for _ in range(quantidade):
+                    usuario = alvo if forca_bruta else aleatorio.choice(nomes_usuarios)
+                    escrever(formatar_linha_sintetica(
+                        formato, inicio + resumo["linhas"] * passo, "WARN", "org.jboss.security", servidor, thread,
+                        f"Login failed user={usuario} IP={ip_ataque} URL=/app/login"))
+                resumo["eventos"] += quantidade
+                resumo["linhas_ataque"] += quantidade
+                resumo["rajadas"].append({"tipo": "forca_bruta" if forca_bruta else "credential_stuffing",
+                                          "ip": ip_ataque, "usuario": alvo if forca_bruta else None,
+                                          "linhas": quantidade})
+                continue
+            
+            _, nivel, categoria, modelo = aleatorio.choices(EVENTOS_SINTETICOS, cum_weights=pesos)[0]
+            mensagem = modelo.format(usuario=aleatorio.choice(nomes_usuarios), ip=aleatorio.choice(enderecos),
+                                     url=aleatorio.choice(URLS_SINTETICAS))
+            escrever(formatar_linha_sintetica(formato, inicio + indice * passo, nivel, categoria, servidor, thread,
+                                              mensagem))
+            resumo["eventos"] += 1
+            
+            if nivel == "ERROR" and resumo["linhas"] < linhas and aleatorio.random() < fracao_stack:
+                # Stack trace: linhas de continuação sem data, descartadas pelo parser
+                escrever(aleatorio.choice(EXCECOES_SINTETICAS))
+                for _ in range(min(aleatorio.randint(6, 20), linhas - resumo["linhas"])):
+                    quadro = aleatorio.choice(QUADROS_STACK_SINTETICOS).format(linha=aleatorio.randint(1, 999))
+                    escrever(f"\tat {quadro}")
+                    resumo["linhas_stack"] += 1
+                resumo["linhas_stack"] += 1
+        
+        if pendentes:
+            f.write("\n".join(pendentes) + "\n")
+    
+    resumo["bytes"] = os.path.getsize(caminho)
+    return resumo
+
+def versao_codigo():
+    """Identifica o código medido (commit do git e versões das bibliotecas) para comparar execuções"""
+    versao = {"python": platform.python_version(), "pandas": pd.__version__}
+    try:
+        import pyarrow
+        versao["pyarrow"] = pyarrow.__version__
+    except ImportError:
+        versao["pyarrow"] = None
+    try:
+        versao["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        versao["commit"] = None
+    return versao
+
+def medir_suite(caminho, resultado, amostra_alertas=2000, repeticoes_dashboard=5, semente=42):
+    """Executado em um processo novo: parse, gravação no banco, alertas e dashboard sobre o arquivo sintético"""
+    with open(caminho, 'rb') as f:
+        linhas_arquivo = sum(bloco.count(b"\n") for bloco in iter(lambda: f.read(1 << 20), b""))
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        motor = MotorMonitoramento(os.path.join(diretorio, "suite.db"))
+        motor.parar_manutencao()
+        # A migração do schema roda em segundo plano; não medir a gravação concorrendo com ela
+        while not motor.schema_tipado:
+            time.sleep(0.05)
+        
+        # Parse: o caminho da carga de arquivo (mmap + extração em lote quando há pyarrow)
+        inicio = time.perf_counter()
+        logs = motor.parser.interpretar(ler_linhas_mmap(caminho))
+        tempo_parse = time.perf_counter() - inicio
+        
+        # Gravação no banco (transação única, rollups e índice FTS incluídos)
+        inicio = time.perf_counter()
+        motor.salvar_logs_db(logs)
+        tempo_banco = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        motor.substituir_logs_memoria(logs)
+        tempo_memoria = time.perf_counter() - inicio
+        
+        # Alertas: latência de verificar_alerta por log, sobre uma amostra fixa com os logs em memória
+        registros = registros_logs(logs)
+        amostra = random.Random(semente).sample(registros, min(amostra_alertas, len(registros)))
+        latencias = []
+        for log in amostra:
+            inicio = time.perf_counter()
+            motor.verificar_alerta(log)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        latencias.sort()
+        
+        # Dashboard: os agregados de todos os painéis (o desenho em Tk não entra na medida)
+        tempos_dashboard = []
+        for _ in range(repeticoes_dashboard):
+            inicio = time.perf_counter()
+            motor.dados_dashboard()
+            tempos_dashboard.append((time.perf_counter() - inicio) * 1000)
+        
+        def percentil(fracao):
+            return round(latencias[min(int(len(latencias) * fracao), len(latencias) - 1)], 3) if latencias else None
+        
+        resultado.put({
+            "parse": {"linhas": linhas_arquivo, "logs": len(logs), "tempo_s": round(tempo_parse, 3),
+                      "linhas_por_s": round(linhas_arquivo / tempo_parse)},
+            "banco": {"logs": len(logs), "tempo_s": round(tempo_banco, 3),
+                      "linhas_por_s": round(len(logs) / tempo_banco) if tempo_banco else None},
+            "memoria": {"logs": len(motor.logs_completos), "tempo_s": round(tempo_memoria, 3)},
+            "alertas": {"avaliados": len(latencias), "gerados": len(motor.alertas), "p50_ms": percentil(0.5),
+                        "p95_ms": percentil(0.95), "p99_ms": percentil(0.99),
+                        "max_ms": round(latencias[-1], 3) if latencias else None},
+            "dashboard": {"repeticoes": repeticoes_dashboard,
+                          "mediana_ms": round(statistics.median(tempos_dashboard), 2)},
+            "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        })
+
+def comparar_suite(atual, anterior, tolerancia=0.10):
+    """Imprime a variação das METRICAS_SUITE em relação a uma execução anterior; retorna as regressões"""
+    regressoes = []
+    print(f"\nComparação com {anterior.get('versao', {}).get('commit') or 'execução anterior'}:")
+    print(f"{'Métrica':<24}{'Anterior':>14}{'Atual':>14}{'Variação':>11}")
+    for etapa, metrica, maior_melhor in METRICAS_SUITE:
+        valor_atual = (atual.get(etapa) or {}).get(metrica) if etapa else atual.get(metrica)
+        valor_anterior = (anterior.get(etapa) or {}).get(metrica) if etapa else anterior.get(metrica)
+        nome = f"{etapa}.{metrica}" if etapa else metrica
+        if not valor_atual or not valor_anterior:
+            continue
+        
+        variacao = valor_atual / valor_anterior - 1
+        piora = -variacao if maior_melhor else variacao
+        marca = "  REGRESSÃO" if piora > tolerancia else ""
+        if marca:
+            regressoes.append(nome)
+        print(f"{nome:<24}{valor_anterior:>14}{valor_atual:>14}{variacao:>+10.1%}{marca}")
+    return regressoes
+
+def benchmark_suite(linhas, usuarios, ips, rajadas, tamanho_rajada, fracao_stack, formatos,
+                    semente=42, anterior=None):
+    """Suíte reprodutível: gera o log sintético e mede parse, banco, alertas, dashboard e pico de RSS"""
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "server.log")
+        inicio = time.perf_counter()
+        gerador = escrever_logs_sinteticos(caminho, linhas, usuarios, ips, formatos, rajadas, tamanho_rajada,
+                                           fracao_stack, semente=semente)
+        gerador["tempo_s"] = round(time.perf_counter() - inicio, 2)
+        
+        fila = contexto.Queue()
+        processo = contexto.Process(target=medir_suite, args=(caminho, fila), kwargs={"semente": semente})
+        processo.start()
+        medidas = fila.get()
+        processo.join()
+    
+    resultado = {
+        "versao": versao_codigo(),
+        "executado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "parametros": {"linhas": linhas, "usuarios": usuarios, "ips": ips, "rajadas": rajadas,
+                       "tamanho_rajada": tamanho_rajada, "fracao_stack": fracao_stack,
+                       "formatos": list(formatos), "semente": semente},
+        "gerador": {chave: valor for chave, valor in gerador.items() if chave != "rajadas"},
+        **medidas,
+    }
+    
+    print(f"Linhas: {linhas}  |  Arquivo: {gerador['bytes'] / 1e6:.1f} MB  |  Eventos: {gerador['eventos']}  |  "
+          f"Stack: {gerador['linhas_stack']}  |  Ataque: {gerador['linhas_ataque']}")
+    print(f"{'Etapa':<12}{'Tempo (s)':>12}{'Linhas/s':>12}")
+    for etapa in ("parse", "banco", "memoria"):
+        valores = medidas[etapa]
+        print(f"{etapa:<12}{valores['tempo_s']:>12.2f}{valores.get('linhas_por_s') or '-':>12}")
+    alertas = medidas["alertas"]
+    print(f"Alertas: {alertas['avaliados']} logs avaliados, {alertas['gerados']} alertas  |  "
+          f"p50 {alertas['p50_ms']} ms  p95 {alertas['p95_ms']} ms  máx {alertas['max_ms']} ms")
+    print(f"Dashboard: {medidas['dashboard']['mediana_ms']} ms (mediana)  |  Pico RSS: {medidas['pico_rss_mb']} MB")
+    
+    if anterior:
+        with open(anterior) as f:
+            resultado["regressoes"] = comparar_suite(resultado, json.load(f))
+    
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Sistema de Monitoramento de Logs")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    parser_consultas = subparsers.add_parser("consultas", help="Consultas de carregar_logs_db antes/depois da migração do schema")
+    parser_consultas.add_argument("--linhas", type=int, default=200000)
+    parser_consultas.add_argument("--json", help="Arquivo para salvar o resultado")
+
+    parser_parquet = subparsers.add_parser("parquet", help="Análise histórica via SQLite vs. Parquet colunar")
+    parser_parquet.add_argument("--linhas", type=int, default=500000)
+    parser_parquet.add_argument("--dias", type=int, default=7, help="Janela analisada (dias mais recentes)")
+    parser_parquet.add_argument("--json", help="Arquivo para salvar o resultado")
+
+    parser_leitura = subparsers.add_parser("leitura", help="Carga inicial de arquivo grande: readlines() vs. mmap")
+    parser_leitura.add_argument("--linhas", type=int, default=1000000)
+    parser_leitura.add_argument("--json", help="Arquivo para salvar o resultado")
+    
+    parser_extracao = subparsers.add_parser("extracao", help="Extração de campos: linha a linha vs. em lote (pyarrow)")
+    parser_extracao.add_argument("--linhas", type=int, default=500000)
+    parser_extracao.add_argument("--json", help="Arquivo para salvar o resultado")
+    
+    parser_memoria = subparsers.add_parser("memoria", help="Logs em memória: colunas object vs. representação compacta")
+    parser_memoria.add_argument("--linhas", type=int, default=200000)
+    parser_memoria.add_argument("--json", help="Arquivo para salvar o resultado")
+    
+    parser_registros = subparsers.add_parser("registros", help="Parser até o banco: dict por linha vs. RegistroLog")
+    parser_registros.add_argument("--linhas", type=int, default=500000)
+    parser_registros.add_argument("--json", help="Arquivo para salvar o resultado")
+    
+    parser_suite = subparsers.add_parser("suite", help="Suíte completa sobre log JBoss sintético (resultado em JSON)")
+    parser_gerar = subparsers.add_parser("gerar", help="Apenas escreve o log JBoss sintético da suíte")
+    parser_gerar.add_argument("saida", help="Arquivo de log a escrever")
+    for subparser in (parser_suite, parser_gerar):
+        subparser.add_argument("--linhas", type=int, default=1000000)
+        subparser.add_argument("--usuarios", type=int, default=200, help="Cardinalidade de usuários")
+        subparser.add_argument("--ips", type=int, default=1000, help="Cardinalidade de IPs")
+        subparser.add_argument("--rajadas", type=int, default=10, help="Rajadas de ataque (logins falhos)")
+        subparser.add_argument("--tamanho-rajada", type=int, default=30, help="Linhas por rajada")
+        subparser.add_argument("--fracao-stack", type=float, default=0.2,
+                               help="Fração dos eventos ERROR seguidos de stack trace")
+        subparser.add_argument("--formatos", nargs="+", choices=FORMATOS_SINTETICOS, default=list(FORMATOS_SINTETICOS))
+        subparser.add_argument("--semente", type=int, default=42)
+    parser_suite.add_argument("--comparar", metavar="JSON", help="Resultado anterior para detectar regressões")
+    parser_suite.add_argument("--json", help="Arquivo para salvar o resultado")
+    parser_gerar.set_defaults(json=None)
+    
+    parser_rede = subparsers.add_parser("rede", help="Vazão do receptor syslog/TCP (loopback) ou gerador de carga")
+    parser_rede.add_argument("--linhas", type=int, default=200000)
+    parser_rede.add_argument("--protocolo", choices=["syslog-udp", "syslog-tcp", "tcp-linhas"], default="syslog-tcp")
+    parser_rede.add_argument("--conexoes", type=int, default=4, help="Conexões (ou sockets UDP) simultâneas")
+    parser_rede.add_argument("--taxa", type=int, help="Linhas por segundo (padrão: sem limite)")
+    parser_rede.add_argument("--destino", metavar="HOST:PORTA",
+                             help="Apenas gera carga contra um receptor já em execução")
+    parser_rede.add_argument("--json", help="Arquivo para salvar o resultado")
+    
+    args = parser.parse_args()
+
+    if args.comando == "consultas":
+        resultado = benchmark_consultas(args.linhas)
+    elif args.comando == "parquet":
+        resultado = benchmark_parquet(args.linhas, args.dias)
+    elif args.comando == "leitura":
+        resultado = benchmark_leitura(args.linhas)
+    elif args.comando == "extracao":
+        resultado = benchmark_extracao(args.linhas)
+    elif args.comando == "memoria":
+        resultado = benchmark_memoria(args.linhas)
+    elif args.comando == "registros":
+        resultado = benchmark_registros(args.linhas)
+    elif args.comando == "suite":
+        resultado = benchmark_suite(args.linhas, args.usuarios, args.ips, args.rajadas, args.tamanho_rajada,
+                                    args.fracao_stack, args.formatos, args.semente, args.comparar)
+    elif args.comando == "gerar":
+        resultado = escrever_logs_sinteticos(args.saida, args.linhas, args.usuarios, args.ips, args.formatos,
+                                             args.rajadas, args.tamanho_rajada, args.fracao_stack,
+                                             semente=args.semente)
+        print(f"{resultado['linhas']} linhas ({resultado['bytes'] / 1e6:.1f} MB) escritas em {args.saida}")
+    elif args.comando == "rede" and args.destino:
+        host, porta = args.destino.rsplit(":", 1)
+        tempo = gerar_carga_rede(host, int(porta), args.protocolo, args.linhas, args.conexoes, args.taxa)
+        resultado = {"protocolo": args.protocolo, "linhas": args.linhas, "envio_s": round(tempo, 3)}
+        print(f"{args.linhas} linhas enviadas para {args.destino} em {tempo:.2f}s")
+    elif args.comando == "rede":
+        resultado = benchmark_rede(args.linhas, args.protocolo, args.conexoes, args.taxa)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(resultado, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5947 @@
+import argparse
+import array
+import asyncio
+import bisect
+import contextlib
+import cProfile
+import csv
+import datetime
+import functools
+import http.server
+import re
+import os
+import json
+import pathlib
+import signal
+import socket
+import sys
+import threading
+import time
+import queue
+import random
+from collections import Counter, OrderedDict
+import sqlite3
+import hashlib
+import heapq
+import itertools
+import gzip
+import bz2
+import lzma
+import mmap
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Colunas indexadas pelo índice de texto completo (FTS5)
+COLUNAS_FTS = ("mensagem", "usuario", "ip", "url")
+
+# Caracteres que fazem parte de um token no índice FTS5 (preserva IPs, e-mails e usuários como joao.silva)
+PADRAO_TOKEN_FTS = r"[\w.@-]+"
+
+def expressao_fts(valor, coluna=None, prefixo=False):
+    """Converte um valor livre em uma expressão FTS5 segura (frase entre aspas)"""
+    tokens = re.findall(PADRAO_TOKEN_FTS, valor or "")
+    if not tokens:
+        return None
+
+    expressao = '"' + " ".join(tokens) + '"'
+    if prefixo:
+        expressao += "*"
+    if coluna:
+        expressao = f"{coluna} : {expressao}"
+    return expressao
+
+def montar_consulta_fts(texto):
+    """Monta uma consulta FTS5 a partir do texto digitado pelo usuário
+
+    Suporta termos simples (falha), prefixos (adm*), frases ("login failed")
+    e restrição por coluna (usuario:joao, url:"api admin"*). Todos os termos
+    são combinados com AND.
+    """
+    padrao = r'(?:(' + "|".join(COLUNAS_FTS) + r'):)?(?:"([^"]*)"(\*)?|(\S+))'
+    expressoes = []
+
+    for coluna, frase, prefixo_frase, termo in re.findall(padrao, texto or ""):
+        if termo:
+            prefixo = termo.endswith("*")
+            expressao = expressao_fts(termo.rstrip("*"), coluna or None, prefixo)
+        else:
+            expressao = expressao_fts(frase, coluna or None, bool(prefixo_frase))
+
+        if expressao:
+            expressoes.append(expressao)
+
+    return " AND ".join(expressoes) if expressoes else None
+
+# Versão do schema da tabela logs (PRAGMA user_version)
+# 1: colunas tipadas (ts_evento em epoch ms, campos codificados por dicionário) e índices compostos
+# 2: chave_dedup única para descartar linhas recarregadas
+VERSAO_SCHEMA = 2
+
+# Campos de baixa cardinalidade armazenados como inteiros via tabela dicionario
+CAMPOS_DICIONARIO = ("nivel", "status", "operacao", "servidor")
+
+# Colunas da tabela logs copiadas para as partições diárias
+COLUNAS_LOGS = ("id", "data", "hora", "nivel", "categoria", "servidor", "thread", "mensagem", "usuario", "ip",
+                "url", "operacao", "status", "timestamp", "ts_evento", "nivel_id", "status_id", "operacao_id",
+                "servidor_id", "chave_dedup")
+
+# Configuração padrão do armazenamento particionado
+ARMAZENAMENTO_PADRAO = {
+    "diretorio_particoes": "particoes",  # Diretório das partições diárias (relativo ao banco)
+    "dias_quentes": 7,  # Dias mantidos no banco principal
+    "retencao_dias": 90,  # Partições mais antigas são removidas
+    "arquivar_parquet": False,  # Converter partições antigas em Parquet compactado
+    "dias_arquivo": 30,  # Idade a partir da qual partições SQLite são arquivadas em Parquet
+    "intervalo_manutencao_min": 60,  # Intervalo entre execuções da manutenção
+    "intervalo_compactacao_horas": 24,  # Intervalo mínimo entre VACUUMs do banco principal
+    "retencao_rollup_minuto_dias": 7,  # Rollups por minuto são mantidos por menos tempo
+    "retencao_rollup_hora_dias": 90  # Rollups por dia seguem a retenção geral
+}
+
+# Formatos aceitos para data e hora nas linhas de log, do mais comum ao mais raro
+FORMATOS_DATA = (
+    '%Y-%m-%d',  # 2023-01-31
+    '%d/%m/%Y',  # 31/01/2023
+    '%d-%m-%Y',  # 31-01-2023
+    '%d.%m.%Y',  # 31.01.2023
+    '%b %d, %Y',  # Jan 31, 2023
+    '%d %b %Y',   # 31 Jan 2023
+)
+FORMATOS_HORA = (
+    '%H:%M:%S',  # 14:30:45
+    '%I:%M:%S %p',  # 02:30:45 PM
+    '%H:%M',  # 14:30
+    '%I:%M %p',  # 02:30 PM
+)
+
+@functools.lru_cache(maxsize=4096)
+def epoch_minuto_local(data, hora_minuto):
+    """Epoch em segundos do início de um minuto local (YYYY-MM-DD, HH:MM)
+
+    Memoizado: as linhas chegam em ordem cronológica, então a resolução de fuso
+    e horário de verão roda uma vez por minuto do log e não por linha.
+    Levanta ValueError para datas ou horas inválidas, como o strptime.
+    """
+    return datetime.datetime(int(data[:4]), int(data[5:7]), int(data[8:10]),
+                             int(hora_minuto[:2]), int(hora_minuto[3:5])).timestamp()
+
+def calcular_ts_evento(data, hora):
+    """Converte data (YYYY-MM-DD) e hora (HH:MM:SS) em epoch em milissegundos (horário local)"""
+    try:
+        # Caminho rápido: fatiamento do formato ISO em vez de strptime por linha
+        if (len(data) == 10 and len(hora) == 8 and data[4] == '-' and data[7] == '-'
+                and hora[2] == ':' and hora[5] == ':'):
+            segundos = int(hora[6:8])
+            if 0 <= segundos < 60:
+                return int((epoch_minuto_local(data, hora[:5]) + segundos) * 1000)
+            return None
+
+        momento = datetime.datetime.strptime(f"{data} {hora}", '%Y-%m-%d %H:%M:%S')
+        return int(momento.timestamp() * 1000)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+def calcular_chave_dedup(log):
+    """Hash de 64 bits dos campos de um log sem chave do parser (dicts avulsos, linhas antigas na migração)
+
+    A hora não tem milissegundos: eventos iguais no mesmo segundo colidem. Os
+    logs interpretados pelo ParserLogs já trazem a chave de chave_dedup_linha.
+    """
+    texto = "\x1f".join(str(log.get(campo, '') or '') for campo in ('data', 'hora', 'servidor', 'thread', 'mensagem'))
+    digest = hashlib.blake2b(texto.encode('utf-8', 'ignore'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def chave_dedup_legado(log, ocorrencia=0):
+    """Chave das linhas gravadas antes de chave_dedup_linha (migração da versão 2 e recarga desses dias)
+
+    Os campos guardados não têm milissegundos nem a posição na fonte, então
+    eventos distintos no mesmo segundo têm o mesmo hash: a ocorrência (0, 1, ...)
+    numera as repetições em vez de descartá-las.
+    """
+    chave = calcular_chave_dedup(log)
+    if not ocorrencia:
+        return chave
+    digest = hashlib.blake2b(f"{chave}\x1f{ocorrencia}".encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def chave_dedup_linha(linha, origem=None, posicao=None):
+    """Hash de 64 bits da linha bruta (timestamp com milissegundos) e da sua posição na fonte
+
+    Com origem e posição (byte de início da linha no arquivo), só a recarga da
+    mesma linha colide; eventos idênticos no mesmo segundo, ou até no mesmo
+    milissegundo em outra posição, são gravados. Sem posição (receptores de
+    rede) colidem apenas linhas idênticas, milissegundos inclusive.
+    """
+    texto = f"{origem or ''}\x1f{'' if posicao is None else posicao}\x1f{linha}"
+    digest = hashlib.blake2b(texto.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+# Sufixos de rotação (server.log.1, server.log.2026-10-01) removidos do nome da fonte
+PADRAO_SUFIXO_ROTACAO = re.compile(r'\.(?:\d+|\d{4}-\d{2}-\d{2}[\w-]*)$')
+
+def origem_log(arquivo):
+    """Nome da fonte na chave de deduplicação: sem diretório, compressão e sufixo de rotação
+
+    O arquivo rotacionado (server.log.1.gz) tem as mesmas linhas nas mesmas
+    posições que tinham em server.log, então as duas leituras geram as mesmas chaves.
+    """
+    nome = os.path.basename(arquivo)
+    raiz, extensao = os.path.splitext(nome)
+    if extensao in COMPRESSORES_LOG:
+        nome = raiz
+    return PADRAO_SUFIXO_ROTACAO.sub('', nome)
+
+def intervalo_dia_ms(data):
+    """Retorna o intervalo [início, fim) em epoch ms do dia informado (YYYY-MM-DD)"""
+    inicio = calcular_ts_evento(data, "00:00:00")
+    if inicio is None:
+        return None, None
+
+    dia_seguinte = datetime.datetime.strptime(data, '%Y-%m-%d') + datetime.timedelta(days=1)
+    return inicio, calcular_ts_evento(dia_seguinte.strftime('%Y-%m-%d'), "00:00:00")
+
+class DicionarioValores:
+    """Codifica valores de baixa cardinalidade em inteiros usando a tabela dicionario"""
+
+    def __init__(self):
+        self.cache = {}
+
+    def codificar(self, cursor, campo, valor):
+        """Retorna o id do valor para o campo, criando a entrada se necessário"""
+        chave = (campo, valor or '')
+        id_valor = self.cache.get(chave)
+        if id_valor is not None:
+            return id_valor
+
+        cursor.execute("INSERT OR IGNORE INTO dicionario (campo, valor) VALUES (?, ?)", chave)
+        cursor.execute("SELECT id FROM dicionario WHERE campo = ? AND valor = ?", chave)
+        id_valor = cursor.fetchone()[0]
+        self.cache[chave] = id_valor
+        return id_valor
+
+def preparar_schema_tipado(conn):
+    """Cria a tabela dicionario e adiciona as colunas tipadas à tabela logs (operação instantânea)"""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS dicionario (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        campo TEXT NOT NULL,
+        valor TEXT NOT NULL,
+        UNIQUE (campo, valor)
+    )
+    ''')
+
+    cursor.execute("PRAGMA table_info(logs)")
+    colunas = {linha[1] for linha in cursor.fetchall()}
+
+    for coluna in ["ts_evento"] + [f"{campo}_id" for campo in CAMPOS_DICIONARIO] + ["chave_dedup"]:
+        if coluna not in colunas:
+            cursor.execute(f"ALTER TABLE logs ADD COLUMN {coluna} INTEGER")
+
+    # Linhas antigas ficam com chave NULL (permitido pelo índice único) até a migração preenchê-las
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_chave_dedup ON logs (chave_dedup)')
+
+    # Intervalo (ts_evento) das linhas que receberam chave_dedup_legado na migração
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS chaves_legado (
+        ts_min INTEGER,
+        ts_max INTEGER
+    )
+    ''')
+
+    conn.commit()
+
+def migrar_schema_logs(conn, tamanho_lote=5000):
+    """Migra a tabela logs para o schema tipado sem bloquear leitores e gravador
+
+    As colunas novas são preenchidas em lotes curtos, cada um em sua própria
+    transação (em modo WAL os leitores e a ingestão continuam durante a
+    migração). Os índices compostos só são criados ao final. Retorna True
+    quando o banco está na versão atual do schema.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA user_version")
+    versao = cursor.fetchone()[0]
+    if versao >= VERSAO_SCHEMA:
+        return True
+
+    preparar_schema_tipado(conn)
+
+    if versao < 1:
+        migrar_para_schema_tipado(conn, tamanho_lote)
+
+    if versao < 2:
+        migrar_para_chave_dedup(conn, tamanho_lote)
+
+    return True
+
+def migrar_para_schema_tipado(conn, tamanho_lote):
+    """Versão 1: preenche ts_evento e os ids do dicionário e cria os índices compostos"""
+    cursor = conn.cursor()
+    dicionario = DicionarioValores()
+
+    # Preencher ts_evento e ids do dicionário para as linhas antigas
+    ultimo_id = 0
+    while True:
+        cursor.execute('''
+        SELECT id, data, hora, nivel, status, operacao, servidor
+        FROM logs
+        WHERE id > ? AND ts_evento IS NULL
+        ORDER BY id
+        LIMIT ?
+        ''', (ultimo_id, tamanho_lote))
+        linhas = cursor.fetchall()
+        if not linhas:
+            break
+
+        atualizacoes = []
+        for id_log, data, hora, nivel, status, operacao, servidor in linhas:
+            atualizacoes.append((
+                calcular_ts_evento(data, hora),
+                dicionario.codificar(cursor, 'nivel', nivel),
+                dicionario.codificar(cursor, 'status', status),
+                dicionario.codificar(cursor, 'operacao', operacao),
+                dicionario.codificar(cursor, 'servidor', servidor),
+                id_log
+            ))
+
+        cursor.executemany('''
+        UPDATE logs SET ts_evento = ?, nivel_id = ?, status_id = ?, operacao_id = ?, servidor_id = ?
+        WHERE id = ?
+        ''', atualizacoes)
+        conn.commit()
+
+        ultimo_id = linhas[-1][0]
+
+    # Índice de cobertura por tempo: ordenação, intervalos e contagens por nível/status sem acessar a tabela
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_logs_ts_cobertura
+    ON logs (ts_evento, nivel_id, status_id, operacao_id, usuario, ip)
+    ''')
+
+    # Índices compostos para as combinações de filtros de carregar_logs_db e dos alertas
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_nivel_ts ON logs (nivel_id, ts_evento)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_status_ts ON logs (status_id, ts_evento)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_nivel_status_ts ON logs (nivel_id, status_id, ts_evento)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_operacao_status_ts ON logs (operacao_id, status_id, ts_evento)')
+
+    cursor.execute("PRAGMA user_version = 1")
+    conn.commit()
+
+def migrar_para_chave_dedup(conn, tamanho_lote):
+    """Versão 2: preenche chave_dedup das linhas antigas com chave_dedup_legado, sem remover nenhuma
+
+    A linha bruta e a posição na fonte usadas por chave_dedup_linha não estão no
+    banco, e linhas com os mesmos campos no mesmo segundo podem ser eventos
+    distintos: cada repetição recebe a ocorrência seguinte. O intervalo migrado
+    fica em chaves_legado para que salvar_logs_db reconheça a recarga desses dias.
+    """
+    cursor = conn.cursor()
+
+    ultimo_id = 0
+    ts_min = ts_max = None
+    while True:
+        cursor.execute('''
+        SELECT id, data, hora, servidor, thread, mensagem, ts_evento
+        FROM logs
+        WHERE id > ? AND chave_dedup IS NULL
+        ORDER BY id
+        LIMIT ?
+        ''', (ultimo_id, tamanho_lote))
+        linhas = cursor.fetchall()
+        if not linhas:
+            break
+
+        for id_log, data, hora, servidor, thread, mensagem, ts_evento in linhas:
+            log = {'data': data, 'hora': hora, 'servidor': servidor, 'thread': thread, 'mensagem': mensagem}
+            ocorrencia = 0
+            while True:
+                cursor.execute("UPDATE OR IGNORE logs SET chave_dedup = ? WHERE id = ?",
+                               (chave_dedup_legado(log, ocorrencia), id_log))
+                if cursor.rowcount:
+                    break
+                ocorrencia += 1
+
+            if ts_evento is not None:
+                ts_min = ts_evento if ts_min is None else min(ts_min, ts_evento)
+                ts_max = ts_evento if ts_max is None else max(ts_max, ts_evento)
+        conn.commit()
+
+        ultimo_id = linhas[-1][0]
+
+    if ts_min is not None:
+        cursor.execute("INSERT INTO chaves_legado (ts_min, ts_max) VALUES (?, ?)", (ts_min, ts_max))
+    cursor.execute("PRAGMA user_version = 2")
+    conn.commit()
+
+def carregar_faixa_chaves_legado(conn):
+    """Intervalo [ts_min, ts_max] das linhas com chave_dedup_legado, ou None se o banco não tem nenhuma"""
+    ts_min, ts_max = conn.execute("SELECT MIN(ts_min), MAX(ts_max) FROM chaves_legado").fetchone()
+    return None if ts_min is None else (ts_min, ts_max)
+
+def criar_schema_particao(conn, esquema):
+    """Cria a tabela logs, os índices e o índice FTS5 em um arquivo de partição anexado"""
+    cursor = conn.cursor()
+
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {esquema}.logs (
+        id INTEGER PRIMARY KEY,
+        data TEXT,
+        hora TEXT,
+        nivel TEXT,
+        categoria TEXT,
+        servidor TEXT,
+        thread TEXT,
+        mensagem TEXT,
+        usuario TEXT,
+        ip TEXT,
+        url TEXT,
+        operacao TEXT,
+        status TEXT,
+        timestamp TEXT,
+        ts_evento INTEGER,
+        nivel_id INTEGER,
+        status_id INTEGER,
+        operacao_id INTEGER,
+        servidor_id INTEGER,
+        chave_dedup INTEGER
+    )
+    ''')
+
+    cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {esquema}.idx_logs_chave_dedup ON logs (chave_dedup)')
+    cursor.execute(f'''
+    CREATE INDEX IF NOT EXISTS {esquema}.idx_logs_ts_cobertura
+    ON logs (ts_evento, nivel_id, status_id, operacao_id, usuario, ip)
+    ''')
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS {esquema}.idx_logs_nivel_status_ts ON logs (nivel_id, status_id, ts_evento)')
+
+    # Partições são gravadas em lote: o índice FTS é reconstruído após cada cópia, sem gatilhos
+    cursor.execute(f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {esquema}.logs_fts USING fts5(
+        mensagem, usuario, ip, url,
+        content='logs',
+        content_rowid='id',
+        tokenize="unicode61 tokenchars '._-@'"
+    )
+    ''')
+    criar_indice_trigrama(conn, esquema)
+
+    conn.commit()
+
+def criar_indice_trigrama(conn, esquema="main"):
+    """Cria o índice trigrama (FTS5) de usuário, IP e URL, que resolve LIKE '%x%' sem varrer a tabela
+
+    Retorna False se o SQLite não tem o tokenizador trigram (anterior à 3.34):
+    os filtros continuam com LIKE direto na tabela logs.
+    """
+    try:
+        conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {esquema}.logs_trigrama USING fts5(
+            usuario, ip, url,
+            content='logs',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+        ''')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def indice_trigrama_disponivel(conn, esquema="main"):
+    """Indica se o esquema tem o índice trigrama (partições antigas e SQLite < 3.34 não têm)"""
+    return conn.execute(f"SELECT 1 FROM {esquema}.sqlite_master WHERE type='table' AND name='logs_trigrama'"
+                        ).fetchone() is not None
+
+def intervalo_filtros(filtros):
+    """Extrai o intervalo [início, fim) em epoch ms dos filtros (data ou ts_inicio/ts_fim)"""
+    if not filtros:
+        return None, None
+
+    if filtros.get('data'):
+        return intervalo_dia_ms(filtros['data'])
+
+    return filtros.get('ts_inicio'), filtros.get('ts_fim')
+
+def montar_consulta_logs(filtros=None, limite=1000, schema_tipado=True, fts_disponivel=True, esquema="main",
+                         colunas="*", crescente=False, trigrama_disponivel=False):
+    """Monta a consulta SQL de carregar_logs_db, retornando (query, params)
+
+    O esquema permite executar a mesma consulta no banco principal ou em uma
+    partição diária anexada (o dicionário fica sempre no banco principal).
+    Limite -1 retorna todas as linhas (exportação). trigrama_disponivel indica
+    se o esquema tem logs_trigrama (ver indice_trigrama_disponivel).
+    """
+    query = f"SELECT {colunas} FROM {esquema}.logs"
+    params = []
+    where_clauses = []
+
+    if filtros:
+        if 'data' in filtros and filtros['data']:
+            inicio, fim = intervalo_dia_ms(filtros['data']) if schema_tipado else (None, None)
+            if inicio is not None:
+                where_clauses.append("ts_evento >= ? AND ts_evento < ?")
+                params.extend([inicio, fim])
+            else:
+                where_clauses.append("data = ?")
+                params.append(filtros['data'])
+        elif schema_tipado:
+            if filtros.get('ts_inicio') is not None:
+                where_clauses.append("ts_evento >= ?")
+                params.append(filtros['ts_inicio'])
+
+            if filtros.get('ts_fim') is not None:
+                where_clauses.append("ts_evento < ?")
+                params.append(filtros['ts_fim'])
+
+        # Usuário, IP e URL casam em qualquer posição ("silva" encontra "joao.silva", "10.0" encontra
+        # "192.10.0.5"); a partir de 3 caracteres o LIKE é resolvido pelo índice trigrama
+        for campo in ('usuario', 'ip', 'url'):
+            if campo in filtros and filtros[campo]:
+                if trigrama_disponivel and len(filtros[campo]) >= 3:
+                    where_clauses.append(f"id IN (SELECT rowid FROM {esquema}.logs_trigrama WHERE {campo} LIKE ?)")
+                else:
+                    where_clauses.append(f"{campo} LIKE ?")
+                params.append(f"%{filtros[campo]}%")
+
+        if 'texto' in filtros and filtros['texto']:
+            expressao = montar_consulta_fts(filtros['texto']) if fts_disponivel else None
+            if expressao:
+                # Texto livre da mensagem é resolvido pelo índice FTS5
+                where_clauses.append(f"id IN (SELECT rowid FROM {esquema}.logs_fts WHERE logs_fts MATCH ?)")
+                params.append(expressao)
+            else:
+                where_clauses.append("mensagem LIKE ?")
+                params.append(f"%{filtros['texto']}%")
+
+        for campo in ('nivel', 'status'):
+            if campo in filtros and filtros[campo] and filtros[campo] != "TODOS":
+                if schema_tipado:
+                    # Subconsulta escalar avaliada uma única vez: compara inteiros no índice composto
+                    where_clauses.append(f"{campo}_id = (SELECT id FROM main.dicionario WHERE campo = '{campo}' AND valor = ?)")
+                else:
+                    where_clauses.append(f"{campo} = ?")
+                params.append(filtros[campo])
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    # Adicionar ordenação e limite
+    ordem = "ASC" if crescente else "DESC"
+    if schema_tipado:
+        query += f" ORDER BY ts_evento {ordem} LIMIT ?"
+    else:
+        query += f" ORDER BY data {ordem}, hora {ordem} LIMIT ?"
+    params.append(limite)
+
+    return query, params
+
+# Conexões somente leitura mantidas abertas para as consultas da interface
+TAMANHO_POOL_LEITURA = 4
+
+# Resultados de consulta guardados (entradas e total de linhas); o cache é descartado a cada gravação no banco
+CAPACIDADE_CACHE_CONSULTAS = 32
+MAX_LINHAS_CACHE_CONSULTAS = 200000
+
+def normalizar_filtros(filtros):
+    """Chave canônica dos filtros: ignora campos vazios e "TODOS", como montar_consulta_logs"""
+    if not filtros:
+        return ()
+
+    itens = []
+    for campo, valor in filtros.items():
+        if valor is None or valor == "" or (campo in ('nivel', 'status') and valor == "TODOS"):
+            continue
+        if campo in ('ts_inicio', 'ts_fim') and filtros.get('data'):
+            continue  # A data tem precedência sobre o intervalo
+        itens.append((campo, valor))
+
+    return tuple(sorted(itens))
+
+def conectar_leitura(db_path):
+    """Abre uma conexão somente leitura ao banco (utilizável por outras threads)"""
+    uri = pathlib.Path(db_path).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+class PoolLeitura:
+    """Conexões somente leitura reaproveitadas entre consultas
+
+    No modo WAL os leitores não bloqueiam o gravador (nem são bloqueados por
+    ele). Uma conexão sentinela expõe PRAGMA data_version, que muda sempre que
+    outra conexão (deste ou de outro processo) grava no banco: é a marca
+    d'água usada para invalidar o cache de consultas.
+    """
+
+    def __init__(self, db_path, tamanho=TAMANHO_POOL_LEITURA):
+        self.db_path = db_path
+        self.livres = queue.LifoQueue()
+        self.vagas = threading.BoundedSemaphore(tamanho)
+        self.lock_sentinela = threading.Lock()
+        self.sentinela = None
+
+    def abrir(self):
+        return conectar_leitura(self.db_path)
+
+    @contextlib.contextmanager
+    def conexao(self):
+        """Empresta uma conexão; se a consulta falhar ela é descartada em vez de voltar ao pool"""
+        with self.vagas:
+            try:
+                conn = self.livres.get_nowait()
+            except queue.Empty:
+                conn = self.abrir()
+
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self.livres.put(conn)
+
+    def marca_dagua(self):
+        """Versão dos dados do banco vista pela conexão sentinela"""
+        with self.lock_sentinela:
+            if self.sentinela is None:
+                self.sentinela = self.abrir()
+            return self.sentinela.execute("PRAGMA data_version").fetchone()[0]
+
+    def fechar(self):
+        with self.lock_sentinela:
+            if self.sentinela is not None:
+                self.sentinela.close()
+                self.sentinela = None
+        while True:
+            try:
+                self.livres.get_nowait().close()
+            except queue.Empty:
+                break
+
+class CacheConsultas:
+    """Cache LRU de resultados de consulta, válido enquanto a marca d'água do banco não muda"""
+
+    def __init__(self, capacidade=CAPACIDADE_CACHE_CONSULTAS, max_linhas=MAX_LINHAS_CACHE_CONSULTAS):
+        self.capacidade = capacidade
+        self.max_linhas = max_linhas
+        self.itens = OrderedDict()  # chave -> (resultado, linhas)
+        self.linhas = 0
+        self.marca = None
+        self.lock = threading.Lock()
+
+    def obter(self, marca, chave):
+        """Retorna (encontrado, resultado)"""
+        with self.lock:
+            if marca != self.marca:
+                self.limpar(marca)
+            if chave not in self.itens:
+                return False, None
+            self.itens.move_to_end(chave)
+            return True, self.itens[chave][0]
+
+    def guardar(self, marca, chave, resultado, linhas):
+        with self.lock:
+            # Resultado calculado antes de uma gravação concorrente: já nasce obsoleto
+            if marca != self.marca or linhas > self.max_linhas:
+                return
+            if chave in self.itens:
+                self.linhas -= self.itens.pop(chave)[1]
+            self.itens[chave] = (resultado, linhas)
+            self.linhas += linhas
+            while len(self.itens) > self.capacidade or self.linhas > self.max_linhas:
+                self.linhas -= self.itens.popitem(last=False)[1][1]
+
+    def limpar(self, marca=None):
+        self.itens.clear()
+        self.linhas = 0
+        self.marca = marca
+
+# Dimensões agregadas nas tabelas de rollup ("total" conta todas as linhas)
+DIMENSOES_ROLLUP = ("total", "usuario", "ip", "url", "nivel", "status", "operacao")
+
+# Granularidades das tabelas de rollup e o tamanho de cada balde em milissegundos
+GRANULARIDADES_ROLLUP = {
+    "minuto": 60000,
+    "hora": 3600000,
+    "dia": 86400000
+}
+
+def criar_tabelas_rollup(conn):
+    """Cria as tabelas de rollup por minuto, hora e dia"""
+    cursor = conn.cursor()
+
+    for granularidade in GRANULARIDADES_ROLLUP:
+        # Chave começa pela dimensão: consultas de relatório filtram dimensão + intervalo de baldes
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS rollup_{granularidade} (
+            dimensao TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            valor TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (dimensao, bucket, valor)
+        ) WITHOUT ROWID
+        ''')
+
+    conn.commit()
+
+def bucket_dia_ms(ts_evento, cache=None):
+    """Retorna o início (meia-noite local) do dia do evento em epoch ms"""
+    chave_hora = ts_evento // 3600000
+    if cache is not None and chave_hora in cache:
+        return cache[chave_hora]
+
+    dia = datetime.datetime.fromtimestamp(ts_evento / 1000).strftime('%Y-%m-%d')
+    inicio = intervalo_dia_ms(dia)[0]
+    if cache is not None:
+        cache[chave_hora] = inicio
+    return inicio
+
+def atualizar_rollups(cursor, logs):
+    """Acumula um lote de logs nas tabelas de rollup (incremental, chamado durante a ingestão)"""
+    contagens = {granularidade: Counter() for granularidade in GRANULARIDADES_ROLLUP}
+    cache_dias = {}
+
+    for log in logs:
+        ts_evento = log.get('ts_evento')
+        if ts_evento is None:
+            continue
+
+        baldes = {
+            "minuto": ts_evento - ts_evento % 60000,
+            "hora": ts_evento - ts_evento % 3600000,
+            "dia": bucket_dia_ms(ts_evento, cache_dias)
+        }
+
+        for dimensao in DIMENSOES_ROLLUP:
+            valor = '' if dimensao == 'total' else str(log.get(dimensao, '') or '')
+            for granularidade, bucket in baldes.items():
+                contagens[granularidade][(dimensao, bucket, valor)] += 1
+
+    for granularidade, contagem in contagens.items():
+        if not contagem:
+            continue
+
+        cursor.executemany(f'''
+        INSERT INTO rollup_{granularidade} (dimensao, bucket, valor, total) VALUES (?, ?, ?, ?)
+        ON CONFLICT (dimensao, bucket, valor) DO UPDATE SET total = total + excluded.total
+        ''', [(dimensao, bucket, valor, total) for (dimensao, bucket, valor), total in contagem.items()])
+
+def reconstruir_rollups(conn, ts_inicio=None, ts_fim=None):
+    """Recalcula as tabelas de rollup a partir dos logs (banco principal e partições)
+
+    Usado para backfill de bancos anteriores aos rollups ou após recargas de
+    dias já selados. O intervalo deve estar alinhado a dias (meia-noite local).
+    """
+    criar_tabelas_rollup(conn)
+    cursor = conn.cursor()
+
+    condicoes = ["ts_evento IS NOT NULL"]
+    params = []
+    if ts_inicio is not None:
+        condicoes.append("ts_evento >= ?")
+        params.append(ts_inicio)
+    if ts_fim is not None:
+        condicoes.append("ts_evento < ?")
+        params.append(ts_fim)
+    where = " AND ".join(condicoes)
+
+    # Partições do intervalo (as arquivadas em Parquet são lidas com pandas)
+    query = "SELECT caminho, formato FROM particoes WHERE 1 = 1"
+    params_particoes = []
+    if ts_inicio is not None:
+        query += " AND ts_max >= ?"
+        params_particoes.append(ts_inicio)
+    if ts_fim is not None:
+        query += " AND ts_min < ?"
+        params_particoes.append(ts_fim)
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='particoes'")
+    particoes = cursor.execute(query, params_particoes).fetchall() if cursor.fetchone() else []
+
+    if any(formato == 'parquet' for _, formato in particoes):
+        import pyarrow  # noqa: F401  (falha antes de apagar os rollups existentes)
+
+    # Apagar os baldes do intervalo em todas as granularidades
+    for granularidade in GRANULARIDADES_ROLLUP:
+        condicoes_bucket = []
+        if ts_inicio is not None:
+            condicoes_bucket.append("bucket >= ?")
+        if ts_fim is not None:
+            condicoes_bucket.append("bucket < ?")
+        where_bucket = " WHERE " + " AND ".join(condicoes_bucket) if condicoes_bucket else ""
+        cursor.execute(f"DELETE FROM rollup_{granularidade}{where_bucket}", params)
+
+    # Expressões SQL equivalentes aos baldes calculados em atualizar_rollups
+    expressoes_bucket = {
+        "minuto": "ts_evento - ts_evento % 60000",
+        "hora": "ts_evento - ts_evento % 3600000",
+        "dia": "CAST(strftime('%s', date(ts_evento / 1000, 'unixepoch', 'localtime'), 'utc') AS INTEGER) * 1000"
+    }
+
+    for caminho, formato in [("", "sqlite")] + particoes:
+        esquema = "main"
+        if caminho and formato == "sqlite":
+            conn.execute("ATTACH DATABASE ? AS particao", (caminho,))
+            esquema = "particao"
+        elif caminho:
+            colunas = ["ts_evento"] + [d for d in DIMENSOES_ROLLUP if d != "total"]
+            df = pd.read_parquet(caminho, columns=colunas)
+            if ts_inicio is not None:
+                df = df[df['ts_evento'] >= ts_inicio]
+            if ts_fim is not None:
+                df = df[df['ts_evento'] < ts_fim]
+            atualizar_rollups(cursor, df.to_dict('records'))
+            conn.commit()
+            continue
+
+        try:
+            for granularidade, expressao in expressoes_bucket.items():
+                for dimensao in DIMENSOES_ROLLUP:
+                    valor = "''" if dimensao == "total" else f"COALESCE({dimensao}, '')"
+                    cursor.execute(f'''
+                    INSERT INTO rollup_{granularidade} (dimensao, bucket, valor, total)
+                    SELECT '{dimensao}', {expressao}, {valor}, COUNT(*)
+                    FROM {esquema}.logs
+                    WHERE {where}
+                    GROUP BY 2, 3
+                    ON CONFLICT (dimensao, bucket, valor) DO UPDATE SET total = total + excluded.total
+                    ''', params)
+            conn.commit()
+        finally:
+            if esquema == "particao":
+                conn.execute("DETACH DATABASE particao")
+
+def consultar_rollups(conn, dimensao, ts_inicio=None, ts_fim=None, granularidade=None, limite=None, serie=False):
+    """Consulta os rollups de uma dimensão no intervalo
+
+    Retorna um DataFrame (valor, total) ordenado pelo total, ou a série
+    temporal (bucket, valor, total) quando serie=True. Sem granularidade
+    explícita, usa a mais grossa alinhada às extremidades do intervalo.
+    """
+    if granularidade is None:
+        granularidade = "minuto"
+        extremos = [ts for ts in (ts_inicio, ts_fim) if ts is not None]
+        if all(ts % 3600000 == 0 for ts in extremos):
+            granularidade = "hora"
+        if all(bucket_dia_ms(ts) == ts for ts in extremos):
+            granularidade = "dia"
+
+    condicoes = ["dimensao = ?"]
+    params = [dimensao]
+    if ts_inicio is not None:
+        condicoes.append("bucket >= ?")
+        params.append(ts_inicio)
+    if ts_fim is not None:
+        condicoes.append("bucket < ?")
+        params.append(ts_fim)
+    where = " AND ".join(condicoes)
+
+    if serie:
+        query = f"SELECT bucket, valor, total FROM rollup_{granularidade} WHERE {where} ORDER BY bucket"
+    else:
+        query = (f"SELECT valor, SUM(total) AS total FROM rollup_{granularidade} WHERE {where} "
+                 "GROUP BY valor ORDER BY total DESC")
+        if limite:
+            query += " LIMIT ?"
+            params.append(limite)
+
+    return pd.read_sql_query(query, conn, params=params)
+
+# Colunas exportadas para Parquet (os ids do dicionário só fazem sentido dentro do SQLite)
+COLUNAS_PARQUET = ("id", "data", "hora", "nivel", "categoria", "servidor", "thread", "mensagem", "usuario", "ip",
+                   "url", "operacao", "status", "timestamp", "ts_evento", "chave_dedup")
+
+# Colunas repetitivas gravadas com codificação por dicionário (viram category no pandas)
+COLUNAS_CATEGORICAS = ("data", "nivel", "categoria", "servidor", "thread", "usuario", "ip", "url", "operacao", "status")
+
+def schema_parquet():
+    """Schema Arrow dos arquivos Parquet de logs"""
+    import pyarrow as pa
+
+    campos = []
+    for coluna in COLUNAS_PARQUET:
+        if coluna in ("id", "ts_evento", "chave_dedup"):
+            campos.append(pa.field(coluna, pa.int64()))
+        elif coluna in COLUNAS_CATEGORICAS:
+            campos.append(pa.field(coluna, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            campos.append(pa.field(coluna, pa.string()))
+    return pa.schema(campos)
+
+def tabela_arrow_logs(linhas):
+    """Converte linhas (tuplas na ordem de COLUNAS_PARQUET) em uma tabela Arrow"""
+    import pyarrow as pa
+
+    schema = schema_parquet()
+    colunas = list(zip(*linhas)) if linhas else [[] for _ in COLUNAS_PARQUET]
+    arrays = []
+    for campo, valores in zip(schema, colunas):
+        if pa.types.is_dictionary(campo.type):
+            arrays.append(pa.array(valores, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(valores, campo.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def exportar_logs_parquet(conn, destino, ts_inicio=None, ts_fim=None, tamanho_lote=100000):
+    """Exporta a tabela logs (banco principal e partições) para Parquet particionado por dia
+
+    Gera destino/dia=YYYY-MM-DD/logs.parquet com compressão zstd e colunas
+    repetitivas codificadas por dicionário. Dias exportados novamente são
+    substituídos. Retorna o número de linhas exportadas.
+    """
+    import pyarrow.parquet as pq
+
+    colunas = ", ".join(COLUNAS_PARQUET)
+    condicoes = ["ts_evento IS NOT NULL"]
+    params = []
+    if ts_inicio is not None:
+        condicoes.append("ts_evento >= ?")
+        params.append(ts_inicio)
+    if ts_fim is not None:
+        condicoes.append("ts_evento < ?")
+        params.append(ts_fim)
+    where = " AND ".join(condicoes)
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='particoes'")
+    particoes = []
+    if cursor.fetchone():
+        query = "SELECT caminho FROM particoes WHERE formato = 'sqlite'"
+        params_particoes = []
+        if ts_inicio is not None:
+            query += " AND ts_max >= ?"
+            params_particoes.append(ts_inicio)
+        if ts_fim is not None:
+            query += " AND ts_min < ?"
+            params_particoes.append(ts_fim)
+        particoes = [caminho for (caminho,) in cursor.execute(query + " ORDER BY dia", params_particoes).fetchall()]
+
+    escritores = {}
+    cache_dias = {}
+    total = 0
+
+    try:
+        for caminho in particoes + [None]:
+            esquema = "main"
+            if caminho:
+                conn.execute("ATTACH DATABASE ? AS particao", (caminho,))
+                esquema = "particao"
+
+            try:
+                cursor.execute(f"SELECT {colunas} FROM {esquema}.logs WHERE {where} ORDER BY ts_evento", params)
+                indice_ts = COLUNAS_PARQUET.index("ts_evento")
+
+                while True:
+                    linhas = cursor.fetchmany(tamanho_lote)
+                    if not linhas:
+                        break
+
+                    # Agrupar o lote pelo dia do evento (as linhas já vêm ordenadas por tempo)
+                    por_dia = {}
+                    for linha in linhas:
+                        ts_dia = bucket_dia_ms(linha[indice_ts], cache_dias)
+                        por_dia.setdefault(ts_dia, []).append(linha)
+
+                    for ts_dia, linhas_dia in por_dia.items():
+                        dia = datetime.datetime.fromtimestamp(ts_dia / 1000).strftime('%Y-%m-%d')
+                        if dia not in escritores:
+                            diretorio = os.path.join(destino, f"dia={dia}")
+                            os.makedirs(diretorio, exist_ok=True)
+                            escritores[dia] = pq.ParquetWriter(os.path.join(diretorio, "logs.parquet"),
+                                                               schema_parquet(), compression="zstd",
+                                                               use_dictionary=True)
+                        escritores[dia].write_table(tabela_arrow_logs(linhas_dia))
+
+                    total += len(linhas)
+            finally:
+                if caminho:
+                    conn.execute("DETACH DATABASE particao")
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+
+    return total
+
+def carregar_logs_parquet(origem, colunas=None, ts_inicio=None, ts_fim=None, filtros=None):
+    """Carrega logs de um diretório Parquet lendo só as colunas e os dias necessários
+
+    O filtro por dia poda diretórios inteiros (dia=YYYY-MM-DD) e o filtro por
+    ts_evento usa as estatísticas dos row groups. Filtros de igualdade
+    (ex.: {'status': 'FAILED'}) também são empurrados para a leitura.
+    Colunas codificadas por dicionário chegam como category no pandas.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    particionamento = ds.partitioning(pa.schema([("dia", pa.string())]), flavor="hive")
+    dataset = ds.dataset(origem, format="parquet", partitioning=particionamento)
+
+    expressao = None
+    condicoes = []
+    if ts_inicio is not None:
+        dia_inicio = datetime.datetime.fromtimestamp(ts_inicio / 1000).strftime('%Y-%m-%d')
+        condicoes += [ds.field("dia") >= dia_inicio, ds.field("ts_evento") >= ts_inicio]
+    if ts_fim is not None:
+        dia_fim = datetime.datetime.fromtimestamp((ts_fim - 1) / 1000).strftime('%Y-%m-%d')
+        condicoes += [ds.field("dia") <= dia_fim, ds.field("ts_evento") < ts_fim]
+    for campo, valor in (filtros or {}).items():
+        if valor and valor != "TODOS":
+            condicoes.append(ds.field(campo) == valor)
+
+    for condicao in condicoes:
+        expressao = condicao if expressao is None else expressao & condicao
+
+    tabela = dataset.to_table(columns=list(colunas) if colunas else list(COLUNAS_PARQUET), filter=expressao)
+    return tabela.to_pandas()
+
+# Formatos da exportação em streaming (com .gz no destino a saída é comprimida)
+FORMATOS_EXPORTACAO = ("csv", "ndjson")
+
+# Linhas lidas do SQLite e escritas por vez: é tudo o que a exportação mantém em memória
+TAMANHO_LOTE_EXPORTACAO = 5000
+
+def listar_particoes_sqlite(conn, ts_inicio=None, ts_fim=None, crescente=False):
+    """Lista as partições SQLite que intersectam o intervalo (da mais recente para a mais antiga, por padrão)"""
+    query = "SELECT caminho FROM particoes WHERE formato = 'sqlite'"
+    params = []
+
+    if ts_inicio is not None:
+        query += " AND ts_max >= ?"
+        params.append(ts_inicio)
+
+    if ts_fim is not None:
+        query += " AND ts_min < ?"
+        params.append(ts_fim)
+
+    query += " ORDER BY dia" if crescente else " ORDER BY dia DESC"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return [caminho for (caminho,) in cursor.fetchall() if os.path.exists(caminho)]
+
+@contextlib.contextmanager
+def anexar_particao(conn, caminho):
+    """Anexa uma partição como esquema "particao" durante o bloco (caminho None usa o banco principal)"""
+    if not caminho:
+        yield "main"
+        return
+
+    conn.execute("ATTACH DATABASE ? AS particao", (caminho,))
+    try:
+        yield "particao"
+    finally:
+        conn.execute("DETACH DATABASE particao")
+
+def chaves_dedup_em_particao(conn, caminho, formato, chaves, tamanho_lote=500):
+    """Chaves de deduplicação já gravadas em uma partição (SQLite, anexada em conn, ou Parquet)"""
+    if not os.path.exists(caminho):
+        return set()
+
+    if formato == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return set()
+        tabela = pq.read_table(caminho, columns=["chave_dedup"], filters=[("chave_dedup", "in", list(chaves))])
+        return set(tabela.column("chave_dedup").to_pylist())
+
+    encontradas = set()
+    with anexar_particao(conn, caminho) as esquema:
+        for i in range(0, len(chaves), tamanho_lote):
+            lote = chaves[i:i + tamanho_lote]
+            encontradas.update(chave for (chave,) in conn.execute(
+                f"SELECT chave_dedup FROM {esquema}.logs WHERE chave_dedup IN ({','.join('?' * len(lote))})", lote))
+    return encontradas
+
+def formato_exportacao(destino, formato=None):
+    """Deduz (formato, comprimido) da extensão do destino: .csv, .ndjson/.jsonl, com .gz opcional"""
+    comprimido = destino.lower().endswith(".gz")
+    if formato is None:
+        base = destino[:-3] if comprimido else destino
+        formato = "ndjson" if base.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    return formato, comprimido
+
+def exportar_logs_streaming(conn, destino, formato=None, filtros=None, schema_tipado=True, fts_disponivel=True,
+                            tamanho_lote=TAMANHO_LOTE_EXPORTACAO, progresso=None, cancelar=None):
+    """Exporta os logs filtrados (banco principal e partições) para CSV ou NDJSON sem montar DataFrames
+
+    As linhas saem em ordem cronológica, lidas com fetchmany e escritas lote a
+    lote; com destino .gz a saída é comprimida com gzip. O arquivo é escrito
+    em destino.parcial e só renomeado ao final, de modo que uma exportação
+    cancelada (cancelar é um threading.Event) ou com erro não deixa arquivo
+    incompleto. progresso(escritas, total) é chamado após cada lote.
+    Retorna o número de linhas exportadas, ou None se cancelada.
+    """
+    formato, comprimido = formato_exportacao(destino, formato)
+
+    ts_inicio, ts_fim = intervalo_filtros(filtros)
+    particoes = listar_particoes_sqlite(conn, ts_inicio, ts_fim, crescente=True) if schema_tipado else []
+    colunas = ", ".join(COLUNAS_PARQUET)
+
+    def consulta(esquema):
+        return montar_consulta_logs(filtros, -1, schema_tipado=schema_tipado, fts_disponivel=fts_disponivel,
+                                    esquema=esquema, colunas=colunas, crescente=True,
+                                    trigrama_disponivel=indice_trigrama_disponivel(conn, esquema))
+
+    total = 0
+    if progresso:
+        # Estimativa para o progresso: contagem nas mesmas origens, antes de abrir a saída
+        # (um erro aqui não deixa arquivo aberto nem .parcial para trás)
+        for caminho in particoes + [None]:
+            with anexar_particao(conn, caminho) as esquema:
+                query, params = consulta(esquema)
+                total += conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+    parcial = destino + ".parcial"
+    if comprimido:
+        saida = gzip.open(parcial, "wt", encoding="utf-8", newline="", compresslevel=6)
+    else:
+        saida = open(parcial, "w", encoding="utf-8", newline="")
+
+    escritas = 0
+    cancelada = False
+    concluida = False
+    try:
+        escritor = csv.writer(saida) if formato == "csv" else None
+        if escritor:
+            escritor.writerow(COLUNAS_PARQUET)
+
+        for caminho in particoes + [None]:
+            with anexar_particao(conn, caminho) as esquema:
+                query, params = consulta(esquema)
+                cursor = conn.execute(query, params)
+                try:
+                    while not cancelada:
+                        linhas = cursor.fetchmany(tamanho_lote)
+                        if not linhas:
+                            break
+
+                        if escritor:
+                            escritor.writerows(linhas)
+                        else:
+                            saida.writelines(json.dumps(dict(zip(COLUNAS_PARQUET, linha)), ensure_ascii=False) + "\n"
+                                             for linha in linhas)
+
+                        escritas += len(linhas)
+                        if progresso:
+                            progresso(escritas, max(total, escritas))
+                        cancelada = cancelar is not None and cancelar.is_set()
+                finally:
+                    # Encerra a leitura antes do DETACH da partição
+                    cursor.close()
+
+            if cancelada:
+                return None
+
+        concluida = True
+    finally:
+        saida.close()
+        if concluida:
+            os.replace(parcial, destino)
+        elif os.path.exists(parcial):
+            os.remove(parcial)
+
+    return escritas
+
+class TarefaSegundoPlano:
+    """Trabalho longo (exportação, relatório) executado em uma thread, com progresso e cancelamento
+
+    executar recebe (progresso, cancelar): progresso(feitos, total) informa o
+    andamento e cancelar é um threading.Event; retornar None indica que a
+    tarefa foi cancelada.
+    """
+
+    descricao = "executar tarefa"  # Completa a mensagem de erro ("Erro ao ...")
+
+    def __init__(self, executar):
+        self.executar = executar
+        self.estado = "pendente"  # pendente, executando, concluida, cancelada ou erro
+        self.feitos = 0
+        self.total = 0
+        self.erro = None
+        self.inicio = None
+        self.fim = None
+        self.evento_cancelar = threading.Event()
+        self.thread = None
+
+    def iniciar(self):
+        self.inicio = time.time()
+        self.estado = "executando"
+        self.thread = threading.Thread(target=self.rodar, daemon=True)
+        self.thread.start()
+        return self
+
+    def rodar(self):
+        try:
+            resultado = self.executar(self.atualizar_progresso, self.evento_cancelar)
+            self.estado = "cancelada" if resultado is None else "concluida"
+        except Exception as e:
+            self.erro = str(e)
+            self.estado = "erro"
+            print(f"Erro ao {self.descricao}: {self.erro}")
+        finally:
+            self.fim = time.time()
+
+    def atualizar_progresso(self, feitos, total):
+        self.feitos = feitos
+        self.total = total
+
+    def progresso(self):
+        """Fração concluída (0 a 1)"""
+        if self.estado == "concluida":
+            return 1.0
+        return self.feitos / self.total if self.total else 0.0
+
+    def cancelar(self):
+        self.evento_cancelar.set()
+
+    def aguardar(self, timeout=None):
+        """Espera o fim da tarefa; retorna True se ela terminou"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.estado not in ("pendente", "executando")
+
+class TarefaExportacao(TarefaSegundoPlano):
+    """Exportação em streaming; feitos/total contam linhas"""
+
+    def __init__(self, destino, executar):
+        super().__init__(executar)
+        self.destino = destino
+        self.descricao = f"exportar logs para {destino}"
+
+# Relatórios: tipo -> expressão SQL de agrupamento; cada linha soma acessos, falhas e erros da chave
+TIPOS_RELATORIO = {
+    "usuarios": "usuario",
+    "ips": "ip",
+    "urls": "url",
+    "niveis": "nivel",
+    "operacoes": "operacao",
+    "servidores": "servidor",
+    "horas": "substr(hora, 1, 2)",
+}
+COLUNAS_RELATORIO = ("chave", "acessos", "falhas", "erros")
+
+# Geração de relatórios em processos de trabalho, cache por dia no banco e agendamento noturno
+RELATORIOS_PADRAO = {
+    "processos": None,  # Processos de trabalho (padrão: núcleos da CPU)
+    "agendados": ["usuarios", "ips", "urls"],  # Gerados para o dia anterior pela manutenção
+    "hora_agendamento": 2,  # Hora local a partir da qual os agendados são gerados
+    "max_cache_dias": 2000,  # Agregados diários mantidos em relatorios_cache
+}
+
+def dias_do_intervalo(data_inicio, data_fim=None):
+    """Lista (dia, ts_inicio, ts_fim) de cada dia entre as datas YYYY-MM-DD (fim inclusivo)"""
+    dia = datetime.datetime.strptime(data_inicio, '%Y-%m-%d').date()
+    ultimo = datetime.datetime.strptime(data_fim or data_inicio, '%Y-%m-%d').date()
+    dias = []
+    while dia <= ultimo:
+        texto = dia.strftime('%Y-%m-%d')
+        dias.append((texto,) + intervalo_dia_ms(texto))
+        dia += datetime.timedelta(days=1)
+    return dias
+
+def marcas_relatorio(conn, dias):
+    """Marca d'água de cada dia: total ingerido (rollup diário) e estado da partição do dia
+
+    Muda quando chegam logs do dia ou quando a partição é selada, arquivada
+    ou removida; não depende da conexão, então vale entre execuções.
+    """
+    if not dias:
+        return {}
+
+    ts_inicio, ts_fim = dias[0][1], dias[-1][2]
+    totais = dict(conn.execute(
+        "SELECT bucket, total FROM rollup_dia WHERE dimensao = 'total' AND valor = '' AND bucket >= ? AND bucket < ?",
+        (ts_inicio, ts_fim)).fetchall())
+    particoes = dict(conn.execute(
+        "SELECT dia, group_concat(formato || ':' || COALESCE(linhas, '') || ':' || COALESCE(atualizada_em, '')) "
+        "FROM particoes "
+        "WHERE dia >= ? AND dia <= ? GROUP BY dia", (dias[0][0], dias[-1][0])).fetchall())
+
+    return {dia: f"{totais.get(inicio, 0)}|{particoes.get(dia, '')}" for dia, inicio, _ in dias}
+
+def agregar_relatorio_dia(db_path, tipo, ts_inicio, ts_fim):
+    """Agrega um dia de logs (banco principal e partição) para o relatório: executada em processo de trabalho
+
+    Retorna {chave: [acessos, falhas, erros]}.
+    """
+    agrupamento = TIPOS_RELATORIO[tipo]
+    conn = conectar_leitura(db_path)
+    try:
+        linhas = {}
+        for caminho in [None] + listar_particoes_sqlite(conn, ts_inicio, ts_fim):
+            with anexar_particao(conn, caminho) as esquema:
+                cursor = conn.execute(f'''
+                SELECT {agrupamento}, COUNT(*), SUM(status = 'FAILED'), SUM(nivel = 'ERROR')
+                FROM {esquema}.logs WHERE ts_evento >= ? AND ts_evento < ? GROUP BY 1
+                ''', (ts_inicio, ts_fim))
+                for chave, acessos, falhas, erros in cursor:
+                    soma = linhas.setdefault(chave or '', [0, 0, 0])
+                    soma[0] += acessos
+                    soma[1] += falhas
+                    soma[2] += erros
+        return linhas
+    finally:
+        conn.close()
+
+class TarefaRelatorio(TarefaSegundoPlano):
+    """Relatório gerado em segundo plano; feitos/total contam dias e o resultado parcial cresce a cada dia
+
+    A interface acompanha pela versao (incrementada a cada dia agregado) e
+    lê resultado() sem esperar o fim.
+    """
+
+    def __init__(self, tipo, data_inicio, data_fim, executar):
+        super().__init__(executar)
+        self.tipo = tipo
+        self.data_inicio = data_inicio
+        self.data_fim = data_fim
+        self.descricao = f"gerar relatório {tipo} ({data_inicio} a {data_fim})"
+        self.linhas = {}  # chave -> [acessos, falhas, erros], somado entre os dias
+        self.dias_em_cache = 0
+        self.versao = 0
+        self.lock = threading.Lock()
+
+    def acumular(self, linhas_dia):
+        """Soma o agregado de um dia ao resultado parcial"""
+        with self.lock:
+            for chave, valores in linhas_dia.items():
+                soma = self.linhas.setdefault(chave, [0, 0, 0])
+                for i, valor in enumerate(valores):
+                    soma[i] += valor
+            self.versao += 1
+
+    def resultado(self, limite=None):
+        """DataFrame (chave, acessos, falhas, erros, taxa_falha) ordenado por acessos"""
+        with self.lock:
+            linhas = [(chave,) + tuple(valores) for chave, valores in self.linhas.items()]
+        df = pd.DataFrame(linhas, columns=list(COLUNAS_RELATORIO))
+        df["taxa_falha"] = (df["falhas"] / df["acessos"].where(df["acessos"] > 0)).fillna(0.0).round(4)
+        ordem = "chave" if self.tipo == "horas" else "acessos"
+        df = df.sort_values(ordem, ascending=ordem == "chave", kind="stable").reset_index(drop=True)
+        return df.head(limite) if limite else df
+
+def hash_distinto(valor):
+    """Hash de 64 bits estável entre processos, usado pelos contadores de valores distintos"""
+    return int.from_bytes(hashlib.blake2b(str(valor).encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+class HyperLogLog:
+    """Estimativa de valores distintos em memória fixa (2^precisao registradores de um byte)
+
+    Erro padrão de ~1,04/sqrt(2^precisao): 3,3% com a precisão padrão (1 KB).
+    Recebe hashes de hash_distinto, calculados uma vez por valor.
+    """
+    __slots__ = ("precisao", "registradores")
+
+    def __init__(self, precisao=10):
+        self.precisao = precisao
+        self.registradores = bytearray(1 << precisao)
+
+    def adicionar_hash(self, h):
+        """Retorna True se algum registrador mudou (a estimativa pode ter aumentado)"""
+        indice = h & ((1 << self.precisao) - 1)
+        resto = h >> self.precisao
+        posicao = 65 - self.precisao - resto.bit_length()  # Posição do primeiro bit 1 (1 a 65 - precisão)
+        if posicao > self.registradores[indice]:
+            self.registradores[indice] = posicao
+            return True
+        return False
+
+    def unir(self, outro):
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+
+    def estimar(self):
+        m = len(self.registradores)
+        soma = sum(2.0 ** -r for r in self.registradores)
+        estimativa = (0.7213 / (1 + 1.079 / m)) * m * m / soma
+        vazios = self.registradores.count(0)
+        if estimativa <= 2.5 * m and vazios:
+            # Correção para cardinalidades pequenas (contagem linear)
+            estimativa = m * np.log(m / vazios)
+        return int(round(estimativa))
+
+# Abaixo deste número de valores o ContadorDistintos guarda os hashes (contagem exata)
+LIMITE_DISTINTOS_EXATOS = 64
+
+# Até este número de valores os hashes ficam em uma tupla (bem menor que um set)
+LIMITE_DISTINTOS_TUPLA = 8
+
+class ContadorDistintos:
+    """Contagem de valores distintos: exata (hashes) até LIMITE_DISTINTOS_EXATOS, depois HyperLogLog
+
+    Mantém pequenos os milhões de contadores com poucos valores (tupla, depois
+    set) e limita a memória dos que recebem muitos.
+    """
+    __slots__ = ("hashes", "hll")
+
+    def __init__(self):
+        self.hashes = ()
+        self.hll = None
+
+    def adicionar_hash(self, h):
+        """Retorna True se o valor é novo (ou, no HyperLogLog, se a estimativa pode ter mudado)"""
+        if self.hll is not None:
+            return self.hll.adicionar_hash(h)
+
+        if h in self.hashes:
+            return False
+        if len(self.hashes) < LIMITE_DISTINTOS_TUPLA:
+            self.hashes += (h,)
+            return True
+
+        if isinstance(self.hashes, tuple):
+            self.hashes = set(self.hashes)
+        self.hashes.add(h)
+        if len(self.hashes) > LIMITE_DISTINTOS_EXATOS:
+            self.hll = HyperLogLog()
+            for valor in self.hashes:
+                self.hll.adicionar_hash(valor)
+            self.hashes = None
+        return True
+
+    def estimar(self):
+        return self.hll.estimar() if self.hll is not None else len(self.hashes)
+
+def estimar_uniao_distintos(contadores):
+    """Valores distintos na união de vários ContadorDistintos (exata enquanto nenhum virou HyperLogLog)"""
+    if all(contador.hll is None for contador in contadores):
+        return len(set().union(*(contador.hashes for contador in contadores)))
+    hll = HyperLogLog()
+    for contador in contadores:
+        if contador.hll is not None:
+            hll.unir(contador.hll)
+        else:
+            for h in contador.hashes:
+                hll.adicionar_hash(h)
+    return hll.estimar()
+
+class EsbocoContagemMinima:
+    """Count-min sketch: contagens aproximadas (nunca subestimadas) em memória fixa
+
+    largura x profundidade contadores de 32 bits; as linhas usam hashes derivados
+    de um único hash_distinto (h1 + i*h2).
+    """
+    __slots__ = ("largura", "profundidade", "contadores")
+
+    def __init__(self, largura=2048, profundidade=4):
+        self.largura = largura
+        self.profundidade = profundidade
+        self.contadores = [array.array("I", [0]) * largura for _ in range(profundidade)]
+
+    def adicionar_hash(self, h, quantidade=1):
+        """Soma quantidade ao valor e retorna a nova estimativa"""
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        estimativa = None
+        for i, linha in enumerate(self.contadores):
+            indice = (h1 + i * h2) % self.largura
+            linha[indice] += quantidade
+            if estimativa is None or linha[indice] < estimativa:
+                estimativa = linha[indice]
+        return estimativa
+
+    def estimar_hash(self, h):
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return min(linha[(h1 + i * h2) % self.largura] for i, linha in enumerate(self.contadores))
+
+    def limpar(self):
+        for linha in self.contadores:
+            linha[:] = array.array("I", [0]) * self.largura
+
+# Detecção de desvios em fluxo (taxa por usuário e IP)
+DETECCAO_PADRAO = {
+    "anomalias": True,  # Compara a taxa do minuto de cada usuário/IP com a taxa normal da própria entidade
+    "fator_anomalia": 20,  # Alerta quando o minuto passa de fator x a taxa normal
+    "minimo_anomalia": 60,  # Requisições no minuto abaixo das quais nunca há alerta
+    "taxa_minima": 2.0,  # Taxa normal assumida (req/min) para entidades novas ou quietas
+    "alfa_ewma": 0.1,  # Peso de cada minuto ativo na média móvel exponencial
+    "alfa_sazonal": 0.05,  # Peso de cada minuto ativo no perfil da hora do dia
+    "amostras_sazonais": 5,  # Minutos de uma hora do dia necessários para usar o perfil sazonal
+    "max_entidades": 50000,  # Entidades com linha de base própria; as demais ficam no count-min sketch
+    "promocao_cauda": 10,  # Requisições no minuto para uma entidade da cauda ganhar linha de base
+    # Correlação de falhas de login (usuários distintos por IP e IPs distintos por usuário)
+    "correlacao_login": True,
+    "janela_correlacao_min": 10,  # Janela deslizante das contagens
+    "fatias_correlacao": 5,  # Fatias da janela (a janela avança de fatia em fatia)
+    "usuarios_por_ip": 20,  # Usuários distintos com falha a partir de um IP (credential stuffing)
+    "ips_por_usuario": 10,  # IPs distintos com falha para um usuário (força bruta distribuída)
+    "max_chaves_correlacao": 50000,  # IPs e usuários acompanhados em cada direção (LRU)
+    "max_chaves_falhas_login": 50000,  # Pares usuário/IP acompanhados pela regra falhas_login (LRU)
+    # Processos que avaliam as regras acima e a regra falhas_login de alertas_config, fragmentadas por
+    # hash de usuário/IP (0 = na thread do pipeline).
+    # Ao mudar o número de processos as linhas de base e janelas recomeçam do zero.
+    "processos_alertas": 0,
+}
+
+class TaxaEntidade:
+    """Linha de base de uma entidade: contagem do minuto atual, EWMA e perfil por hora do dia"""
+    __slots__ = ("minuto", "contagem", "ewma", "perfil", "amostras", "alertado")
+
+    def __init__(self, minuto):
+        self.minuto = minuto
+        self.contagem = 0
+        self.ewma = None
+        self.perfil = None  # array('f', 24) criado no primeiro minuto fechado
+        self.amostras = None  # array('H', 24): minutos ativos vistos em cada hora
+        self.alertado = -1  # Minuto do último alerta (no máximo um por minuto)
+
+    def fechar_minuto(self, hora, contagem, alfa, alfa_sazonal):
+        """Incorpora a contagem de um minuto encerrado à EWMA e ao perfil da hora"""
+        if self.ewma is None:
+            self.ewma = float(contagem)
+            self.perfil = array.array("f", [0.0]) * 24
+            self.amostras = array.array("H", [0]) * 24
+        else:
+            self.ewma += alfa * (contagem - self.ewma)
+        if self.amostras[hora]:
+            self.perfil[hora] += alfa_sazonal * (contagem - self.perfil[hora])
+        else:
+            self.perfil[hora] = contagem
+        if self.amostras[hora] < 0xFFFF:
+            self.amostras[hora] += 1
+
+class DetectorAnomalias:
+    """Detecta minutos com taxa de requisições muito acima do normal de cada entidade
+
+    Custo O(1) por evento e memória limitada: até max_entidades linhas de base
+    (LRU); as demais entidades são contadas por minuto em um count-min sketch e
+    só ganham linha de base quando o minuto passa de promocao_cauda.
+    Minutos sem eventos não entram na linha de base (taxa por minuto ativo).
+    """
+
+    def __init__(self, config):
+        self.config = config  # Referência ao deteccao_config do motor (lido a cada evento)
+        self.entidades = OrderedDict()  # (tipo, valor) -> TaxaEntidade, da menos para a mais recente
+        self.esboco = EsbocoContagemMinima()
+        self.minuto_esboco = None
+        self.horas = {}  # Hora epoch -> hora do dia local
+
+    def hora_do_dia(self, minuto):
+        hora_epoch = minuto // 60
+        hora = self.horas.get(hora_epoch)
+        if hora is None:
+            if len(self.horas) > 48:
+                self.horas.clear()
+            hora = self.horas[hora_epoch] = time.localtime(hora_epoch * 3600).tm_hour
+        return hora
+
+    def taxa_normal(self, estado, hora):
+        config = self.config
+        base = float(config.get("taxa_minima", 2.0))
+        if estado.ewma is not None:
+            base = max(base, estado.ewma)
+            if estado.amostras[hora] >= int(config.get("amostras_sazonais", 5)):
+                base = max(base, estado.perfil[hora])
+        return base
+
+    def registrar(self, tipo, valor, ts_evento):
+        """Conta um evento; retorna (contagem do minuto, taxa normal) quando o minuto é anômalo"""
+        config = self.config
+        minuto = ts_evento // 60000
+        chave = (tipo, valor)
+        estado = self.entidades.get(chave)
+        if estado is None:
+            contagem_inicial = 0
+            if len(self.entidades) >= int(config.get("max_entidades", 50000)):
+                # Cauda longa: contagem aproximada até o minuto ficar movimentado
+                if minuto != self.minuto_esboco:
+                    self.esboco.limpar()
+                    self.minuto_esboco = minuto
+                estimativa = self.esboco.adicionar_hash(hash_distinto(chave))
+                if estimativa < int(config.get("promocao_cauda", 10)):
+                    return None
+                self.entidades.popitem(last=False)
+                contagem_inicial = estimativa - 1
+            estado = self.entidades[chave] = TaxaEntidade(minuto)
+            estado.contagem = contagem_inicial
+        else:
+            self.entidades.move_to_end(chave)
+
+        fator = float(config.get("fator_anomalia", 20))
+        if minuto > estado.minuto:
+            # Minuto encerrado; minutos anômalos entram limitados ao próprio limite para não inflar a base
+            hora = self.hora_do_dia(estado.minuto)
+            limite = max(float(config.get("minimo_anomalia", 60)), fator * self.taxa_normal(estado, hora))
+            estado.fechar_minuto(hora, min(estado.contagem, limite),
+                                 float(config.get("alfa_ewma", 0.1)), float(config.get("alfa_sazonal", 0.05)))
+            estado.minuto = minuto
+            estado.contagem = 0
+        # Eventos atrasados (minuto anterior) contam no minuto atual
+        estado.contagem += 1
+
+        if estado.alertado == estado.minuto:
+            return None
+        base = self.taxa_normal(estado, self.hora_do_dia(estado.minuto))
+        if estado.contagem >= max(float(config.get("minimo_anomalia", 60)), fator * base):
+            estado.alertado = estado.minuto
+            return estado.contagem, base
+        return None
+
+class JanelaDistintos:
+    """Valores distintos em uma janela deslizante, dividida em fatias de tempo
+
+    Cada fatia tem um ContadorDistintos; as fatias que saem da janela são
+    descartadas e a contagem da janela é a união das restantes.
+    """
+    __slots__ = ("fatias", "alertado_ate")
+
+    def __init__(self):
+        self.fatias = []  # [(id da fatia, ContadorDistintos)], da mais antiga para a atual
+        self.alertado_ate = -1  # Última fatia coberta pelo último alerta
+
+    def adicionar_hash(self, h, fatia, num_fatias):
+        """Conta o valor na fatia atual; retorna True se a contagem da janela pode ter aumentado"""
+        fatias = self.fatias
+        if not fatias or fatia > fatias[-1][0]:
+            while fatias and fatias[0][0] <= fatia - num_fatias:
+                fatias.pop(0)
+            fatias.append((fatia, ContadorDistintos()))
+        # Eventos atrasados contam na fatia atual
+        return fatias[-1][1].adicionar_hash(h)
+
+    def estimar(self):
+        return estimar_uniao_distintos([contador for _, contador in self.fatias])
+
+class DetectorCorrelacaoLogin:
+    """Correlaciona falhas de login entre usuários e IPs em janelas deslizantes
+
+    Um IP com falhas em muitos usuários distintos indica credential stuffing ou
+    password spraying; um usuário com falhas vindas de muitos IPs, força bruta
+    distribuída. Memória limitada: no máximo max_chaves_correlacao IPs e
+    usuários (LRU), cada um com contadores de distintos limitados (HyperLogLog).
+    """
+
+    def __init__(self, config):
+        self.config = config  # Referência ao deteccao_config do motor (lido a cada evento)
+        self.usuarios_por_ip = OrderedDict()  # ip -> JanelaDistintos dos usuários
+        self.ips_por_usuario = OrderedDict()  # usuario -> JanelaDistintos dos IPs
+
+    def contar(self, tabela, chave, valor, fatia, num_fatias, limite):
+        """Conta valor na janela de chave; retorna o número de distintos quando atinge o limite"""
+        janela = tabela.get(chave)
+        if janela is None:
+            maximo = max(1, int(self.config.get("max_chaves_correlacao", 50000)))
+            while len(tabela) >= maximo:
+                tabela.popitem(last=False)
+            janela = tabela[chave] = JanelaDistintos()
+        else:
+            tabela.move_to_end(chave)
+
+        # A união das fatias só é calculada quando aparece um valor novo fora de um alerta recente
+        if janela.adicionar_hash(hash_distinto(valor), fatia, num_fatias) and fatia > janela.alertado_ate:
+            distintos = janela.estimar()
+            if distintos >= limite:
+                janela.alertado_ate = fatia + num_fatias - 1
+                return distintos
+        return None
+
+    def registrar_falha(self, tipo_chave, chave, outro, ts_evento):
+        """Conta uma falha de login na janela da chave ("ip": usuários distintos, "usuario": IPs distintos)
+
+        Retorna o número de distintos quando a janela atinge o limite. As duas
+        direções são independentes, então cada chave pode ficar em um fragmento.
+        """
+        config = self.config
+        num_fatias = max(1, int(config.get("fatias_correlacao", 5)))
+        duracao_fatia = max(1, int(float(config.get("janela_correlacao_min", 10)) * 60000) // num_fatias)
+        fatia = ts_evento // duracao_fatia
+        if tipo_chave == "ip":
+            return self.contar(self.usuarios_por_ip, chave, outro, fatia, num_fatias,
+                               int(config.get("usuarios_por_ip", 20)))
+        return self.contar(self.ips_por_usuario, chave, outro, fatia, num_fatias,
+                           int(config.get("ips_por_usuario", 10)))
+
+class JanelaContagem:
+    """Número de eventos em uma janela deslizante, dividida em fatias de tempo (memória O(fatias))"""
+    __slots__ = ("fatias",)
+
+    def __init__(self):
+        self.fatias = []  # [[id da fatia, contagem]], da mais antiga para a atual
+
+    def adicionar(self, fatia, num_fatias):
+        """Conta um evento na fatia atual e retorna o total da janela"""
+        fatias = self.fatias
+        if not fatias or fatia > fatias[-1][0]:
+            while fatias and fatias[0][0] <= fatia - num_fatias:
+                fatias.pop(0)
+            fatias.append([fatia, 0])
+        # Eventos atrasados contam na fatia atual
+        fatias[-1][1] += 1
+        return sum(contagem for _, contagem in fatias)
+
+# Janela da regra falhas_login: últimas 24 horas, em fatias de uma hora
+JANELA_FALHAS_LOGIN_MS = 24 * 3600000
+FATIAS_FALHAS_LOGIN = 24
+
+class DetectorFalhasLogin:
+    """Falhas de login de um mesmo usuário a partir do mesmo IP nas últimas 24 horas (regra falhas_login)
+
+    Cada par usuário/IP tem uma JanelaContagem; no máximo max_chaves_falhas_login
+    pares (LRU). O limite vem de alertas_config["falhas_login"] (None desliga a regra).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.pares = OrderedDict()  # (usuario, ip) -> JanelaContagem
+
+    def registrar_falha(self, usuario, ip, ts_evento, agora_ms):
+        """Conta a falha; retorna o número de falhas do par na janela quando atinge o limite"""
+        limite = self.config.get("falhas_login")
+        if not limite or ts_evento < agora_ms - JANELA_FALHAS_LOGIN_MS:
+            return None
+
+        chave = (usuario, ip)
+        janela = self.pares.get(chave)
+        if janela is None:
+            maximo = max(1, int(self.config.get("max_chaves_falhas_login", 50000)))
+            while len(self.pares) >= maximo:
+                self.pares.popitem(last=False)
+            janela = self.pares[chave] = JanelaContagem()
+        else:
+            self.pares.move_to_end(chave)
+
+        falhas = janela.adicionar(ts_evento // (JANELA_FALHAS_LOGIN_MS // FATIAS_FALHAS_LOGIN), FATIAS_FALHAS_LOGIN)
+        return falhas if falhas >= int(limite) else None
+
+def tarefas_alerta(log, indice):
+    """Avaliações com estado de um log, uma por chave (usuário e IP): (indice, tipo, chave, outro, ts, falha_login)"""
+    usuario, ip = log['usuario'], log['ip']
+    usuario = usuario if usuario and usuario != 'desconhecido' else None
+    ip = ip if ip and ip != 'desconhecido' else None
+    ts_evento = log['ts_evento']
+    if ts_evento is None or ts_evento < 0:
+        ts_evento = int(time.time() * 1000)
+    falha_login = log['operacao'] == 'LOGIN' and log['status'] == 'FAILED'
+    tarefas = []
+    if usuario is not None:
+        tarefas.append((indice, 'usuario', usuario, ip, ts_evento, falha_login))
+    if ip is not None:
+        tarefas.append((indice, 'ip', ip, usuario, ts_evento, falha_login))
+    return tarefas
+
+class AvaliadorFragmento:
+    """Regras com estado por chave (falhas de login, anomalias de taxa e correlação de logins) de um fragmento
+
+    Cada chave é avaliada sempre pelo mesmo avaliador e na ordem de chegada,
+    então o estado é local e não precisa de locks. A regra falhas_login (par
+    usuário/IP) fica com o fragmento do usuário, ou do IP quando não há usuário.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.falhas_login = DetectorFalhasLogin(config)
+        self.anomalias = DetectorAnomalias(config)
+        self.correlacao = DetectorCorrelacaoLogin(config)
+
+    def avaliar(self, tarefas):
+        """Avalia as tarefas em ordem; retorna as detecções [(indice, regra, tipo da chave, chave, resultado)]"""
+        anomalias = self.config.get("anomalias", True)
+        correlacao = self.config.get("correlacao_login", True)
+        agora_ms = int(time.time() * 1000)
+        deteccoes = []
+        for indice, tipo_chave, chave, outro, ts_evento, falha_login in tarefas:
+            if falha_login and (tipo_chave == 'usuario' or outro is None):
+                usuario, ip = (chave, outro) if tipo_chave == 'usuario' else (None, chave)
+                falhas = self.falhas_login.registrar_falha(usuario, ip, ts_evento, agora_ms)
+                if falhas is not None:
+                    deteccoes.append((indice, "falhas_login", tipo_chave, chave, falhas))
+            if correlacao and falha_login and outro is not None:
+                distintos = self.correlacao.registrar_falha(tipo_chave, chave, outro, ts_evento)
+                if distintos is not None:
+                    deteccoes.append((indice, "correlacao_login", tipo_chave, chave, distintos))
+            if anomalias:
+                anomalia = self.anomalias.registrar(tipo_chave, chave, ts_evento)
+                if anomalia is not None:
+                    deteccoes.append((indice, "anomalia_taxa", tipo_chave, chave, anomalia))
+        return deteccoes
+
+def executar_fragmento_alertas(entrada, saida):
+    """Laço de um processo de avaliação: recebe (config, tarefas) e devolve as detecções do lote"""
+    config = dict(DETECCAO_PADRAO)
+    avaliador = AvaliadorFragmento(config)
+    while True:
+        item = entrada.get()
+        if item is None:
+            break
+        novo_config, tarefas = item
+        config.update(novo_config)
+        try:
+            saida.put(avaliador.avaliar(tarefas))
+        except Exception as e:
+            print(f"Erro ao avaliar fragmento de alertas: {str(e)}")
+            saida.put([])
+
+# Espera máxima (s) pelas detecções de um lote (inclui a inicialização dos processos)
+TIMEOUT_FRAGMENTOS_ALERTAS = 60
+
+class FragmentosAlertas:
+    """Processos de avaliação das regras com estado, cada um dono das chaves de um fragmento
+
+    Cada usuário/IP vai sempre para o processo hash(tipo, chave) % processos,
+    pela fila daquele processo: a ordem por chave é preservada e o estado
+    (linhas de base, janelas) fica local ao processo.
+    """
+
+    def __init__(self, processos):
+        contexto = multiprocessing.get_context("spawn")
+        self.saida = contexto.Queue()  # Detecções de todos os fragmentos, um item por lote enviado
+        self.entradas = []
+        self.processos = []
+        for indice in range(processos):
+            entrada = contexto.Queue()
+            processo = contexto.Process(target=executar_fragmento_alertas, args=(entrada, self.saida),
+                                        name=f"alertas-{indice}", daemon=True)
+            processo.start()
+            self.entradas.append(entrada)
+            self.processos.append(processo)
+
+    def enviar(self, logs, config):
+        """Distribui as tarefas dos logs pelos fragmentos; retorna quantos fragmentos receberam tarefas"""
+        num_fragmentos = len(self.entradas)
+        por_fragmento = [[] for _ in range(num_fragmentos)]
+        for indice, log in enumerate(logs):
+            for tarefa in tarefas_alerta(log, indice):
+                por_fragmento[hash((tarefa[1], tarefa[2])) % num_fragmentos].append(tarefa)
+
+        enviados = 0
+        for entrada, tarefas in zip(self.entradas, por_fragmento):
+            if tarefas:
+                entrada.put((config, tarefas))
+                enviados += 1
+        return enviados
+
+    def receber(self, enviados):
+        """Junta as detecções dos fragmentos que receberam o lote, em ordem de log"""
+        deteccoes = []
+        for _ in range(enviados):
+            deteccoes.extend(self.saida.get(timeout=TIMEOUT_FRAGMENTOS_ALERTAS))
+        deteccoes.sort(key=lambda deteccao: deteccao[0])  # Estável: a ordem de cada fragmento é mantida
+        return deteccoes
+
+    def fechar(self):
+        for entrada in self.entradas:
+            try:
+                entrada.put(None)
+            except Exception:
+                pass
+        for processo in self.processos:
+            processo.join(timeout=2.0)
+            if processo.is_alive():
+                processo.terminate()
+        self.entradas = []
+        self.processos = []
+
+def segmentos_url(url):
+    """Divide o caminho da URL em segmentos, sem query string ("/api/admin/*" -> ["api", "admin"])"""
+    if not url or url == "desconhecido":
+        return None
+    caminho = url.split("?", 1)[0].split("#", 1)[0]
+    if caminho.endswith("*"):
+        caminho = caminho[:-1]
+    return [segmento for segmento in caminho.split("/") if segmento]
+
+# Colunas de estatísticas por URL (detalhar_urls e top_urls)
+COLUNAS_ESTATISTICAS_URL = ("url", "acessos", "falhas", "taxa_falha", "usuarios", "latencia_media_ms",
+                            "acessos_exatos", "falhas_exatas", "subcaminhos")
+
+class NoURL:
+    """Nó da árvore de URLs: contadores do caminho exato e da subárvore (prefixo)"""
+    __slots__ = ("filhos", "acessos", "falhas", "total_acessos", "total_falhas", "usuarios",
+                 "soma_latencia", "medidas_latencia")
+
+    def __init__(self):
+        self.filhos = None  # segmento -> NoURL, criado no primeiro filho
+        self.acessos = 0  # Acessos ao caminho exato
+        self.falhas = 0
+        self.total_acessos = 0  # Acessos ao caminho e a tudo abaixo dele
+        self.total_falhas = 0
+        self.usuarios = None  # Usuários distintos da subárvore (ContadorDistintos, criado no primeiro usuário)
+        self.soma_latencia = 0.0
+        self.medidas_latencia = 0
+
+    def estatisticas(self, url):
+        return {
+            "url": url,
+            "acessos": self.total_acessos,
+            "falhas": self.total_falhas,
+            "taxa_falha": round(self.total_falhas / self.total_acessos, 4) if self.total_acessos else 0.0,
+            "usuarios": self.usuarios.estimar() if self.usuarios else 0,
+            "latencia_media_ms": round(self.soma_latencia / self.medidas_latencia, 1) if self.medidas_latencia else None,
+            "acessos_exatos": self.acessos,
+            "falhas_exatas": self.falhas,
+            "subcaminhos": len(self.filhos) if self.filhos else 0,
+        }
+
+class IndiceURLs:
+    """Árvore de prefixos dos caminhos acessados, atualizada na ingestão
+
+    Cada log custa um passo por segmento da URL. Consultas por prefixo
+    ("/api/admin/*") leem um nó; detalhamento e top-N percorrem nós da
+    subárvore, nunca as linhas de log. Usuários distintos são aproximados
+    (ContadorDistintos) e a latência só entra quando o log traz duracao_ms.
+    """
+
+    def __init__(self):
+        self.raiz = NoURL()
+        self.urls = 0  # Caminhos exatos distintos
+        self.lock = threading.Lock()
+
+    def adicionar(self, logs):
+        """Contabiliza um lote de logs (RegistroLog ou dicts com url, status, usuario e, opcionalmente, duracao_ms)"""
+        with self.lock:
+            for log in logs:
+                self.adicionar_log(log.get('url'), log.get('status') == 'FAILED', log.get('usuario'),
+                                   log.get('duracao_ms'))
+
+    def adicionar_log(self, url, falhou, usuario=None, latencia_ms=None):
+        segmentos = segmentos_url(url)
+        if segmentos is None:
+            return
+
+        h = hash_distinto(usuario) if usuario and usuario != "desconhecido" else None
+        no = self.raiz
+        caminho = [no]
+        for segmento in segmentos:
+            if no.filhos is None:
+                no.filhos = {}
+            filho = no.filhos.get(segmento)
+            if filho is None:
+                filho = no.filhos[segmento] = NoURL()
+            no = filho
+            caminho.append(no)
+
+        if no.acessos == 0:
+            self.urls += 1
+        no.acessos += 1
+        no.falhas += falhou
+
+        for no in caminho:
+            no.total_acessos += 1
+            no.total_falhas += falhou
+            if h is not None:
+                if no.usuarios is None:
+                    no.usuarios = ContadorDistintos()
+                no.usuarios.adicionar_hash(h)
+            if latencia_ms is not None:
+                no.soma_latencia += latencia_ms
+                no.medidas_latencia += 1
+
+    def buscar(self, prefixo):
+        """Nó do prefixo, ou None se nenhum caminho começa por ele"""
+        segmentos = segmentos_url(prefixo or "/") or []
+        no = self.raiz
+        for segmento in segmentos:
+            if not no.filhos or segmento not in no.filhos:
+                return None
+            no = no.filhos[segmento]
+        return no
+
+    def estatisticas(self, prefixo="/"):
+        """Estatísticas agregadas do prefixo (o caminho e tudo abaixo dele)"""
+        with self.lock:
+            no = self.buscar(prefixo)
+            return no.estatisticas(normalizar_prefixo(prefixo)) if no else None
+
+    def detalhar(self, prefixo="/", limite=50):
+        """Subcaminhos imediatos do prefixo, com estatísticas da subárvore de cada um, por acessos"""
+        with self.lock:
+            no = self.buscar(prefixo)
+            if not no or not no.filhos:
+                return []
+            base = normalizar_prefixo(prefixo).rstrip("/")
+            filhos = heapq.nlargest(limite, no.filhos.items(), key=lambda item: item[1].total_acessos)
+            return [filho.estatisticas(f"{base}/{segmento}") for segmento, filho in filhos]
+
+    def top(self, limite=10, prefixo="/", criterio="acessos"):
+        """Caminhos exatos com mais acessos (ou falhas) sob o prefixo
+
+        Busca pela melhor estimativa: o total da subárvore limita o valor de
+        qualquer caminho abaixo do nó, então só os ramos que ainda podem
+        entrar no top-N são abertos. Todos os filhos de um nó aberto vão para
+        um heap próprio e entram na fila um de cada vez, do maior total para o
+        menor (um total grande não garante um caminho grande abaixo, então
+        nenhum filho é descartado antes de ser aberto). Acessos e falhas são
+        os do caminho exato; usuários e latência, os da subárvore.
+        """
+        with self.lock:
+            inicio = self.buscar(prefixo)
+            if not inicio:
+                return []
+
+            if criterio == "falhas":
+                exato, total = (lambda no: no.falhas), (lambda no: no.total_falhas)
+            else:
+                exato, total = (lambda no: no.acessos), (lambda no: no.total_acessos)
+
+            # Entradas: (-valor, desempate, tipo, url, nó ou heap de filhos [(-total, desempate, segmento, nó)])
+            CAMINHO, NO, FILHOS = 0, 1, 2
+            contador = itertools.count()
+            fila = [(-total(inicio), next(contador), NO, normalizar_prefixo(prefixo).rstrip("/"), inicio)]
+            resultado = []
+            while fila and len(resultado) < limite:
+                valor, _, tipo, url, item = heapq.heappop(fila)
+                if valor == 0:
+                    break  # Nada restante tem acessos (ou falhas)
+
+                if tipo == CAMINHO:
+                    # Nenhum ramo restante passa deste valor
+                    estatisticas = item.estatisticas(url or "/")
+                    estatisticas["acessos"], estatisticas["falhas"] = item.acessos, item.falhas
+                    estatisticas["taxa_falha"] = round(item.falhas / item.acessos, 4)
+                    resultado.append(estatisticas)
+                    continue
+
+                if tipo == FILHOS:
+                    filhos = item
+                    _, _, segmento, item = heapq.heappop(filhos)
+                    if filhos:
+                        heapq.heappush(fila, (filhos[0][0], next(contador), FILHOS, url, filhos))
+                    url = f"{url}/{segmento}"
+
+                if exato(item):
+                    heapq.heappush(fila, (-exato(item), next(contador), CAMINHO, url, item))
+                if item.filhos:
+                    # heapify é linear; os filhos só são ordenados à medida que saem
+                    filhos = [(-total(filho), next(contador), segmento, filho) for segmento, filho in item.filhos.items()]
+                    heapq.heapify(filhos)
+                    heapq.heappush(fila, (filhos[0][0], next(contador), FILHOS, url, filhos))
+            return resultado
+
+def indexar_urls_do_banco(conn, indice, desde_id=0, ate_id=None, tamanho_lote=20000):
+    """Acrescenta ao índice de URLs os logs do banco principal com id em (desde_id, ate_id]"""
+    query = "SELECT url, status, usuario FROM logs WHERE id > ?"
+    params = [desde_id]
+    if ate_id is not None:
+        query += " AND id <= ?"
+        params.append(ate_id)
+
+    cursor = conn.execute(query, params)
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            break
+        with indice.lock:
+            for url, status, usuario in linhas:
+                indice.adicionar_log(url, status == 'FAILED', usuario)
+
+def normalizar_prefixo(prefixo):
+    """Forma canônica do prefixo exibida nos resultados ("api/admin/*" -> "/api/admin")"""
+    return "/" + "/".join(segmentos_url(prefixo or "/") or [])
+
+# Formatos de linha do JBOSS reconhecidos pelo parser: (padrão, campos capturados), tentados em ordem
+FORMATOS_LINHA_LOG = (
+    # Formato 1: [data] [hora] [nível] [categoria] [mensagem]
+    (r'\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+(.*)',
+     ("data", "hora", "nivel", "categoria", "mensagem")),
+    # Formato 2: data hora [servidor] [nível] [categoria] - mensagem
+    (r'(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2},\d{3})\s+\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+-\s+(.*)',
+     ("data", "hora", "servidor", "nivel", "categoria", "mensagem")),
+    # Formato 3: data hora INFO [categoria] (thread) mensagem
+    (r'(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2},\d{3})\s+(\w+)\s+\[(.*?)\]\s+$$(.*?)$$\s+(.*)',
+     ("data", "hora", "nivel", "categoria", "thread", "mensagem")),
+)
+
+# Campos extraídos da mensagem (sem diferenciar maiúsculas)
+PADRAO_USUARIO_MENSAGEM = r'user[=:][\s]*[\'"]?([\w\.@-]+)[\'"]?'
+PADRAO_IP_MENSAGEM = r'(?:IP|address|from)[=:][\s]*[\'"]?(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})[\'"]?'
+PADRAO_URL_MENSAGEM = r'(?:URL|uri|path)[=:][\s]*[\'"]?((?:/[\w\.-]+)+)[\'"]?'
+
+# Operação e status pela mensagem: (valor, padrão), vence a primeira regra que casar
+REGRAS_OPERACAO = (
+    ("LOGIN", r'login|authenticate|auth'),
+    ("LOGOUT", r'logout|signout'),
+    ("VIEW", r'GET|view|read|select'),
+    ("UPDATE", r'POST|PUT|update|modify'),
+    ("DELETE", r'DELETE|remove'),
+)
+REGRAS_STATUS = (
+    ("SUCCESS", r'success|successful|succeeded|ok|200'),
+    ("FAILED", r'fail|failed|error|exception|denied|401|403|404|500'),
+)
+
+# Linhas fora dos formatos conhecidos: só data/hora, IP e URL soltos na linha
+PADRAO_DATA_HORA_SIMPLES = r'(\d{4}-\d{2}-\d{2}).*?(\d{2}:\d{2}:\d{2})'
+PADRAO_IP_SIMPLES = r'\b(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\b'
+PADRAO_URL_SIMPLES = r'(?:/[\w\.-]+){2,}'
+NIVEIS_LINHA_SIMPLES = ("INFO", "ERROR", "WARN", "DEBUG")
+
+# Colunas produzidas pela extração em lote; todas categóricas, exceto mensagem e ts_evento (Int64)
+COLUNAS_LOTE = ("data", "hora", "nivel", "categoria", "servidor", "thread", "mensagem", "usuario", "ip", "url",
+                "operacao", "status", "ts_evento")
+COLUNAS_CATEGORICAS_LOTE = tuple(coluna for coluna in COLUNAS_LOTE if coluna not in ("mensagem", "ts_evento"))
+
+# Campos de RegistroLog: as colunas da extração em lote mais o timestamp de gravação no banco e a chave de deduplicação
+CAMPOS_REGISTRO = COLUNAS_LOTE + ("timestamp", "chave_dedup")
+
+# Valores distintos guardados pelo ParserLogs para reaproveitar strings repetidas (usuário, IP, URL...)
+LIMITE_INTERNADOS = 200000
+
+class RegistroLog:
+    """Log interpretado com __slots__, usado do parser até a gravação no banco e os alertas
+
+    Ocupa uma fração de um dict com as mesmas chaves e aceita o acesso que os
+    consumidores já faziam nos dicts (log['campo'], log.get('campo'),
+    log['campo'] = valor, 'campo' in log).
+    """
+    __slots__ = CAMPOS_REGISTRO
+
+    def __init__(self, data, hora, nivel, mensagem, ts_evento=None, categoria="desconhecido",
+                 servidor="desconhecido", thread="desconhecido", usuario="desconhecido", ip="desconhecido",
+                 url="desconhecido", operacao="desconhecido", status="desconhecido", timestamp=None, chave_dedup=None):
+        self.data = data
+        self.hora = hora
+        self.nivel = nivel
+        self.categoria = categoria
+        self.servidor = servidor
+        self.thread = thread
+        self.mensagem = mensagem
+        self.usuario = usuario
+        self.ip = ip
+        self.url = url
+        self.operacao = operacao
+        self.status = status
+        self.ts_evento = ts_evento
+        self.timestamp = timestamp
+        self.chave_dedup = chave_dedup  # chave_dedup_linha, preenchida pelo parser
+
+    def __getitem__(self, campo):
+        try:
+            return getattr(self, campo)
+        except (AttributeError, TypeError):
+            raise KeyError(campo) from None
+
+    def __setitem__(self, campo, valor):
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo):
+        return campo in CAMPOS_REGISTRO
+
+    def get(self, campo, padrao=None):
+        return getattr(self, campo, padrao)
+
+    def valores(self):
+        """Valores na ordem de COLUNAS_LOTE (montagem do DataFrame)"""
+        return (self.data, self.hora, self.nivel, self.categoria, self.servidor, self.thread, self.mensagem,
+                self.usuario, self.ip, self.url, self.operacao, self.status, self.ts_evento)
+
+    def como_dict(self):
+        return {campo: getattr(self, campo) for campo in CAMPOS_REGISTRO}
+
+    def __repr__(self):
+        return f"RegistroLog({self.como_dict()!r})"
+
+def tabela_logs(logs):
+    """DataFrame a partir do resultado do parser: DataFrame (lote), lista de RegistroLog ou lista de dicts"""
+    if isinstance(logs, pd.DataFrame):
+        return logs
+    logs = list(logs)
+    if logs and isinstance(logs[0], RegistroLog):
+        return pd.DataFrame.from_records([registro.valores() + (registro.chave_dedup,) for registro in logs],
+                                         columns=list(COLUNAS_LOTE) + ["chave_dedup"])
+    return pd.DataFrame(logs)
+
+def juntar_logs(partes):
+    """Junta resultados do parser (DataFrames do modo em lote ou listas de dicts) em um único resultado"""
+    partes = [parte for parte in partes if len(parte)]
+    if not any(isinstance(parte, pd.DataFrame) for parte in partes):
+        return [log for parte in partes for log in parte]
+    
+    logs = pd.concat([tabela_logs(parte) for parte in partes], ignore_index=True)
+    # Categorias diferentes entre as partes viram object no concat
+    for coluna in COLUNAS_CATEGORICAS_LOTE:
+        if coluna in logs.columns and not isinstance(logs[coluna].dtype, pd.CategoricalDtype):
+            logs[coluna] = logs[coluna].astype("category")
+    return logs
+
+# Representação compacta dos logs em memória (logs_completos): IPv4 em uint32, epoch em int64, demais campos categóricos
+IP_DESCONHECIDO = 0  # "desconhecido" e valores que não são IPv4 válidos
+TS_DESCONHECIDO = -1  # Linhas sem data/hora interpretável
+
+def ip_para_int(ip):
+    """Empacota um IPv4 (a.b.c.d) em inteiro de 32 bits; IP_DESCONHECIDO se não for um IPv4 válido"""
+    try:
+        octetos = [int(octeto) for octeto in ip.split('.')]
+    except (AttributeError, ValueError):
+        return IP_DESCONHECIDO
+    if len(octetos) != 4 or not all(0 <= octeto <= 255 for octeto in octetos):
+        return IP_DESCONHECIDO
+    return octetos[0] << 24 | octetos[1] << 16 | octetos[2] << 8 | octetos[3]
+
+def int_para_ip(valor):
+    """Inverso de ip_para_int ("desconhecido" para IP_DESCONHECIDO)"""
+    valor = int(valor)
+    if valor == IP_DESCONHECIDO:
+        return "desconhecido"
+    return f"{valor >> 24}.{valor >> 16 & 255}.{valor >> 8 & 255}.{valor & 255}"
+
+def compactar_logs(logs):
+    """Converte um DataFrame de logs para a representação compacta usada em memória
+
+    ip vira uint32 (uma conversão por IP distinto), ts_evento vira int64
+    (TS_DESCONHECIDO quando ausente), mensagem vira string Arrow (com pyarrow)
+    e as demais colunas de texto viram categóricas com categorias em ordem
+    lexical. Filtros e value_counts passam a operar sobre os códigos.
+    chave_dedup só serve à gravação e não fica em memória. Idempotente.
+    """
+    logs = logs.drop(columns=["chave_dedup"], errors="ignore")
+    
+    if "ip" in logs.columns and logs["ip"].dtype != np.uint32:
+        codigos, unicos = pd.factorize(logs["ip"])
+        convertidos = np.array([ip_para_int(ip) for ip in unicos] + [IP_DESCONHECIDO], dtype=np.uint32)
+        logs["ip"] = convertidos[codigos]  # Código -1 (nulo) aponta para o último elemento
+    
+    if "ts_evento" in logs.columns or {"data", "hora"} <= set(logs.columns):
+        ts_evento = logs["ts_evento"] if "ts_evento" in logs.columns else pd.Series(None, index=logs.index, dtype=object)
+        if ts_evento.dtype != np.int64:
+            # float64 representa epoch ms exatamente; NaN marca os ausentes
+            ts_evento = pd.to_numeric(ts_evento, errors="coerce").to_numpy(np.float64, na_value=np.nan, copy=True)
+            ausentes = np.isnan(ts_evento)
+            if ausentes.any() and {"data", "hora"} <= set(logs.columns):
+                calculados = [calcular_ts_evento(data, hora) for data, hora in
+                              zip(logs["data"].to_numpy()[ausentes], logs["hora"].to_numpy()[ausentes])]
+                ts_evento[ausentes] = [np.nan if ts is None else ts for ts in calculados]
+            logs["ts_evento"] = np.where(np.isnan(ts_evento), TS_DESCONHECIDO, ts_evento).astype(np.int64)
+    
+    for coluna in logs.columns:
+        if coluna == "mensagem":
+            # Alta cardinalidade: texto contíguo em Arrow (um buffer) em vez de um objeto str por linha
+            if pd.api.types.is_object_dtype(logs[coluna].dtype):
+                try:
+                    logs[coluna] = logs[coluna].astype("string[pyarrow]")
+                except ImportError:
+                    pass
+            continue
+        if isinstance(logs[coluna].dtype, pd.CategoricalDtype):
+            logs[coluna] = logs[coluna].cat.remove_unused_categories()
+        elif pd.api.types.is_object_dtype(logs[coluna].dtype) or pd.api.types.is_string_dtype(logs[coluna].dtype):
+            logs[coluna] = pd.Categorical(logs[coluna])
+    return logs
+
+def concatenar_logs_compactos(partes):
+    """pd.concat de DataFrames compactos preservando as colunas categóricas (união das categorias)"""
+    partes = [parte for parte in partes if len(parte)]
+    if len(partes) == 1:
+        return partes[0]
+    
+    categoricas = {}
+    for coluna in partes[0].columns:
+        serie = [parte[coluna] for parte in partes if coluna in parte.columns]
+        if all(isinstance(valores.dtype, pd.CategoricalDtype) for valores in serie) and len(serie) == len(partes):
+            # Categorias vindas do Arrow (object) e do pandas (str) precisam do mesmo tipo na união
+            tipo = serie[0].cat.categories.dtype
+            serie = [valores if valores.cat.categories.dtype == tipo
+                     else valores.cat.set_categories(valores.cat.categories.astype(tipo)) for valores in serie]
+            categoricas[coluna] = pd.api.types.union_categoricals(serie, sort_categories=True)
+    
+    logs = pd.concat(partes, ignore_index=True)
+    for coluna, valores in categoricas.items():
+        logs[coluna] = valores
+    return logs
+
+def memoria_logs(logs):
+    """Memória ocupada por coluna de um DataFrame de logs: {coluna: {tipo, bytes, bytes_por_log}}"""
+    if logs is None or logs.empty:
+        return {}
+    uso = logs.memory_usage(deep=True, index=False)
+    return {coluna: {"tipo": str(logs[coluna].dtype), "bytes": int(uso[coluna]),
+                     "bytes_por_log": round(float(uso[coluna]) / len(logs), 1)} for coluna in logs.columns}
+
+def registros_logs(logs):
+    """Logs como lista de dicts com tipos Python (nulos viram None), aceitando também o DataFrame do modo em lote"""
+    if not isinstance(logs, pd.DataFrame):
+        return logs
+    return logs.astype(object).where(logs.notna(), None).to_dict('records')
+
+# Classes do re (Unicode) reescritas para o RE2 do pyarrow, em que \w, \d e \s só casam ASCII
+CLASSES_UNICODE_RE2 = {"w": r"\p{L}\p{N}_", "d": r"\p{Nd}", "s": r"\s\x0b\x1c-\x1f\x85\p{Z}"}
+
+def padrao_re2(padrao):
+    """Adapta um padrão do re ao extract_regex do pyarrow: grupos nomeados (g0, g1, ...) e classes Unicode"""
+    partes = []
+    em_classe = False
+    grupos = 0
+    i = 0
+    while i < len(padrao):
+        caractere = padrao[i]
+        if caractere == '\\':
+            escapado = padrao[i + 1]
+            classe = CLASSES_UNICODE_RE2.get(escapado)
+            if classe is None:
+                partes.append(padrao[i:i + 2])
+            else:
+                partes.append(classe if em_classe else f"[{classe}]")
+            i += 2
+            continue
+        if em_classe:
+            em_classe = caractere != ']'
+        elif caractere == '[':
+            em_classe = True
+        elif caractere == '(' and not padrao.startswith('(?', i):
+            caractere = f"(?P<g{grupos}>"
+            grupos += 1
+        partes.append(caractere)
+        i += 1
+    return "".join(partes)
+
+def extrair_regex(textos, padrao):
+    """Aplica o padrão a uma coluna Arrow de strings; retorna as colunas dos grupos (nulas onde não casou)"""
+    import pyarrow.compute as pc
+    
+    casamentos = pc.extract_regex(textos, padrao_re2(padrao))
+    return [pc.struct_field(casamentos, [i]) for i in range(casamentos.type.num_fields)]
+
+def selecionar_primeira(textos, regras, padrao, literal=False, ignorar_caixa=False):
+    """Valor da primeira regra (valor, padrão) que casa em cada string da coluna Arrow; senão padrao"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    buscar = pc.match_substring if literal else pc.match_substring_regex
+    condicoes = [buscar(textos, expressao, ignore_case=ignorar_caixa).to_numpy(zero_copy_only=False)
+                 for _, expressao in regras]
+    # Índice da regra vencedora (0 = nenhuma) por linha, convertido no valor correspondente
+    valores = pa.array([padrao] + [valor for valor, _ in regras], pa.large_string())
+    indices = np.select(condicoes, np.arange(1, len(regras) + 1, dtype=np.int32), np.int32(0))
+    return pc.take(valores, pa.array(indices, pa.int32()))
+
+def categorica_arrow(coluna, normalizar=None):
+    """Converte uma coluna Arrow de strings em Categorical do pandas (categorias em ordem lexical)
+
+    normalizar, se informado, é aplicado uma vez a cada valor distinto.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    if isinstance(coluna, pa.ChunkedArray):
+        coluna = coluna.combine_chunks()
+    codificada = pc.dictionary_encode(coluna)
+    valores = codificada.dictionary.to_pylist()
+    if normalizar:
+        valores = [normalizar(valor) for valor in valores]
+    normalizados = pd.Index(valores, dtype=object)
+    categorias = normalizados.unique().sort_values()
+    codigos = categorias.get_indexer(normalizados)
+    return pd.Categorical.from_codes(codigos[codificada.indices.to_numpy(zero_copy_only=False)], categorias)
+
+def hora_do_dia(valores):
+    """Hora (0-23) de cada valor 'HH:MM:SS'; 24 para valores sem hora reconhecível"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return np.array([int(hora) if hora.isdigit() else 24
+                         for hora in (str(valor).partition(':')[0] for valor in valores)], dtype=np.int64)
+    
+    horas, = extrair_regex(pa.array(np.asarray(valores, dtype=object), pa.string()), r'^([0-9]+):')
+    return pc.cast(horas, pa.int64()).fill_null(24).to_numpy(zero_copy_only=False)
+
+class ParserLogs:
+    """Parser das linhas de log do JBOSS, sem estado de banco ou interface
+
+    Fica fora do MotorMonitoramento para poder rodar em processos de trabalho
+    (importação paralela de arquivos rotacionados).
+    """
+
+    def __init__(self, vetorizado=False):
+        self.formato_hora = None  # Formato de hora detectado na fonte, tentado antes dos demais
+        self.vetorizado = vetorizado  # Extração em lote (processar_lote) em vez de linha a linha
+        self.internados = {}  # Instância canônica de cada valor repetido (ver internar)
+    
+    def internar(self, valor):
+        """Devolve a instância já vista de um valor repetido, para que os registros compartilhem a mesma str"""
+        canonico = self.internados.get(valor)
+        if canonico is None:
+            if len(self.internados) >= LIMITE_INTERNADOS:
+                self.internados.clear()
+            canonico = self.internados[valor] = valor
+        return canonico
+    
+    def interpretar(self, linhas):
+        """Interpreta as linhas no modo configurado: DataFrame (em lote) ou lista de dicts (linha a linha)
+
+        Cada item é uma str ou (origem, posição, linha), como geram
+        iterar_linhas_log(com_posicao=True) e ler_novas_linhas; a origem e a
+        posição entram na chave de deduplicação.
+        """
+        if self.vetorizado:
+            try:
+                return self.processar_lote(linhas)
+            except ImportError:
+                print("Extração em lote indisponível: instale o pacote pyarrow")
+                self.vetorizado = False
+        return self.processar_linhas(linhas)
+    
+    def processar_linhas(self, linhas):
+        """Extrai as informações de cada linha de log (qualquer iterável de str, inclusive arquivos abertos)"""
+        logs = []
+        
+        # Padrões de regex para diferentes formatos de log
+        (padrao1, _), (padrao2, _), (padrao3, _) = FORMATOS_LINHA_LOG
+        
+        for linha in linhas:
+            origem = posicao = None
+            if linha.__class__ is tuple:
+                origem, posicao, linha = linha
+            linha = linha.strip()
+            if not linha:
+                continue
+            
+            # Tentar diferentes padrões
+            match = re.match(padrao1, linha) or re.match(padrao2, linha) or re.match(padrao3, linha)
+            
+            if match:
+                # Extrair informações com base no padrão que deu match
+                if match.re.pattern == padrao1:
+                    data, hora, nivel, categoria, mensagem = match.groups()
+                    servidor = "desconhecido"
+                    thread = "desconhecido"
+                elif match.re.pattern == padrao2:
+                    data, hora, servidor, nivel, categoria, mensagem = match.groups()
+                    thread = "desconhecido"
+                else:  # padrao3
+                    data, hora, nivel, categoria, thread, mensagem = match.groups()
+                    servidor = "desconhecido"
+                
+                # Informações básicas (valores repetidos compartilham a mesma str)
+                internar = self.internar
+                data, hora, ts_evento = self.normalizar_tempo(data, hora)
+                registro = RegistroLog(internar(data), internar(hora), internar(nivel), mensagem, ts_evento,
+                                       internar(categoria), internar(servidor), internar(thread))
+                
+                # Processar a mensagem para extrair informações adicionais
+                self.preencher_info_mensagem(registro, mensagem)
+                
+                registro.chave_dedup = chave_dedup_linha(linha, origem, posicao)
+                logs.append(registro)
+            else:
+                # Tentar extrair informações básicas da linha
+                log_info = self.extrair_info_linha_simples(linha)
+                if log_info:
+                    log_info.chave_dedup = chave_dedup_linha(linha, origem, posicao)
+                    logs.append(log_info)
+        
+        return logs
+    
+    def processar_lote(self, linhas):
+        """Extrai as mesmas informações de processar_linhas para um lote inteiro, com operações vetorizadas
+        
+        As linhas viram uma coluna de strings do Arrow e cada campo é extraído
+        pelo motor de regex do pyarrow sobre a coluna inteira, sem um dict (nem
+        uma str Python) por registro. Retorna um DataFrame na ordem das linhas,
+        com as colunas de COLUNAS_LOTE categóricas (exceto mensagem),
+        ts_evento em Int64 e chave_dedup em int64. Requer pyarrow.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        linhas = list(linhas)
+        origens = inicios = None
+        if linhas and linhas[0].__class__ is tuple:
+            origens, inicios, linhas = zip(*linhas)
+        textos = pc.utf8_trim_whitespace(pa.array(linhas, pa.large_string()))
+        posicoes = pc.indices_nonzero(pc.greater(pc.utf8_length(textos), 0))
+        restantes = textos.take(posicoes)
+        partes = []
+        
+        # Formatos conhecidos, na mesma ordem do parser linha a linha (re.match: ancorado no início)
+        for padrao, campos in FORMATOS_LINHA_LOG:
+            if len(restantes) == 0:
+                break
+            grupos = extrair_regex(restantes, '^' + padrao)
+            casou = pc.is_valid(grupos[0])
+            if pc.any(casou).as_py():
+                colunas = {campo: grupo.filter(casou) for campo, grupo in zip(campos, grupos)}
+                colunas.update(self.extrair_info_mensagem_lote(colunas["mensagem"]))
+                partes.append(pa.table({"posicao": posicoes.filter(casou), **colunas}))
+            nao_casou = pc.invert(casou)
+            restantes, posicoes = restantes.filter(nao_casou), posicoes.filter(nao_casou)
+        
+        # Demais linhas: extração simples (data/hora, nível, status, IP e URL soltos na linha)
+        if len(restantes) > 0:
+            data, hora = extrair_regex(restantes, PADRAO_DATA_HORA_SIMPLES)
+            casou = pc.is_valid(data)
+            linhas_simples = restantes.filter(casou)
+            if len(linhas_simples) > 0:
+                partes.append(pa.table({
+                    "posicao": posicoes.filter(casou),
+                    "data": data.filter(casou),
+                    "hora": hora.filter(casou),
+                    "nivel": selecionar_primeira(linhas_simples, [(nivel, nivel) for nivel in NIVEIS_LINHA_SIMPLES],
+                                                 "UNKNOWN", literal=True),
+                    "mensagem": linhas_simples,
+                    "usuario": extrair_regex(linhas_simples, "(?i)" + PADRAO_USUARIO_MENSAGEM)[0],
+                    "ip": extrair_regex(linhas_simples, PADRAO_IP_SIMPLES)[0],
+                    "url": extrair_regex(linhas_simples, f"({PADRAO_URL_SIMPLES})")[0],
+                    "operacao": selecionar_primeira(linhas_simples, REGRAS_OPERACAO, "desconhecido", ignorar_caixa=True),
+                    "status": selecionar_primeira(pc.utf8_lower(linhas_simples),
+                                                  [("SUCCESS", "success"), ("FAILED", "fail|error")], "UNKNOWN")
+                }))
+        
+        if not partes:
+            vazio = pd.DataFrame({coluna: pd.Series(dtype="Int64" if coluna == "ts_evento" else object)
+                                  for coluna in COLUNAS_LOTE})
+            vazio["chave_dedup"] = pd.Series(dtype=np.int64)
+            return vazio
+        
+        # Partes reunidas na ordem original das linhas; campos ausentes em um formato viram "desconhecido"
+        tabela = pa.concat_tables(partes, promote_options="permissive")
+        tabela = tabela.take(pc.sort_indices(tabela["posicao"]))
+        logs = pd.DataFrame({"mensagem": tabela["mensagem"].to_pandas()})
+        for coluna in COLUNAS_CATEGORICAS_LOTE:
+            valores = (pc.fill_null(tabela[coluna], "desconhecido") if coluna in tabela.column_names
+                       else pa.array(["desconhecido"] * tabela.num_rows, pa.large_string()))
+            # Data e hora normalizadas uma vez por valor distinto (categorias)
+            normalizar = {"data": self.formatar_data, "hora": self.formatar_hora}.get(coluna)
+            logs[coluna] = categorica_arrow(valores, normalizar)
+        
+        # Epoch calculado uma vez por par (data, hora) distinto
+        datas, horas = logs["data"].cat.categories, logs["hora"].cat.categories
+        chaves = logs["data"].cat.codes.to_numpy(np.int64) * len(horas) + logs["hora"].cat.codes.to_numpy(np.int64)
+        unicas, inversos = np.unique(chaves, return_inverse=True)
+        epochs = pd.array([calcular_ts_evento(datas[chave // len(horas)], horas[chave % len(horas)]) for chave in unicas],
+                          dtype="Int64")
+        logs["ts_evento"] = epochs.take(inversos)
+        
+        # Chave de deduplicação da linha bruta (o mesmo texto que o parser linha a linha usa)
+        indices = tabela["posicao"].to_numpy()
+        if origens is None:
+            chaves = [chave_dedup_linha(linhas[i].strip()) for i in indices]
+        else:
+            chaves = [chave_dedup_linha(linhas[i].strip(), origens[i], inicios[i]) for i in indices]
+        logs["chave_dedup"] = np.array(chaves, dtype=np.int64)
+        
+        return logs[list(COLUNAS_LOTE) + ["chave_dedup"]]
+    
+    def extrair_info_mensagem_lote(self, mensagens):
+        """Versão vetorizada de preencher_info_mensagem para uma coluna Arrow de mensagens"""
+        return {
+            "usuario": extrair_regex(mensagens, "(?i)" + PADRAO_USUARIO_MENSAGEM)[0],
+            "ip": extrair_regex(mensagens, "(?i)" + PADRAO_IP_MENSAGEM)[0],
+            "url": extrair_regex(mensagens, "(?i)" + PADRAO_URL_MENSAGEM)[0],
+            "operacao": selecionar_primeira(mensagens, REGRAS_OPERACAO, "desconhecido", ignorar_caixa=True),
+            "status": selecionar_primeira(mensagens, REGRAS_STATUS, "desconhecido", ignorar_caixa=True)
+        }
+    
+    def preencher_info_mensagem(self, registro, mensagem):
+        """Extrai informações adicionais da mensagem de log direto no registro"""
+        # Extrair usuário
+        match_usuario = re.search(PADRAO_USUARIO_MENSAGEM, mensagem, re.IGNORECASE)
+        if match_usuario:
+            registro.usuario = self.internar(match_usuario.group(1))
+        
+        # Extrair IP
+        match_ip = re.search(PADRAO_IP_MENSAGEM, mensagem, re.IGNORECASE)
+        if match_ip:
+            registro.ip = self.internar(match_ip.group(1))
+        
+        # Extrair URL
+        match_url = re.search(PADRAO_URL_MENSAGEM, mensagem, re.IGNORECASE)
+        if match_url:
+            registro.url = self.internar(match_url.group(1))
+        
+        # Determinar operação
+        for operacao, padrao in REGRAS_OPERACAO:
+            if re.search(padrao, mensagem, re.IGNORECASE):
+                registro.operacao = operacao
+                break
+        
+        # Determinar status
+        for status, padrao in REGRAS_STATUS:
+            if re.search(padrao, mensagem, re.IGNORECASE):
+                registro.status = status
+                break
+    
+    def extrair_info_linha_simples(self, linha):
+        """Tenta extrair informações básicas de uma linha de log simples"""
+        # Tentar extrair data e hora
+        match_data_hora = re.search(PADRAO_DATA_HORA_SIMPLES, linha)
+        
+        if not match_data_hora:
+            return None
+        
+        data, hora, ts_evento = self.normalizar_tempo(*match_data_hora.groups())
+        minusculas = linha.lower()
+        
+        # Informações básicas
+        registro = RegistroLog(
+            self.internar(data), self.internar(hora),
+            next((nivel for nivel in NIVEIS_LINHA_SIMPLES if nivel in linha), "UNKNOWN"),
+            linha, ts_evento,
+            status="SUCCESS" if "success" in minusculas else "FAILED" if "fail" in minusculas or "error" in minusculas else "UNKNOWN"
+        )
+        
+        # Tentar extrair IP
+        match_ip = re.search(PADRAO_IP_SIMPLES, linha)
+        if match_ip:
+            registro.ip = self.internar(match_ip.group(1))
+        
+        # Tentar extrair URL
+        match_url = re.search(PADRAO_URL_SIMPLES, linha)
+        if match_url:
+            registro.url = self.internar(match_url.group(0))
+        
+        # Usuário e operação, como nas mensagens dos formatos conhecidos (regras de login dependem deles)
+        match_usuario = re.search(PADRAO_USUARIO_MENSAGEM, linha, re.IGNORECASE)
+        if match_usuario:
+            registro.usuario = self.internar(match_usuario.group(1))
+        
+        for operacao, padrao in REGRAS_OPERACAO:
+            if re.search(padrao, linha, re.IGNORECASE):
+                registro.operacao = operacao
+                break
+        
+        return registro
+    
+    def normalizar_tempo(self, data, hora):
+        """Normaliza data e hora da linha e calcula o epoch (ms) junto com as strings de exibição"""
+        data = self.formatar_data(data)
+        hora = self.formatar_hora(hora)
+        return data, hora, calcular_ts_evento(data, hora)
+    
+    def formatar_data(self, data):
+        """Formata a data para o formato padrão YYYY-MM-DD"""
+        # Caminho rápido: data já em ISO, o formato do JBOSS
+        if len(data) == 10 and data[4] == '-' and data[7] == '-':
+            return data
+        return normalizar_data_texto(data)
+    
+    def formatar_hora(self, hora):
+        """Formata a hora para o formato padrão HH:MM:SS"""
+        # Remover milissegundos se presentes
+        hora = hora.partition(',')[0]
+        
+        # Caminho rápido: hora já em HH:MM:SS
+        if len(hora) == 8 and hora[2] == ':' and hora[5] == ':':
+            return hora
+        
+        # Formato detectado nas linhas anteriores desta fonte é tentado primeiro
+        formatos = FORMATOS_HORA if self.formato_hora is None else (self.formato_hora,) + FORMATOS_HORA
+        for formato in formatos:
+            try:
+                normalizada = datetime.datetime.strptime(hora, formato).strftime('%H:%M:%S')
+            except ValueError:
+                continue
+            self.formato_hora = formato
+            return normalizada
+        
+        # Se nenhum formato funcionar, retornar a hora original
+        return hora
+
+@functools.lru_cache(maxsize=4096)
+def normalizar_data_texto(data):
+    """Converte uma data em formato livre para YYYY-MM-DD (memoizado: poucas datas distintas por arquivo)"""
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.datetime.strptime(data, formato).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    
+    # Se nenhum formato funcionar, retornar a data original
+    return data
+
+# Extensões de logs rotacionados compactados e o módulo que os lê em streaming
+COMPRESSORES_LOG = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+def eh_arquivo_log(nome):
+    """Indica se o nome é de um log do JBOSS: server.log ou rotacionado (server.log.2026-10-01, server.log.1.gz)"""
+    return nome.endswith('.log') or '.log.' in nome
+
+def abrir_arquivo_log(arquivo):
+    """Abre um log em modo texto, descompactando em streaming conforme a extensão"""
+    modulo = COMPRESSORES_LOG.get(os.path.splitext(arquivo)[1])
+    if modulo:
+        return modulo.open(arquivo, 'rt', encoding='utf-8', errors='ignore')
+    return open(arquivo, 'r', encoding='utf-8', errors='ignore')
+
+# Primeiro byte das linhas nos formatos conhecidos: "[data]..." ou "2026-10-01 ..."
+PREFIXOS_LINHA_LOG = frozenset(b'[0123456789')
+ESPACOS_BYTES = frozenset(b' \t\r')
+PADRAO_DATA_BYTES = re.compile(rb'\d{4}-\d{2}-\d{2}')
+PADRAO_PREFIXO_INDENTADO = re.compile(rb'\s*[\[0-9]')
+
+# Tamanho dos blocos do arquivo mapeado processados de cada vez no leitor mmap
+TAMANHO_BLOCO_MMAP = 4 * 1024 * 1024
+
+def ler_linhas_mmap(arquivo, tamanho_bloco=TAMANHO_BLOCO_MMAP, inicio=0, fim=None, com_posicao=False):
+    """Gera as linhas de um log não compactado via mmap, decodificando só as que podem ser logs
+
+    O arquivo mapeado é percorrido em blocos terminados em quebra de linha; as
+    linhas são localizadas e pré-filtradas direto no mapa, sem copiar o bloco,
+    e só as candidatas viram str. Stack traces e continuações são descartados sem
+    decodificação e o arquivo nunca fica inteiro na memória como texto.
+    inicio/fim (bytes, início de linha) restringem a leitura a um trecho.
+    Com com_posicao, gera (origem, byte de início, linha) para a chave de deduplicação.
+    """
+    origem = origem_log(arquivo) if com_posicao else None
+    with open(arquivo, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapa.madvise(mmap.MADV_SEQUENTIAL)
+            
+            visao = memoryview(mapa)
+            try:
+                tamanho = len(mapa) if fim is None else min(fim, len(mapa))
+                liberado = inicio - inicio % mmap.PAGESIZE  # Páginas já processadas e devolvidas ao sistema
+                while inicio < tamanho:
+                    fim = tamanho
+                    if inicio + tamanho_bloco < tamanho:
+                        # Cortar o bloco na última quebra de linha (ou na próxima, se a linha for maior que o bloco)
+                        fim = (mapa.rfind(b'\n', inicio, inicio + tamanho_bloco) + 1
+                               or mapa.find(b'\n', inicio + tamanho_bloco) + 1
+                               or tamanho)
+                    
+                    # Pré-filtro em bytes: prefixo de formato conhecido ou data em algum ponto da linha
+                    posicao = inicio
+                    while posicao < fim:
+                        fim_linha = mapa.find(b'\n', posicao, fim)
+                        if fim_linha < 0:
+                            fim_linha = fim
+                        primeiro = mapa[posicao]
+                        if (primeiro in PREFIXOS_LINHA_LOG
+                                or (mapa.find(b'-', posicao, fim_linha) >= 0
+                                    and PADRAO_DATA_BYTES.search(mapa, posicao, fim_linha))
+                                or (primeiro in ESPACOS_BYTES and PADRAO_PREFIXO_INDENTADO.match(mapa, posicao, fim_linha))):
+                            # Fatia da memoryview não copia: a linha é decodificada direto do mapa
+                            texto = str(visao[posicao:fim_linha], 'utf-8', 'ignore')
+                            yield (origem, posicao, texto) if com_posicao else texto
+                        posicao = fim_linha + 1
+                    
+                    inicio = fim
+                    
+                    # Desmapear as páginas lidas para o RSS não crescer com o arquivo (continuam no cache do SO)
+                    limite = inicio - inicio % mmap.PAGESIZE
+                    if hasattr(mmap, 'MADV_DONTNEED') and limite > liberado:
+                        mapa.madvise(mmap.MADV_DONTNEED, liberado, limite - liberado)
+                        liberado = limite
+            finally:
+                visao.release()
+
+# Data e hora no início de uma linha nos formatos conhecidos ("2026-10-01 14:00:00,123" ou "[2026-10-01] [14:00:00]")
+PADRAO_TS_LINHA_BYTES = re.compile(rb'[ \t]*\[?(\d{4}-\d{2}-\d{2})\]?[ T]+\[?(\d{2}:\d{2}:\d{2})')
+
+# Distância entre pontos do índice esparso tempo -> byte e trecho máximo lido por sondagem
+PASSO_INDICE_TEMPO = 1024 * 1024
+LIMITE_SONDAGEM = 256 * 1024
+
+# Folga (ms) nas buscas por intervalo: linhas de threads diferentes podem sair levemente fora de ordem
+FOLGA_BUSCA_TEMPO_MS = 5000
+
+def converter_para_ts(valor, fim=False):
+    """Converte datetime, 'YYYY-MM-DD[ HH:MM[:SS]]' ou epoch ms em epoch ms; datas sem hora como fim cobrem o dia"""
+    if valor is None or isinstance(valor, int):
+        return valor
+    if isinstance(valor, datetime.datetime):
+        return int(valor.timestamp() * 1000)
+    
+    valor = str(valor).strip().replace('T', ' ')
+    if len(valor) == 10:
+        inicio_dia, fim_dia = intervalo_dia_ms(valor)
+        return fim_dia - 1 if fim and fim_dia is not None else inicio_dia
+    if len(valor) == 16:
+        valor += ":00"
+    return calcular_ts_evento(valor[:10], valor[11:19])
+
+def alinhar_inicio_linha(mapa, posicao):
+    """Primeiro início de linha em ou depois de `posicao`"""
+    if posicao <= 0 or posicao >= len(mapa) or mapa[posicao - 1:posicao] == b'\n':
+        return min(max(posicao, 0), len(mapa))
+    return mapa.find(b'\n', posicao) + 1 or len(mapa)
+
+def sondar_ts(mapa, posicao, limite=LIMITE_SONDAGEM):
+    """Primeira linha com data/hora a partir de um byte: retorna (início da linha, epoch ms) ou (None, None)"""
+    posicao = alinhar_inicio_linha(mapa, posicao)
+    fim_sondagem = len(mapa) if limite is None else min(len(mapa), posicao + limite)
+    while posicao < fim_sondagem:
+        fim_linha = mapa.find(b'\n', posicao, fim_sondagem)
+        if fim_linha < 0:
+            fim_linha = fim_sondagem
+        
+        match = PADRAO_TS_LINHA_BYTES.match(mapa, posicao, fim_linha)
+        if match:
+            ts = calcular_ts_evento(match.group(1).decode(), match.group(2).decode())
+            if ts is not None:
+                return posicao, ts
+        posicao = fim_linha + 1
+    return None, None
+
+def buscar_offset_ts(mapa, ts_alvo, inicio=0, fim=None):
+    """Busca binária pelo início da primeira linha com data/hora >= ts_alvo no trecho [inicio, fim]
+
+    Pressupõe horários crescentes no arquivo (como no server.log do JBoss). Se
+    a resposta cair logo após linhas sem data (stack traces), pode retornar o
+    início dessas linhas, o que só acrescenta linhas descartadas pelo parser.
+    """
+    fim = len(mapa) if fim is None else fim
+    while fim - inicio > LIMITE_SONDAGEM // 4:
+        meio = (inicio + fim) // 2
+        offset, ts = sondar_ts(mapa, meio, limite=None)
+        if offset is None or offset >= fim:
+            # Só linhas sem data entre meio e fim
+            fim = meio
+        elif ts < ts_alvo:
+            inicio = offset + 1
+        else:
+            fim = offset
+    
+    # Trecho pequeno: varredura linear até a primeira linha no intervalo
+    offset, ts = sondar_ts(mapa, inicio, limite=None)
+    while offset is not None and offset < fim and ts < ts_alvo:
+        offset, ts = sondar_ts(mapa, offset + 1, limite=None)
+    
+    if offset is not None and offset < fim:
+        return offset
+    return alinhar_inicio_linha(mapa, fim)
+
+def construir_indice_tempo(mapa, inicio=0, passo=PASSO_INDICE_TEMPO):
+    """Índice esparso [(byte, epoch ms)] com uma sondagem a cada `passo` bytes (não lê o arquivo inteiro)"""
+    pontos = []
+    for posicao in range(inicio, len(mapa), passo):
+        offset, ts = sondar_ts(mapa, posicao)
+        if offset is not None and (not pontos or offset > pontos[-1][0]):
+            pontos.append((offset, ts))
+    return pontos
+
+def trecho_do_intervalo(mapa, ts_inicio=None, ts_fim=None, indice=None):
+    """Bytes [inicio, fim) de um log que cobrem [ts_inicio, ts_fim], usando o índice esparso se houver"""
+    tamanho = len(mapa)
+    
+    def limites(ts_alvo):
+        # Pontos do índice em volta do alvo reduzem a busca binária a um passo do índice
+        baixo, alto = 0, tamanho
+        for offset, ts in indice or []:
+            if ts < ts_alvo:
+                baixo = offset
+            else:
+                alto = offset
+                break
+        return baixo, alto
+    
+    inicio = 0
+    if ts_inicio is not None:
+        inicio = buscar_offset_ts(mapa, ts_inicio - FOLGA_BUSCA_TEMPO_MS, *limites(ts_inicio - FOLGA_BUSCA_TEMPO_MS))
+    
+    fim = tamanho
+    if ts_fim is not None:
+        fim = buscar_offset_ts(mapa, ts_fim + FOLGA_BUSCA_TEMPO_MS, *limites(ts_fim + FOLGA_BUSCA_TEMPO_MS))
+    
+    return inicio, max(inicio, fim)
+
+def iterar_linhas_log(arquivo, com_posicao=False):
+    """Linhas de um arquivo de log: mmap para texto, descompressão em streaming para .gz/.bz2/.xz
+
+    Com com_posicao, gera (origem, byte de início, linha); nos compactados a
+    posição é a do conteúdo descompactado, igual à do arquivo antes da compressão.
+    """
+    modulo = COMPRESSORES_LOG.get(os.path.splitext(arquivo)[1])
+    if modulo and com_posicao:
+        origem = origem_log(arquivo)
+        posicao = 0
+        with modulo.open(arquivo, 'rb') as f:
+            for linha in f:
+                yield origem, posicao, linha.decode('utf-8', errors='ignore')
+                posicao += len(linha)
+    elif modulo:
+        with abrir_arquivo_log(arquivo) as f:
+            yield from f
+    else:
+        yield from ler_linhas_mmap(arquivo, com_posicao=com_posicao)
+
+def processar_arquivo_em_processo(arquivo, vetorizado=False):
+    """Lê e interpreta um arquivo de log inteiro (executado nos processos de trabalho)"""
+    return ParserLogs(vetorizado).interpretar(iterar_linhas_log(arquivo, com_posicao=True))
+
+# Intervalo (segundos) entre heartbeats do daemon no banco
+INTERVALO_HEARTBEAT = 5
+
+# Parâmetros da coleta concorrente de logs (ColetorLogs)
+COLETA_PADRAO = {
+    "fontes": [],  # Arquivos/diretórios monitorados além de caminho_logs (um por nó JBoss)
+    "intervalo_s": 2,  # Intervalo entre leituras de uma fonte sem novidades
+    "max_bytes_leitura": 4 * 1024 * 1024,  # Máximo lido de um arquivo por vez
+    "tamanho_fila_fonte": 16,  # Lotes pendentes por fonte antes de pausar a leitura dela
+    "tamanho_fila_pipeline": 256,  # Lotes pendentes no pipeline antes de pausar todas as fontes
+    "endereco_receptor": "0.0.0.0",  # Interface dos receptores de rede
+    "syslog_udp": None,  # Porta syslog UDP (ex.: 5514); None desativa
+    "syslog_tcp": None,  # Porta syslog TCP (contagem de octetos ou uma mensagem por linha)
+    "tcp_linhas": None,  # Porta TCP com uma linha de log por mensagem
+    "tamanho_lote_rede": 500,  # Mensagens UDP acumuladas antes de enviar um lote
+    "max_conexoes": 200  # Conexões TCP simultâneas por receptor
+}
+
+class ProtocoloSyslogUDP(asyncio.DatagramProtocol):
+    """Recebe datagramas syslog e os repassa ao ColetorLogs"""
+
+    def __init__(self, coletor):
+        self.coletor = coletor
+        self.nome = None
+    
+    def datagram_received(self, dados, endereco):
+        if self.nome:
+            self.coletor.receber_datagrama(self.nome, dados)
+
+# Maior mensagem aceita dos receptores de rede (bytes); acima disso a mensagem é cortada
+TAMANHO_MAXIMO_MENSAGEM = 64 * 1024
+
+# Cabeçalhos syslog RFC 5424 (<PRI>1 TIMESTAMP HOST APP PROCID MSGID SD MSG) e RFC 3164 (<PRI>Mmm dd hh:mm:ss HOST TAG: MSG)
+PADRAO_SYSLOG_5424 = re.compile(r'<\d{1,3}>\d{1,2} (\S+) \S+ \S+ \S+ \S+ (?:-|(?:\[(?:[^\]"]|"(?:[^"\\]|\\.)*")*\])+) ?(.*)', re.S)
+PADRAO_SYSLOG_3164 = re.compile(r'<\d{1,3}>[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2} \S+ (?:[^\s:\[]+(?:\[\d+\])?: ?)?(.*)', re.S)
+
+def separar_mensagens(buffer, syslog):
+    """Separa um buffer TCP em mensagens completas; retorna (mensagens, resto incompleto)
+
+    Syslog sobre TCP pode usar contagem de octetos (RFC 6587: "TAMANHO <PRI>...")
+    ou uma mensagem por linha; o modo TCP simples usa apenas linhas.
+    """
+    mensagens = []
+    inicio = 0
+    while inicio < len(buffer):
+        if syslog and buffer[inicio:inicio + 1].isdigit():
+            espaco = buffer.find(b' ', inicio, inicio + 10)
+            if espaco > 0 and buffer[inicio:espaco].isdigit():
+                fim = espaco + 1 + int(buffer[inicio:espaco])
+                if fim > len(buffer):
+                    break
+                mensagens.append(buffer[espaco + 1:fim])
+                inicio = fim
+                continue
+        
+        fim = buffer.find(b'\n', inicio)
+        if fim < 0:
+            break
+        mensagens.append(buffer[inicio:fim])
+        inicio = fim + 1
+    
+    resto = buffer[inicio:]
+    if len(resto) >= TAMANHO_MAXIMO_MENSAGEM:
+        # Linha sem quebra grande demais: cortar em vez de acumular sem limite
+        mensagens.append(resto[:TAMANHO_MAXIMO_MENSAGEM])
+        resto = b""
+    return mensagens, resto
+
+def converter_mensagens(mensagens, syslog):
+    """Decodifica mensagens recebidas pela rede em linhas de log para o parser"""
+    linhas = []
+    for mensagem in mensagens:
+        linha = mensagem.decode('utf-8', errors='ignore').strip()
+        if not linha:
+            continue
+        if syslog:
+            linha = normalizar_syslog(linha)
+        linhas.append(linha)
+    return linhas
+
+def normalizar_syslog(linha, recebido_em=None):
+    """Remove o cabeçalho syslog e garante data/hora na linha entregue ao parser
+
+    O JBoss normalmente envia a linha completa do log como MSG; quando ela não
+    traz data, usa-se o TIMESTAMP do cabeçalho RFC 5424 ou, no RFC 3164 (sem
+    ano), o horário de recebimento.
+    """
+    momento = None
+    match = PADRAO_SYSLOG_5424.match(linha)
+    if match:
+        try:
+            momento = datetime.datetime.fromisoformat(match.group(1).replace('Z', '+00:00'))
+            if momento.tzinfo:
+                momento = momento.astimezone().replace(tzinfo=None)
+        except ValueError:
+            momento = None
+        mensagem = match.group(2)
+    else:
+        match = PADRAO_SYSLOG_3164.match(linha)
+        mensagem = match.group(1) if match else linha
+    
+    mensagem = mensagem.lstrip('\ufeff').strip()
+    if re.search(r'\d{4}-\d{2}-\d{2}', mensagem):
+        return mensagem
+    
+    momento = momento or recebido_em or datetime.datetime.now()
+    return f"{momento.strftime('%Y-%m-%d %H:%M:%S')} {mensagem}"
+
+class ColetorLogs:
+    """Coleta linhas de várias fontes ao mesmo tempo em um loop asyncio próprio
+
+    Cada fonte tem sua tarefa de leitura (a E/S bloqueante roda em um pool de
+    threads, então um caminho NFS lento atrasa só a própria fonte) e sua fila
+    limitada. Os lotes de linhas brutas seguem para uma única fila de saída,
+    consumida pelo pipeline de parse, banco e alertas do MotorMonitoramento,
+    como tuplas (fonte, linhas, instante de entrada na fila em perf_counter).
+    """
+
+    def __init__(self, fila_saida, config=None):
+        self.fila_saida = fila_saida
+        self.config = dict(COLETA_PADRAO, **(config or {}))
+        self.fontes = {}  # nome -> estatísticas da fonte (linhas, bytes, atraso, fila...)
+        self.loop = None
+        self.thread = None
+        self.executor = None
+        self.evento_parar = None
+        self.tarefas = []
+        self.servidores = []  # Servidores TCP e transportes UDP abertos
+        self.portas = {}  # Portas efetivamente abertas por receptor (syslog_udp, syslog_tcp, tcp_linhas)
+        self.lotes_udp = {}  # nome da fonte UDP -> mensagens ainda não enviadas
+        self.pronto = threading.Event()
+    
+    def iniciar(self, caminhos):
+        """Inicia o loop asyncio em uma thread com uma tarefa de leitura por caminho"""
+        self.thread = threading.Thread(target=self.executar, args=(list(caminhos),), daemon=True)
+        self.thread.start()
+        self.pronto.wait(timeout=5)
+    
+    def parar(self, timeout=5.0):
+        """Sinaliza as tarefas para encerrar e aguarda a thread do loop"""
+        if self.loop and self.evento_parar:
+            self.loop.call_soon_threadsafe(self.evento_parar.set)
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+    
+    def executar(self, caminhos):
+        """Corpo da thread do coletor"""
+        try:
+            asyncio.run(self.principal(caminhos))
+        except Exception as e:
+            print(f"Erro no coletor de logs: {str(e)}")
+        finally:
+            self.pronto.set()
+    
+    async def principal(self, caminhos):
+        """Cria as tarefas das fontes e espera o sinal de parada"""
+        self.loop = asyncio.get_running_loop()
+        self.evento_parar = asyncio.Event()
+        self.executor = ThreadPoolExecutor(max_workers=min(32, len(caminhos) + 4),
+                                           thread_name_prefix="coletor")
+        try:
+            for caminho in caminhos:
+                self.adicionar_fonte_arquivo(caminho)
+            await self.iniciar_receptores()
+            self.pronto.set()
+            
+            await self.evento_parar.wait()
+        finally:
+            for servidor in self.servidores:
+                servidor.close()
+            for tarefa in self.tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*self.tarefas, return_exceptions=True)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def registrar_fonte(self, nome, tipo):
+        """Cria a fila limitada e as estatísticas de uma fonte"""
+        fila = asyncio.Queue(maxsize=self.config["tamanho_fila_fonte"])
+        self.fontes[nome] = {
+            "tipo": tipo,
+            "linhas": 0,
+            "bytes": 0,
+            "lotes": 0,
+            "bytes_pendentes": 0,
+            "em_dia_desde": time.time(),  # Última vez em que a fonte não tinha nada pendente
+            "conexoes": 0,
+            "descartadas": 0,
+            "erros": 0,
+            "ultimo_erro": None,
+            "fila": fila
+        }
+        self.tarefas.append(asyncio.create_task(self.encaminhar(nome, fila)))
+        return fila
+    
+    def adicionar_fonte_arquivo(self, caminho):
+        """Adiciona um arquivo ou diretório de logs como fonte (chamado no loop do coletor)"""
+        if caminho in self.fontes:
+            return
+        fila = self.registrar_fonte(caminho, "arquivo")
+        self.tarefas.append(asyncio.create_task(self.ler_fonte_arquivo(caminho, fila)))
+    
+    async def ler_fonte_arquivo(self, caminho, fila):
+        """Tarefa de leitura de uma fonte local: acompanha o crescimento dos arquivos .log"""
+        estatisticas = self.fontes[caminho]
+        posicoes = {}  # arquivo -> último byte lido
+        
+        while True:
+            try:
+                linhas, lidos, pendentes = await self.loop.run_in_executor(
+                    self.executor, ler_novas_linhas, caminho, posicoes, self.config["max_bytes_leitura"])
+                
+                estatisticas["bytes"] += lidos
+                estatisticas["bytes_pendentes"] = pendentes
+                if not pendentes:
+                    estatisticas["em_dia_desde"] = time.time()
+                
+                if linhas:
+                    # Fila cheia: a leitura desta fonte pausa até o pipeline alcançar
+                    await fila.put(linhas)
+                
+                if not pendentes:
+                    await asyncio.sleep(self.config["intervalo_s"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                estatisticas["erros"] += 1
+                estatisticas["ultimo_erro"] = str(e)
+                print(f"Erro ao ler fonte {caminho}: {str(e)}")
+                await asyncio.sleep(self.config["intervalo_s"] * 2)
+    
+    async def encaminhar(self, nome, fila):
+        """Move os lotes da fila da fonte para a fila única do pipeline"""
+        estatisticas = self.fontes[nome]
+        while True:
+            linhas = await fila.get()
+            # O instante de entrada na fila mede a espera até o pipeline consumir o lote
+            lote = (nome, linhas, time.perf_counter())
+            try:
+                self.fila_saida.put_nowait(lote)
+            except queue.Full:
+                # Pipeline saturado: bloquear em uma thread, sem travar o loop das demais fontes
+                await asyncio.to_thread(self.fila_saida.put, lote)
+            estatisticas["linhas"] += len(linhas)
+            estatisticas["lotes"] += 1
+    
+    async def iniciar_receptores(self):
+        """Abre os receptores de rede configurados (syslog UDP/TCP e TCP com uma linha por mensagem)"""
+        endereco = self.config["endereco_receptor"]
+        
+        if self.config["syslog_udp"] is not None:
+            transporte, _ = await self.loop.create_datagram_endpoint(
+                lambda: ProtocoloSyslogUDP(self), local_addr=(endereco, self.config["syslog_udp"]))
+            try:
+                # Buffer maior no kernel para absorver rajadas enquanto o loop está ocupado
+                transporte.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+            except OSError:
+                pass
+            porta = transporte.get_extra_info('sockname')[1]
+            nome = f"syslog-udp:{porta}"
+            transporte.get_protocol().nome = nome
+            self.registrar_fonte(nome, "syslog-udp")
+            self.tarefas.append(asyncio.create_task(self.descarregar_udp(nome)))
+            self.servidores.append(transporte)
+            self.portas["syslog_udp"] = porta
+        
+        for chave, syslog in (("syslog_tcp", True), ("tcp_linhas", False)):
+            if self.config[chave] is None:
+                continue
+            
+            # O nome da fonte só é conhecido depois do bind (porta 0 = porta livre, usada nos testes)
+            nomes = {}
+            servidor = await asyncio.start_server(
+                lambda leitor, escritor, syslog=syslog, nomes=nomes:
+                    self.atender_conexao(nomes["nome"], syslog, leitor, escritor),
+                endereco, self.config[chave], limit=TAMANHO_MAXIMO_MENSAGEM)
+            porta = servidor.sockets[0].getsockname()[1]
+            nomes["nome"] = f"{chave.replace('_', '-')}:{porta}"
+            self.registrar_fonte(nomes["nome"], chave.replace('_', '-'))
+            self.servidores.append(servidor)
+            self.portas[chave] = porta
+    
+    async def atender_conexao(self, nome, syslog, leitor, escritor):
+        """Lê uma conexão TCP em blocos; cada bloco vira um lote de mensagens para a fila da fonte"""
+        estatisticas = self.fontes[nome]
+        if estatisticas["conexoes"] >= self.config["max_conexoes"]:
+            estatisticas["erros"] += 1
+            estatisticas["ultimo_erro"] = "Limite de conexões atingido"
+            escritor.close()
+            return
+        
+        estatisticas["conexoes"] += 1
+        resto = b""
+        try:
+            while True:
+                dados = await leitor.read(TAMANHO_MAXIMO_MENSAGEM)
+                if not dados:
+                    break
+                
+                estatisticas["bytes"] += len(dados)
+                mensagens, resto = separar_mensagens(resto + dados, syslog)
+                if mensagens:
+                    # Fila cheia: a leitura do socket pausa e o TCP segura o remetente
+                    await estatisticas["fila"].put(converter_mensagens(mensagens, syslog))
+                    estatisticas["em_dia_desde"] = time.time()
+            
+            if resto.strip():
+                await estatisticas["fila"].put(converter_mensagens([resto], syslog))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            estatisticas["erros"] += 1
+            estatisticas["ultimo_erro"] = str(e)
+        finally:
+            estatisticas["conexoes"] -= 1
+            escritor.close()
+    
+    def receber_datagrama(self, nome, dados):
+        """Acumula um datagrama syslog no lote pendente da fonte UDP"""
+        estatisticas = self.fontes[nome]
+        estatisticas["bytes"] += len(dados)
+        self.lotes_udp.setdefault(nome, []).extend(dados.splitlines())
+        if len(self.lotes_udp[nome]) >= self.config["tamanho_lote_rede"]:
+            self.enviar_lote_udp(nome)
+    
+    def enviar_lote_udp(self, nome):
+        """Envia o lote UDP pendente sem bloquear; sem espaço na fila o lote é descartado e contado"""
+        mensagens = self.lotes_udp.pop(nome, None)
+        if not mensagens:
+            return
+        
+        estatisticas = self.fontes[nome]
+        try:
+            estatisticas["fila"].put_nowait(converter_mensagens(mensagens, True))
+            estatisticas["em_dia_desde"] = time.time()
+        except asyncio.QueueFull:
+            # UDP não tem controle de fluxo: descartar é a única forma de backpressure
+            estatisticas["descartadas"] += len(mensagens)
+    
+    async def descarregar_udp(self, nome):
+        """Envia periodicamente lotes UDP incompletos para não atrasar tráfego baixo"""
+        while True:
+            await asyncio.sleep(0.2)
+            self.enviar_lote_udp(nome)
+    
+    def estatisticas(self):
+        """Retorna uma cópia das estatísticas por fonte, com atraso em segundos e tamanho da fila"""
+        agora = time.time()
+        resultado = {}
+        for nome, estatisticas in list(self.fontes.items()):
+            copia = {chave: valor for chave, valor in estatisticas.items() if chave != "fila"}
+            copia["fila"] = estatisticas["fila"].qsize()
+            copia["atraso_s"] = round(agora - estatisticas["em_dia_desde"], 1)
+            resultado[nome] = copia
+        return resultado
+
+def ler_novas_linhas(caminho, posicoes, max_bytes):
+    """Lê as linhas completas acrescentadas aos arquivos .log de um caminho desde a última leitura
+
+    Retorna (linhas, bytes lidos, bytes ainda pendentes), com cada linha como
+    (origem, byte de início, texto), as mesmas posições de uma carga do
+    arquivo. Na primeira vez que um arquivo é visto a leitura começa no fim
+    dele; se o arquivo encolher (rotação/truncamento) ela recomeça do início.
+    """
+    if os.path.isdir(caminho):
+        arquivos = [os.path.join(caminho, f) for f in os.listdir(caminho) if f.endswith('.log')]
+    elif os.path.exists(caminho):
+        arquivos = [caminho]
+    else:
+        arquivos = []
+    
+    linhas = []
+    lidos = 0
+    pendentes = 0
+    for arquivo in arquivos:
+        tamanho_atual = os.path.getsize(arquivo)
+        
+        # Se é a primeira vez que verificamos este arquivo, apenas armazenar o tamanho
+        if arquivo not in posicoes:
+            posicoes[arquivo] = tamanho_atual
+            continue
+        
+        if tamanho_atual < posicoes[arquivo]:
+            posicoes[arquivo] = 0
+        
+        disponivel = tamanho_atual - posicoes[arquivo]
+        if disponivel <= 0:
+            continue
+        
+        if lidos >= max_bytes:
+            pendentes += disponivel
+            continue
+        
+        with open(arquivo, 'rb') as f:
+            f.seek(posicoes[arquivo])
+            bloco = f.read(min(disponivel, max_bytes - lidos))
+        
+        # Consumir só até a última quebra de linha (a linha parcial é lida na próxima vez)
+        fim = bloco.rfind(b'\n') + 1
+        if fim == 0:
+            continue
+        
+        origem = origem_log(arquivo)
+        posicao = posicoes[arquivo]
+        for linha in bloco[:fim - 1].split(b'\n'):
+            linhas.append((origem, posicao, linha.decode('utf-8', errors='ignore')))
+            posicao += len(linha) + 1
+        
+        posicoes[arquivo] += fim
+        lidos += fim
+        pendentes += tamanho_atual - posicoes[arquivo]
+    
+    return linhas, lidos, pendentes
+
+# Limites (s) dos histogramas de latência por etapa; o último balde (+Inf) é implícito
+LIMITES_LATENCIA = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Etapas instrumentadas, na ordem do pipeline (a interface é medida pelo cliente Tk;
+# alertas_fragmentos é o lote inteiro quando há processos de alertas)
+ETAPAS_PIPELINE = ("fila", "parse", "memoria", "banco", "alertas", "alertas_fragmentos", "interface")
+
+# Contadores do pipeline (exportados como monitor_<nome>_total)
+DESCRICOES_CONTADORES = {
+    "linhas_recebidas": "Linhas brutas retiradas da fila do pipeline",
+    "logs_interpretados": "Logs extraídos das linhas pelo parser",
+    "logs_gravados": "Logs novos gravados no SQLite, após a deduplicação (inclui cargas de arquivo)",
+    "logs_avaliados": "Logs avaliados pelas regras de alerta",
+    "alertas_gerados": "Alertas novos, por tipo",
+    "erros": "Erros por etapa do pipeline",
+    "consultas": "Consultas de logs (carregar_logs_db e buscar_logs), por resultado no cache (acerto/falha)",
+}
+
+# Endpoint HTTP com as métricas no formato de texto do Prometheus
+DIAGNOSTICO_PADRAO = {
+    "porta_metricas": None,  # None = endpoint desligado
+    "endereco_metricas": "127.0.0.1",  # Apenas local por padrão
+    # Perfilamento dos pontos de entrada (lido a cada chamada: pode ser ligado com o sistema em execução)
+    "perfilamento": False,
+    "modo_perfilamento": "cprofile",  # "cprofile" (determinístico) ou "amostragem" (pilhas a cada intervalo)
+    "intervalo_amostragem_ms": 10,
+    "diretorio_perfis": "perfis",
+    "intervalo_dump_s": 60,  # Um arquivo novo por thread (cProfile) ou de amostras a cada intervalo
+    "max_dumps": 20,  # Arquivos mantidos por thread/modo; os mais antigos são apagados
+    # Operações (callbacks do Tk e pontos de entrada) acima do limite vão para operacoes_lentas.log
+    "registrar_operacoes_lentas": False,  # Também registradas sempre que o perfilamento está ligado
+    "limite_lento_ms": 200,
+}
+
+# Tamanho a partir do qual operacoes_lentas.log é rotacionado (.1)
+TAMANHO_MAXIMO_LOG_LENTAS = 5 * 1024 * 1024
+
+class MetricasPipeline:
+    """Contadores e histogramas de latência por etapa do pipeline
+
+    Cada observação custa uma busca binária nos limites e alguns incrementos sob
+    um lock curto. As etapas medem lotes inteiros (os alertas, cada log), então o
+    custo fica bem abaixo do trabalho medido.
+    """
+
+    def __init__(self, limites=LIMITES_LATENCIA):
+        self.limites = tuple(limites)
+        self.lock = threading.Lock()
+        self.contadores = Counter()  # (nome, rótulos) -> total
+        self.histogramas = {}  # etapa -> baldes, soma, total e máximo
+        self.iniciado_em = time.time()
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        """Soma valor ao contador nome (rótulos opcionais, ex.: etapa="banco")"""
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self.lock:
+            self.contadores[chave] += valor
+
+    def observar(self, etapa, segundos):
+        """Registra uma duração (s) no histograma da etapa"""
+        indice = bisect.bisect_left(self.limites, segundos)
+        with self.lock:
+            histograma = self.histogramas.get(etapa)
+            if histograma is None:
+                histograma = self.histogramas[etapa] = {
+                    "baldes": [0] * (len(self.limites) + 1), "soma": 0.0, "total": 0, "maximo": 0.0}
+            histograma["baldes"][indice] += 1
+            histograma["soma"] += segundos
+            histograma["total"] += 1
+            if segundos > histograma["maximo"]:
+                histograma["maximo"] = segundos
+
+    @contextlib.contextmanager
+    def medir(self, etapa):
+        """Mede o bloco with e registra a duração na etapa"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(etapa, time.perf_counter() - inicio)
+
+    def percentil(self, histograma, fracao):
+        """Limite superior do balde que contém o percentil (o máximo observado no balde +Inf)"""
+        alvo = fracao * histograma["total"]
+        acumulado = 0
+        for limite, contagem in zip(self.limites, histograma["baldes"]):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(limite, histograma["maximo"])
+        return histograma["maximo"]
+
+    def instantaneo(self):
+        """Cópia das métricas para exibição: por etapa (eventos, média, p50, p95, máximo em ms) e contadores"""
+        with self.lock:
+            histogramas = {etapa: dict(h, baldes=list(h["baldes"])) for etapa, h in self.histogramas.items()}
+            contadores = dict(self.contadores)
+
+        etapas = {}
+        for etapa in ETAPAS_PIPELINE + tuple(sorted(set(histogramas) - set(ETAPAS_PIPELINE))):
+            histograma = histogramas.get(etapa)
+            if histograma is None:
+                continue
+            etapas[etapa] = {
+                "eventos": histograma["total"],
+                "media_ms": round(histograma["soma"] / histograma["total"] * 1000, 3),
+                "p50_ms": round(self.percentil(histograma, 0.5) * 1000, 3),
+                "p95_ms": round(self.percentil(histograma, 0.95) * 1000, 3),
+                "max_ms": round(histograma["maximo"] * 1000, 3),
+            }
+        return {
+            "desde": self.iniciado_em,
+            "etapas": etapas,
+            "contadores": {nome + "".join(f"[{valor}]" for _, valor in rotulos): total
+                           for (nome, rotulos), total in sorted(contadores.items())},
+        }
+
+    def formato_prometheus(self, medidores=()):
+        """Texto de exposição do Prometheus; medidores = [(nome, tipo, ajuda, [(rótulos, valor), ...]), ...]
+
+        tipo é "gauge" ou "counter" (valores acumulados mantidos fora daqui, ex.: linhas por fonte).
+        """
+        with self.lock:
+            histogramas = {etapa: dict(h, baldes=list(h["baldes"])) for etapa, h in self.histogramas.items()}
+            contadores = dict(self.contadores)
+
+        linhas = []
+        nomes = sorted({nome for nome, _ in contadores})
+        for nome in nomes:
+            if nome in DESCRICOES_CONTADORES:
+                linhas.append(f"# HELP monitor_{nome}_total {DESCRICOES_CONTADORES[nome]}")
+            linhas.append(f"# TYPE monitor_{nome}_total counter")
+            for (nome_contador, rotulos), total in sorted(contadores.items()):
+                if nome_contador == nome:
+                    linhas.append(f"monitor_{nome}_total{formatar_rotulos(dict(rotulos))} {total}")
+
+        if histogramas:
+            linhas.append("# HELP monitor_etapa_duracao_segundos Duração de cada etapa do pipeline")
+            linhas.append("# TYPE monitor_etapa_duracao_segundos histogram")
+        for etapa, histograma in sorted(histogramas.items()):
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (float("inf"),), histograma["baldes"]):
+                acumulado += contagem
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                linhas.append(f"monitor_etapa_duracao_segundos_bucket{formatar_rotulos({'etapa': etapa, 'le': le})} "
+                              f"{acumulado}")
+            linhas.append(f"monitor_etapa_duracao_segundos_sum{formatar_rotulos({'etapa': etapa})} "
+                          f"{histograma['soma']:.6f}")
+            linhas.append(f"monitor_etapa_duracao_segundos_count{formatar_rotulos({'etapa': etapa})} "
+                          f"{histograma['total']}")
+
+        for nome, tipo, ajuda, valores in medidores:
+            nome = f"monitor_{nome}_total" if tipo == "counter" else f"monitor_{nome}"
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for rotulos, valor in valores:
+                linhas.append(f"{nome}{formatar_rotulos(rotulos)} {valor}")
+        return "\n".join(linhas) + "\n"
+
+def formatar_rotulos(rotulos):
+    """Rótulos no formato do Prometheus ({chave="valor",...}), com escape de \\, aspas e quebras de linha"""
+    if not rotulos:
+        return ""
+    pares = []
+    for chave, valor in rotulos.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pares.append(f'{chave}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+class ManipuladorMetricas(http.server.BaseHTTPRequestHandler):
+    """Responde GET /metrics com as métricas do motor (self.server.motor)"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        try:
+            corpo = self.server.motor.texto_metricas().encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        # Sem uma linha no console a cada coleta do Prometheus
+        pass
+
+class Perfilador:
+    """Perfilamento opcional dos pontos de entrada do monitoramento (verificar_alerta, lotes, interface)
+
+    envolver() devolve a função original quando o perfilamento está desligado, a
+    menos de uma consulta à configuração. Ligado, cada chamada é medida com
+    cProfile (um perfil por thread, gravado pela própria thread a cada
+    intervalo_dump_s) ou registrada para a thread de amostragem, que lê as pilhas
+    com sys._current_frames() e grava contagens no formato "folded" (flame graphs).
+    """
+
+    def __init__(self, config):
+        self.config = config  # Referência ao diagnostico_config do motor
+        self.lock = threading.Lock()
+        self.perfis = {}  # id da thread -> (cProfile.Profile, início do perfil)
+        self.em_execucao = {}  # id da thread -> ponto de entrada em execução (para a amostragem)
+        self.amostras = Counter()  # "ponto;pilha" -> amostras
+        self.thread_amostragem = None
+
+    @property
+    def ativo(self):
+        return bool(self.config.get("perfilamento"))
+
+    def medindo_lentas(self):
+        return self.ativo or bool(self.config.get("registrar_operacoes_lentas"))
+
+    def envolver(self, nome, funcao):
+        """Envolve funcao como ponto de entrada nome"""
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not self.config.get("perfilamento"):
+                if self.perfis:
+                    self.descarregar_thread()
+                if self.config.get("registrar_operacoes_lentas"):
+                    inicio = time.perf_counter()
+                    try:
+                        return funcao(*args, **kwargs)
+                    finally:
+                        self.registrar_duracao(nome, time.perf_counter() - inicio)
+                return funcao(*args, **kwargs)
+            return self.executar(nome, funcao, args, kwargs)
+        return envolvida
+
+    def executar(self, nome, funcao, args, kwargs):
+        """Executa um ponto de entrada com o perfilamento ligado"""
+        thread = threading.get_ident()
+        externo = thread not in self.em_execucao  # Chamadas aninhadas ficam no perfil da externa
+        perfil = None
+        if externo:
+            self.em_execucao[thread] = nome
+            if self.config.get("modo_perfilamento") == "amostragem":
+                if thread in self.perfis:
+                    self.descarregar_thread()
+                self.iniciar_amostragem()
+            else:
+                perfil = self.perfil_da_thread(thread)
+
+        inicio = time.perf_counter()
+        try:
+            if perfil is not None:
+                try:
+                    perfil.enable()
+                except ValueError:
+                    # Outro profiler ativo nesta thread (ou, no Python 3.12+, no processo)
+                    perfil = None
+            return funcao(*args, **kwargs)
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            if externo:
+                del self.em_execucao[thread]
+                self.registrar_duracao(nome, time.perf_counter() - inicio)
+                if perfil is not None and time.time() - self.perfis[thread][1] >= self.config.get("intervalo_dump_s", 60):
+                    self.descarregar_thread()
+
+    def perfil_da_thread(self, thread):
+        """Perfil cProfile da thread atual (criado na primeira chamada perfilada)"""
+        if thread not in self.perfis:
+            with self.lock:
+                self.perfis[thread] = (cProfile.Profile(), time.time())
+        return self.perfis[thread][0]
+
+    def descarregar_thread(self):
+        """Grava e descarta o perfil da thread atual (só a dona do perfil o grava, fora de uso)"""
+        with self.lock:
+            perfil_inicio = self.perfis.pop(threading.get_ident(), None)
+        if perfil_inicio is None:
+            return
+        prefixo = f"perfil-{threading.current_thread().name}-"
+        try:
+            perfil_inicio[0].dump_stats(self.caminho_dump(prefixo, ".prof"))
+            self.rotacionar(prefixo)
+        except Exception as e:
+            print(f"Erro ao gravar perfil: {str(e)}")
+
+    def iniciar_amostragem(self):
+        """Inicia a thread de amostragem de pilhas, se ainda não estiver rodando"""
+        with self.lock:
+            if self.thread_amostragem and self.thread_amostragem.is_alive():
+                return
+            self.thread_amostragem = threading.Thread(target=self.amostrar, daemon=True, name="amostragem")
+            self.thread_amostragem.start()
+
+    def amostrar(self):
+        """Corpo da thread de amostragem: pilhas das threads dentro de pontos de entrada, até desligar"""
+        ultimo_dump = time.time()
+        while self.ativo and self.config.get("modo_perfilamento") == "amostragem":
+            time.sleep(max(self.config.get("intervalo_amostragem_ms", 10), 1) / 1000)
+            quadros = sys._current_frames()
+            for thread, nome in list(self.em_execucao.items()):
+                quadro = quadros.get(thread)
+                pilha = []
+                while quadro is not None:
+                    codigo = quadro.f_code
+                    pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{quadro.f_lineno})")
+                    quadro = quadro.f_back
+                self.amostras[nome + ";" + ";".join(reversed(pilha))] += 1
+            del quadros
+            
+            if time.time() - ultimo_dump >= self.config.get("intervalo_dump_s", 60):
+                self.descarregar_amostras()
+                ultimo_dump = time.time()
+        self.descarregar_amostras()
+
+    def descarregar_amostras(self):
+        """Grava as amostras acumuladas (formato folded: "pilha contagem" por linha) e recomeça"""
+        amostras, self.amostras = self.amostras, Counter()
+        if not amostras:
+            return
+        try:
+            with open(self.caminho_dump("amostras-", ".folded"), "w", encoding="utf-8") as f:
+                for pilha, contagem in amostras.most_common():
+                    f.write(f"{pilha} {contagem}\n")
+            self.rotacionar("amostras-")
+        except Exception as e:
+            print(f"Erro ao gravar amostras de perfil: {str(e)}")
+
+    def registrar_duracao(self, nome, segundos):
+        """Acrescenta a operacoes_lentas.log as operações acima de limite_lento_ms"""
+        limite_ms = self.config.get("limite_lento_ms", 200)
+        if segundos * 1000 < limite_ms:
+            return
+        try:
+            diretorio = self.config.get("diretorio_perfis") or "perfis"
+            os.makedirs(diretorio, exist_ok=True)
+            caminho = os.path.join(diretorio, "operacoes_lentas.log")
+            with self.lock:
+                if os.path.exists(caminho) and os.path.getsize(caminho) > TAMANHO_MAXIMO_LOG_LENTAS:
+                    os.replace(caminho, caminho + ".1")
+                with open(caminho, "a", encoding="utf-8") as f:
+                    f.write(f"{datetime.datetime.now().isoformat(timespec='milliseconds')} "
+                            f"{threading.current_thread().name} {nome} {segundos * 1000:.1f} ms\n")
+        except Exception as e:
+            print(f"Erro ao registrar operação lenta: {str(e)}")
+
+    def caminho_dump(self, prefixo, extensao):
+        """Caminho de um novo arquivo de perfil (o nome ordena por data)"""
+        diretorio = self.config.get("diretorio_perfis") or "perfis"
+        os.makedirs(diretorio, exist_ok=True)
+        return os.path.join(diretorio, f"{prefixo}{datetime.datetime.now():%Y%m%d-%H%M%S-%f}{extensao}")
+
+    def rotacionar(self, prefixo):
+        """Mantém apenas os max_dumps arquivos mais recentes com o prefixo"""
+        diretorio = self.config.get("diretorio_perfis") or "perfis"
+        arquivos = sorted(nome for nome in os.listdir(diretorio) if nome.startswith(prefixo))
+        for nome in arquivos[:-max(int(self.config.get("max_dumps", 20)), 1)]:
+            try:
+                os.remove(os.path.join(diretorio, nome))
+            except OSError:
+                pass
+
+class MotorMonitoramento:
+    """Núcleo do sistema sem interface gráfica: ingestão, monitoramento, alertas e persistência
+
+    Pode rodar dentro da interface Tkinter (SistemaMonitoramento) ou sozinho como
+    daemon (python motor_monitoramento.py --daemon). Quando há um daemon ativo no
+    mesmo banco, a interface entra em modo cliente e apenas lê o que ele grava.
+    """
+
+    def __init__(self, db_path="logs_cache.db"):
+        # Variáveis globais
+        self.logs_data = None  # DataFrame para exibição (filtrado)
+        self.logs_completos = None  # DataFrame completo com todos os logs
+        self.caminho_logs = None
+        self.max_logs_memoria = 100000  # Limite de logs em memória (representação compacta, ver compactar_logs)
+        self.monitoramento_ativo = False
+        self.modo_cliente = False  # True quando outro processo (daemon) faz a ingestão
+        self.thread_monitoramento = None
+        self.thread_pipeline = None
+        self.coletor = None  # ColetorLogs ativo (uma tarefa de leitura por fonte)
+        self.coleta_config = dict(COLETA_PADRAO)  # Fontes adicionais e limites das filas
+        self.fila_logs = queue.Queue()  # Lotes (fonte, linhas) entre o coletor e o pipeline
+        self.tamanho_lote_pipeline = 1000  # Máximo de logs por lote (memória, banco e alertas)
+        self.lock_memoria = threading.RLock()  # Protege logs_completos/logs_data entre threads
+        self.versao_dados = 0  # Incrementada a cada alteração de logs_completos
+        self.alertas = []  # Lista para armazenar alertas
+        self.ouvintes_alerta = []  # Funções chamadas com cada novo alerta
+        self.ouvintes_aviso = []  # Funções chamadas com (nivel, titulo, mensagem) para avisos ao usuário
+        self.db_path = db_path  # Caminho para o banco de dados SQLite
+        self.pool_leitura = PoolLeitura(db_path)  # Conexões somente leitura das consultas
+        self.cache_consultas = CacheConsultas()  # Resultados por filtros normalizados, invalidados a cada gravação
+        self.fts_disponivel = False  # Indica se o SQLite suporta o índice FTS5
+        self.schema_tipado = False  # Indica se a migração para o schema tipado já terminou
+        self.faixa_chaves_legado = None  # (ts_min, ts_max) das linhas migradas com chave_dedup_legado
+        self.dicionario = DicionarioValores()  # Cache de codificação nível/status/operação/servidor
+        self.parser = ParserLogs(vetorizado=True)  # Interpretação das linhas de log (em lote nas cargas de arquivo)
+        self.usar_indice_tempo = True  # Grava no banco o índice esparso tempo -> byte dos arquivos carregados por intervalo
+        self.armazenamento_config = dict(ARMAZENAMENTO_PADRAO)  # Partições, retenção e compactação
+        self.ultima_compactacao = 0.0  # Epoch da última compactação (VACUUM) do banco principal
+        self.thread_manutencao = None
+        self.evento_parar_manutencao = threading.Event()
+        self.metricas = MetricasPipeline()  # Contadores e latências por etapa do pipeline
+        self.diagnostico_config = dict(DIAGNOSTICO_PADRAO)  # Endpoint de métricas e perfilamento
+        self.servidor_metricas = None
+        self.exportacoes = []  # Exportações em streaming recentes (TarefaExportacao)
+        self.relatorios_config = dict(RELATORIOS_PADRAO)  # Processos, cache e agendamento dos relatórios
+        self.relatorios = []  # Relatórios recentes (TarefaRelatorio)
+        self.indice_urls = IndiceURLs()  # Estatísticas por caminho/prefixo de URL, atualizadas na gravação
+        self.lock_indice_urls = threading.Lock()  # Ordena gravações e a troca do índice na carga inicial
+        self.id_indice_urls = 0  # Último id de logs lido do banco pelo índice (modo cliente)
+        self.deteccao_config = dict(DETECCAO_PADRAO)  # Limites da detecção de anomalias em fluxo
+        self.avaliador_alertas = AvaliadorFragmento(dict(DETECCAO_PADRAO))  # Regras por usuário/IP na thread do pipeline
+        self.fragmentos_alertas = None  # FragmentosAlertas quando deteccao_config["processos_alertas"] > 0
+        
+        # Pontos de entrada perfilados quando diagnostico_config["perfilamento"] está ligado
+        self.perfilador = Perfilador(self.diagnostico_config)
+        self.verificar_alerta = self.perfilador.envolver("verificar_alerta", self.verificar_alerta)
+        self.processar_lote_logs = self.perfilador.envolver("processar_lote_logs", self.processar_lote_logs)
+
+        # Configurações de alertas
+        self.alertas_config = {
+            "falhas_login": 3,  # Número de falhas de login para gerar alerta
+            "acessos_suspeitos": True,  # Alertar sobre acessos fora do horário comercial
+            "urls_restritas": ["/admin", "/config", "/system", "/api/admin"]  # URLs restritas
+        }
+        
+        # Inicializar banco de dados
+        self.inicializar_db()
+        
+        # Preencher o índice de URLs com os logs já gravados, sem atrasar a inicialização
+        threading.Thread(target=self.carregar_indice_urls, daemon=True).start()
+        
+        # Carregar configurações salvas
+        self.carregar_configuracoes()
+        
+        # Iniciar manutenção do armazenamento em segundo plano
+        self.iniciar_manutencao()
+    
+    def notificar(self, nivel, titulo, mensagem):
+        """Encaminha um aviso ao usuário (interface ou console, no modo daemon)"""
+        if not self.ouvintes_aviso:
+            print(f"[{nivel.upper()}] {titulo}: {mensagem}")
+            return
+        
+        for ouvinte in self.ouvintes_aviso:
+            try:
+                ouvinte(nivel, titulo, mensagem)
+            except Exception as e:
+                print(f"Erro ao notificar aviso: {str(e)}")
+    
+    def substituir_logs_memoria(self, logs):
+        """Substitui os logs em memória (carga inicial de arquivo, diretório ou banco)"""
+        df = tabela_logs(logs)
+        
+        # Limitar quantidade de logs em memória
+        if len(df) > self.max_logs_memoria:
+            df = df.head(self.max_logs_memoria)
+        
+        # Representação compacta (categorias, IP em uint32, epoch em int64)
+        df = compactar_logs(df)
+        
+        # Ordenar por data e hora
+        if not df.empty:
+            df = df.sort_values(by=["data", "hora"], ascending=False)
+        
+        with self.lock_memoria:
+            self.logs_completos = df
+            # logs_data (para exibição) compartilha os dados: a interface só acrescenta colunas derivadas
+            self.logs_data = df.copy(deep=False)
+            self.versao_dados += 1
+    
+    def acrescentar_logs_memoria(self, novos_logs):
+        """Acrescenta logs recém-lidos aos logs em memória"""
+        novos_df = compactar_logs(tabela_logs(novos_logs))
+        
+        with self.lock_memoria:
+            if self.logs_completos is None or self.logs_completos.empty:
+                logs_completos = novos_df
+            else:
+                logs_completos = concatenar_logs_compactos([novos_df, self.logs_completos])
+            
+            # Limitar quantidade de logs em memória (e descartar categorias que ficaram sem uso)
+            logs_completos = compactar_logs(logs_completos.head(self.max_logs_memoria))
+            
+            # Ordenar por data e hora
+            self.logs_completos = logs_completos.sort_values(by=["data", "hora"], ascending=False)
+            
+            # Atualizar logs_data (para exibição), compartilhando os dados
+            self.logs_data = self.logs_completos.copy(deep=False)
+            self.versao_dados += 1
+    
+    def relatorio_memoria(self):
+        """Memória dos logs em memória por coluna, mais o total e a média por log"""
+        with self.lock_memoria:
+            logs = self.logs_completos
+            colunas = memoria_logs(logs)
+        total = sum(coluna["bytes"] for coluna in colunas.values())
+        return {"logs": 0 if logs is None else len(logs), "limite": self.max_logs_memoria, "bytes": total,
+                "bytes_por_log": round(total / len(logs), 1) if colunas else 0, "colunas": colunas}
+
+    def dados_dashboard(self, top_usuarios=5, ultimos=5):
+        """Agregados exibidos pelo dashboard: resumo, top usuários, acessos por hora e últimos acessos"""
+        with self.lock_memoria:
+            logs = self.logs_data
+        if logs is None:
+            return None
+
+        # Acessos de hoje vêm do rollup diário (inclui logs além do limite em memória)
+        hoje = datetime.datetime.now().strftime("%Y-%m-%d")
+        inicio, fim = intervalo_dia_ms(hoje)
+        rollup_hoje = self.consultar_rollups('total', inicio, fim, granularidade='dia')
+        if rollup_hoje is not None and not rollup_hoje.empty:
+            acessos_hoje = int(rollup_hoje['total'].sum())
+        else:
+            acessos_hoje = int((logs['data'] == hoje).sum())
+
+        # Hora do dia calculada uma vez por valor distinto de 'hora' (categorias) e contada pelos códigos
+        if isinstance(logs['hora'].dtype, pd.CategoricalDtype):
+            codigos, valores = logs['hora'].cat.codes.to_numpy(), logs['hora'].cat.categories
+        else:
+            codigos, valores = pd.factorize(logs['hora'])
+        acessos_por_hora = np.bincount(hora_do_dia(valores)[codigos[codigos >= 0]], minlength=25)[:24]
+
+        return {
+            "total_acessos": len(logs),
+            "total_usuarios": logs['usuario'].nunique(),
+            "total_ips": logs['ip'].nunique(),
+            "total_urls": logs['url'].nunique(),
+            "acessos_hoje": acessos_hoje,
+            "top_usuarios": logs['usuario'].value_counts().head(top_usuarios),
+            "acessos_por_hora": pd.Series(acessos_por_hora, index=range(24)),
+            "ultimos": logs.head(ultimos),
+        }
+
+    def inicializar_db(self):
+        """Inicializa o banco de dados SQLite para cache de logs"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Modo WAL: leitores não bloqueiam o gravador (necessário para a migração online)
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
+            # Criar tabela de logs se não existir
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                data TEXT,
+                hora TEXT,
+                nivel TEXT,
+                categoria TEXT,
+                servidor TEXT,
+                thread TEXT,
+                mensagem TEXT,
+                usuario TEXT,
+                ip TEXT,
+                url TEXT,
+                operacao TEXT,
+                status TEXT,
+                timestamp TEXT,
+                ts_evento INTEGER,
+                nivel_id INTEGER,
+                status_id INTEGER,
+                operacao_id INTEGER,
+                servidor_id INTEGER
+            )
+            ''')
+            
+            # Criar tabela de configurações se não existir
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS configuracoes (
+                chave TEXT PRIMARY KEY,
+                valor TEXT
+            )
+            ''')
+            
+            # Criar tabela de alertas se não existir
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alertas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tipo TEXT,
+                nivel TEXT,
+                usuario TEXT,
+                ip TEXT,
+                url TEXT,
+                data TEXT,
+                hora TEXT,
+                mensagem TEXT,
+                detalhes TEXT,
+                timestamp TEXT,
+                lido INTEGER DEFAULT 0
+            )
+            ''')
+            
+            # Criar catálogo das partições diárias (arquivos SQLite ou Parquet)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS particoes (
+                caminho TEXT PRIMARY KEY,
+                dia TEXT,
+                formato TEXT,
+                linhas INTEGER,
+                ts_min INTEGER,
+                ts_max INTEGER,
+                atualizada_em TEXT
+            )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_particoes_dia ON particoes (dia)')
+            
+            # Criar tabela do índice esparso tempo -> byte dos arquivos de log (cargas por intervalo)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS indice_tempo (
+                arquivo TEXT PRIMARY KEY,
+                inode INTEGER,
+                tamanho INTEGER,
+                assinatura TEXT,
+                pontos TEXT
+            )
+            ''')
+            
+            # Criar tabela de estado do daemon (heartbeat lido pela interface em modo cliente)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS estado_daemon (
+                chave TEXT PRIMARY KEY,
+                valor TEXT
+            )
+            ''')
+            
+            # Criar tabela de agregados diários dos relatórios (válidos enquanto a marca d'água do dia não muda)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS relatorios_cache (
+                tipo TEXT NOT NULL,
+                dia TEXT NOT NULL,
+                marca TEXT NOT NULL,
+                gerado_em TEXT NOT NULL,
+                linhas TEXT NOT NULL,
+                PRIMARY KEY (tipo, dia)
+            )
+            ''')
+            
+            # Criar índices para melhorar performance
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_data ON logs (data)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_usuario ON logs (usuario)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_ip ON logs (ip)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_url ON logs (url)')
+
+            conn.commit()
+
+            # Criar tabelas de rollup usadas pelos relatórios e pelo dashboard
+            criar_tabelas_rollup(conn)
+
+            # Criar índice de texto completo sobre as mensagens
+            self.inicializar_fts(conn)
+
+            # Colunas tipadas: criadas na hora, preenchidas em segundo plano para bancos existentes
+            preparar_schema_tipado(conn)
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= VERSAO_SCHEMA:
+                self.faixa_chaves_legado = carregar_faixa_chaves_legado(conn)
+                self.schema_tipado = True
+            else:
+                threading.Thread(target=self.migrar_schema_em_segundo_plano, daemon=True).start()
+
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao inicializar banco de dados: {str(e)}")
+
+    def migrar_schema_em_segundo_plano(self):
+        """Executa a migração online do schema da tabela logs em uma thread separada"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            inicio = time.time()
+            schema_tipado = migrar_schema_logs(conn)
+            self.faixa_chaves_legado = carregar_faixa_chaves_legado(conn)
+            self.schema_tipado = schema_tipado
+            conn.close()
+            print(f"Migração do banco de dados concluída em {time.time() - inicio:.1f}s")
+        except Exception as e:
+            print(f"Erro ao migrar banco de dados: {str(e)}")
+
+    def inicializar_fts(self, conn):
+        """Cria o índice FTS5 sobre a tabela de logs e os gatilhos que o mantêm sincronizado"""
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='logs_fts'")
+            fts_existente = cursor.fetchone() is not None
+
+            # Tabela de conteúdo externo: o texto fica apenas em logs, o índice guarda só os tokens
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+                mensagem, usuario, ip, url,
+                content='logs',
+                content_rowid='id',
+                tokenize="unicode61 tokenchars '._-@'"
+            )
+            ''')
+
+            # Gatilhos para manter o índice sincronizado com a ingestão
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+                INSERT INTO logs_fts (rowid, mensagem, usuario, ip, url)
+                VALUES (new.id, new.mensagem, new.usuario, new.ip, new.url);
+            END
+            ''')
+
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+                INSERT INTO logs_fts (logs_fts, rowid, mensagem, usuario, ip, url)
+                VALUES ('delete', old.id, old.mensagem, old.usuario, old.ip, old.url);
+            END
+            ''')
+
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logs_fts_update AFTER UPDATE OF mensagem, usuario, ip, url ON logs BEGIN
+                INSERT INTO logs_fts (logs_fts, rowid, mensagem, usuario, ip, url)
+                VALUES ('delete', old.id, old.mensagem, old.usuario, old.ip, old.url);
+                INSERT INTO logs_fts (rowid, mensagem, usuario, ip, url)
+                VALUES (new.id, new.mensagem, new.usuario, new.ip, new.url);
+            END
+            ''')
+
+            # Bancos criados antes do índice: indexar os logs já existentes
+            if not fts_existente:
+                cursor.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+
+            conn.commit()
+            self.fts_disponivel = True
+        except sqlite3.OperationalError as e:
+            # SQLite compilado sem FTS5: as buscas usam LIKE como alternativa
+            print(f"Índice de texto completo indisponível: {str(e)}")
+            self.fts_disponivel = False
+            return
+
+        self.inicializar_trigrama(conn)
+
+    def inicializar_trigrama(self, conn):
+        """Cria o índice trigrama de usuário, IP e URL no banco principal e os gatilhos que o sincronizam"""
+        cursor = conn.cursor()
+        trigrama_existente = indice_trigrama_disponivel(conn)
+        if not criar_indice_trigrama(conn):
+            print("Índice trigrama indisponível (SQLite anterior à 3.34): filtros de usuário, IP e URL usam LIKE")
+            return
+
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_trigrama_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO logs_trigrama (rowid, usuario, ip, url) VALUES (new.id, new.usuario, new.ip, new.url);
+        END
+        ''')
+
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_trigrama_delete AFTER DELETE ON logs BEGIN
+            INSERT INTO logs_trigrama (logs_trigrama, rowid, usuario, ip, url)
+            VALUES ('delete', old.id, old.usuario, old.ip, old.url);
+        END
+        ''')
+
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_trigrama_update AFTER UPDATE OF usuario, ip, url ON logs BEGIN
+            INSERT INTO logs_trigrama (logs_trigrama, rowid, usuario, ip, url)
+            VALUES ('delete', old.id, old.usuario, old.ip, old.url);
+            INSERT INTO logs_trigrama (rowid, usuario, ip, url) VALUES (new.id, new.usuario, new.ip, new.url);
+        END
+        ''')
+
+        # Bancos criados antes do índice: indexar os logs já existentes
+        if not trigrama_existente:
+            cursor.execute("INSERT INTO logs_trigrama (logs_trigrama) VALUES ('rebuild')")
+
+        conn.commit()
+    
+    def carregar_dados_logs(self, caminho=None, inicio=None, fim=None):
+        """Carrega dados de logs de um arquivo ou diretório, opcionalmente só do intervalo [inicio, fim]
+
+        inicio/fim aceitam datetime, 'YYYY-MM-DD[ HH:MM[:SS]]' ou epoch ms.
+        """
+        ts_inicio = converter_para_ts(inicio)
+        ts_fim = converter_para_ts(fim, fim=True)
+        
+        if not caminho and self.caminho_logs:
+            caminho = self.caminho_logs
+        
+        if not caminho:
+            self.notificar("erro", "Erro", "Caminho de logs não especificado.")
+            return False
+        
+        try:
+            if os.path.isdir(caminho):
+                # Carregar logs de um diretório
+                return self.carregar_logs_diretorio(caminho, ts_inicio, ts_fim)
+            else:
+                # Carregar logs de um arquivo
+                return self.carregar_logs_arquivo(caminho, ts_inicio, ts_fim)
+        except Exception as e:
+            self.notificar("erro", "Erro", f"Erro ao carregar logs: {str(e)}")
+            return False
+    
+    def carregar_logs_diretorio(self, diretorio, ts_inicio=None, ts_fim=None):
+        """Carrega logs dos arquivos .log (e rotacionados .gz/.bz2/.xz) mais recentes de um diretório"""
+        arquivos_log = [os.path.join(diretorio, f) for f in os.listdir(diretorio) if eh_arquivo_log(f)]
+        
+        if not arquivos_log:
+            self.notificar("aviso", "Aviso", f"Nenhum arquivo de log (.log, .gz, .bz2, .xz) encontrado no diretório: {diretorio}")
+            return False
+        
+        if ts_inicio is not None or ts_fim is not None:
+            return self.carregar_logs_diretorio_intervalo(arquivos_log, ts_inicio, ts_fim)
+        
+        # Ordenar arquivos por data de modificação (mais recentes primeiro)
+        arquivos_log.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        
+        # Limitar a quantidade de arquivos para não sobrecarregar a memória
+        max_arquivos = 5
+        if len(arquivos_log) > max_arquivos:
+            arquivos_log = arquivos_log[:max_arquivos]
+        
+        # Processar os arquivos em paralelo (descompressão e parse em processos de trabalho)
+        logs_combinados = juntar_logs(logs for _, logs in self.processar_arquivos_paralelo(arquivos_log))
+        
+        if not len(logs_combinados):
+            self.notificar("aviso", "Aviso", "Nenhum log válido encontrado nos arquivos.")
+            return False
+        
+        # Converter para DataFrame e atualizar os logs em memória
+        self.substituir_logs_memoria(logs_combinados)
+        
+        # Salvar logs no banco de dados para cache
+        self.salvar_logs_db(logs_combinados)
+        
+        return True
+    
+    def carregar_logs_diretorio_intervalo(self, arquivos_log, ts_inicio, ts_fim):
+        """Carrega de vários arquivos só os logs do intervalo (cada arquivo vai direto ao trecho certo)"""
+        # Arquivo modificado pela última vez antes do início do intervalo: todas as linhas são anteriores
+        logs_combinados = juntar_logs(
+            self.processar_arquivo_log(arquivo, ts_inicio, ts_fim) for arquivo in arquivos_log
+            if ts_inicio is None or os.path.getmtime(arquivo) * 1000 >= ts_inicio - FOLGA_BUSCA_TEMPO_MS)
+        
+        if not len(logs_combinados):
+            self.notificar("aviso", "Aviso", "Nenhum log encontrado no intervalo informado.")
+            return False
+        
+        # Converter para DataFrame e atualizar os logs em memória
+        self.substituir_logs_memoria(logs_combinados)
+        
+        # Salvar logs no banco de dados para cache
+        self.salvar_logs_db(logs_combinados)
+        
+        return True
+    
+    def carregar_logs_arquivo(self, arquivo, ts_inicio=None, ts_fim=None):
+        """Carrega logs de um único arquivo (opcionalmente só do intervalo [ts_inicio, ts_fim])"""
+        try:
+            logs = self.processar_arquivo_log(arquivo, ts_inicio, ts_fim)
+            
+            if not len(logs):
+                self.notificar("aviso", "Aviso", "Nenhum log válido encontrado no arquivo.")
+                return False
+            
+            # Converter para DataFrame e atualizar os logs em memória
+            self.substituir_logs_memoria(logs)
+            
+            # Salvar logs no banco de dados para cache
+            self.salvar_logs_db(logs)
+            
+            return True
+        
+        except Exception as e:
+            self.notificar("erro", "Erro", f"Erro ao carregar arquivo de log: {str(e)}")
+            return False
+    
+    def salvar_logs_db(self, logs):
+        """Salva logs no banco de dados SQLite para cache"""
+        inicio = time.perf_counter()
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Adicionar timestamp atual
+            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Preparar dados para inserção (colunas textuais + colunas tipadas)
+            logs = registros_logs(logs)
+            registros = []
+            for log in logs:
+                log['timestamp'] = timestamp
+                
+                ts_evento = log.get('ts_evento')
+                if ts_evento is None:
+                    ts_evento = calcular_ts_evento(log.get('data', ''), log.get('hora', ''))
+                
+                registros.append((
+                    log.get('data', ''),
+                    log.get('hora', ''),
+                    log.get('nivel', ''),
+                    log.get('categoria', ''),
+                    log.get('servidor', ''),
+                    log.get('thread', ''),
+                    log.get('mensagem', ''),
+                    log.get('usuario', ''),
+                    log.get('ip', ''),
+                    log.get('url', ''),
+                    log.get('operacao', ''),
+                    log.get('status', ''),
+                    log.get('timestamp', ''),
+                    ts_evento,
+                    self.dicionario.codificar(cursor, 'nivel', log.get('nivel', '')),
+                    self.dicionario.codificar(cursor, 'status', log.get('status', '')),
+                    self.dicionario.codificar(cursor, 'operacao', log.get('operacao', '')),
+                    self.dicionario.codificar(cursor, 'servidor', log.get('servidor', '')),
+                    calcular_chave_dedup(log) if log.get('chave_dedup') is None else int(log['chave_dedup'])
+                ))
+                log['ts_evento'] = ts_evento
+            
+            # Linhas de dias migrados da versão anterior (chave_dedup_legado): a recarga é reconhecida pela
+            # chave legada, numerada pela ocorrência dos mesmos campos no lote como na migração
+            legados = [None] * len(registros)
+            if self.faixa_chaves_legado:
+                ts_min, ts_max = self.faixa_chaves_legado
+                ocorrencias = Counter()
+                for i, (registro, log) in enumerate(zip(registros, logs)):
+                    # Linhas antigas não têm milissegundos: ts_evento delas é o início do segundo
+                    if registro[13] is not None and ts_min <= registro[13] - registro[13] % 1000 <= ts_max:
+                        base = calcular_chave_dedup(log)
+                        legados[i] = chave_dedup_legado(log, ocorrencias[base])
+                        ocorrencias[base] += 1
+            
+            # Descartar linhas já gravadas (recargas) para que os rollups contem cada linha uma única vez
+            existentes = set()
+            chaves = [registro[-1] for registro in registros] + [chave for chave in legados if chave is not None]
+            for i in range(0, len(chaves), 500):
+                lote = chaves[i:i + 500]
+                cursor.execute(f"SELECT chave_dedup FROM logs WHERE chave_dedup IN ({','.join('?' * len(lote))})", lote)
+                existentes.update(chave for (chave,) in cursor.fetchall())
+            
+            # Dias já selados em partições (recarga de arquivos antigos): as chaves também são procuradas nelas,
+            # por uma conexão de leitura (ATTACH não é permitido na transação aberta pelo dicionário)
+            tss = [registro[13] for registro in registros if registro[13] is not None]
+            if tss:
+                cursor.execute("SELECT caminho, formato FROM particoes WHERE ts_max >= ? AND ts_min <= ?",
+                               (min(tss), max(tss)))
+                particoes = cursor.fetchall()
+                if particoes:
+                    with self.pool_leitura.conexao() as leitura:
+                        for caminho, formato in particoes:
+                            existentes.update(chaves_dedup_em_particao(leitura, caminho, formato, chaves))
+            
+            novos_registros = []
+            novos_logs = []
+            for registro, log, legado in zip(registros, logs, legados):
+                if registro[-1] not in existentes and legado not in existentes:
+                    existentes.add(registro[-1])
+                    novos_registros.append(registro)
+                    novos_logs.append(log)
+            
+            # Inserir no banco de dados (a chave de deduplicação continua protegendo contra gravações concorrentes)
+            cursor.executemany('''
+            INSERT OR IGNORE INTO logs (data, hora, nivel, categoria, servidor, thread, mensagem, usuario, ip, url, operacao, status,
+                                        timestamp, ts_evento, nivel_id, status_id, operacao_id, servidor_id, chave_dedup)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', novos_registros)
+            
+            # Atualizar os rollups de minuto/hora/dia na mesma transação
+            atualizar_rollups(cursor, novos_logs)
+            
+            with self.lock_indice_urls:
+                conn.commit()
+                self.indice_urls.adicionar(novos_logs)
+            conn.close()
+            self.metricas.observar("banco", time.perf_counter() - inicio)
+            self.metricas.incrementar("logs_gravados", len(novos_registros))
+        except Exception as e:
+            self.metricas.incrementar("erros", etapa="banco")
+            print(f"Erro ao salvar logs no banco de dados: {str(e)}")
+    
+    def carregar_indice_urls(self):
+        """Recria o índice de URLs a partir dos logs do banco principal (dias ainda não particionados)"""
+        try:
+            conn = conectar_leitura(self.db_path)
+            # Gravações posteriores à troca vão para o índice novo; as anteriores, pela leitura até ultimo_id
+            with self.lock_indice_urls:
+                indice = self.indice_urls = IndiceURLs()
+                ultimo_id = self.id_indice_urls = conn.execute("SELECT COALESCE(MAX(id), 0) FROM logs").fetchone()[0]
+            indexar_urls_do_banco(conn, indice, ate_id=ultimo_id)
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao carregar índice de URLs: {str(e)}")
+
+    def estatisticas_url(self, prefixo="/"):
+        """Acessos, falhas, usuários distintos e latência de um caminho e tudo abaixo dele ("/api/admin/*")"""
+        return self.indice_urls.estatisticas(prefixo)
+
+    def detalhar_urls(self, prefixo="/", limite=50):
+        """Subcaminhos imediatos do prefixo com as estatísticas de cada um (drill-down)"""
+        return pd.DataFrame(self.indice_urls.detalhar(prefixo, limite), columns=COLUNAS_ESTATISTICAS_URL)
+
+    def top_urls(self, limite=10, prefixo="/", criterio="acessos"):
+        """Caminhos exatos com mais acessos (ou falhas, criterio="falhas") sob o prefixo"""
+        return pd.DataFrame(self.indice_urls.top(limite, prefixo, criterio), columns=COLUNAS_ESTATISTICAS_URL)
+
+    def carregar_logs_db(self, filtros=None, limite=1000):
+        """Carrega logs do banco de dados SQLite com filtros opcionais
+
+        Resultados repetidos (mesmos filtros, banco sem gravações desde a
+        consulta anterior) vêm do cache em memória.
+        """
+        try:
+            marca = self.pool_leitura.marca_dagua()
+            chave = ("logs", normalizar_filtros(filtros), limite, self.schema_tipado, self.fts_disponivel)
+            encontrado, df = self.cache_consultas.obter(marca, chave)
+            self.metricas.incrementar("consultas", resultado="acerto" if encontrado else "falha")
+            if not encontrado:
+                with self.pool_leitura.conexao() as conn:
+                    df = self.consultar_logs_db(conn, filtros, limite)
+                self.cache_consultas.guardar(marca, chave, df, 0 if df is None else len(df))
+            
+            # Cópia: quem chama pode alterar o DataFrame sem afetar o cache
+            return None if df is None else df.copy()
+        
+        except Exception as e:
+            print(f"Erro ao carregar logs do banco de dados: {str(e)}")
+            return None
+
+    def consultar_logs_db(self, conn, filtros, limite):
+        """Executa a consulta de carregar_logs_db no banco principal e nas partições do intervalo"""
+        # Partições diárias que intersectam o intervalo dos filtros (as demais são ignoradas)
+        ts_inicio, ts_fim = intervalo_filtros(filtros)
+        particoes = self.particoes_no_intervalo(conn, ts_inicio, ts_fim) if self.schema_tipado else []
+        
+        # Cada origem devolve suas `limite` linhas mais recentes: linhas antigas recarregadas no banco principal
+        # e dias ainda não selados se sobrepõem às partições, então nenhuma origem pode ser pulada
+        resultados = []
+        for caminho in [None] + particoes:
+            with anexar_particao(conn, caminho) as esquema:
+                # Construir consulta SQL com filtros
+                query, params = montar_consulta_logs(filtros, limite,
+                                                     schema_tipado=self.schema_tipado,
+                                                     fts_disponivel=self.fts_disponivel,
+                                                     esquema=esquema,
+                                                     trigrama_disponivel=indice_trigrama_disponivel(conn, esquema))
+                
+                # Executar consulta
+                df = pd.read_sql_query(query, conn, params=params)
+            
+            if not df.empty:
+                resultados.append(df)
+        
+        if not resultados:
+            return None
+        
+        df = pd.concat(resultados, ignore_index=True)
+        if self.schema_tipado:
+            df = df.sort_values(by="ts_evento", ascending=False, kind="stable").head(limite).reset_index(drop=True)
+        
+        return df
+
+    def buscar_logs(self, consulta, filtros=None, pagina=1, por_pagina=50):
+        """Busca textual nos logs usando o índice FTS5, com ranking por relevância e paginação
+
+        A busca abrange o banco principal e as partições diárias do intervalo
+        filtrado (todas, se não houver filtro de data). Retorna uma tupla
+        (DataFrame com a página solicitada, total de resultados); a coluna
+        relevancia traz o BM25 normalizado pela origem (-1 é o melhor resultado
+        de cada origem; menor é mais relevante).
+        """
+        expressao = montar_consulta_fts(consulta)
+        if not expressao or not self.fts_disponivel:
+            return None, 0
+
+        try:
+            pagina = max(1, int(pagina))
+            marca = self.pool_leitura.marca_dagua()
+            chave = ("busca", expressao, normalizar_filtros(filtros), pagina, por_pagina, self.schema_tipado)
+            encontrado, resultado = self.cache_consultas.obter(marca, chave)
+            self.metricas.incrementar("consultas", resultado="acerto" if encontrado else "falha")
+            if not encontrado:
+                with self.pool_leitura.conexao() as conn:
+                    resultado = self.consultar_busca(conn, expressao, filtros, pagina, por_pagina)
+                self.cache_consultas.guardar(marca, chave, resultado, len(resultado[0]))
+
+            df, total = resultado
+            return df.copy(), total
+
+        except Exception as e:
+            print(f"Erro ao buscar logs: {str(e)}")
+            return None, 0
+
+    def consultar_busca(self, conn, expressao, filtros, pagina, por_pagina):
+        """Executa a busca FTS5 de buscar_logs no banco principal e nas partições do intervalo"""
+        where_clauses = ["logs_fts MATCH ?"]
+        params = [expressao]
+
+        ts_inicio, ts_fim = intervalo_filtros(filtros)
+        if filtros:
+            if self.schema_tipado:
+                # O intervalo (data ou ts_inicio/ts_fim) também filtra as linhas, não só as partições:
+                # o banco principal e as partições das bordas têm linhas fora dele
+                if ts_inicio is not None:
+                    where_clauses.append("logs.ts_evento >= ?")
+                    params.append(ts_inicio)
+                if ts_fim is not None:
+                    where_clauses.append("logs.ts_evento < ?")
+                    params.append(ts_fim)
+            elif 'data' in filtros and filtros['data']:
+                where_clauses.append("logs.data = ?")
+                params.append(filtros['data'])
+
+            if 'nivel' in filtros and filtros['nivel'] and filtros['nivel'] != "TODOS":
+                where_clauses.append("logs.nivel = ?")
+                params.append(filtros['nivel'])
+
+            if 'status' in filtros and filtros['status'] and filtros['status'] != "TODOS":
+                where_clauses.append("logs.status = ?")
+                params.append(filtros['status'])
+
+        where = " WHERE " + " AND ".join(where_clauses)
+
+        particoes = self.particoes_no_intervalo(conn, ts_inicio, ts_fim) if self.schema_tipado else []
+
+        ordem = "logs.ts_evento DESC" if self.schema_tipado else "logs.data DESC, logs.hora DESC"
+
+        resultados = []
+        total = 0
+        cursor = conn.cursor()
+        for caminho in [None] + particoes:
+            with anexar_particao(conn, caminho) as esquema:
+                origem = f"FROM {esquema}.logs_fts JOIN {esquema}.logs AS logs ON logs.id = logs_fts.rowid{where}"
+
+                # Total de resultados para a paginação
+                cursor.execute(f"SELECT COUNT(*) {origem}", params)
+                total += cursor.fetchone()[0]
+
+                # Usuário, IP e URL pesam mais que a mensagem no ranking BM25;
+                # cada origem contribui com no máximo as linhas até o fim da página pedida
+                query = (
+                    f"SELECT logs.*, bm25(logs_fts, 1.0, 2.0, 2.0, 2.0) AS relevancia {origem} "
+                    f"ORDER BY relevancia, {ordem} LIMIT ?"
+                )
+                df = pd.read_sql_query(query, conn, params=params + [pagina * por_pagina])
+
+            # O BM25 (negativo, menor é melhor) usa as estatísticas do índice FTS de cada origem e não é
+            # comparável entre partições: dividido pelo melhor resultado da origem, fica em [-1, 0) em todas
+            if not df.empty:
+                melhor = abs(df["relevancia"].iloc[0])
+                if melhor > 0:
+                    df["relevancia"] = df["relevancia"] / melhor
+                resultados.append(df)
+
+        if not resultados:
+            return pd.DataFrame(), total
+
+        df = pd.concat(resultados, ignore_index=True)
+        if self.schema_tipado:
+            df = df.sort_values(by=["relevancia", "ts_evento"], ascending=[True, False], kind="stable")
+        else:
+            df = df.sort_values(by="relevancia", kind="stable")
+        df = df.iloc[(pagina - 1) * por_pagina:pagina * por_pagina].reset_index(drop=True)
+
+        return df, total
+
+    def consultar_rollups(self, dimensao, ts_inicio=None, ts_fim=None, granularidade=None, limite=None, serie=False):
+        """Consulta contagens pré-agregadas (usuário, IP, URL, nível, status, operação ou total)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            df = consultar_rollups(conn, dimensao, ts_inicio, ts_fim, granularidade, limite, serie)
+            conn.close()
+            return df
+        except Exception as e:
+            print(f"Erro ao consultar rollups: {str(e)}")
+            return None
+
+    def reconstruir_rollups(self, data_inicio=None, data_fim=None):
+        """Reconstrói os rollups a partir dos logs armazenados (datas YYYY-MM-DD, fim inclusivo)"""
+        try:
+            ts_inicio = intervalo_dia_ms(data_inicio)[0] if data_inicio else None
+            ts_fim = intervalo_dia_ms(data_fim)[1] if data_fim else None
+
+            conn = sqlite3.connect(self.db_path)
+            reconstruir_rollups(conn, ts_inicio, ts_fim)
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"Erro ao reconstruir rollups: {str(e)}")
+            return False
+
+    def diretorio_particoes(self):
+        """Retorna o diretório das partições diárias, relativo ao banco principal"""
+        diretorio = self.armazenamento_config.get('diretorio_particoes', 'particoes')
+        if not os.path.isabs(diretorio):
+            diretorio = os.path.join(os.path.dirname(os.path.abspath(self.db_path)), diretorio)
+        return diretorio
+
+    def diretorio_arquivo_parquet(self):
+        """Retorna o diretório do arquivo histórico em Parquet (partições arquivadas)"""
+        return os.path.join(self.diretorio_particoes(), "parquet")
+
+    def exportar_parquet(self, destino, data_inicio=None, data_fim=None):
+        """Exporta os logs para Parquet particionado por dia (datas YYYY-MM-DD, fim inclusivo)"""
+        try:
+            ts_inicio = intervalo_dia_ms(data_inicio)[0] if data_inicio else None
+            ts_fim = intervalo_dia_ms(data_fim)[1] if data_fim else None
+
+            conn = sqlite3.connect(self.db_path)
+            total = exportar_logs_parquet(conn, destino, ts_inicio, ts_fim)
+            conn.close()
+            return total
+        except ImportError:
+            print("Exportação para Parquet indisponível: instale o pacote pyarrow")
+            return 0
+        except Exception as e:
+            print(f"Erro ao exportar logs para Parquet: {str(e)}")
+            return 0
+
+    def exportar_logs(self, destino, formato=None, filtros=None):
+        """Inicia em segundo plano a exportação em streaming dos logs filtrados (CSV ou NDJSON, .gz opcional)
+
+        Aceita os mesmos filtros de carregar_logs_db e retorna a
+        TarefaExportacao (progresso, cancelar, aguardar), ou None se o
+        formato for inválido.
+        """
+        try:
+            formato, _ = formato_exportacao(destino, formato)
+        except ValueError as e:
+            print(f"Erro ao exportar logs: {str(e)}")
+            return None
+
+        def executar(progresso, cancelar):
+            with self.pool_leitura.conexao() as conn:
+                return exportar_logs_streaming(conn, destino, formato, filtros,
+                                               schema_tipado=self.schema_tipado,
+                                               fts_disponivel=self.fts_disponivel,
+                                               progresso=progresso, cancelar=cancelar)
+
+        tarefa = TarefaExportacao(destino, executar)
+        self.exportacoes = self.exportacoes[-19:] + [tarefa]
+        return tarefa.iniciar()
+
+    def gerar_relatorio(self, tipo, data_inicio, data_fim=None, processos=None):
+        """Inicia em segundo plano um relatório agregado por dia (datas YYYY-MM-DD, fim inclusivo)
+
+        Os dias são agregados em processos de trabalho direto no SQLite
+        (banco principal e partições). Dias cuja marca d'água não mudou desde
+        a última geração vêm de relatorios_cache, então reabrir um relatório
+        é instantâneo. Retorna a TarefaRelatorio (resultado parcial,
+        progresso, cancelar), ou None se o tipo ou as datas forem inválidos.
+        """
+        try:
+            if tipo not in TIPOS_RELATORIO:
+                raise ValueError(f"Tipo de relatório desconhecido: {tipo}")
+            dias = dias_do_intervalo(data_inicio, data_fim)
+        except ValueError as e:
+            print(f"Erro ao gerar relatório: {str(e)}")
+            return None
+
+        processos = processos or self.relatorios_config.get('processos')
+
+        def executar(progresso, cancelar):
+            # Os agregados dependem de ts_evento: aguardar o fim da migração do schema
+            while not self.schema_tipado:
+                if cancelar.wait(1.0):
+                    return None
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                marcas = marcas_relatorio(conn, dias)
+                em_cache = self.relatorios_em_cache(conn, tipo, marcas)
+            finally:
+                conn.close()
+
+            pendentes = []
+            for dia in dias:
+                if dia[0] in em_cache:
+                    tarefa.acumular(em_cache[dia[0]])
+                    tarefa.dias_em_cache += 1
+                else:
+                    pendentes.append(dia)
+            feitos = tarefa.dias_em_cache
+            progresso(feitos, len(dias))
+
+            novos = {}
+            try:
+                for dia, linhas in self.agregar_dias_paralelo(tipo, pendentes, processos, cancelar):
+                    tarefa.acumular(linhas)
+                    novos[dia] = linhas
+                    feitos += 1
+                    progresso(feitos, len(dias))
+            finally:
+                # Dias concluídos ficam no cache mesmo se o relatório for cancelado
+                self.guardar_relatorios_cache(tipo, novos, marcas)
+
+            return None if cancelar.is_set() else feitos
+
+        tarefa = TarefaRelatorio(tipo, dias[0][0], dias[-1][0], executar)
+        self.relatorios = self.relatorios[-19:] + [tarefa]
+        return tarefa.iniciar()
+
+    def agregar_dias_paralelo(self, tipo, dias, processos=None, cancelar=None):
+        """Agrega os dias do relatório em processos de trabalho; gera (dia, linhas) conforme terminam"""
+        processos = min(processos or os.cpu_count() or 1, len(dias))
+        if processos <= 1:
+            for dia, ts_inicio, ts_fim in dias:
+                if cancelar is not None and cancelar.is_set():
+                    return
+                yield dia, agregar_relatorio_dia(self.db_path, tipo, ts_inicio, ts_fim)
+            return
+
+        # spawn: o processo principal tem threads (coletor, manutenção) e fork não é seguro com elas
+        contexto = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=processos, mp_context=contexto)
+        try:
+            futuros = {executor.submit(agregar_relatorio_dia, self.db_path, tipo, ts_inicio, ts_fim): dia
+                       for dia, ts_inicio, ts_fim in dias}
+            for futuro in as_completed(futuros):
+                if cancelar is not None and cancelar.is_set():
+                    return
+                yield futuros[futuro], futuro.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def relatorios_em_cache(self, conn, tipo, marcas):
+        """Agregados diários do cache cuja marca d'água ainda é a atual"""
+        em_cache = {}
+        dias = list(marcas)
+        for i in range(0, len(dias), 500):
+            lote = dias[i:i + 500]
+            cursor = conn.execute(
+                f"SELECT dia, marca, linhas FROM relatorios_cache WHERE tipo = ? AND dia IN ({','.join('?' * len(lote))})",
+                [tipo] + lote)
+            for dia, marca, linhas in cursor:
+                if marca == marcas[dia]:
+                    em_cache[dia] = json.loads(linhas)
+        return em_cache
+
+    def guardar_relatorios_cache(self, tipo, agregados, marcas):
+        """Grava os agregados diários no cache, descartando os mais antigos acima de max_cache_dias"""
+        if not agregados:
+            return
+
+        try:
+            gerado_em = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(
+                "INSERT OR REPLACE INTO relatorios_cache (tipo, dia, marca, gerado_em, linhas) VALUES (?, ?, ?, ?, ?)",
+                [(tipo, dia, marcas[dia], gerado_em, json.dumps(linhas)) for dia, linhas in agregados.items()])
+            conn.execute(
+                "DELETE FROM relatorios_cache WHERE rowid IN "
+                "(SELECT rowid FROM relatorios_cache ORDER BY gerado_em DESC LIMIT -1 OFFSET ?)",
+                (int(self.relatorios_config.get('max_cache_dias', 2000)),))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao gravar cache de relatórios: {str(e)}")
+
+    def gerar_relatorios_agendados(self):
+        """Gera os relatórios agendados do dia anterior após hora_agendamento (dias já em cache são ignorados)"""
+        agora = datetime.datetime.now()
+        if agora.hour < int(self.relatorios_config.get('hora_agendamento', 2)):
+            return
+
+        ontem = (agora - datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        for tipo in self.relatorios_config.get('agendados', []):
+            if self.evento_parar_manutencao.is_set():
+                break
+            tarefa = self.gerar_relatorio(tipo, ontem)
+            if tarefa:
+                tarefa.aguardar()
+
+    def carregar_logs_historico(self, colunas=None, data_inicio=None, data_fim=None, filtros=None, origem=None):
+        """Carrega logs históricos do Parquet (arquivo de partições ou uma exportação) só com as colunas pedidas"""
+        try:
+            origem = origem or self.diretorio_arquivo_parquet()
+            if not os.path.isdir(origem):
+                return None
+
+            ts_inicio = intervalo_dia_ms(data_inicio)[0] if data_inicio else None
+            ts_fim = intervalo_dia_ms(data_fim)[1] if data_fim else None
+
+            df = carregar_logs_parquet(origem, colunas, ts_inicio, ts_fim, filtros)
+            return df if not df.empty else None
+        except ImportError:
+            print("Leitura de Parquet indisponível: instale o pacote pyarrow")
+            return None
+        except Exception as e:
+            print(f"Erro ao carregar logs históricos: {str(e)}")
+            return None
+
+    def particoes_no_intervalo(self, conn, ts_inicio=None, ts_fim=None):
+        """Lista as partições SQLite que intersectam o intervalo, da mais recente para a mais antiga"""
+        return listar_particoes_sqlite(conn, ts_inicio, ts_fim)
+
+    def iniciar_manutencao(self):
+        """Inicia a thread de manutenção do armazenamento (particionamento, retenção e compactação)"""
+        if self.thread_manutencao and self.thread_manutencao.is_alive():
+            return
+
+        self.evento_parar_manutencao.clear()
+        self.thread_manutencao = threading.Thread(target=self.loop_manutencao, daemon=True)
+        self.thread_manutencao.start()
+
+    def parar_manutencao(self):
+        """Para a thread de manutenção do armazenamento"""
+        self.evento_parar_manutencao.set()
+
+        if self.thread_manutencao:
+            self.thread_manutencao.join(timeout=1.0)
+            self.thread_manutencao = None
+
+    def loop_manutencao(self):
+        """Função executada em uma thread separada para manter o armazenamento"""
+        # Aguardar a inicialização da interface antes da primeira execução
+        espera = 30
+
+        while not self.evento_parar_manutencao.wait(espera):
+            self.executar_manutencao()
+            espera = max(1, int(self.armazenamento_config.get('intervalo_manutencao_min', 60))) * 60
+
+    def executar_manutencao(self):
+        """Sela os dias antigos em partições, aplica a retenção, arquiva e compacta o banco"""
+        # As partições dependem de ts_evento: aguardar o fim da migração do schema
+        if not self.schema_tipado:
+            return
+
+        try:
+            self.selar_particoes()
+            self.indexar_trigrama_particoes()
+
+            if self.armazenamento_config.get('arquivar_parquet', False):
+                self.arquivar_particoes()
+
+            self.aplicar_retencao()
+
+            intervalo = float(self.armazenamento_config.get('intervalo_compactacao_horas', 24)) * 3600
+            if time.time() - self.ultima_compactacao >= intervalo:
+                self.compactar_db()
+            
+            self.gerar_relatorios_agendados()
+        except Exception as e:
+            print(f"Erro na manutenção do armazenamento: {str(e)}")
+
+    def selar_particoes(self, tamanho_lote=20000):
+        """Move os dias fora da janela quente do banco principal para arquivos de partição diários"""
+        hoje = datetime.datetime.now().strftime('%Y-%m-%d')
+        hoje_ms = intervalo_dia_ms(hoje)[0]
+        dias_quentes = int(self.armazenamento_config.get('dias_quentes', 7))
+        retencao_dias = int(self.armazenamento_config.get('retencao_dias', 90))
+        limite_quente = hoje_ms - dias_quentes * 86400000
+        limite_retencao = hoje_ms - retencao_dias * 86400000
+
+        os.makedirs(self.diretorio_particoes(), exist_ok=True)
+        colunas = ", ".join(COLUNAS_LOGS)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        while True:
+            cursor.execute("SELECT MIN(ts_evento) FROM logs WHERE ts_evento IS NOT NULL")
+            ts_minimo = cursor.fetchone()[0]
+            if ts_minimo is None or ts_minimo >= limite_quente:
+                break
+
+            dia = datetime.datetime.fromtimestamp(ts_minimo / 1000).strftime('%Y-%m-%d')
+            inicio, fim = intervalo_dia_ms(dia)
+
+            # Dias além da retenção (recargas de arquivos antigos) são descartados diretamente
+            if ts_minimo < limite_retencao:
+                cursor.execute("DELETE FROM logs WHERE ts_evento >= ? AND ts_evento < ?", (inicio, fim))
+                conn.commit()
+                continue
+
+            cursor.execute("SELECT caminho FROM particoes WHERE dia = ? AND formato = 'sqlite'", (dia,))
+            linha = cursor.fetchone()
+            caminho = linha[0] if linha else os.path.join(self.diretorio_particoes(), f"logs_{dia}.db")
+
+            conn.execute("ATTACH DATABASE ? AS particao", (caminho,))
+            try:
+                conn.execute("PRAGMA particao.journal_mode=WAL")
+                criar_schema_particao(conn, "particao")
+
+                # Cópia em lotes curtos para não bloquear a ingestão no banco principal
+                while True:
+                    cursor.execute('''
+                    SELECT MAX(id) FROM (
+                        SELECT id FROM logs WHERE ts_evento >= ? AND ts_evento < ? ORDER BY id LIMIT ?
+                    )
+                    ''', (inicio, fim, tamanho_lote))
+                    ate_id = cursor.fetchone()[0]
+                    if ate_id is None:
+                        break
+
+                    cursor.execute(f'''
+                    INSERT OR IGNORE INTO particao.logs ({colunas})
+                    SELECT {colunas} FROM main.logs WHERE ts_evento >= ? AND ts_evento < ? AND id <= ?
+                    ''', (inicio, fim, ate_id))
+                    cursor.execute("DELETE FROM main.logs WHERE ts_evento >= ? AND ts_evento < ? AND id <= ?",
+                                   (inicio, fim, ate_id))
+                    conn.commit()
+
+                cursor.execute("INSERT INTO particao.logs_fts (logs_fts) VALUES ('rebuild')")
+                if indice_trigrama_disponivel(conn, "particao"):
+                    cursor.execute("INSERT INTO particao.logs_trigrama (logs_trigrama) VALUES ('rebuild')")
+                cursor.execute("SELECT COUNT(*), MIN(ts_evento), MAX(ts_evento) FROM particao.logs")
+                linhas, ts_min, ts_max = cursor.fetchone()
+
+                cursor.execute('''
+                INSERT OR REPLACE INTO particoes (caminho, dia, formato, linhas, ts_min, ts_max, atualizada_em)
+                VALUES (?, ?, 'sqlite', ?, ?, ?, ?)
+                ''', (caminho, dia, linhas, ts_min, ts_max, datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                conn.commit()
+            finally:
+                conn.execute("DETACH DATABASE particao")
+
+            print(f"Partição {dia} selada com {linhas} logs")
+
+        conn.close()
+
+    def arquivar_particoes(self):
+        """Converte partições SQLite antigas em arquivos Parquet compactados"""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Arquivamento em Parquet indisponível: instale o pacote pyarrow")
+            return
+
+        hoje = datetime.datetime.now()
+        dias_arquivo = int(self.armazenamento_config.get('dias_arquivo', 30))
+        limite = (hoje - datetime.timedelta(days=dias_arquivo)).strftime('%Y-%m-%d')
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT caminho, dia FROM particoes WHERE formato = 'sqlite' AND dia < ? ORDER BY dia", (limite,))
+
+        for caminho, dia in cursor.fetchall():
+            # Mesmo layout da exportação (dia=YYYY-MM-DD), legível por carregar_logs_parquet
+            diretorio = os.path.join(self.diretorio_arquivo_parquet(), f"dia={dia}")
+            os.makedirs(diretorio, exist_ok=True)
+            destino = os.path.join(diretorio, "logs.parquet")
+            if os.path.exists(destino):
+                destino = os.path.join(diretorio, f"logs_{int(time.time())}.parquet")
+
+            conn_particao = sqlite3.connect(caminho)
+            linhas = conn_particao.execute(
+                f"SELECT {', '.join(COLUNAS_PARQUET)} FROM logs ORDER BY ts_evento").fetchall()
+            conn_particao.close()
+
+            tabela = tabela_arrow_logs(linhas)
+            pq.write_table(tabela, destino, compression="zstd", use_dictionary=True)
+
+            indice_ts = COLUNAS_PARQUET.index("ts_evento")
+            cursor.execute("DELETE FROM particoes WHERE caminho = ?", (caminho,))
+            cursor.execute('''
+            INSERT INTO particoes (caminho, dia, formato, linhas, ts_min, ts_max, atualizada_em)
+            VALUES (?, ?, 'parquet', ?, ?, ?, ?)
+            ''', (destino, dia, len(linhas),
+                  linhas[0][indice_ts] if linhas else None, linhas[-1][indice_ts] if linhas else None,
+                  datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            conn.commit()
+
+            self.remover_arquivo_particao(caminho)
+            print(f"Partição {dia} arquivada em {destino}")
+
+        conn.close()
+
+    def indexar_trigrama_particoes(self):
+        """Cria o índice trigrama nas partições SQLite seladas antes dele existir"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        for caminho in listar_particoes_sqlite(conn):
+            conn.execute("ATTACH DATABASE ? AS particao", (caminho,))
+            try:
+                if indice_trigrama_disponivel(conn, "particao") or not criar_indice_trigrama(conn, "particao"):
+                    continue
+                cursor.execute("INSERT INTO particao.logs_trigrama (logs_trigrama) VALUES ('rebuild')")
+                conn.commit()
+                print(f"Índice trigrama criado na partição {os.path.basename(caminho)}")
+            finally:
+                conn.execute("DETACH DATABASE particao")
+
+        conn.close()
+
+    def aplicar_retencao(self):
+        """Remove as partições (SQLite ou Parquet) mais antigas que a retenção configurada"""
+        retencao_dias = int(self.armazenamento_config.get('retencao_dias', 90))
+        limite = (datetime.datetime.now() - datetime.timedelta(days=retencao_dias)).strftime('%Y-%m-%d')
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT caminho, dia FROM particoes WHERE dia < ?", (limite,))
+
+        for caminho, dia in cursor.fetchall():
+            self.remover_arquivo_particao(caminho)
+            cursor.execute("DELETE FROM particoes WHERE caminho = ?", (caminho,))
+            conn.commit()
+            print(f"Partição {dia} removida pela política de retenção")
+
+        # Rollups: minuto e hora têm retenção própria, dia segue a retenção dos logs
+        agora_ms = int(time.time() * 1000)
+        retencoes = {
+            "minuto": int(self.armazenamento_config.get('retencao_rollup_minuto_dias', 7)),
+            "hora": int(self.armazenamento_config.get('retencao_rollup_hora_dias', 90)),
+            "dia": retencao_dias
+        }
+        for granularidade, dias in retencoes.items():
+            cursor.execute(f"DELETE FROM rollup_{granularidade} WHERE bucket < ?", (agora_ms - dias * 86400000,))
+        conn.commit()
+
+        conn.close()
+
+    def remover_arquivo_particao(self, caminho):
+        """Remove o arquivo de uma partição e seus arquivos auxiliares do WAL"""
+        for arquivo in (caminho, caminho + "-wal", caminho + "-shm"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+        # Diretório dia=YYYY-MM-DD de arquivos Parquet fica vazio após a remoção
+        diretorio = os.path.dirname(caminho)
+        if os.path.basename(diretorio).startswith("dia=") and not os.listdir(diretorio):
+            os.rmdir(diretorio)
+
+    def compactar_db(self):
+        """Compacta o banco principal (VACUUM) liberando o espaço dos dias movidos para partições"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA optimize")
+        conn.close()
+
+        self.ultima_compactacao = time.time()
+        self.salvar_configuracoes()
+
+    def processar_arquivo_log(self, arquivo, ts_inicio=None, ts_fim=None):
+        """Processa um arquivo de log do JBOSS (texto ou compactado) e extrai informações relevantes"""
+        if ts_inicio is not None or ts_fim is not None:
+            return self.processar_intervalo_arquivo(arquivo, ts_inicio, ts_fim)
+        
+        try:
+            # Leitura em streaming: mmap para texto, descompressão linha a linha para arquivos rotacionados
+            logs = self.parser.interpretar(iterar_linhas_log(arquivo, com_posicao=True))
+            
+            # Se não encontrou logs no formato esperado, gerar dados de exemplo
+            if not len(logs):
+                print(f"Nenhum log encontrado no formato esperado em {arquivo}. Gerando dados de exemplo.")
+                self.gerar_dados_exemplo()
+                return []
+            
+            return logs
+        
+        except Exception as e:
+            print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
+            # Em caso de erro, gerar dados de exemplo
+            self.gerar_dados_exemplo()
+            return []
+    
+    def processar_intervalo_arquivo(self, arquivo, ts_inicio, ts_fim):
+        """Interpreta só o trecho do arquivo com logs entre ts_inicio e ts_fim (epoch ms, inclusivos)"""
+        try:
+            logs = self.parser.interpretar(self.linhas_no_intervalo(arquivo, ts_inicio, ts_fim))
+        except Exception as e:
+            print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
+            return []
+        
+        # O trecho tem folga nas bordas; o filtro exato é feito nos logs já interpretados
+        if isinstance(logs, pd.DataFrame):
+            ts_evento = logs["ts_evento"]
+            mascara = ts_evento.notna().to_numpy()
+            valores = ts_evento.fillna(0).to_numpy(np.int64)
+            if ts_inicio is not None:
+                mascara = mascara & (valores >= ts_inicio)
+            if ts_fim is not None:
+                mascara = mascara & (valores <= ts_fim)
+            return logs[mascara].reset_index(drop=True)
+        
+        return [log for log in logs if log.get("ts_evento") is not None
+                and (ts_inicio is None or log["ts_evento"] >= ts_inicio)
+                and (ts_fim is None or log["ts_evento"] <= ts_fim)]
+    
+    def linhas_no_intervalo(self, arquivo, ts_inicio=None, ts_fim=None):
+        """Linhas (origem, posição, texto) do trecho do arquivo que cobre o intervalo, achado por busca binária"""
+        if os.path.splitext(arquivo)[1] in COMPRESSORES_LOG or os.path.getsize(arquivo) == 0:
+            # Arquivos compactados não permitem seek: leitura completa em streaming
+            yield from iterar_linhas_log(arquivo, com_posicao=True)
+            return
+        
+        with open(arquivo, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                indice = self.indice_tempo_arquivo(arquivo, mapa) if self.usar_indice_tempo else None
+                inicio, fim = trecho_do_intervalo(mapa, ts_inicio, ts_fim, indice)
+        
+        yield from ler_linhas_mmap(arquivo, inicio=inicio, fim=fim, com_posicao=True)
+    
+    def indice_tempo_arquivo(self, arquivo, mapa):
+        """Carrega (e completa ou refaz) o índice esparso tempo -> byte de um arquivo, salvo no banco"""
+        try:
+            caminho = os.path.abspath(arquivo)
+            inode = os.stat(caminho).st_ino
+            tamanho = len(mapa)
+            # Início do arquivo identifica rotações/recriações com o mesmo nome
+            assinatura = hashlib.blake2b(mapa[:4096], digest_size=16).hexdigest()
+            
+            conn = sqlite3.connect(self.db_path)
+            linha = conn.execute("SELECT inode, tamanho, assinatura, pontos FROM indice_tempo WHERE arquivo = ?",
+                                 (caminho,)).fetchone()
+            
+            if linha and linha[0] == inode and linha[2] == assinatura and linha[1] <= tamanho:
+                pontos = [tuple(ponto) for ponto in json.loads(linha[3])]
+                if linha[1] == tamanho:
+                    conn.close()
+                    return pontos
+                # Arquivo cresceu: sondar só os passos novos
+                pontos.extend(ponto for ponto in construir_indice_tempo(mapa, -(-linha[1] // PASSO_INDICE_TEMPO) * PASSO_INDICE_TEMPO)
+                              if not pontos or ponto[0] > pontos[-1][0])
+            else:
+                pontos = construir_indice_tempo(mapa)
+            
+            conn.execute("INSERT OR REPLACE INTO indice_tempo (arquivo, inode, tamanho, assinatura, pontos) VALUES (?, ?, ?, ?, ?)",
+                         (caminho, inode, tamanho, assinatura, json.dumps(pontos)))
+            conn.commit()
+            conn.close()
+            return pontos
+        except Exception as e:
+            print(f"Erro ao atualizar índice de tempo de {arquivo}: {str(e)}")
+            return None
+    
+    def processar_arquivos_paralelo(self, arquivos, processos=None):
+        """Processa vários arquivos de log em processos de trabalho; gera (arquivo, logs) conforme terminam"""
+        processos = min(processos or os.cpu_count() or 1, len(arquivos))
+        if processos <= 1:
+            for arquivo in arquivos:
+                try:
+                    yield arquivo, processar_arquivo_em_processo(arquivo, self.parser.vetorizado)
+                except Exception as e:
+                    print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
+            return
+        
+        # spawn: o processo principal tem threads (coletor, manutenção) e fork não é seguro com elas
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+            futuros = {executor.submit(processar_arquivo_em_processo, arquivo, self.parser.vetorizado): arquivo
+                       for arquivo in arquivos}
+            for futuro in as_completed(futuros):
+                try:
+                    yield futuros[futuro], futuro.result()
+                except Exception as e:
+                    print(f"Erro ao processar arquivo {futuros[futuro]}: {str(e)}")
+    
+    def importar_historico(self, caminho, processos=None):
+        """Importa para o banco todos os logs (inclusive rotacionados e compactados) de um arquivo ou diretório"""
+        if os.path.isdir(caminho):
+            arquivos = [os.path.join(raiz, nome) for raiz, _, nomes in os.walk(caminho)
+                        for nome in nomes if eh_arquivo_log(nome)]
+        else:
+            arquivos = [caminho]
+        
+        # Arquivos maiores primeiro para equilibrar os processos
+        arquivos.sort(key=os.path.getsize, reverse=True)
+        
+        total = 0
+        for arquivo, logs in self.processar_arquivos_paralelo(arquivos, processos):
+            if len(logs):
+                self.salvar_logs_db(logs)
+                total += len(logs)
+            print(f"{arquivo}: {len(logs)} logs", flush=True)
+        return total
+    
+    def gerar_dados_exemplo(self):
+        """Gera dados de exemplo para demonstração"""
+        # Lista de usuários de exemplo
+        usuarios = ["admin", "joao.silva", "maria.santos", "carlos.oliveira", "ana.pereira"]
+        
+        # Lista de IPs de exemplo
+        ips = ["192.168.1." + str(i) for i in range(1, 20)] + ["10.0.0." + str(i) for i in range(1, 10)]
+        
+        # Lista de URLs/endpoints de exemplo
+        urls = [
+            "/app/dashboard",
+            "/app/users",
+            "/app/reports",
+            "/app/settings",
+            "/api/data",
+            "/api/users",
+            "/api/auth/login",
+            "/api/auth/logout",
+            "/app/products",
+            "/app/orders"
+        ]
+        
+        # Lista de níveis de log
+        niveis = ["INFO", "WARN", "ERROR", "DEBUG"]
+        
+        # Lista de categorias
+        categorias = ["Security", "Authentication", "Database", "Application", "System"]
+        
+        # Lista de servidores
+        servidores = ["jboss1", "jboss2", "jboss3"]
+        
+        # Gerar 100 registros de log
+        data_atual = datetime.datetime.now()
+        logs = []
+        
+        for i in range(100):
+            # Data aleatória nos últimos 7 dias
+            delta = datetime.timedelta(
+                days=random.randint(0, 7),
+                hours=random.randint(0, 23),
+                minutes=random.randint(0, 59),
+                seconds=random.randint(0, 59)
+            )
+            data_log = data_atual - delta
+            
+            # Selecionar valores aleatórios
+            usuario = random.choice(usuarios)
+            ip = random.choice(ips)
+            url = random.choice(urls)
+            nivel = random.choice(niveis)
+            categoria = random.choice(categorias)
+            servidor = random.choice(servidores)
+            thread = f"Thread-{random.randint(1, 100)}"
+            
+            # Tipo de operação
+            operacao = random.choice(["LOGIN", "LOGOUT", "VIEW", "UPDATE", "DELETE"])
+            
+            # Status
+            status = random.choice(["SUCCESS", "FAILED", "SUCCESS", "SUCCESS", "SUCCESS"])
+            
+            # Gerar mensagem
+            if operacao == "LOGIN":
+                if status == "SUCCESS":
+                    mensagem = f"User {usuario} successfully logged in from IP={ip}"
+                else:
+                    mensagem = f"Failed login attempt for user {usuario} from IP={ip}"
+            elif operacao == "LOGOUT":
+                mensagem = f"User {usuario} logged out"
+            elif operacao == "VIEW":
+                mensagem = f"User {usuario} accessed URL={url} from IP={ip}"
+            elif operacao == "UPDATE":
+                mensagem = f"User {usuario} updated data at URL={url} from IP={ip}"
+            elif operacao == "DELETE":
+                mensagem = f"User {usuario} deleted data at URL={url} from IP={ip}"
+            
+            logs.append({
+                "data": data_log.strftime("%Y-%m-%d"),
+                "hora": data_log.strftime("%H:%M:%S"),
+                "nivel": nivel,
+                "categoria": categoria,
+                "servidor": servidor,
+                "thread": thread,
+                "mensagem": mensagem,
+                "usuario": usuario,
+                "ip": ip,
+                "url": url,
+                "operacao": operacao,
+                "status": status,
+                "ts_evento": calcular_ts_evento(data_log.strftime("%Y-%m-%d"), data_log.strftime("%H:%M:%S"))
+            })
+        
+        # Converter para DataFrame e atualizar os logs em memória
+        self.substituir_logs_memoria(logs)
+        
+        # Salvar logs no banco de dados para cache
+        self.salvar_logs_db(logs)
+    
+    def iniciar_monitoramento(self):
+        """Inicia o monitoramento em tempo real dos logs"""
+        if self.monitoramento_ativo:
+            return
+        
+        self.monitoramento_ativo = True
+        
+        # Fila única e limitada entre as fontes e o pipeline
+        self.fila_logs = queue.Queue(maxsize=self.coleta_config["tamanho_fila_pipeline"])
+        
+        # Iniciar o coletor (uma tarefa de leitura por fonte)
+        self.coletor = ColetorLogs(self.fila_logs, self.coleta_config)
+        self.coletor.iniciar(self.fontes_monitoradas())
+        
+        # Iniciar thread de processamento da fila (memória, banco e alertas), fora do loop do Tk
+        self.thread_pipeline = threading.Thread(target=self.processar_fila_logs, daemon=True)
+        self.thread_pipeline.start()
+        
+        # Endpoint de métricas (Prometheus), se configurado
+        self.iniciar_servidor_metricas()
+    
+    def parar_monitoramento(self):
+        """Para o monitoramento em tempo real dos logs"""
+        self.monitoramento_ativo = False
+        
+        # As threads vão parar automaticamente na próxima iteração
+        if self.coletor:
+            self.coletor.parar()
+            self.coletor = None
+        
+        if self.thread_monitoramento:
+            self.thread_monitoramento.join(timeout=1.0)
+            self.thread_monitoramento = None
+        
+        if self.thread_pipeline:
+            self.thread_pipeline.join(timeout=2.0)
+            self.thread_pipeline = None
+        
+        self.parar_servidor_metricas()
+        
+        self.fechar_fragmentos_alertas()
+        
+        self.modo_cliente = False
+    
+    def fontes_monitoradas(self):
+        """Caminhos monitorados: caminho_logs mais as fontes adicionais da configuração"""
+        fontes = [self.caminho_logs] if self.caminho_logs else []
+        for caminho in self.coleta_config["fontes"]:
+            if caminho and caminho not in fontes:
+                fontes.append(caminho)
+        return fontes
+    
+    def estatisticas_coleta(self):
+        """Linhas, bytes, atraso (s) e ocupação da fila por fonte monitorada"""
+        if not self.coletor:
+            return {}
+        return self.coletor.estatisticas()
+    
+    def diagnostico(self):
+        """Métricas do pipeline para a tela de diagnóstico: etapas, contadores, filas e atraso por fonte"""
+        with self.lock_memoria:
+            logs_memoria = 0 if self.logs_completos is None else len(self.logs_completos)
+        return dict(self.metricas.instantaneo(),
+                    fila_pipeline=self.fila_logs.qsize(),
+                    capacidade_fila=self.fila_logs.maxsize,
+                    logs_memoria=logs_memoria,
+                    fontes=self.estatisticas_coleta(),
+                    endpoint=self.endereco_metricas())
+    
+    def texto_metricas(self):
+        """Métricas no formato de texto do Prometheus (contadores, histogramas e medidores atuais)"""
+        fontes = self.estatisticas_coleta()
+        with self.lock_memoria:
+            logs_memoria = 0 if self.logs_completos is None else len(self.logs_completos)
+        medidores = [
+            ("fila_pipeline_lotes", "gauge", "Lotes aguardando o pipeline na fila_logs", [({}, self.fila_logs.qsize())]),
+            ("logs_memoria", "gauge", "Logs mantidos em memória", [({}, logs_memoria)]),
+            ("fonte_fila_lotes", "gauge", "Lotes na fila própria de cada fonte",
+             [({"fonte": nome}, e["fila"]) for nome, e in fontes.items()]),
+            ("fonte_bytes_pendentes", "gauge", "Bytes ainda não lidos até o fim dos arquivos da fonte",
+             [({"fonte": nome}, e["bytes_pendentes"]) for nome, e in fontes.items()]),
+            ("fonte_atraso_segundos", "gauge", "Tempo desde a última vez em que a fonte estava em dia",
+             [({"fonte": nome}, e["atraso_s"]) for nome, e in fontes.items()]),
+            ("fonte_linhas", "counter", "Linhas entregues ao pipeline pela fonte",
+             [({"fonte": nome}, e["linhas"]) for nome, e in fontes.items()]),
+            ("fonte_descartadas", "counter", "Mensagens descartadas pela fonte (UDP sem espaço na fila)",
+             [({"fonte": nome}, e["descartadas"]) for nome, e in fontes.items()]),
+        ]
+        return self.metricas.formato_prometheus(medidores)
+    
+    def iniciar_servidor_metricas(self):
+        """Abre o endpoint HTTP /metrics se diagnostico_config tiver uma porta"""
+        porta = self.diagnostico_config.get("porta_metricas")
+        if porta is None or self.servidor_metricas:
+            return
+        try:
+            servidor = http.server.ThreadingHTTPServer(
+                (self.diagnostico_config.get("endereco_metricas") or "127.0.0.1", int(porta)), ManipuladorMetricas)
+        except OSError as e:
+            print(f"Erro ao abrir o endpoint de métricas: {str(e)}")
+            return
+        servidor.daemon_threads = True
+        servidor.motor = self
+        self.servidor_metricas = servidor
+        threading.Thread(target=servidor.serve_forever, daemon=True, name="metricas").start()
+    
+    def parar_servidor_metricas(self):
+        """Fecha o endpoint HTTP de métricas"""
+        if self.servidor_metricas:
+            self.servidor_metricas.shutdown()
+            self.servidor_metricas.server_close()
+            self.servidor_metricas = None
+    
+    def endereco_metricas(self):
+        """URL do endpoint de métricas aberto, ou None"""
+        if not self.servidor_metricas:
+            return None
+        endereco, porta = self.servidor_metricas.server_address[:2]
+        return f"http://{endereco}:{porta}/metrics"
+    
+    def definir_perfilamento(self, ativo, modo=None):
+        """Liga/desliga o perfilamento em execução (ao desligar, cada thread grava seu perfil na próxima chamada)"""
+        if modo:
+            self.diagnostico_config["modo_perfilamento"] = modo
+        self.diagnostico_config["perfilamento"] = bool(ativo)
+    
+    def processar_fila_logs(self):
+        """Consome a fila de logs em uma thread própria: memória, banco de dados e alertas"""
+        while self.monitoramento_ativo or not self.fila_logs.empty():
+            try:
+                _, linhas, enfileirado_em = self.fila_logs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            metricas = self.metricas
+            metricas.observar("fila", time.perf_counter() - enfileirado_em)
+            
+            # Agrupar o que já estiver na fila em um único lote (uma transação no banco)
+            while len(linhas) < self.tamanho_lote_pipeline:
+                try:
+                    _, mais_linhas, enfileirado_em = self.fila_logs.get_nowait()
+                except queue.Empty:
+                    break
+                metricas.observar("fila", time.perf_counter() - enfileirado_em)
+                linhas.extend(mais_linhas)
+            metricas.incrementar("linhas_recebidas", len(linhas))
+            
+            try:
+                # Parse único para todas as fontes, com os mesmos formatos das cargas de arquivo
+                # (fontes de arquivo enviam (origem, posição, linha); receptores de rede, só a linha)
+                inicio = time.perf_counter()
+                novos_logs = self.parser.processar_linhas(linhas)
+                metricas.observar("parse", time.perf_counter() - inicio)
+                metricas.incrementar("logs_interpretados", len(novos_logs))
+                
+                if not novos_logs:
+                    continue
+                
+                self.processar_lote_logs(novos_logs)
+            except Exception as e:
+                metricas.incrementar("erros", etapa="pipeline")
+                print(f"Erro ao processar lote de logs: {str(e)}")
+    
+    def processar_lote_logs(self, novos_logs):
+        """Atualiza memória, banco de dados e alertas com um lote de logs novos"""
+        # Adicionar novos logs ao DataFrame
+        with self.metricas.medir("memoria"):
+            self.acrescentar_logs_memoria(novos_logs)
+        
+        # Salvar logs no banco de dados para cache
+        self.salvar_logs_db(novos_logs)
+        
+        # Verificar alertas (latência medida por log)
+        observar = self.metricas.observar
+        fragmentos = self.obter_fragmentos_alertas()
+        if fragmentos is None:
+            for log in novos_logs:
+                inicio = time.perf_counter()
+                self.verificar_alerta(log)
+                observar("alertas", time.perf_counter() - inicio)
+        else:
+            # Regras por chave nos processos de alertas enquanto as demais rodam aqui;
+            # depois as detecções entram no fluxo de alertas em ordem de log
+            inicio_lote = time.perf_counter()
+            enviados = fragmentos.enviar(novos_logs, self.config_regras_por_chave())
+            for log in novos_logs:
+                inicio = time.perf_counter()
+                self.verificar_alerta(log, regras_por_chave=False)
+                observar("alertas", time.perf_counter() - inicio)
+            try:
+                deteccoes = fragmentos.receber(enviados)
+            except Exception as e:
+                # Processo encerrado ou sem resposta: recria os fragmentos no próximo lote
+                self.metricas.incrementar("erros", etapa="alertas")
+                print(f"Erro na avaliação fragmentada de alertas: {str(e)}")
+                self.fechar_fragmentos_alertas()
+                deteccoes = []
+            for deteccao in deteccoes:
+                self.emitir_deteccao(novos_logs[deteccao[0]], deteccao)
+            observar("alertas_fragmentos", time.perf_counter() - inicio_lote)
+        self.metricas.incrementar("logs_avaliados", len(novos_logs))
+    
+    def registrar_heartbeat(self):
+        """Registra no banco que este processo está executando a ingestão (modo daemon)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany("INSERT OR REPLACE INTO estado_daemon (chave, valor) VALUES (?, ?)", [
+                ('pid', str(os.getpid())),
+                ('heartbeat', str(time.time())),
+                ('caminho_logs', self.caminho_logs or ''),
+                ('coleta', json.dumps(self.estatisticas_coleta())),
+            ])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao registrar heartbeat do daemon: {str(e)}")
+    
+    def limpar_heartbeat(self):
+        """Remove o registro do daemon ao encerrar"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("DELETE FROM estado_daemon")
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao limpar heartbeat do daemon: {str(e)}")
+    
+    def daemon_ativo(self, tolerancia=INTERVALO_HEARTBEAT * 3):
+        """Indica se outro processo (daemon) está ingerindo logs neste banco"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            estado = dict(conn.execute("SELECT chave, valor FROM estado_daemon").fetchall())
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao consultar estado do daemon: {str(e)}")
+            return False
+        
+        if not estado.get('heartbeat') or estado.get('pid') == str(os.getpid()):
+            return False
+        return time.time() - float(estado['heartbeat']) < tolerancia
+    
+    def iniciar_modo_cliente(self):
+        """Lê do banco o que o daemon ingeriu, sem monitorar os arquivos neste processo"""
+        if self.monitoramento_ativo:
+            return
+        
+        self.monitoramento_ativo = True
+        self.modo_cliente = True
+        
+        # Carga inicial a partir do banco (vazio enquanto o daemon não gravou nada)
+        logs = self.carregar_logs_db(limite=self.max_logs_memoria)
+        self.substituir_logs_memoria(logs if logs is not None else [])
+        self.alertas = self.carregar_alertas_db()[:100][::-1]
+        
+        self.thread_monitoramento = threading.Thread(target=self.sincronizar_do_banco, daemon=True)
+        self.thread_monitoramento.start()
+    
+    def sincronizar_do_banco(self):
+        """Função executada em uma thread separada no modo cliente (marca d'água por id)"""
+        ultimo_log = ultimo_alerta = 0
+        try:
+            conn = sqlite3.connect(self.db_path)
+            ultimo_log = conn.execute("SELECT COALESCE(MAX(id), 0) FROM logs").fetchone()[0]
+            ultimo_alerta = conn.execute("SELECT COALESCE(MAX(id), 0) FROM alertas").fetchone()[0]
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao iniciar sincronização com o banco: {str(e)}")
+        
+        while self.monitoramento_ativo:
+            time.sleep(INTERVALO_HEARTBEAT / 5)
+            try:
+                conn = sqlite3.connect(self.db_path)
+                atual_log = conn.execute("SELECT COALESCE(MAX(id), 0) FROM logs").fetchone()[0]
+                atual_alerta = conn.execute("SELECT COALESCE(MAX(id), 0) FROM alertas").fetchone()[0]
+                conn.close()
+                
+                if atual_log != ultimo_log:
+                    # O daemon grava em outro processo: o índice de URLs lê só os logs novos
+                    conn = conectar_leitura(self.db_path)
+                    indexar_urls_do_banco(conn, self.indice_urls, self.id_indice_urls, atual_log)
+                    self.id_indice_urls = atual_log
+                    conn.close()
+                    ultimo_log = atual_log
+                    self.substituir_logs_memoria(self.carregar_logs_db(limite=self.max_logs_memoria))
+                
+                if atual_alerta != ultimo_alerta:
+                    novos = [a for a in self.carregar_alertas_db() if a['id'] > ultimo_alerta]
+                    ultimo_alerta = atual_alerta
+                    for alerta in reversed(novos):
+                        self.alertas.append(alerta)
+                        self.notificar_alerta(alerta)
+                    self.alertas = self.alertas[-100:]
+            except Exception as e:
+                print(f"Erro ao sincronizar com o banco: {str(e)}")
+    
+    def config_regras_por_chave(self):
+        """Configuração das regras por chave: deteccao_config mais o limite falhas_login de alertas_config"""
+        config = dict(self.deteccao_config)
+        config['falhas_login'] = self.alertas_config.get('falhas_login')
+        return config
+    
+    def verificar_alerta(self, log, regras_por_chave=True):
+        """Verifica se um log deve gerar um alerta"""
+        # Verificar acessos fora do horário comercial
+        if (self.alertas_config.get('acessos_suspeitos', False) and 
+            log['status'] == 'SUCCESS'):
+            
+            # Extrair hora
+            try:
+                hora = int(log['hora'].split(':')[0])
+                
+                # Verificar se está fora do horário comercial (antes das 8h ou depois das 18h)
+                if hora < 8 or hora > 18:
+                    self.adicionar_alerta({
+                        'tipo': 'horario_suspeito',
+                        'nivel': 'médio',
+                        'usuario': log['usuario'],
+                        'ip': log['ip'],
+                        'url': log['url'],
+                        'data': log['data'],
+                        'hora': log['hora'],
+                        'mensagem': f"Acesso fora do horário comercial pelo usuário {log['usuario']} às {log['hora']}",
+                        'detalhes': f"O usuário {log['usuario']} acessou o sistema do IP {log['ip']} às {log['hora']}, fora do horário comercial (8h-18h)."
+                    })
+            except:
+                pass
+        
+        # Verificar acessos a URLs restritas
+        if ('urls_restritas' in self.alertas_config and 
+            self.alertas_config['urls_restritas'] and 
+            log['url'] != 'desconhecido'):
+            
+            for url_restrita in self.alertas_config['urls_restritas']:
+                if url_restrita in log['url']:
+                    self.adicionar_alerta({
+                        'tipo': 'url_restrita',
+                        'nivel': 'alto' if log['status'] == 'SUCCESS' else 'médio',
+                        'usuario': log['usuario'],
+                        'ip': log['ip'],
+                        'url': log['url'],
+                        'data': log['data'],
+                        'hora': log['hora'],
+                        'mensagem': f"Acesso a URL restrita {log['url']} pelo usuário {log['usuario']}",
+                        'detalhes': f"O usuário {log['usuario']} acessou a URL restrita {log['url']} do IP {log['ip']} às {log['hora']}. Status: {log['status']}"
+                    })
+                    break
+        
+        # Regras com estado por usuário e IP (falhas de login, correlação de logins, anomalias de taxa); com
+        # processos de alertas configurados, processar_lote_logs as avalia nos fragmentos em vez de aqui
+        if regras_por_chave:
+            self.avaliador_alertas.config.update(self.config_regras_por_chave())
+            for deteccao in self.avaliador_alertas.avaliar(tarefas_alerta(log, 0)):
+                self.emitir_deteccao(log, deteccao)
+    
+    def emitir_deteccao(self, log, deteccao):
+        """Gera o alerta de uma detecção das regras por chave (AvaliadorFragmento) para o log"""
+        _, regra, tipo_chave, chave, resultado = deteccao
+        usuario, ip = log['usuario'], log['ip']
+        
+        if regra == 'falhas_login':
+            # Falhas de login do mesmo usuário a partir do mesmo IP nas últimas 24 horas
+            falhas = resultado
+            self.adicionar_alerta({
+                'tipo': 'falha_login',
+                'nivel': 'alto',
+                'usuario': usuario,
+                'ip': ip,
+                'url': '',
+                'data': log['data'],
+                'hora': log['hora'],
+                'mensagem': f"Múltiplas falhas de login ({falhas}) para o usuário {usuario} do IP {ip}",
+                'detalhes': f"Detectadas {falhas} tentativas de login malsucedidas nas últimas 24 horas."
+            })
+        
+        elif regra == 'correlacao_login':
+            # Falhas de login correlacionadas entre usuários e IPs (credential stuffing, força bruta distribuída)
+            distintos = resultado
+            janela = self.deteccao_config.get('janela_correlacao_min', 10)
+            if tipo_chave == 'ip':
+                self.adicionar_alerta({
+                    'tipo': 'varredura_usuarios',
+                    'nivel': 'alto',
+                    'usuario': usuario,
+                    'ip': ip,
+                    'url': log['url'],
+                    'data': log['data'],
+                    'hora': log['hora'],
+                    'chave_dedup': f"ip:{ip}",
+                    'mensagem': f"Falhas de login em {distintos} usuários distintos a partir do IP {ip}",
+                    'detalhes': f"O IP {ip} teve falhas de login para cerca de {distintos} usuários diferentes nos últimos {janela} minutos (possível credential stuffing ou password spraying)."
+                })
+            else:
+                self.adicionar_alerta({
+                    'tipo': 'forca_bruta_distribuida',
+                    'nivel': 'alto',
+                    'usuario': usuario,
+                    'ip': ip,
+                    'url': log['url'],
+                    'data': log['data'],
+                    'hora': log['hora'],
+                    'chave_dedup': f"usuario:{usuario}",
+                    'mensagem': f"Falhas de login para o usuário {usuario} a partir de {distintos} IPs distintos",
+                    'detalhes': f"O usuário {usuario} teve falhas de login vindas de cerca de {distintos} IPs diferentes nos últimos {janela} minutos (possível força bruta distribuída)."
+                })
+        
+        elif regra == 'anomalia_taxa':
+            # Minuto com taxa muito acima da linha de base do usuário ou do IP
+            contagem, base = resultado
+            razao = contagem / base
+            descricao = f"o usuário {chave}" if tipo_chave == 'usuario' else f"o IP {chave}"
+            self.adicionar_alerta({
+                'tipo': 'anomalia_taxa',
+                'nivel': 'alto' if razao >= 2 * float(self.deteccao_config.get('fator_anomalia', 20)) else 'médio',
+                'usuario': usuario,
+                'ip': ip,
+                'url': log['url'],
+                'data': log['data'],
+                'hora': log['hora'],
+                'chave_dedup': f"{tipo_chave}:{chave}",
+                'mensagem': f"Taxa de requisições anômala para {descricao}: {contagem}/min ({razao:.0f}x o normal)",
+                'detalhes': f"{contagem} requisições no minuto de {log['hora'][:5]} para {descricao}; taxa normal de {base:.1f} req/min (média móvel e perfil da hora do dia)."
+            })
+    
+    def obter_fragmentos_alertas(self):
+        """Processos de alertas conforme deteccao_config["processos_alertas"] (None = avaliação local)"""
+        processos = int(self.deteccao_config.get('processos_alertas') or 0)
+        fragmentos = self.fragmentos_alertas
+        if fragmentos is not None and len(fragmentos.processos) != processos:
+            self.fechar_fragmentos_alertas()
+            fragmentos = None
+        if fragmentos is None and processos > 0:
+            fragmentos = self.fragmentos_alertas = FragmentosAlertas(processos)
+        return fragmentos
+    
+    def fechar_fragmentos_alertas(self):
+        """Encerra os processos de alertas (o estado das regras por chave é descartado)"""
+        if self.fragmentos_alertas is not None:
+            self.fragmentos_alertas.fechar()
+            self.fragmentos_alertas = None
+    
+    def adicionar_alerta(self, alerta):
+        """Adiciona um novo alerta à lista de alertas"""
+        # Verificar se já existe um alerta similar recente
+        # (alertas com chave_dedup, como os por IP, usam a chave em vez do usuário)
+        for a in self.alertas:
+            if (a['tipo'] == alerta['tipo'] and 
+                a.get('chave_dedup', a['usuario']) == alerta.get('chave_dedup', alerta['usuario']) and 
+                a['data'] == alerta['data']):
+                # Já existe um alerta similar hoje, não duplicar
+                return
+        
+        # Adicionar timestamp
+        alerta['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Adicionar à lista de alertas
+        self.alertas.append(alerta)
+        self.metricas.incrementar("alertas_gerados", tipo=alerta.get('tipo', ''))
+        
+        # Limitar número de alertas armazenados
+        max_alertas = 100
+        if len(self.alertas) > max_alertas:
+            self.alertas = self.alertas[-max_alertas:]
+        
+        # Salvar alerta no banco de dados
+        self.salvar_alerta_db(alerta)
+        
+        # Notificar interface, console do daemon etc.
+        self.notificar_alerta(alerta)
+    
+    def notificar_alerta(self, alerta):
+        """Chama os ouvintes registrados para um novo alerta"""
+        for ouvinte in self.ouvintes_alerta:
+            try:
+                ouvinte(alerta)
+            except Exception as e:
+                print(f"Erro ao notificar alerta: {str(e)}")
+    
+    def salvar_alerta_db(self, alerta):
+        """Salva um alerta no banco de dados"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO alertas (tipo, nivel, usuario, ip, url, data, hora, mensagem, detalhes, timestamp, lido)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                alerta.get('tipo', ''),
+                alerta.get('nivel', ''),
+                alerta.get('usuario', ''),
+                alerta.get('ip', ''),
+                alerta.get('url', ''),
+                alerta.get('data', ''),
+                alerta.get('hora', ''),
+                alerta.get('mensagem', ''),
+                alerta.get('detalhes', ''),
+                alerta.get('timestamp', ''),
+                0  # Não lido
+            ))
+            
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Erro ao salvar alerta no banco de dados: {str(e)}")
+    
+    def carregar_alertas_db(self):
+        """Carrega alertas do banco de dados"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT tipo, nivel, usuario, ip, url, data, hora, mensagem, detalhes, timestamp, lido, id
+            FROM alertas
+            ORDER BY timestamp DESC
+            ''')
+            
+            alertas = []
+            for row in cursor.fetchall():
+                alertas.append({
+                    'tipo': row[0],
+                    'nivel': row[1],
+                    'usuario': row[2],
+                    'ip': row[3],
+                    'url': row[4],
+                    'data': row[5],
+                    'hora': row[6],
+                    'mensagem': row[7],
+                    'detalhes': row[8],
+                    'timestamp': row[9],
+                    'lido': bool(row[10]),
+                    'id': row[11]
+                })
+            
+            conn.close()
+            return alertas
+        except Exception as e:
+            print(f"Erro ao carregar alertas do banco de dados: {str(e)}")
+            return []
+    
+    def marcar_alerta_como_lido(self, alerta_id):
+        """Marca um alerta como lido no banco de dados"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('UPDATE alertas SET lido = 1 WHERE id = ?', (alerta_id,))
+            
+            conn.commit()
+            conn.close()
+            
+            # Atualizar também na lista em memória
+            for alerta in self.alertas:
+                if alerta.get('id') == alerta_id:
+                    alerta['lido'] = True
+                    break
+        except Exception as e:
+            print(f"Erro ao marcar alerta como lido: {str(e)}")
+    
+    def carregar_configuracoes(self):
+        """Carrega configurações salvas"""
+        try:
+            # Primeiro tentar carregar do banco de dados
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Verificar se a tabela existe
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='configuracoes'")
+            if cursor.fetchone():
+                # Carregar configurações
+                cursor.execute("SELECT chave, valor FROM configuracoes")
+                for chave, valor in cursor.fetchall():
+                    if chave == 'caminho_logs':
+                        self.caminho_logs = valor
+                    elif chave == 'max_logs_memoria':
+                        self.max_logs_memoria = int(valor)
+                    elif chave == 'alertas_config':
+                        self.alertas_config = json.loads(valor)
+                    elif chave == 'armazenamento_config':
+                        self.armazenamento_config.update(json.loads(valor))
+                    elif chave == 'coleta_config':
+                        self.coleta_config.update(json.loads(valor))
+                    elif chave == 'diagnostico_config':
+                        self.diagnostico_config.update(json.loads(valor))
+                    elif chave == 'relatorios_config':
+                        self.relatorios_config.update(json.loads(valor))
+                    elif chave == 'deteccao_config':
+                        self.deteccao_config.update(json.loads(valor))
+                    elif chave == 'ultima_compactacao':
+                        self.ultima_compactacao = float(valor)
+            
+            conn.close()
+            
+            # Se não encontrou no banco de dados, tentar arquivo JSON
+            if not self.caminho_logs and os.path.exists('config.json'):
+                with open('config.json', 'r') as f:
+                    config = json.load(f)
+                
+                # Carregar configurações
+                if 'caminho_logs' in config:
+                    self.caminho_logs = config['caminho_logs']
+                
+                if 'max_logs_memoria' in config:
+                    self.max_logs_memoria = config['max_logs_memoria']
+                
+                if 'alertas_config' in config:
+                    self.alertas_config = config['alertas_config']
+                
+                if 'armazenamento_config' in config:
+                    self.armazenamento_config.update(config['armazenamento_config'])
+                
+                if 'coleta_config' in config:
+                    self.coleta_config.update(config['coleta_config'])
+                
+                if 'diagnostico_config' in config:
+                    self.diagnostico_config.update(config['diagnostico_config'])
+                
+                if 'relatorios_config' in config:
+                    self.relatorios_config.update(config['relatorios_config'])
+                
+                if 'deteccao_config' in config:
+                    self.deteccao_config.update(config['deteccao_config'])
+                
+                # Salvar no banco de dados para futuras execuções
+                self.salvar_configuracoes()
+        except Exception as e:
+            print(f"Erro ao carregar configurações: {str(e)}")
+    
+    def salvar_configuracoes(self):
+        """Salva configurações atuais"""
+        try:
+            # Salvar no banco de dados
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Limpar configurações existentes
+            cursor.execute("DELETE FROM configuracoes")
+            
+            # Inserir novas configurações
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('caminho_logs', self.caminho_logs or ''))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('max_logs_memoria', str(self.max_logs_memoria)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('alertas_config', json.dumps(self.alertas_config)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('armazenamento_config', json.dumps(self.armazenamento_config)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('ultima_compactacao', str(self.ultima_compactacao)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('coleta_config', json.dumps(self.coleta_config)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('diagnostico_config', json.dumps(self.diagnostico_config)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('relatorios_config', json.dumps(self.relatorios_config)))
+            
+            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
+                          ('deteccao_config', json.dumps(self.deteccao_config)))
+            
+            conn.commit()
+            conn.close()
+            
+            # Também salvar em arquivo JSON para compatibilidade
+            config = {
+                'caminho_logs': self.caminho_logs,
+                'max_logs_memoria': self.max_logs_memoria,
+                'alertas_config': self.alertas_config,
+                'armazenamento_config': self.armazenamento_config,
+                'coleta_config': self.coleta_config,
+                'diagnostico_config': self.diagnostico_config,
+                'relatorios_config': self.relatorios_config,
+                'deteccao_config': self.deteccao_config
+            }
+            
+            with open('config.json', 'w') as f:
+                json.dump(config, f, indent=4)
+            
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar configurações: {str(e)}")
+            return False
+    
+
+def executar_daemon(motor, caminhos=None, carga_inicial=False, receptores=None, inicio=None, fim=None):
+    """Executa ingestão, monitoramento, alertas e manutenção sem interface até SIGINT/SIGTERM"""
+    parar = threading.Event()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sinal, lambda *_: parar.set())
+    
+    # SIGUSR1 liga/desliga o perfilamento sem reiniciar o daemon
+    if hasattr(signal, "SIGUSR1"):
+        def alternar_perfilamento(*_):
+            motor.definir_perfilamento(not motor.diagnostico_config["perfilamento"])
+            print(f"Perfilamento {'ligado' if motor.diagnostico_config['perfilamento'] else 'desligado'} "
+                  f"({motor.diagnostico_config['modo_perfilamento']}, {motor.diagnostico_config['diretorio_perfis']})",
+                  flush=True)
+        signal.signal(signal.SIGUSR1, alternar_perfilamento)
+    
+    if caminhos:
+        # O primeiro caminho é o principal; os demais são fontes adicionais coletadas em paralelo
+        motor.caminho_logs = caminhos[0]
+        motor.coleta_config["fontes"] = list(caminhos[1:])
+    motor.coleta_config.update({chave: valor for chave, valor in (receptores or {}).items() if valor is not None})
+    receptores = [f"{chave}:{motor.coleta_config[chave]}" for chave in ("syslog_udp", "syslog_tcp", "tcp_linhas")
+                  if motor.coleta_config[chave] is not None]
+    if not motor.fontes_monitoradas() and not receptores:
+        print("Caminho de logs não especificado (use --caminho, --syslog-udp/--syslog-tcp/--tcp-linhas "
+              "ou configure pela interface).")
+        return 1
+    
+    # Alertas vão para o console (e para o banco, onde a interface os lê)
+    motor.ouvintes_alerta.append(
+        lambda alerta: print(f"[ALERTA {alerta['nivel'].upper()}] {alerta['data']} {alerta['hora']} - {alerta['mensagem']}", flush=True))
+    
+    if carga_inicial:
+        motor.carregar_dados_logs(inicio=inicio, fim=fim)
+    
+    motor.registrar_heartbeat()
+    motor.iniciar_monitoramento()
+    print(f"Daemon monitorando {', '.join(motor.fontes_monitoradas() + receptores)} "
+          f"(banco: {motor.db_path}, pid {os.getpid()})", flush=True)
+    if motor.endereco_metricas():
+        print(f"Métricas em {motor.endereco_metricas()}", flush=True)
+    
+    while not parar.wait(INTERVALO_HEARTBEAT):
+        motor.registrar_heartbeat()
+    
+    print("Encerrando daemon...", flush=True)
+    motor.parar_monitoramento()
+    motor.parar_manutencao()
+    motor.limpar_heartbeat()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Monitoramento de Logs JBOSS")
+    parser.add_argument("--db", default="logs_cache.db", help="Banco de dados SQLite")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Executa ingestão, alertas e persistência sem interface gráfica")
+    parser.add_argument("--caminho", action="append",
+                        help="Arquivo ou diretório de logs monitorado pelo daemon (pode repetir, um por nó)")
+    parser.add_argument("--syslog-udp", type=int, metavar="PORTA", help="Recebe syslog via UDP (daemon)")
+    parser.add_argument("--syslog-tcp", type=int, metavar="PORTA", help="Recebe syslog via TCP (daemon)")
+    parser.add_argument("--tcp-linhas", type=int, metavar="PORTA",
+                        help="Recebe logs via TCP, uma linha por mensagem (daemon)")
+    parser.add_argument("--endereco", help="Interface dos receptores de rede (padrão 0.0.0.0)")
+    parser.add_argument("--metricas", type=int, metavar="PORTA",
+                        help="Expõe as métricas do pipeline em http://127.0.0.1:PORTA/metrics (daemon)")
+    parser.add_argument("--carga-inicial", action="store_true",
+                        help="Carrega os arquivos existentes antes de começar a monitorar (daemon)")
+    parser.add_argument("--importar", metavar="CAMINHO",
+                        help="Importa todos os logs (inclusive .gz/.bz2/.xz rotacionados) de um arquivo ou diretório e sai")
+    parser.add_argument("--processos", type=int, help="Processos de trabalho da importação (padrão: núcleos da CPU)")
+    parser.add_argument("--reconstruir-rollups", action="store_true",
+                        help="Reconstrói as tabelas de rollup a partir dos logs e sai")
+    parser.add_argument("--exportar-parquet", metavar="DESTINO",
+                        help="Exporta os logs para Parquet particionado por dia e sai")
+    parser.add_argument("--exportar", metavar="DESTINO",
+                        help="Exporta os logs em streaming para CSV ou NDJSON (.csv, .ndjson, com .gz opcional) e sai")
+    parser.add_argument("--formato", choices=FORMATOS_EXPORTACAO, help="Formato do --exportar (padrão: pela extensão)")
+    parser.add_argument("--inicio", help="Início (YYYY-MM-DD[ HH:MM[:SS]]) dos comandos acima e da carga inicial")
+    parser.add_argument("--fim", help="Fim inclusivo (YYYY-MM-DD[ HH:MM[:SS]]) dos comandos acima e da carga inicial")
+    args = parser.parse_args(argv)
+    
+    ts_inicio = converter_para_ts(args.inicio)
+    ts_fim = converter_para_ts(args.fim, fim=True)
+    
+    if args.daemon:
+        receptores = {"syslog_udp": args.syslog_udp, "syslog_tcp": args.syslog_tcp,
+                      "tcp_linhas": args.tcp_linhas, "endereco_receptor": args.endereco}
+        motor = MotorMonitoramento(args.db)
+        if args.metricas is not None:
+            motor.diagnostico_config["porta_metricas"] = args.metricas
+        return executar_daemon(motor, args.caminho, args.carga_inicial, receptores, args.inicio, args.fim)
+    elif args.importar:
+        inicio = time.time()
+        motor = MotorMonitoramento(args.db)
+        total = motor.importar_historico(args.importar, args.processos)
+        motor.parar_manutencao()
+        print(f"{total} logs importados de {args.importar} em {time.time() - inicio:.1f}s")
+    elif args.reconstruir_rollups:
+        # Backfill sem interface gráfica
+        inicio = time.time()
+        conn = sqlite3.connect(args.db)
+        reconstruir_rollups(conn, ts_inicio, ts_fim)
+        conn.close()
+        print(f"Rollups reconstruídos em {time.time() - inicio:.1f}s")
+    elif args.exportar_parquet:
+        inicio = time.time()
+        conn = sqlite3.connect(args.db)
+        total = exportar_logs_parquet(conn, args.exportar_parquet, ts_inicio, ts_fim)
+        conn.close()
+        print(f"{total} logs exportados para {args.exportar_parquet} em {time.time() - inicio:.1f}s")
+    elif args.exportar:
+        motor = MotorMonitoramento(args.db)
+        tarefa = motor.exportar_logs(args.exportar, args.formato, {"ts_inicio": ts_inicio, "ts_fim": ts_fim})
+        try:
+            while tarefa and not tarefa.aguardar(1.0):
+                print(f"\r{tarefa.feitos}/{tarefa.total} logs ({tarefa.progresso():.0%})", end="", flush=True)
+        except KeyboardInterrupt:
+            tarefa.cancelar()
+            tarefa.aguardar()
+        motor.parar_manutencao()
+        if not tarefa or tarefa.estado != "concluida":
+            print("\nExportação não concluída")
+            return 1
+        print(f"\r{tarefa.feitos} logs exportados para {args.exportar} em {tarefa.fim - tarefa.inicio:.1f}s")
+    else:
+        parser.print_help()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,63 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import datetime
-import re
 import os
-import socket
+import sys
 import json
-import threading
-import time
 import queue
-import random
-from collections import Counter, deque
-import csv
-import sqlite3
-import hashlib
+import time
+import datetime
+
+from motor_monitoramento import MotorMonitoramento, TIPOS_RELATORIO, main as main_motor
+
+class ChamadaTkCronometrada(tk.CallWrapper):
+    """Callback do Tk (after, botões, eventos) com a duração enviada ao perfilador do motor
+
+    Instalada uma vez, na importação do módulo, no lugar de tkinter.CallWrapper:
+    callbacks acima de limite_lento_ms vão para operacoes_lentas.log quando o
+    perfilamento ou o registro de operações lentas está ligado. Sem perfilador
+    (nenhuma interface aberta) ou com a medição desligada, só repassa a chamada.
+    """
+    perfilador = None
+
+    def __call__(self, *args):
+        perfilador = self.perfilador
+        if perfilador is None or not perfilador.medindo_lentas():
+            return super().__call__(*args)
+        inicio = time.perf_counter()
+        try:
+            return super().__call__(*args)
+        finally:
+            nome = getattr(self.func, "__qualname__", None) or repr(self.func)
+            perfilador.registrar_duracao(f"tk:{nome}", time.perf_counter() - inicio)
+
+# Antes de qualquer widget registrar comandos; a medição depende do perfilamento do motor
+tk.CallWrapper = ChamadaTkCronometrada
 
 class SistemaMonitoramento(tk.Tk):
+    """Interface Tkinter: cliente fino do MotorMonitoramento (ingestão, alertas e banco)"""
+
     def __init__(self):
+        # O motor não depende do Tk; os atributos que não são da interface são delegados a ele
+        self.motor = MotorMonitoramento()
+        
+        # Callbacks do Tk medidos pelo perfilador deste motor (ver ChamadaTkCronometrada)
+        ChamadaTkCronometrada.perfilador = self.motor.perfilador
+        
         super().__init__()
         self.title("Sistema de Monitoramento de Logs JBOSS")
         self.geometry("1000x600")
         self.configure(bg="#f0f0f0")
         
-        # Variáveis globais
-        self.logs_data = None  # DataFrame para exibição (filtrado)
-        self.logs_completos = None  # DataFrame completo com todos os logs
+        # Variáveis da interface
         self.usuario_atual = None
-        self.caminho_logs = None
-        self.max_logs_memoria = 10000  # Limite de logs em memória
-        self.monitoramento_ativo = False
-        self.thread_monitoramento = None
-        self.fila_logs = queue.Queue()  # Fila para comunicação entre threads
-        self.alertas = []  # Lista para armazenar alertas
-        self.db_path = "logs_cache.db"  # Caminho para o banco de dados SQLite
-        
-        # Configurações de alertas
-        self.alertas_config = {
-            "falhas_login": 3,  # Número de falhas de login para gerar alerta
-            "acessos_suspeitos": True,  # Alertar sobre acessos fora do horário comercial
-            "urls_restritas": ["/admin", "/config", "/system", "/api/admin"]  # URLs restritas
-        }
-        
-        # Inicializar banco de dados
-        self.inicializar_db()
+        self.fila_interface = queue.Queue()  # Alertas e avisos vindos das threads do motor
+        self.versao_exibida = 0  # Última versao_dados do motor refletida na tela
         
-        # Carregar configurações salvas
-        self.carregar_configuracoes()
+        # As threads do motor só enfileiram; o loop do Tk consome em verificar_atualizacoes
+        self.motor.ouvintes_alerta.append(lambda alerta: self.fila_interface.put(("alerta", alerta)))
+        self.motor.ouvintes_aviso.append(lambda *aviso: self.fila_interface.put(("aviso", aviso)))
         
         # Inicializar frames
         self.frames = {}
@@ -57,80 +67,63 @@ class SistemaMonitoramento(tk.Tk):
         container.pack(fill="both", expand=True)
         
         # Criar frames para cada tela
-        for F in (TelaLogin, TelaDashboard, TelaDetalhes, TelaConfiguracoes, TelaRelatorios, TelaURLs, TelaAlertas):
+        for F in (TelaLogin, TelaDashboard, TelaDetalhes, TelaConfiguracoes, TelaRelatorios, TelaURLs, TelaAlertas,
+                  TelaDiagnosticos):
             frame_name = F.__name__
             frame = F(parent=container, controller=self)
             self.frames[frame_name] = frame
             frame.grid(row=0, column=0, sticky="nsew")
         
+        # Pontos de entrada da interface perfilados junto com os do motor
+        perfilador = self.motor.perfilador
+        self.verificar_atualizacoes = perfilador.envolver("verificar_atualizacoes", self.verificar_atualizacoes)
+        tela_dashboard = self.frames["TelaDashboard"]
+        tela_dashboard.atualizar_dashboard = perfilador.envolver("atualizar_dashboard", tela_dashboard.atualizar_dashboard)
+        
         # Iniciar com a tela de login
         self.mostrar_frame("TelaLogin")
         
+        # Iniciar verificação periódica das atualizações do motor
+        self.after(1000, self.verificar_atualizacoes)
+        
         # Configurar manipulador de fechamento da janela
         self.protocol("WM_DELETE_WINDOW", self.ao_fechar)
     
-    def inicializar_db(self):
-        """Inicializa o banco de dados SQLite para cache de logs"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Criar tabela de logs se não existir
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data TEXT,
-                hora TEXT,
-                nivel TEXT,
-                categoria TEXT,
-                servidor TEXT,
-                thread TEXT,
-                mensagem TEXT,
-                usuario TEXT,
-                ip TEXT,
-                url TEXT,
-                operacao TEXT,
-                status TEXT,
-                timestamp TEXT
-            )
-            ''')
-            
-            # Criar tabela de configurações se não existir
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configuracoes (
-                chave TEXT PRIMARY KEY,
-                valor TEXT
-            )
-            ''')
-            
-            # Criar tabela de alertas se não existir
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS alertas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                tipo TEXT,
-                nivel TEXT,
-                usuario TEXT,
-                ip TEXT,
-                url TEXT,
-                data TEXT,
-                hora TEXT,
-                mensagem TEXT,
-                detalhes TEXT,
-                timestamp TEXT,
-                lido INTEGER DEFAULT 0
-            )
-            ''')
-            
-            # Criar índices para melhorar performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_data ON logs (data)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_usuario ON logs (usuario)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_ip ON logs (ip)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_url ON logs (url)')
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Erro ao inicializar banco de dados: {str(e)}")
+    def __getattr__(self, nome):
+        """Delega ao motor o que não é da interface (carregar_logs_db, alertas, db_path etc.)"""
+        motor = self.__dict__.get('motor')
+        if motor is not None and hasattr(motor, nome):
+            return getattr(motor, nome)
+        return super().__getattr__(nome)
+    
+    # Estado alterado pelas telas: as atribuições precisam chegar ao motor
+    logs_data = property(lambda self: self.motor.logs_data,
+                         lambda self, valor: setattr(self.motor, 'logs_data', valor))
+    logs_completos = property(lambda self: self.motor.logs_completos,
+                              lambda self, valor: setattr(self.motor, 'logs_completos', valor))
+    caminho_logs = property(lambda self: self.motor.caminho_logs,
+                            lambda self, valor: setattr(self.motor, 'caminho_logs', valor))
+    max_logs_memoria = property(lambda self: self.motor.max_logs_memoria,
+                                lambda self, valor: setattr(self.motor, 'max_logs_memoria', valor))
+    alertas_config = property(lambda self: self.motor.alertas_config,
+                              lambda self, valor: setattr(self.motor, 'alertas_config', valor))
+    
+    def iniciar_sessao(self):
+        """Carrega os logs e inicia o monitoramento, ou segue o daemon se houver um ativo"""
+        if self.motor.daemon_ativo():
+            # Outro processo já ingere os logs: apenas ler do banco
+            self.motor.iniciar_modo_cliente()
+            return
+        
+        # Carregar dados de logs
+        if self.motor.caminho_logs:
+            self.motor.carregar_dados_logs()
+        else:
+            # Se não há caminho configurado, gerar dados de exemplo
+            self.motor.gerar_dados_exemplo()
+        
+        # Iniciar monitoramento em tempo real
+        self.motor.iniciar_monitoramento()
     
     def mostrar_frame(self, frame_name):
         """Mostra o frame especificado"""
@@ -140,862 +133,66 @@ class SistemaMonitoramento(tk.Tk):
         # Atualizar dados se necessário
         if frame_name == "TelaDashboard" and self.usuario_atual:
             self.frames["TelaDashboard"].atualizar_dashboard()
-        elif frame_name == "TelaDetalhes" and self.logs_data is not None:
-            self.frames["TelaDetalhes"].carregar_logs(self.logs_data)
-        elif frame_name == "TelaURLs" and self.logs_data is not None:
+        elif frame_name == "TelaDetalhes":
+            self.frames["TelaDetalhes"].aplicar_filtros()
+        elif frame_name == "TelaConfiguracoes":
+            self.frames["TelaConfiguracoes"].carregar_valores()
+        elif frame_name == "TelaURLs":
             self.frames["TelaURLs"].carregar_dados()
         elif frame_name == "TelaAlertas":
             self.frames["TelaAlertas"].carregar_alertas()
+        elif frame_name == "TelaDiagnosticos":
+            self.frames["TelaDiagnosticos"].atualizar()
     
-    def carregar_dados_logs(self, caminho=None):
-        """Carrega dados de logs de um arquivo ou diretório"""
-        if not caminho and self.caminho_logs:
-            caminho = self.caminho_logs
-        
-        if not caminho:
-            messagebox.showerror("Erro", "Caminho de logs não especificado.")
-            return False
-        
-        try:
-            if os.path.isdir(caminho):
-                # Carregar logs de um diretório
-                return self.carregar_logs_diretorio(caminho)
-            else:
-                # Carregar logs de um arquivo
-                return self.carregar_logs_arquivo(caminho)
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar logs: {str(e)}")
-            return False
-    
-    def carregar_logs_diretorio(self, diretorio):
-        """Carrega logs de todos os arquivos .log em um diretório"""
-        arquivos_log = [os.path.join(diretorio, f) for f in os.listdir(diretorio) if f.endswith('.log')]
-        
-        if not arquivos_log:
-            messagebox.showwarning("Aviso", f"Nenhum arquivo de log (.log) encontrado no diretório: {diretorio}")
-            return False
-        
-        # Ordenar arquivos por data de modificação (mais recentes primeiro)
-        arquivos_log.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        
-        # Limitar a quantidade de arquivos para não sobrecarregar a memória
-        max_arquivos = 5
-        if len(arquivos_log) > max_arquivos:
-            arquivos_log = arquivos_log[:max_arquivos]
-        
-        # Processar cada arquivo
-        logs_combinados = []
-        for arquivo in arquivos_log:
-            try:
-                logs = self.processar_arquivo_log(arquivo)
-                if logs:
-                    logs_combinados.extend(logs)
-            except Exception as e:
-                print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
-        
-        if not logs_combinados:
-            messagebox.showwarning("Aviso", "Nenhum log válido encontrado nos arquivos.")
-            return False
-        
-        # Converter para DataFrame
-        self.logs_completos = pd.DataFrame(logs_combinados)
-        
-        # Limitar quantidade de logs em memória
-        if len(self.logs_completos) > self.max_logs_memoria:
-            self.logs_completos = self.logs_completos.head(self.max_logs_memoria)
-        
-        # Ordenar por data e hora
-        self.logs_completos = self.logs_completos.sort_values(by=["data", "hora"], ascending=False)
-        
-        # Copiar para logs_data (para exibição)
-        self.logs_data = self.logs_completos.copy()
-        
-        # Salvar logs no banco de dados para cache
-        self.salvar_logs_db(logs_combinados)
-        
-        return True
-    
-    def carregar_logs_arquivo(self, arquivo):
-        """Carrega logs de um único arquivo"""
-        try:
-            logs = self.processar_arquivo_log(arquivo)
-            
-            if not logs:
-                messagebox.showwarning("Aviso", "Nenhum log válido encontrado no arquivo.")
-                return False
-            
-            # Converter para DataFrame
-            self.logs_completos = pd.DataFrame(logs)
-            
-            # Limitar quantidade de logs em memória
-            if len(self.logs_completos) > self.max_logs_memoria:
-                self.logs_completos = self.logs_completos.head(self.max_logs_memoria)
-            
-            # Ordenar por data e hora
-            self.logs_completos = self.logs_completos.sort_values(by=["data", "hora"], ascending=False)
-            
-            # Copiar para logs_data (para exibição)
-            self.logs_data = self.logs_completos.copy()
-            
-            # Salvar logs no banco de dados para cache
-            self.salvar_logs_db(logs)
-            
-            return True
-        
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar arquivo de log: {str(e)}")
-            return False
-    
-    def salvar_logs_db(self, logs):
-        """Salva logs no banco de dados SQLite para cache"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Preparar dados para inserção
-            for log in logs:
-                # Adicionar timestamp atual
-                log['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Inserir no banco de dados
-                cursor.execute('''
-                INSERT INTO logs (data, hora, nivel, categoria, servidor, thread, mensagem, usuario, ip, url, operacao, status, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    log.get('data', ''),
-                    log.get('hora', ''),
-                    log.get('nivel', ''),
-                    log.get('categoria', ''),
-                    log.get('servidor', ''),
-                    log.get('thread', ''),
-                    log.get('mensagem', ''),
-                    log.get('usuario', ''),
-                    log.get('ip', ''),
-                    log.get('url', ''),
-                    log.get('operacao', ''),
-                    log.get('status', ''),
-                    log.get('timestamp', '')
-                ))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Erro ao salvar logs no banco de dados: {str(e)}")
-    
-    def carregar_logs_db(self, filtros=None, limite=1000):
-        """Carrega logs do banco de dados SQLite com filtros opcionais"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Construir consulta SQL com filtros
-            query = "SELECT * FROM logs"
-            params = []
-            
-            if filtros:
-                where_clauses = []
-                
-                if 'data' in filtros and filtros['data']:
-                    where_clauses.append("data = ?")
-                    params.append(filtros['data'])
-                
-                if 'usuario' in filtros and filtros['usuario']:
-                    where_clauses.append("usuario LIKE ?")
-                    params.append(f"%{filtros['usuario']}%")
-                
-                if 'ip' in filtros and filtros['ip']:
-                    where_clauses.append("ip LIKE ?")
-                    params.append(f"%{filtros['ip']}%")
-                
-                if 'url' in filtros and filtros['url']:
-                    where_clauses.append("url LIKE ?")
-                    params.append(f"%{filtros['url']}%")
-                
-                if 'nivel' in filtros and filtros['nivel'] and filtros['nivel'] != "TODOS":
-                    where_clauses.append("nivel = ?")
-                    params.append(filtros['nivel'])
-                
-                if 'status' in filtros and filtros['status'] and filtros['status'] != "TODOS":
-                    where_clauses.append("status = ?")
-                    params.append(filtros['status'])
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
-            
-            # Adicionar ordenação e limite
-            query += " ORDER BY data DESC, hora DESC LIMIT ?"
-            params.append(limite)
-            
-            # Executar consulta
-            df = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-            
-            if df.empty:
-                return None
-            
-            return df
-        
-        except Exception as e:
-            print(f"Erro ao carregar logs do banco de dados: {str(e)}")
-            return None
-    
-    def processar_arquivo_log(self, arquivo):
-        """Processa um arquivo de log do JBOSS e extrai informações relevantes"""
-        logs = []
-        
-        try:
-            with open(arquivo, 'r', encoding='utf-8', errors='ignore') as f:
-                linhas = f.readlines()
-            
-            # Padrões de regex para diferentes formatos de log
-            # Formato 1: [data] [hora] [nível] [categoria] [mensagem]
-            padrao1 = r'\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+(.*)'
-            
-            # Formato 2: data hora [servidor] [nível] [categoria] - mensagem
-            padrao2 = r'(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2},\d{3})\s+\[(.*?)\]\s+\[(.*?)\]\s+\[(.*?)\]\s+-\s+(.*)'
-            
-            # Formato 3: data hora INFO [categoria] (thread) mensagem
-            padrao3 = r'(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2},\d{3})\s+(\w+)\s+\[(.*?)\]\s+$$(.*?)$$\s+(.*)'
-            
-            for linha in linhas:
-                linha = linha.strip()
-                if not linha:
-                    continue
-                
-                # Tentar diferentes padrões
-                match = re.match(padrao1, linha) or re.match(padrao2, linha) or re.match(padrao3, linha)
-                
-                if match:
-                    # Extrair informações com base no padrão que deu match
-                    if match.re.pattern == padrao1:
-                        data, hora, nivel, categoria, mensagem = match.groups()
-                        servidor = "desconhecido"
-                        thread = "desconhecido"
-                    elif match.re.pattern == padrao2:
-                        data, hora, servidor, nivel, categoria, mensagem = match.groups()
-                        thread = "desconhecido"
-                    else:  # padrao3
-                        data, hora, nivel, categoria, thread, mensagem = match.groups()
-                        servidor = "desconhecido"
-                    
-                    # Processar a mensagem para extrair informações adicionais
-                    log_info = self.extrair_info_mensagem(mensagem)
-                    
-                    # Adicionar informações básicas
-                    log_info.update({
-                        "data": self.formatar_data(data),
-                        "hora": self.formatar_hora(hora),
-                        "nivel": nivel,
-                        "categoria": categoria,
-                        "servidor": servidor,
-                        "thread": thread,
-                        "mensagem": mensagem
-                    })
-                    
-                    logs.append(log_info)
-                else:
-                    # Tentar extrair informações básicas da linha
-                    log_info = self.extrair_info_linha_simples(linha)
-                    if log_info:
-                        logs.append(log_info)
-            
-            # Se não encontrou logs no formato esperado, gerar dados de exemplo
-            if not logs:
-                print(f"Nenhum log encontrado no formato esperado em {arquivo}. Gerando dados de exemplo.")
-                self.gerar_dados_exemplo()
-                return []
-            
-            return logs
-        
-        except Exception as e:
-            print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
-            # Em caso de erro, gerar dados de exemplo
-            self.gerar_dados_exemplo()
-            return []
-    
-    def extrair_info_mensagem(self, mensagem):
-        """Extrai informações adicionais da mensagem de log"""
-        info = {
-            "usuario": "desconhecido",
-            "ip": "desconhecido",
-            "url": "desconhecido",
-            "operacao": "desconhecido",
-            "status": "desconhecido"
-        }
-        
-        # Extrair usuário
-        padrao_usuario = r'user[=:][\s]*[\'"]?([\w\.@-]+)[\'"]?'
-        match_usuario = re.search(padrao_usuario, mensagem, re.IGNORECASE)
-        if match_usuario:
-            info["usuario"] = match_usuario.group(1)
-        
-        # Extrair IP
-        padrao_ip = r'(?:IP|address|from)[=:][\s]*[\'"]?(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})[\'"]?'
-        match_ip = re.search(padrao_ip, mensagem, re.IGNORECASE)
-        if match_ip:
-            info["ip"] = match_ip.group(1)
-        
-        # Extrair URL
-        padrao_url = r'(?:URL|uri|path)[=:][\s]*[\'"]?((?:/[\w\.-]+)+)[\'"]?'
-        match_url = re.search(padrao_url, mensagem, re.IGNORECASE)
-        if match_url:
-            info["url"] = match_url.group(1)
-        
-        # Determinar operação
-        if re.search(r'login|authenticate|auth', mensagem, re.IGNORECASE):
-            info["operacao"] = "LOGIN"
-        elif re.search(r'logout|signout', mensagem, re.IGNORECASE):
-            info["operacao"] = "LOGOUT"
-        elif re.search(r'GET|view|read|select', mensagem, re.IGNORECASE):
-            info["operacao"] = "VIEW"
-        elif re.search(r'POST|PUT|update|modify', mensagem, re.IGNORECASE):
-            info["operacao"] = "UPDATE"
-        elif re.search(r'DELETE|remove', mensagem, re.IGNORECASE):
-            info["operacao"] = "DELETE"
-        
-        # Determinar status
-        if re.search(r'success|successful|succeeded|ok|200', mensagem, re.IGNORECASE):
-            info["status"] = "SUCCESS"
-        elif re.search(r'fail|failed|error|exception|denied|401|403|404|500', mensagem, re.IGNORECASE):
-            info["status"] = "FAILED"
-        
-        return info
+    def frame_visivel(self):
+        """Retorna o nome do frame exibido no momento"""
+        for frame_name, frame in self.frames.items():
+            if frame.winfo_viewable():
+                return frame_name
+        return None
     
-    def extrair_info_linha_simples(self, linha):
-        """Tenta extrair informações básicas de uma linha de log simples"""
-        # Tentar extrair data e hora
-        padrao_data_hora = r'(\d{4}-\d{2}-\d{2}).*?(\d{2}:\d{2}:\d{2})'
-        match_data_hora = re.search(padrao_data_hora, linha)
-        
-        if not match_data_hora:
-            return None
-        
-        data, hora = match_data_hora.groups()
-        
-        # Informações básicas
-        info = {
-            "data": self.formatar_data(data),
-            "hora": self.formatar_hora(hora),
-            "nivel": "INFO" if "INFO" in linha else "ERROR" if "ERROR" in linha else "WARN" if "WARN" in linha else "DEBUG" if "DEBUG" in linha else "UNKNOWN",
-            "categoria": "desconhecido",
-            "servidor": "desconhecido",
-            "thread": "desconhecido",
-            "mensagem": linha,
-            "usuario": "desconhecido",
-            "ip": "desconhecido",
-            "url": "desconhecido",
-            "operacao": "desconhecido",
-            "status": "SUCCESS" if "success" in linha.lower() else "FAILED" if "fail" in linha.lower() or "error" in linha.lower() else "UNKNOWN"
-        }
-        
-        # Tentar extrair IP
-        padrao_ip = r'\b(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\b'
-        match_ip = re.search(padrao_ip, linha)
-        if match_ip:
-            info["ip"] = match_ip.group(1)
+    def verificar_atualizacoes(self):
+        """Reflete na interface os alertas, avisos e logs produzidos pelas threads do motor"""
+        frame_name = self.frame_visivel()
         
-        # Tentar extrair URL
-        padrao_url = r'(?:/[\w\.-]+){2,}'
-        match_url = re.search(padrao_url, linha)
-        if match_url:
-            info["url"] = match_url.group(0)
-        
-        return info
-    
-    def formatar_data(self, data):
-        """Formata a data para o formato padrão YYYY-MM-DD"""
-        try:
-            # Tentar diferentes formatos de data
-            formatos = [
-                '%Y-%m-%d',  # 2023-01-31
-                '%d/%m/%Y',  # 31/01/2023
-                '%d-%m-%Y',  # 31-01-2023
-                '%d.%m.%Y',  # 31.01.2023
-                '%b %d, %Y',  # Jan 31, 2023
-                '%d %b %Y',   # 31 Jan 2023
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.datetime.strptime(data, formato).strftime('%Y-%m-%d')
-                except ValueError:
-                    continue
-            
-            # Se nenhum formato funcionar, retornar a data original
-            return data
-        except:
-            # Em caso de erro, retornar a data atual
-            return datetime.datetime.now().strftime('%Y-%m-%d')
-    
-    def formatar_hora(self, hora):
-        """Formata a hora para o formato padrão HH:MM:SS"""
-        try:
-            # Remover milissegundos se presentes
-            hora = hora.split(',')[0]
-            
-            # Tentar diferentes formatos de hora
-            formatos = [
-                '%H:%M:%S',  # 14:30:45
-                '%I:%M:%S %p',  # 02:30:45 PM
-                '%H:%M',  # 14:30
-                '%I:%M %p',  # 02:30 PM
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.datetime.strptime(hora, formato).strftime('%H:%M:%S')
-                except ValueError:
-                    continue
-            
-            # Se nenhum formato funcionar, retornar a hora original
-            return hora
-        except:
-            # Em caso de erro, retornar a hora atual
-            return datetime.datetime.now().strftime('%H:%M:%S')
-    
-    def gerar_dados_exemplo(self):
-        """Gera dados de exemplo para demonstração"""
-        # Lista de usuários de exemplo
-        usuarios = ["admin", "joao.silva", "maria.santos", "carlos.oliveira", "ana.pereira"]
-        
-        # Lista de IPs de exemplo
-        ips = ["192.168.1." + str(i) for i in range(1, 20)] + ["10.0.0." + str(i) for i in range(1, 10)]
-        
-        # Lista de URLs/endpoints de exemplo
-        urls = [
-            "/app/dashboard",
-            "/app/users",
-            "/app/reports",
-            "/app/settings",
-            "/api/data",
-            "/api/users",
-            "/api/auth/login",
-            "/api/auth/logout",
-            "/app/products",
-            "/app/orders"
-        ]
-        
-        # Lista de níveis de log
-        niveis = ["INFO", "WARN", "ERROR", "DEBUG"]
-        
-        # Lista de categorias
-        categorias = ["Security", "Authentication", "Database", "Application", "System"]
-        
-        # Lista de servidores
-        servidores = ["jboss1", "jboss2", "jboss3"]
-        
-        # Gerar 100 registros de log
-        data_atual = datetime.datetime.now()
-        logs = []
-        
-        for i in range(100):
-            # Data aleatória nos últimos 7 dias
-            delta = datetime.timedelta(
-                days=random.randint(0, 7),
-                hours=random.randint(0, 23),
-                minutes=random.randint(0, 59),
-                seconds=random.randint(0, 59)
-            )
-            data_log = data_atual - delta
-            
-            # Selecionar valores aleatórios
-            usuario = random.choice(usuarios)
-            ip = random.choice(ips)
-            url = random.choice(urls)
-            nivel = random.choice(niveis)
-            categoria = random.choice(categorias)
-            servidor = random.choice(servidores)
-            thread = f"Thread-{random.randint(1, 100)}"
-            
-            # Tipo de operação
-            operacao = random.choice(["LOGIN", "LOGOUT", "VIEW", "UPDATE", "DELETE"])
-            
-            # Status
-            status = random.choice(["SUCCESS", "FAILED", "SUCCESS", "SUCCESS", "SUCCESS"])
-            
-            # Gerar mensagem
-            if operacao == "LOGIN":
-                if status == "SUCCESS":
-                    mensagem = f"User {usuario} successfully logged in from IP={ip}"
-                else:
-                    mensagem = f"Failed login attempt for user {usuario} from IP={ip}"
-            elif operacao == "LOGOUT":
-                mensagem = f"User {usuario} logged out"
-            elif operacao == "VIEW":
-                mensagem = f"User {usuario} accessed URL={url} from IP={ip}"
-            elif operacao == "UPDATE":
-                mensagem = f"User {usuario} updated data at URL={url} from IP={ip}"
-            elif operacao == "DELETE":
-                mensagem = f"User {usuario} deleted data at URL={url} from IP={ip}"
-            
-            logs.append({
-                "data": data_log.strftime("%Y-%m-%d"),
-                "hora": data_log.strftime("%H:%M:%S"),
-                "nivel": nivel,
-                "categoria": categoria,
-                "servidor": servidor,
-                "thread": thread,
-                "mensagem": mensagem,
-                "usuario": usuario,
-                "ip": ip,
-                "url": url,
-                "operacao": operacao,
-                "status": status
-            })
-        
-        # Converter para DataFrame
-        self.logs_completos = pd.DataFrame(logs)
-        
-        # Ordenar por data e hora
-        self.logs_completos = self.logs_completos.sort_values(by=["data", "hora"], ascending=False)
-        
-        # Copiar para logs_data (para exibição)
-        self.logs_data = self.logs_completos.copy()
-        
-        # Salvar logs no banco de dados para cache
-        self.salvar_logs_db(logs)
-    
-    def iniciar_monitoramento(self):
-        """Inicia o monitoramento em tempo real dos logs"""
-        if self.monitoramento_ativo:
-            return
-        
-        self.monitoramento_ativo = True
-        
-        # Iniciar thread de monitoramento
-        self.thread_monitoramento = threading.Thread(target=self.monitorar_logs, daemon=True)
-        self.thread_monitoramento.start()
-        
-        # Iniciar verificação periódica da fila
-        self.after(1000, self.verificar_fila_logs)
-    
-    def parar_monitoramento(self):
-        """Para o monitoramento em tempo real dos logs"""
-        self.monitoramento_ativo = False
-        
-        # A thread vai parar automaticamente na próxima iteração
-        if self.thread_monitoramento:
-            self.thread_monitoramento.join(timeout=1.0)
-            self.thread_monitoramento = None
-    
-    def monitorar_logs(self):
-        """Função executada em uma thread separada para monitorar logs"""
-        ultimo_tamanho = {}  # Dicionário para armazenar o último tamanho de cada arquivo
-        
-        while self.monitoramento_ativo:
+        # Processar até 20 eventos por vez para não bloquear a interface
+        for _ in range(20):
             try:
-                if not self.caminho_logs:
-                    time.sleep(2)
-                    continue
-                
-                if os.path.isdir(self.caminho_logs):
-                    # Monitorar todos os arquivos .log no diretório
-                    arquivos_log = [os.path.join(self.caminho_logs, f) for f in os.listdir(self.caminho_logs) if f.endswith('.log')]
-                    
-                    for arquivo in arquivos_log:
-                        self.verificar_novos_logs(arquivo, ultimo_tamanho)
-                else:
-                    # Monitorar um único arquivo
-                    self.verificar_novos_logs(self.caminho_logs, ultimo_tamanho)
-                
-                # Aguardar antes da próxima verificação
-                time.sleep(2)
-            
-            except Exception as e:
-                print(f"Erro no monitoramento: {str(e)}")
-                time.sleep(5)  # Aguardar mais tempo em caso de erro
-    
-    def verificar_novos_logs(self, arquivo, ultimo_tamanho):
-        """Verifica se há novos logs em um arquivo"""
-        try:
-            # Verificar se o arquivo existe
-            if not os.path.exists(arquivo):
-                return
-            
-            # Obter o tamanho atual do arquivo
-            tamanho_atual = os.path.getsize(arquivo)
-            
-            # Se é a primeira vez que verificamos este arquivo, apenas armazenar o tamanho
-            if arquivo not in ultimo_tamanho:
-                ultimo_tamanho[arquivo] = tamanho_atual
-                return
-            
-            # Se o arquivo não mudou de tamanho, não há novos logs
-            if tamanho_atual <= ultimo_tamanho[arquivo]:
-                return
-            
-            # Ler apenas as novas linhas
-            with open(arquivo, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(ultimo_tamanho[arquivo])
-                novas_linhas = f.readlines()
-            
-            # Atualizar o último tamanho conhecido
-            ultimo_tamanho[arquivo] = tamanho_atual
-            
-            # Processar as novas linhas
-            for linha in novas_linhas:
-                linha = linha.strip()
-                if not linha:
-                    continue
-                
-                # Tentar extrair informações da linha
-                log_info = self.extrair_info_linha_simples(linha)
-                
-                if log_info:
-                    # Adicionar à fila para processamento na thread principal
-                    self.fila_logs.put(log_info)
-        
-        except Exception as e:
-            print(f"Erro ao verificar novos logs em {arquivo}: {str(e)}")
-    
-    def verificar_fila_logs(self):
-        """Verifica a fila de logs e atualiza a interface"""
-        # Processar até 100 logs por vez para não bloquear a interface
-        logs_processados = 0
-        novos_logs = []
-        
-        while not self.fila_logs.empty() and logs_processados < 100:
-            try:
-                log_info = self.fila_logs.get_nowait()
-                novos_logs.append(log_info)
-                logs_processados += 1
+                tipo, conteudo = self.fila_interface.get_nowait()
             except queue.Empty:
                 break
-        
-        if novos_logs:
-            # Adicionar novos logs ao DataFrame
-            novos_df = pd.DataFrame(novos_logs)
-            
-            if self.logs_completos is None:
-                self.logs_completos = novos_df
-            else:
-                self.logs_completos = pd.concat([novos_df, self.logs_completos], ignore_index=True)
-            
-            # Limitar quantidade de logs em memória
-            if len(self.logs_completos) > self.max_logs_memoria:
-                self.logs_completos = self.logs_completos.head(self.max_logs_memoria)
-            
-            # Ordenar por data e hora
-            self.logs_completos = self.logs_completos.sort_values(by=["data", "hora"], ascending=False)
             
-            # Atualizar logs_data (para exibição)
-            self.logs_data = self.logs_completos.copy()
-            
-            # Salvar logs no banco de dados para cache
-            self.salvar_logs_db(novos_logs)
-            
-            # Verificar alertas
-            for log in novos_logs:
-                self.verificar_alerta(log)
-            
-            # Atualizar interface se estiver na tela relevante
-            frame_atual = [f for f in self.frames.values() if f.winfo_viewable()][0]
-            frame_name = frame_atual.__class__.__name__
-            
-            if frame_name == "TelaDashboard":
-                self.frames["TelaDashboard"].atualizar_dashboard()
-            elif frame_name == "TelaDetalhes":
-                self.frames["TelaDetalhes"].carregar_logs(self.logs_data)
-            elif frame_name == "TelaURLs":
-                self.frames["TelaURLs"].carregar_dados()
-        
-        # Agendar próxima verificação se o monitoramento estiver ativo
-        if self.monitoramento_ativo:
-            self.after(1000, self.verificar_fila_logs)
-    
-    def verificar_alerta(self, log):
-        """Verifica se um log deve gerar um alerta"""
-        # Verificar falhas de login
-        if (log['operacao'] == 'LOGIN' and log['status'] == 'FAILED' and 
-            'falhas_login' in self.alertas_config):
-            
-            # Contar falhas recentes para este usuário/IP
-            if self.logs_completos is not None:
-                usuario = log['usuario']
-                ip = log['ip']
-                
-                # Filtrar logs recentes (últimas 24 horas)
-                data_limite = (datetime.datetime.now() - datetime.timedelta(hours=24)).strftime('%Y-%m-%d')
-                logs_recentes = self.logs_completos[
-                    (self.logs_completos['data'] >= data_limite) & 
-                    (self.logs_completos['operacao'] == 'LOGIN') & 
-                    (self.logs_completos['status'] == 'FAILED') & 
-                    (self.logs_completos['usuario'] == usuario) & 
-                    (self.logs_completos['ip'] == ip)
-                ]
-                
-                # Se o número de falhas atingiu o limite, gerar alerta
-                if len(logs_recentes) >= self.alertas_config['falhas_login']:
-                    self.adicionar_alerta({
-                        'tipo': 'falha_login',
-                        'nivel': 'alto',
-                        'usuario': usuario,
-                        'ip': ip,
-                        'url': '',
-                        'data': log['data'],
-                        'hora': log['hora'],
-                        'mensagem': f"Múltiplas falhas de login ({len(logs_recentes)}) para o usuário {usuario} do IP {ip}",
-                        'detalhes': f"Detectadas {len(logs_recentes)} tentativas de login malsucedidas nas últimas 24 horas."
-                    })
-        
-        # Verificar acessos fora do horário comercial
-        if (self.alertas_config.get('acessos_suspeitos', False) and 
-            log['status'] == 'SUCCESS'):
-            
-            # Extrair hora
-            try:
-                hora = int(log['hora'].split(':')[0])
-                
-                # Verificar se está fora do horário comercial (antes das 8h ou depois das 18h)
-                if hora < 8 or hora > 18:
-                    self.adicionar_alerta({
-                        'tipo': 'horario_suspeito',
-                        'nivel': 'médio',
-                        'usuario': log['usuario'],
-                        'ip': log['ip'],
-                        'url': log['url'],
-                        'data': log['data'],
-                        'hora': log['hora'],
-                        'mensagem': f"Acesso fora do horário comercial pelo usuário {log['usuario']} às {log['hora']}",
-                        'detalhes': f"O usuário {log['usuario']} acessou o sistema do IP {log['ip']} às {log['hora']}, fora do horário comercial (8h-18h)."
-                    })
-            except:
-                pass
-        
-        # Verificar acessos a URLs restritas
-        if ('urls_restritas' in self.alertas_config and 
-            self.alertas_config['urls_restritas'] and 
-            log['url'] != 'desconhecido'):
-            
-            for url_restrita in self.alertas_config['urls_restritas']:
-                if url_restrita in log['url']:
-                    self.adicionar_alerta({
-                        'tipo': 'url_restrita',
-                        'nivel': 'alto' if log['status'] == 'SUCCESS' else 'médio',
-                        'usuario': log['usuario'],
-                        'ip': log['ip'],
-                        'url': log['url'],
-                        'data': log['data'],
-                        'hora': log['hora'],
-                        'mensagem': f"Acesso a URL restrita {log['url']} pelo usuário {log['usuario']}",
-                        'detalhes': f"O usuário {log['usuario']} acessou a URL restrita {log['url']} do IP {log['ip']} às {log['hora']}. Status: {log['status']}"
-                    })
-                    break
-    
-    def adicionar_alerta(self, alerta):
-        """Adiciona um novo alerta à lista de alertas"""
-        # Verificar se já existe um alerta similar recente
-        for a in self.alertas:
-            if (a['tipo'] == alerta['tipo'] and 
-                a['usuario'] == alerta['usuario'] and 
-                a['data'] == alerta['data']):
-                # Já existe um alerta similar hoje, não duplicar
-                return
-        
-        # Adicionar timestamp
-        alerta['timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Adicionar à lista de alertas
-        self.alertas.append(alerta)
-        
-        # Limitar número de alertas armazenados
-        max_alertas = 100
-        if len(self.alertas) > max_alertas:
-            self.alertas = self.alertas[-max_alertas:]
-        
-        # Salvar alerta no banco de dados
-        self.salvar_alerta_db(alerta)
-        
-        # Notificar usuário se estiver na tela de alertas
-        frame_atual = [f for f in self.frames.values() if f.winfo_viewable()][0]
-        frame_name = frame_atual.__class__.__name__
-        
-        if frame_name == "TelaAlertas":
-            self.frames["TelaAlertas"].carregar_alertas()
-        else:
-            # Mostrar notificação
-            self.mostrar_notificacao_alerta(alerta)
-    
-    def salvar_alerta_db(self, alerta):
-        """Salva um alerta no banco de dados"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO alertas (tipo, nivel, usuario, ip, url, data, hora, mensagem, detalhes, timestamp, lido)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                alerta.get('tipo', ''),
-                alerta.get('nivel', ''),
-                alerta.get('usuario', ''),
-                alerta.get('ip', ''),
-                alerta.get('url', ''),
-                alerta.get('data', ''),
-                alerta.get('hora', ''),
-                alerta.get('mensagem', ''),
-                alerta.get('detalhes', ''),
-                alerta.get('timestamp', ''),
-                0  # Não lido
-            ))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Erro ao salvar alerta no banco de dados: {str(e)}")
-    
-    def carregar_alertas_db(self):
-        """Carrega alertas do banco de dados"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT tipo, nivel, usuario, ip, url, data, hora, mensagem, detalhes, timestamp, lido, id
-            FROM alertas
-            ORDER BY timestamp DESC
-            ''')
-            
-            alertas = []
-            for row in cursor.fetchall():
-                alertas.append({
-                    'tipo': row[0],
-                    'nivel': row[1],
-                    'usuario': row[2],
-                    'ip': row[3],
-                    'url': row[4],
-                    'data': row[5],
-                    'hora': row[6],
-                    'mensagem': row[7],
-                    'detalhes': row[8],
-                    'timestamp': row[9],
-                    'lido': bool(row[10]),
-                    'id': row[11]
-                })
-            
-            conn.close()
-            return alertas
-        except Exception as e:
-            print(f"Erro ao carregar alertas do banco de dados: {str(e)}")
-            return []
-    
-    def marcar_alerta_como_lido(self, alerta_id):
-        """Marca um alerta como lido no banco de dados"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('UPDATE alertas SET lido = 1 WHERE id = ?', (alerta_id,))
-            
-            conn.commit()
-            conn.close()
-            
-            # Atualizar também na lista em memória
-            for alerta in self.alertas:
-                if alerta.get('id') == alerta_id:
-                    alerta['lido'] = True
-                    break
-        except Exception as e:
-            print(f"Erro ao marcar alerta como lido: {str(e)}")
+            if tipo == "aviso":
+                nivel, titulo, mensagem = conteudo
+                if nivel == "erro":
+                    messagebox.showerror(titulo, mensagem)
+                else:
+                    messagebox.showwarning(titulo, mensagem)
+            elif frame_name == "TelaAlertas":
+                self.frames["TelaAlertas"].carregar_alertas()
+            elif self.usuario_atual:
+                # Mostrar notificação
+                self.mostrar_notificacao_alerta(conteudo)
+        
+        # Redesenhar a tela atual apenas quando o motor alterou os logs em memória
+        versao = self.motor.versao_dados
+        if versao != self.versao_exibida and self.usuario_atual:
+            self.versao_exibida = versao
+            
+            # Tempo de redesenho entra nas métricas do pipeline (etapa "interface")
+            with self.motor.metricas.medir("interface"):
+                if frame_name == "TelaDashboard":
+                    self.frames["TelaDashboard"].atualizar_dashboard()
+                elif frame_name == "TelaDetalhes":
+                    self.frames["TelaDetalhes"].aplicar_filtros()
+                elif frame_name == "TelaURLs":
+                    self.frames["TelaURLs"].carregar_dados()
+        
+        # A tela de diagnóstico acompanha as métricas a cada verificação
+        if frame_name == "TelaDiagnosticos":
+            self.frames["TelaDiagnosticos"].atualizar()
+        
+        self.after(1000, self.verificar_atualizacoes)
     
     def mostrar_notificacao_alerta(self, alerta):
         """Mostra uma notificação de alerta"""
@@ -1046,96 +243,20 @@ class SistemaMonitoramento(tk.Tk):
         # Auto-fechar após 10 segundos
         notificacao.after(10000, notificacao.destroy)
     
-    def carregar_configuracoes(self):
-        """Carrega configurações salvas"""
-        try:
-            # Primeiro tentar carregar do banco de dados
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Verificar se a tabela existe
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='configuracoes'")
-            if cursor.fetchone():
-                # Carregar configurações
-                cursor.execute("SELECT chave, valor FROM configuracoes")
-                for chave, valor in cursor.fetchall():
-                    if chave == 'caminho_logs':
-                        self.caminho_logs = valor
-                    elif chave == 'max_logs_memoria':
-                        self.max_logs_memoria = int(valor)
-                    elif chave == 'alertas_config':
-                        self.alertas_config = json.loads(valor)
-            
-            conn.close()
-            
-            # Se não encontrou no banco de dados, tentar arquivo JSON
-            if not self.caminho_logs and os.path.exists('config.json'):
-                with open('config.json', 'r') as f:
-                    config = json.load(f)
-                
-                # Carregar configurações
-                if 'caminho_logs' in config:
-                    self.caminho_logs = config['caminho_logs']
-                
-                if 'max_logs_memoria' in config:
-                    self.max_logs_memoria = config['max_logs_memoria']
-                
-                if 'alertas_config' in config:
-                    self.alertas_config = config['alertas_config']
-                
-                # Salvar no banco de dados para futuras execuções
-                self.salvar_configuracoes()
-        except Exception as e:
-            print(f"Erro ao carregar configurações: {str(e)}")
-    
-    def salvar_configuracoes(self):
-        """Salva configurações atuais"""
-        try:
-            # Salvar no banco de dados
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Limpar configurações existentes
-            cursor.execute("DELETE FROM configuracoes")
-            
-            # Inserir novas configurações
-            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
-                          ('caminho_logs', self.caminho_logs or ''))
-            
-            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
-                          ('max_logs_memoria', str(self.max_logs_memoria)))
-            
-            cursor.execute("INSERT INTO configuracoes (chave, valor) VALUES (?, ?)", 
-                          ('alertas_config', json.dumps(self.alertas_config)))
-            
-            conn.commit()
-            conn.close()
-            
-            # Também salvar em arquivo JSON para compatibilidade
-            config = {
-                'caminho_logs': self.caminho_logs,
-                'max_logs_memoria': self.max_logs_memoria,
-                'alertas_config': self.alertas_config
-            }
-            
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=4)
-            
-            return True
-        except Exception as e:
-            print(f"Erro ao salvar configurações: {str(e)}")
-            return False
-    
     def ao_fechar(self):
         """Manipulador para quando a janela é fechada"""
         # Parar monitoramento se estiver ativo
-        if self.monitoramento_ativo:
-            self.parar_monitoramento()
+        if self.motor.monitoramento_ativo:
+            self.motor.parar_monitoramento()
+        
+        # Parar manutenção do armazenamento
+        self.motor.parar_manutencao()
         
         # Salvar configurações
-        self.salvar_configuracoes()
+        self.motor.salvar_configuracoes()
         
         # Fechar a aplicação
+        ChamadaTkCronometrada.perfilador = None
         self.destroy()
 
 class TelaLogin(tk.Frame):
@@ -1223,15 +344,8 @@ class TelaLogin(tk.Frame):
             
             self.controller.usuario_atual = usuario
             
-            # Carregar dados de logs
-            if self.controller.caminho_logs:
-                self.controller.carregar_dados_logs()
-            else:
-                # Se não há caminho configurado, gerar dados de exemplo
-                self.controller.gerar_dados_exemplo()
-            
-            # Iniciar monitoramento em tempo real
-            self.controller.iniciar_monitoramento()
+            # Carregar dados de logs e iniciar monitoramento (ou seguir o daemon)
+            self.controller.iniciar_sessao()
             
             # Ir para o dashboard
             self.controller.mostrar_frame("TelaDashboard")
@@ -1271,6 +385,7 @@ class TelaDashboard(tk.Frame):
             ("Alertas", lambda: self.controller.mostrar_frame("TelaAlertas")),
             ("Relatórios", lambda: self.controller.mostrar_frame("TelaRelatorios")),
             ("Configurações", lambda: self.controller.mostrar_frame("TelaConfiguracoes")),
+            ("Diagnóstico", lambda: self.controller.mostrar_frame("TelaDiagnosticos")),
             ("Sair", self.logout)
         ]
         
@@ -1290,7 +405,9 @@ class TelaDashboard(tk.Frame):
     
     def atualizar_status_monitoramento(self):
         """Atualiza o status de monitoramento na interface"""
-        if self.controller.monitoramento_ativo:
+        if self.controller.monitoramento_ativo and self.controller.modo_cliente:
+            self.label_monitoramento.config(text="Monitoramento: Daemon", fg="#4CAF50")
+        elif self.controller.monitoramento_ativo:
             self.label_monitoramento.config(text="Monitoramento: Ativo", fg="#4CAF50")
         else:
             self.label_monitoramento.config(text="Monitoramento: Inativo", fg="#f44336")
@@ -1324,7 +441,9 @@ class TelaDashboard(tk.Frame):
     
     def atualizar_dashboard(self):
         """Atualiza todos os painéis do dashboard com dados atuais"""
-        if self.controller.logs_data is None:
+        # Agregados calculados pelo motor (mesmos números do benchmark "suite")
+        dados = self.controller.dados_dashboard()
+        if dados is None:
             return
         
         # Limpar painéis existentes
@@ -1338,26 +457,17 @@ class TelaDashboard(tk.Frame):
             widget.destroy()
         
         # Atualizar cada painel
-        self.atualizar_painel_resumo()
-        self.atualizar_painel_usuarios()
-        self.atualizar_painel_horas()
-        self.atualizar_painel_ultimos()
+        self.atualizar_painel_resumo(dados)
+        self.atualizar_painel_usuarios(dados)
+        self.atualizar_painel_horas(dados)
+        self.atualizar_painel_ultimos(dados)
     
-    def atualizar_painel_resumo(self):
+    def atualizar_painel_resumo(self, dados):
         """Atualiza o painel de resumo"""
-        logs = self.controller.logs_data
-        
         # Título do painel
         tk.Label(self.painel_resumo, text="Resumo de Acessos", 
                 font=("Arial", 12, "bold"), bg="white").pack(anchor="w")
         
-        # Estatísticas
-        total_acessos = len(logs)
-        total_usuarios = logs['usuario'].nunique()
-        total_ips = logs['ip'].nunique()
-        total_urls = logs['url'].nunique()
-        acessos_hoje = len(logs[logs['data'] == datetime.datetime.now().strftime("%Y-%m-%d")])
-        
         # Frame para estatísticas
         frame_stats = tk.Frame(self.painel_resumo, bg="white")
         frame_stats.pack(fill="both", expand=True, pady=10)
@@ -1370,12 +480,11 @@ class TelaDashboard(tk.Frame):
         frame_stats.rowconfigure(2, weight=1)
         
         # Exibir estatísticas em cards
-        self.criar_card_estatistica(frame_stats, "Total de Acessos", total_acessos, 0, 0)
-        self.criar_card_estatistica(frame_stats, "Usuários Únicos", total_usuarios, 0, 1)
-        self.criar_card_estatistica(frame_stats, "IPs Únicos", total_ips, 1, 0)
-        self.criar_card_estatistica(frame_stats, "URLs Únicas", total_urls, 1, 1)
-        self.criar_card_estatistica(frame_stats, "Acessos Hoje", acessos_hoje, 2,  total_urls, 1, 1)
-        self.criar_card_estatistica(frame_stats, "Acessos Hoje", acessos_hoje, 2, 0, colspan=2)
+        self.criar_card_estatistica(frame_stats, "Total de Acessos", dados["total_acessos"], 0, 0)
+        self.criar_card_estatistica(frame_stats, "Usuários Únicos", dados["total_usuarios"], 0, 1)
+        self.criar_card_estatistica(frame_stats, "IPs Únicos", dados["total_ips"], 1, 0)
+        self.criar_card_estatistica(frame_stats, "URLs Únicas", dados["total_urls"], 1, 1)
+        self.criar_card_estatistica(frame_stats, "Acessos Hoje", dados["acessos_hoje"], 2, 0, colspan=2)
     
     def criar_card_estatistica(self, parent, titulo, valor, row, col, colspan=1):
         """Cria um card para exibir uma estatística"""
@@ -1385,16 +494,14 @@ class TelaDashboard(tk.Frame):
         tk.Label(frame, text=titulo, font=("Arial", 10), bg="#f9f9f9").pack(anchor="w")
         tk.Label(frame, text=str(valor), font=("Arial", 16, "bold"), bg="#f9f9f9").pack(anchor="center", pady=5)
     
-    def atualizar_painel_usuarios(self):
+    def atualizar_painel_usuarios(self, dados):
         """Atualiza o gráfico de acessos por usuário"""
-        logs = self.controller.logs_data
-        
         # Título do painel
         tk.Label(self.painel_usuarios, text="Acessos por Usuário", 
                 font=("Arial", 12, "bold"), bg="white").pack(anchor="w")
         
         # Contar acessos por usuário
-        contagem_usuarios = logs['usuario'].value_counts().head(5)
+        contagem_usuarios = dados["top_usuarios"]
         
         # Criar figura para o gráfico
         fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
@@ -1416,21 +523,14 @@ class TelaDashboard(tk.Frame):
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
     
-    def atualizar_painel_horas(self):
+    def atualizar_painel_horas(self, dados):
         """Atualiza o gráfico de acessos por hora"""
-        logs = self.controller.logs_data
-        
         # Título do painel
         tk.Label(self.painel_horas, text="Acessos por Hora do Dia", 
                 font=("Arial", 12, "bold"), bg="white").pack(anchor="w")
         
-        # Extrair hora dos logs
-        logs['hora_apenas'] = logs['hora'].apply(lambda x: int(x.split(':')[0]))
-        contagem_horas = logs['hora_apenas'].value_counts().sort_index()
-        
-        # Preencher horas faltantes com zeros
-        todas_horas = pd.Series(0, index=range(24))
-        contagem_horas = contagem_horas.add(todas_horas, fill_value=0).sort_index()
+        # Acessos por hora do dia (horas sem acesso já vêm com zero)
+        contagem_horas = dados["acessos_por_hora"]
         
         # Criar figura para o gráfico
         fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
@@ -1447,10 +547,8 @@ class TelaDashboard(tk.Frame):
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
     
-    def atualizar_painel_ultimos(self):
+    def atualizar_painel_ultimos(self, dados):
         """Atualiza a lista dos últimos acessos"""
-        logs = self.controller.logs_data
-        
         # Título do painel
         tk.Label(self.painel_ultimos, text="Últimos Acessos", 
                 font=("Arial", 12, "bold"), bg="white").pack(anchor="w")
@@ -1466,7 +564,7 @@ class TelaDashboard(tk.Frame):
                     bg="#e0e0e0", padx=5, pady=2).grid(row=0, column=i, sticky="ew")
         
         # Últimos 5 registros
-        ultimos_logs = logs.head(5)
+        ultimos_logs = dados["ultimos"]
         for i, (_, log) in enumerate(ultimos_logs.iterrows(), 1):
             bg_color = "#f0f0f0" if i % 2 == 0 else "white"
             
@@ -1485,6 +583,227 @@ class TelaDashboard(tk.Frame):
         self.controller.parar_monitoramento()
         self.controller.mostrar_frame("TelaLogin")
 
+class TelaDetalhes(tk.Frame):
+    """Tabela de logs: sem filtros mostra os logs em memória, com filtros consulta o banco pelo motor"""
+
+    COLUNAS = ("data", "hora", "nivel", "usuario", "ip", "url", "operacao", "status", "mensagem")
+    TITULOS = ("Data", "Hora", "Nível", "Usuário", "IP", "URL", "Operação", "Status", "Mensagem")
+    LIMITE = 1000  # Linhas exibidas na tabela
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#f0f0f0")
+        self.controller = controller
+        
+        # Barra superior
+        barra_superior = tk.Frame(self, bg="#333333", height=50)
+        barra_superior.pack(fill="x")
+        
+        tk.Label(barra_superior, text="Logs Detalhados", 
+                font=("Arial", 12, "bold"), bg="#333333", fg="white").pack(side="left", padx=20)
+        
+        tk.Button(barra_superior, text="Voltar", command=lambda: self.controller.mostrar_frame("TelaDashboard"),
+                 bg="#333333", fg="white", bd=0, padx=10,
+                 activebackground="#555555", activeforeground="white").pack(side="right", padx=20)
+        
+        self.frame_principal = tk.Frame(self, bg="#f0f0f0", padx=10, pady=10)
+        self.frame_principal.pack(fill="both", expand=True)
+        
+        # Filtros (usuário, IP e URL casam em qualquer posição; texto usa o índice FTS5 da mensagem)
+        frame_filtros = tk.Frame(self.frame_principal, bg="white", padx=10, pady=10)
+        frame_filtros.pack(fill="x", pady=5)
+        
+        self.filtro_data = self.criar_filtro(frame_filtros, "Data (AAAA-MM-DD):", 12)
+        self.filtro_usuario = self.criar_filtro(frame_filtros, "Usuário:", 14)
+        self.filtro_ip = self.criar_filtro(frame_filtros, "IP:", 14)
+        self.filtro_url = self.criar_filtro(frame_filtros, "URL:", 18)
+        self.filtro_texto = self.criar_filtro(frame_filtros, "Texto:", 18)
+        
+        tk.Label(frame_filtros, text="Status:", bg="white").pack(side="left", padx=(10, 5))
+        self.filtro_status = ttk.Combobox(frame_filtros, values=["TODOS", "SUCCESS", "FAILED"], width=10,
+                                          state="readonly")
+        self.filtro_status.set("TODOS")
+        self.filtro_status.pack(side="left", padx=5)
+        
+        tk.Button(frame_filtros, text="Filtrar", command=self.aplicar_filtros,
+                 bg="#4CAF50", fg="white").pack(side="left", padx=5)
+        tk.Button(frame_filtros, text="Limpar", command=self.limpar_filtros,
+                 bg="#2196F3", fg="white").pack(side="left", padx=5)
+        
+        self.label_resumo = tk.Label(self.frame_principal, text="", font=("Arial", 10), bg="#f0f0f0", anchor="w")
+        self.label_resumo.pack(fill="x", pady=5)
+        
+        # Tabela de logs com barra de rolagem
+        frame_tabela = tk.Frame(self.frame_principal, bg="#f0f0f0")
+        frame_tabela.pack(fill="both", expand=True)
+        
+        self.tabela = ttk.Treeview(frame_tabela, columns=self.COLUNAS, show="headings")
+        for coluna, titulo in zip(self.COLUNAS, self.TITULOS):
+            self.tabela.heading(coluna, text=titulo)
+            self.tabela.column(coluna, width=320 if coluna == "mensagem" else 90, anchor="w")
+        
+        barra_rolagem = ttk.Scrollbar(frame_tabela, orient="vertical", command=self.tabela.yview)
+        self.tabela.configure(yscrollcommand=barra_rolagem.set)
+        barra_rolagem.pack(side="right", fill="y")
+        self.tabela.pack(side="left", fill="both", expand=True)
+    
+    def criar_filtro(self, parent, texto, largura):
+        """Cria um campo de filtro com rótulo; Enter aplica os filtros"""
+        tk.Label(parent, text=texto, bg="white").pack(side="left", padx=(10, 5))
+        entrada = tk.Entry(parent, width=largura)
+        entrada.bind("<Return>", lambda _: self.aplicar_filtros())
+        entrada.pack(side="left")
+        return entrada
+    
+    def obter_filtros(self):
+        """Filtros preenchidos na tela, no formato de carregar_logs_db"""
+        filtros = {
+            "data": self.filtro_data.get().strip(),
+            "usuario": self.filtro_usuario.get().strip(),
+            "ip": self.filtro_ip.get().strip(),
+            "url": self.filtro_url.get().strip(),
+            "texto": self.filtro_texto.get().strip(),
+            "status": self.filtro_status.get(),
+        }
+        return {campo: valor for campo, valor in filtros.items() if valor and valor != "TODOS"}
+    
+    def aplicar_filtros(self):
+        """Exibe os logs em memória ou, havendo filtros, os logs do banco que os atendem"""
+        filtros = self.obter_filtros()
+        if not filtros:
+            self.carregar_logs(self.controller.logs_data)
+            return
+        
+        self.carregar_logs(self.controller.carregar_logs_db(filtros, self.LIMITE))
+    
+    def limpar_campos(self):
+        for entrada in (self.filtro_data, self.filtro_usuario, self.filtro_ip, self.filtro_url, self.filtro_texto):
+            entrada.delete(0, tk.END)
+        self.filtro_status.set("TODOS")
+    
+    def limpar_filtros(self):
+        self.limpar_campos()
+        self.aplicar_filtros()
+    
+    def carregar_logs(self, logs):
+        """Substitui o conteúdo da tabela pelos logs mais recentes do DataFrame"""
+        self.tabela.delete(*self.tabela.get_children())
+        if logs is None or logs.empty:
+            self.label_resumo.config(text="Nenhum log encontrado")
+            return
+        
+        if "ts_evento" in logs.columns:
+            logs = logs.sort_values(by="ts_evento", ascending=False, kind="stable")
+        else:
+            logs = logs.iloc[::-1]
+        exibidos = logs.head(self.LIMITE).reindex(columns=self.COLUNAS)
+        
+        for linha in exibidos.itertuples(index=False):
+            # Colunas ausentes no DataFrame (None ou NaN) ficam em branco
+            self.tabela.insert("", "end", values=["" if valor is None or valor != valor else valor
+                                                  for valor in linha])
+        
+        self.label_resumo.config(text=f"{len(exibidos)} de {len(logs)} logs exibidos (mais recentes primeiro)")
+
+class TelaConfiguracoes(tk.Frame):
+    """Caminho dos logs, limite de logs em memória e regras de alerta, salvos pelo motor"""
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#f0f0f0")
+        self.controller = controller
+        
+        # Barra superior
+        barra_superior = tk.Frame(self, bg="#333333", height=50)
+        barra_superior.pack(fill="x")
+        
+        tk.Label(barra_superior, text="Configurações", 
+                font=("Arial", 12, "bold"), bg="#333333", fg="white").pack(side="left", padx=20)
+        
+        tk.Button(barra_superior, text="Voltar", command=lambda: self.controller.mostrar_frame("TelaDashboard"),
+                 bg="#333333", fg="white", bd=0, padx=10,
+                 activebackground="#555555", activeforeground="white").pack(side="right", padx=20)
+        
+        frame_principal = tk.Frame(self, bg="white", padx=20, pady=20)
+        frame_principal.pack(fill="x", padx=10, pady=10)
+        
+        # Logs
+        tk.Label(frame_principal, text="Diretório ou arquivo de logs:", bg="white").grid(row=0, column=0, sticky="w", pady=5)
+        self.entrada_caminho = tk.Entry(frame_principal, width=60)
+        self.entrada_caminho.grid(row=0, column=1, sticky="w", padx=5)
+        tk.Button(frame_principal, text="Procurar", command=self.procurar_caminho,
+                 bg="#2196F3", fg="white").grid(row=0, column=2, padx=5)
+        
+        tk.Label(frame_principal, text="Máximo de logs em memória:", bg="white").grid(row=1, column=0, sticky="w", pady=5)
+        self.entrada_max_logs = tk.Entry(frame_principal, width=12)
+        self.entrada_max_logs.grid(row=1, column=1, sticky="w", padx=5)
+        
+        # Alertas
+        tk.Label(frame_principal, text="Alertas", font=("Arial", 12, "bold"),
+                bg="white").grid(row=2, column=0, sticky="w", pady=(15, 5))
+        
+        tk.Label(frame_principal, text="Falhas de login para alertar:", bg="white").grid(row=3, column=0, sticky="w", pady=5)
+        self.entrada_falhas_login = tk.Entry(frame_principal, width=12)
+        self.entrada_falhas_login.grid(row=3, column=1, sticky="w", padx=5)
+        
+        self.var_acessos_suspeitos = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame_principal, text="Alertar acessos fora do horário comercial",
+                       variable=self.var_acessos_suspeitos, bg="white").grid(row=4, column=0, columnspan=2,
+                                                                             sticky="w", pady=5)
+        
+        tk.Label(frame_principal, text="URLs restritas (separadas por vírgula):",
+                bg="white").grid(row=5, column=0, sticky="w", pady=5)
+        self.entrada_urls_restritas = tk.Entry(frame_principal, width=60)
+        self.entrada_urls_restritas.grid(row=5, column=1, sticky="w", padx=5)
+        
+        tk.Button(frame_principal, text="Salvar", command=self.salvar,
+                 bg="#4CAF50", fg="white", padx=20).grid(row=6, column=1, sticky="w", padx=5, pady=(15, 0))
+    
+    def carregar_valores(self):
+        """Preenche os campos com a configuração atual do motor"""
+        config = self.controller.alertas_config
+        valores = (
+            (self.entrada_caminho, self.controller.caminho_logs or ""),
+            (self.entrada_max_logs, self.controller.max_logs_memoria),
+            (self.entrada_falhas_login, config.get("falhas_login", 3)),
+            (self.entrada_urls_restritas, ", ".join(config.get("urls_restritas", []))),
+        )
+        for entrada, valor in valores:
+            entrada.delete(0, tk.END)
+            entrada.insert(0, str(valor))
+        self.var_acessos_suspeitos.set(bool(config.get("acessos_suspeitos", True)))
+    
+    def procurar_caminho(self):
+        caminho = filedialog.askdirectory(title="Diretório de logs")
+        if caminho:
+            self.entrada_caminho.delete(0, tk.END)
+            self.entrada_caminho.insert(0, caminho)
+    
+    def salvar(self):
+        """Valida os campos e salva pelo motor (banco e config.json)"""
+        try:
+            max_logs = int(self.entrada_max_logs.get().strip())
+            falhas_login = int(self.entrada_falhas_login.get().strip())
+        except ValueError:
+            messagebox.showerror("Configurações", "Máximo de logs e falhas de login devem ser números inteiros.")
+            return
+        
+        if max_logs <= 0 or falhas_login <= 0:
+            messagebox.showerror("Configurações", "Máximo de logs e falhas de login devem ser maiores que zero.")
+            return
+        
+        # Novo dicionário: as chaves que a tela não edita são preservadas
+        alertas_config = dict(self.controller.alertas_config)
+        alertas_config.update({
+            "falhas_login": falhas_login,
+            "acessos_suspeitos": self.var_acessos_suspeitos.get(),
+            "urls_restritas": [url.strip() for url in self.entrada_urls_restritas.get().split(",") if url.strip()],
+        })
+        
+        self.controller.caminho_logs = self.entrada_caminho.get().strip()
+        self.controller.max_logs_memoria = max_logs
+        self.controller.alertas_config = alertas_config
+        self.controller.salvar_configuracoes()
+        messagebox.showinfo("Configurações", "Configurações salvas.")
+
 class TelaAlertas(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg="#f0f0f0")
@@ -1514,6 +833,7 @@ class TelaAlertas(tk.Frame):
             ("Alertas", lambda: self.controller.mostrar_frame("TelaAlertas")),
             ("Relatórios", lambda: self.controller.mostrar_frame("TelaRelatorios")),
             ("Configurações", lambda: self.controller.mostrar_frame("TelaConfiguracoes")),
+            ("Diagnóstico", lambda: self.controller.mostrar_frame("TelaDiagnosticos")),
             ("Sair", self.logout)
         ]
         
@@ -1561,7 +881,9 @@ class TelaAlertas(tk.Frame):
         
         # Filtro de tipo
         tk.Label(frame_filtros, text="Tipo:", bg="white").grid(row=0, column=3, padx=5, pady=5)
-        self.filtro_tipo = ttk.Combobox(frame_filtros, values=["Todos", "Falha de Login", "Horário Suspeito", "URL Restrita"], width=15)
+        self.filtro_tipo = ttk.Combobox(frame_filtros, values=["Todos", "Falha de Login", "Horário Suspeito", "URL Restrita",
+                                                               "Anomalia de Taxa", "Varredura de Usuários",
+                                                               "Força Bruta Distribuída"], width=22)
         self.filtro_tipo.current(0)
         self.filtro_tipo.grid(row=0, column=4, padx=5, pady=5)
         
@@ -1641,7 +963,10 @@ class TelaAlertas(tk.Frame):
             tipo_map = {
                 "Falha de Login": "falha_login",
                 "Horário Suspeito": "horario_suspeito",
-                "URL Restrita": "url_restrita"
+                "URL Restrita": "url_restrita",
+                "Anomalia de Taxa": "anomalia_taxa",
+                "Varredura de Usuários": "varredura_usuarios",
+                "Força Bruta Distribuída": "forca_bruta_distribuida"
             }
             tipo_filtro = tipo_map.get(tipo, "")
             if tipo_filtro:
@@ -1753,7 +1078,8 @@ class TelaAlertas(tk.Frame):
         # Ir para a tela de detalhes com filtros pré-configurados
         tela_detalhes = self.controller.frames["TelaDetalhes"]
         
-        # Configurar filtros
+        # Configurar filtros (sem herdar os de uma investigação anterior)
+        tela_detalhes.limpar_campos()
         if alerta['usuario'] != 'desconhecido':
             tela_detalhes.filtro_usuario.delete(0, tk.END)
             tela_detalhes.filtro_usuario.insert(0, alerta['usuario'])
@@ -1770,9 +1096,8 @@ class TelaAlertas(tk.Frame):
             tela_detalhes.filtro_data.delete(0, tk.END)
             tela_detalhes.filtro_data.insert(0, alerta['data'])
         
-        # Aplicar filtros e mostrar tela
+        # Mostrar a tela (mostrar_frame aplica os filtros)
         self.controller.mostrar_frame("TelaDetalhes")
-        tela_detalhes.aplicar_filtros()
         
         # Marcar como lido
         if 'id' in alerta and not alerta.get('lido', False):
@@ -1784,7 +1109,376 @@ class TelaAlertas(tk.Frame):
         self.controller.parar_monitoramento()
         self.controller.mostrar_frame("TelaLogin")
 
-# Iniciar a aplicação
+class TelaURLs(tk.Frame):
+    """Análise de URLs por prefixo (drill-down) e top-N, lida do índice de URLs do motor"""
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#f0f0f0")
+        self.controller = controller
+        self.prefixo = "/"
+        
+        # Barra superior
+        barra_superior = tk.Frame(self, bg="#333333", height=50)
+        barra_superior.pack(fill="x")
+        
+        tk.Label(barra_superior, text="Análise de URLs", 
+                font=("Arial", 12, "bold"), bg="#333333", fg="white").pack(side="left", padx=20)
+        
+        tk.Button(barra_superior, text="Voltar", command=lambda: self.controller.mostrar_frame("TelaDashboard"),
+                 bg="#333333", fg="white", bd=0, padx=10,
+                 activebackground="#555555", activeforeground="white").pack(side="right", padx=20)
+        
+        self.frame_principal = tk.Frame(self, bg="#f0f0f0", padx=10, pady=10)
+        self.frame_principal.pack(fill="both", expand=True)
+        
+        # Prefixo atual (ex.: /api/admin/*)
+        frame_prefixo = tk.Frame(self.frame_principal, bg="white", padx=10, pady=10)
+        frame_prefixo.pack(fill="x", pady=5)
+        
+        tk.Label(frame_prefixo, text="Prefixo:", bg="white").pack(side="left", padx=5)
+        self.entrada_prefixo = tk.Entry(frame_prefixo, width=40)
+        self.entrada_prefixo.insert(0, self.prefixo)
+        self.entrada_prefixo.bind("<Return>", lambda _: self.ir_para(self.entrada_prefixo.get()))
+        self.entrada_prefixo.pack(side="left", padx=5)
+        
+        tk.Button(frame_prefixo, text="Ir", command=lambda: self.ir_para(self.entrada_prefixo.get()),
+                 bg="#4CAF50", fg="white").pack(side="left", padx=5)
+        tk.Button(frame_prefixo, text="Subir", command=self.subir,
+                 bg="#2196F3", fg="white").pack(side="left", padx=5)
+        
+        tk.Label(frame_prefixo, text="Top por:", bg="white").pack(side="left", padx=(20, 5))
+        self.criterio = ttk.Combobox(frame_prefixo, values=["acessos", "falhas"], width=10, state="readonly")
+        self.criterio.set("acessos")
+        self.criterio.bind("<<ComboboxSelected>>", lambda _: self.carregar_dados())
+        self.criterio.pack(side="left", padx=5)
+        
+        self.label_resumo = tk.Label(self.frame_principal, text="", font=("Arial", 10), bg="#f0f0f0", anchor="w")
+        self.label_resumo.pack(fill="x", pady=5)
+        
+        colunas = ("url", "acessos", "falhas", "taxa_falha", "usuarios", "latencia_media_ms")
+        titulos = ("URL", "Acessos", "Falhas", "Taxa de falha", "Usuários", "Latência média (ms)")
+        
+        # Subcaminhos imediatos (duplo clique desce um nível)
+        tk.Label(self.frame_principal, text="Subcaminhos", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor="w")
+        self.tabela_subcaminhos = self.criar_tabela(colunas, titulos, 10)
+        self.tabela_subcaminhos.bind("<Double-1>", self.descer)
+        
+        # URLs exatas com mais acessos ou falhas sob o prefixo
+        tk.Label(self.frame_principal, text="Top URLs", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor="w")
+        self.tabela_top = self.criar_tabela(colunas, titulos, 10)
+    
+    def criar_tabela(self, colunas, titulos, altura):
+        """Cria uma Treeview com as colunas e títulos informados"""
+        tabela = ttk.Treeview(self.frame_principal, columns=colunas, show="headings", height=altura)
+        for coluna, titulo in zip(colunas, titulos):
+            tabela.heading(coluna, text=titulo)
+            tabela.column(coluna, width=320 if coluna == "url" else 100, anchor="w" if coluna == "url" else "e")
+        tabela.pack(fill="x", pady=5)
+        return tabela
+    
+    def preencher(self, tabela, df):
+        """Substitui o conteúdo da tabela pelas linhas de estatísticas"""
+        tabela.delete(*tabela.get_children())
+        for linha in df.itertuples(index=False):
+            latencia = linha.latencia_media_ms
+            if latencia is None or latencia != latencia:  # Sem duracao_ms nos logs (None ou NaN)
+                latencia = "-"
+            tabela.insert("", "end", values=(linha.url, linha.acessos, linha.falhas, f"{linha.taxa_falha:.1%}",
+                                             linha.usuarios, latencia))
+    
+    def ir_para(self, prefixo):
+        self.prefixo = prefixo.strip() or "/"
+        self.carregar_dados()
+    
+    def subir(self):
+        self.ir_para(self.prefixo.rstrip("/*").rsplit("/", 1)[0] or "/")
+    
+    def descer(self, _evento):
+        selecionado = self.tabela_subcaminhos.focus()
+        if selecionado:
+            self.ir_para(self.tabela_subcaminhos.item(selecionado, "values")[0])
+    
+    def carregar_dados(self):
+        """Consulta o índice de URLs do motor para o prefixo atual (não percorre os logs)"""
+        self.entrada_prefixo.delete(0, "end")
+        self.entrada_prefixo.insert(0, self.prefixo)
+        
+        estatisticas = self.controller.estatisticas_url(self.prefixo)
+        if estatisticas is None:
+            self.label_resumo.config(text=f"Nenhum acesso sob {self.prefixo}")
+            self.tabela_subcaminhos.delete(*self.tabela_subcaminhos.get_children())
+            self.tabela_top.delete(*self.tabela_top.get_children())
+            return
+        
+        self.label_resumo.config(text=f"{estatisticas['url']}: {estatisticas['acessos']} acessos, "
+                                      f"{estatisticas['falhas']} falhas ({estatisticas['taxa_falha']:.1%}), "
+                                      f"~{estatisticas['usuarios']} usuários, "
+                                      f"{estatisticas['subcaminhos']} subcaminhos")
+        self.preencher(self.tabela_subcaminhos, self.controller.detalhar_urls(self.prefixo, 100))
+        self.preencher(self.tabela_top, self.controller.top_urls(20, self.prefixo, self.criterio.get()))
+
+class TelaRelatorios(tk.Frame):
+    """Relatórios agregados por período, gerados em segundo plano pelo motor e exibidos conforme os dias chegam"""
+
+    # Nomes exibidos para os tipos de relatório do motor
+    TITULOS_TIPOS = {
+        "usuarios": "Acessos por usuário",
+        "ips": "Acessos por IP",
+        "urls": "Acessos por URL",
+        "niveis": "Logs por nível",
+        "operacoes": "Logs por operação",
+        "servidores": "Logs por servidor",
+        "horas": "Acessos por hora do dia",
+    }
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#f0f0f0")
+        self.controller = controller
+        self.tarefa = None  # TarefaRelatorio exibida
+        self.versao_exibida = -1
+        
+        # Barra superior
+        barra_superior = tk.Frame(self, bg="#333333", height=50)
+        barra_superior.pack(fill="x")
+        
+        tk.Label(barra_superior, text="Relatórios", 
+                font=("Arial", 12, "bold"), bg="#333333", fg="white").pack(side="left", padx=20)
+        
+        tk.Button(barra_superior, text="Voltar", command=lambda: self.controller.mostrar_frame("TelaDashboard"),
+                 bg="#333333", fg="white", bd=0, padx=10,
+                 activebackground="#555555", activeforeground="white").pack(side="right", padx=20)
+        
+        self.frame_principal = tk.Frame(self, bg="#f0f0f0", padx=10, pady=10)
+        self.frame_principal.pack(fill="both", expand=True)
+        
+        # Tipo e período (datas YYYY-MM-DD, fim inclusivo)
+        frame_filtros = tk.Frame(self.frame_principal, bg="white", padx=10, pady=10)
+        frame_filtros.pack(fill="x", pady=5)
+        
+        tk.Label(frame_filtros, text="Relatório:", bg="white").grid(row=0, column=0, padx=5, pady=5)
+        self.tipos = {titulo: tipo for tipo, titulo in self.TITULOS_TIPOS.items() if tipo in TIPOS_RELATORIO}
+        self.filtro_tipo = ttk.Combobox(frame_filtros, values=list(self.tipos), width=25, state="readonly")
+        self.filtro_tipo.current(0)
+        self.filtro_tipo.grid(row=0, column=1, padx=5, pady=5)
+        
+        hoje = datetime.date.today()
+        tk.Label(frame_filtros, text="De:", bg="white").grid(row=0, column=2, padx=5, pady=5)
+        self.entrada_inicio = tk.Entry(frame_filtros, width=12)
+        self.entrada_inicio.insert(0, (hoje - datetime.timedelta(days=6)).strftime('%Y-%m-%d'))
+        self.entrada_inicio.grid(row=0, column=3, padx=5, pady=5)
+        
+        tk.Label(frame_filtros, text="Até:", bg="white").grid(row=0, column=4, padx=5, pady=5)
+        self.entrada_fim = tk.Entry(frame_filtros, width=12)
+        self.entrada_fim.insert(0, hoje.strftime('%Y-%m-%d'))
+        self.entrada_fim.grid(row=0, column=5, padx=5, pady=5)
+        
+        tk.Button(frame_filtros, text="Gerar", command=self.gerar,
+                 bg="#4CAF50", fg="white").grid(row=0, column=6, padx=10, pady=5)
+        tk.Button(frame_filtros, text="Cancelar", command=self.cancelar,
+                 bg="#f44336", fg="white").grid(row=0, column=7, padx=5, pady=5)
+        tk.Button(frame_filtros, text="Exportar logs do período", command=self.exportar,
+                 bg="#2196F3", fg="white").grid(row=0, column=8, padx=5, pady=5)
+        
+        # Andamento
+        frame_progresso = tk.Frame(self.frame_principal, bg="#f0f0f0")
+        frame_progresso.pack(fill="x", pady=5)
+        self.barra_progresso = ttk.Progressbar(frame_progresso, length=200, maximum=1.0)
+        self.barra_progresso.pack(side="left")
+        self.label_status = tk.Label(frame_progresso, text="", bg="#f0f0f0", anchor="w")
+        self.label_status.pack(side="left", fill="x", padx=10)
+        
+        # Resultado (parcial enquanto a geração não termina)
+        colunas = ("chave", "acessos", "falhas", "erros", "taxa_falha")
+        self.tabela = ttk.Treeview(self.frame_principal, columns=colunas, show="headings")
+        for coluna, titulo in zip(colunas, ("Chave", "Acessos", "Falhas", "Erros", "Taxa de falha")):
+            self.tabela.heading(coluna, text=titulo)
+            self.tabela.column(coluna, width=320 if coluna == "chave" else 100, anchor="w" if coluna == "chave" else "e")
+        self.tabela.pack(fill="both", expand=True, pady=5)
+    
+    def gerar(self):
+        """Pede ao motor o relatório selecionado e passa a acompanhar o resultado parcial"""
+        self.cancelar()
+        tarefa = self.controller.gerar_relatorio(self.tipos[self.filtro_tipo.get()],
+                                                 self.entrada_inicio.get().strip(), self.entrada_fim.get().strip())
+        if tarefa is None:
+            messagebox.showerror("Relatórios", "Período inválido: use datas no formato AAAA-MM-DD.")
+            return
+        
+        self.tarefa = tarefa
+        self.versao_exibida = -1
+        self.acompanhar(tarefa)
+    
+    def cancelar(self):
+        if self.tarefa is not None and self.tarefa.estado == "executando":
+            self.tarefa.cancelar()
+    
+    def acompanhar(self, tarefa):
+        """Redesenha a tabela quando chegam dias novos, até a tarefa terminar"""
+        if tarefa is not self.tarefa:
+            return  # Substituída por um relatório mais recente
+        
+        if tarefa.versao != self.versao_exibida:
+            self.versao_exibida = tarefa.versao
+            self.tabela.delete(*self.tabela.get_children())
+            for linha in tarefa.resultado(limite=500).itertuples(index=False):
+                self.tabela.insert("", "end", values=(linha.chave, linha.acessos, linha.falhas, linha.erros,
+                                                      f"{linha.taxa_falha:.1%}"))
+        
+        self.barra_progresso["value"] = tarefa.progresso()
+        status = f"{tarefa.feitos}/{tarefa.total} dias ({tarefa.dias_em_cache} do cache)"
+        if tarefa.estado == "executando":
+            self.label_status.config(text=f"Gerando... {status}")
+            self.after(250, lambda: self.acompanhar(tarefa))
+        elif tarefa.estado == "erro":
+            self.label_status.config(text=f"Erro: {tarefa.erro}")
+        else:
+            self.label_status.config(text=f"Relatório {tarefa.estado}: {status} em {tarefa.fim - tarefa.inicio:.1f}s")
+    
+    def exportar(self):
+        """Exporta em segundo plano os logs do período (CSV ou NDJSON, .gz opcional)"""
+        destino = filedialog.asksaveasfilename(
+            title="Exportar logs", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("CSV compactado", "*.csv.gz"), ("NDJSON", "*.ndjson"),
+                       ("NDJSON compactado", "*.ndjson.gz")])
+        if not destino:
+            return
+        
+        try:
+            inicio = datetime.datetime.strptime(self.entrada_inicio.get().strip(), '%Y-%m-%d')
+            fim = datetime.datetime.strptime(self.entrada_fim.get().strip(), '%Y-%m-%d') + datetime.timedelta(days=1)
+        except ValueError:
+            messagebox.showerror("Relatórios", "Período inválido: use datas no formato AAAA-MM-DD.")
+            return
+        
+        filtros = {"ts_inicio": int(inicio.timestamp() * 1000), "ts_fim": int(fim.timestamp() * 1000)}
+        tarefa = self.controller.exportar_logs(destino, filtros=filtros)
+        if tarefa is not None:
+            self.acompanhar_exportacao(tarefa)
+    
+    def acompanhar_exportacao(self, tarefa):
+        if tarefa.estado == "executando":
+            self.label_status.config(text=f"Exportando... {tarefa.feitos}/{tarefa.total} logs")
+            self.after(500, lambda: self.acompanhar_exportacao(tarefa))
+        elif tarefa.estado == "concluida":
+            self.label_status.config(text=f"{tarefa.feitos} logs exportados para {tarefa.destino}")
+        else:
+            self.label_status.config(text=f"Exportação {tarefa.estado}{': ' + tarefa.erro if tarefa.erro else ''}")
+
+class TelaDiagnosticos(tk.Frame):
+    """Métricas do pipeline (latência por etapa, contadores, filas e atraso de cada fonte) e perfilamento"""
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#f0f0f0")
+        self.controller = controller
+        
+        # Barra superior
+        barra_superior = tk.Frame(self, bg="#333333", height=50)
+        barra_superior.pack(fill="x")
+        
+        tk.Label(barra_superior, text="Diagnóstico do Pipeline", 
+                font=("Arial", 12, "bold"), bg="#333333", fg="white").pack(side="left", padx=20)
+        
+        tk.Button(barra_superior, text="Voltar", command=lambda: self.controller.mostrar_frame("TelaDashboard"),
+                 bg="#333333", fg="white", bd=0, padx=10,
+                 activebackground="#555555", activeforeground="white").pack(side="right", padx=20)
+        
+        self.frame_principal = tk.Frame(self, bg="#f0f0f0", padx=10, pady=10)
+        self.frame_principal.pack(fill="both", expand=True)
+        
+        # Perfilamento (vale na hora: o motor lê diagnostico_config a cada chamada)
+        frame_perfil = tk.Frame(self.frame_principal, bg="white", padx=10, pady=5)
+        frame_perfil.pack(fill="x", pady=5)
+        
+        self.var_perfilamento = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_perfil, text="Perfilamento", variable=self.var_perfilamento,
+                       command=self.aplicar_perfilamento, bg="white").pack(side="left")
+        
+        self.modo_perfilamento = ttk.Combobox(frame_perfil, values=["cprofile", "amostragem"], width=12, state="readonly")
+        self.modo_perfilamento.set("cprofile")
+        self.modo_perfilamento.bind("<<ComboboxSelected>>", lambda _: self.aplicar_perfilamento())
+        self.modo_perfilamento.pack(side="left", padx=5)
+        
+        self.var_lentas = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_perfil, text="Registrar operações lentas", variable=self.var_lentas,
+                       command=self.aplicar_perfilamento, bg="white").pack(side="left", padx=10)
+        
+        self.label_perfis = tk.Label(frame_perfil, text="", bg="white", fg="#555555")
+        self.label_perfis.pack(side="left", padx=10)
+        
+        # Resumo: fila do pipeline, logs em memória e endpoint de métricas
+        self.label_resumo = tk.Label(self.frame_principal, text="", font=("Arial", 10), bg="#f0f0f0", anchor="w")
+        self.label_resumo.pack(fill="x", pady=5)
+        
+        # Latência por etapa
+        tk.Label(self.frame_principal, text="Etapas", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor="w")
+        colunas_etapas = ("etapa", "eventos", "media_ms", "p50_ms", "p95_ms", "max_ms")
+        self.tabela_etapas = self.criar_tabela(colunas_etapas, ("Etapa", "Eventos", "Média (ms)", "p50 (ms)",
+                                                                "p95 (ms)", "Máx. (ms)"), 7)
+        
+        # Fontes: fila própria, bytes pendentes até o fim dos arquivos e atraso
+        tk.Label(self.frame_principal, text="Fontes", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor="w")
+        colunas_fontes = ("fonte", "tipo", "linhas", "fila", "bytes_pendentes", "atraso_s", "descartadas", "erros")
+        self.tabela_fontes = self.criar_tabela(colunas_fontes, ("Fonte", "Tipo", "Linhas", "Fila", "Bytes pendentes",
+                                                                "Atraso (s)", "Descartadas", "Erros"), 5)
+        
+        # Contadores
+        tk.Label(self.frame_principal, text="Contadores", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor="w")
+        self.tabela_contadores = self.criar_tabela(("contador", "valor"), ("Contador", "Valor"), 6)
+    
+    def criar_tabela(self, colunas, titulos, altura):
+        """Cria uma Treeview com as colunas e títulos informados"""
+        tabela = ttk.Treeview(self.frame_principal, columns=colunas, show="headings", height=altura)
+        for coluna, titulo in zip(colunas, titulos):
+            tabela.heading(coluna, text=titulo)
+            tabela.column(coluna, width=240 if coluna == "fonte" else 100, anchor="w" if coluna == colunas[0] else "e")
+        tabela.pack(fill="x", pady=5)
+        return tabela
+    
+    def preencher(self, tabela, linhas):
+        """Substitui o conteúdo da tabela"""
+        tabela.delete(*tabela.get_children())
+        for linha in linhas:
+            tabela.insert("", "end", values=linha)
+    
+    def aplicar_perfilamento(self):
+        """Leva as opções de perfilamento da tela para a configuração do motor e salva"""
+        self.controller.diagnostico_config["registrar_operacoes_lentas"] = self.var_lentas.get()
+        self.controller.definir_perfilamento(self.var_perfilamento.get(), self.modo_perfilamento.get())
+        self.controller.salvar_configuracoes()
+        self.atualizar()
+    
+    def atualizar(self):
+        """Lê as métricas atuais do motor e atualiza as tabelas"""
+        diagnostico = self.controller.diagnostico()
+        
+        config = self.controller.diagnostico_config
+        self.var_perfilamento.set(bool(config["perfilamento"]))
+        self.var_lentas.set(bool(config["registrar_operacoes_lentas"]))
+        if self.modo_perfilamento.get() != config["modo_perfilamento"]:
+            self.modo_perfilamento.set(config["modo_perfilamento"])
+        self.label_perfis.config(text=f"Perfis e operações lentas (> {config['limite_lento_ms']} ms) em "
+                                      f"{os.path.abspath(config['diretorio_perfis'])}")
+        
+        endpoint = diagnostico["endpoint"] or "desligado (diagnostico_config['porta_metricas'])"
+        self.label_resumo.config(text=f"Fila do pipeline: {diagnostico['fila_pipeline']}/"
+                                      f"{diagnostico['capacidade_fila'] or '∞'} lotes  |  "
+                                      f"Logs em memória: {diagnostico['logs_memoria']}  |  Métricas: {endpoint}")
+        
+        self.preencher(self.tabela_etapas, [
+            (etapa, valores["eventos"], valores["media_ms"], valores["p50_ms"], valores["p95_ms"], valores["max_ms"])
+            for etapa, valores in diagnostico["etapas"].items()
+        ])
+        self.preencher(self.tabela_fontes, [
+            (nome, fonte["tipo"], fonte["linhas"], fonte["fila"], fonte["bytes_pendentes"], fonte["atraso_s"],
+             fonte["descartadas"], fonte["erros"])
+            for nome, fonte in diagnostico["fontes"].items()
+        ])
+        self.preencher(self.tabela_contadores, list(diagnostico["contadores"].items()))
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Comandos sem interface (--daemon, --reconstruir-rollups, --exportar, --exportar-parquet)
+        sys.exit(main_motor())
+    
     app = SistemaMonitoramento()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
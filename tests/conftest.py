@@ -0,0 +1,24 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Os módulos do sistema ficam na raiz do repositório (sem pacote instalável)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def motor(tmp_path, monkeypatch):
+    """MotorMonitoramento com banco próprio em um diretório temporário (config.json também fica nele)"""
+    from motor_monitoramento import MotorMonitoramento
+
+    monkeypatch.chdir(tmp_path)
+    motor = MotorMonitoramento(db_path=str(tmp_path / "logs.db"))
+    limite = time.time() + 30
+    while not motor.schema_tipado and time.time() < limite:
+        time.sleep(0.05)
+    motor.parar_manutencao()
+    yield motor
+    motor.parar_monitoramento()
+    motor.pool_leitura.fechar()
@@ -0,0 +1,58 @@
+import time
+
+from motor_monitoramento import ParserLogs
+
+
+def aguardar(condicao, limite_s=15):
+    fim = time.time() + limite_s
+    while time.time() < fim:
+        if condicao():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_parser_simples_extrai_usuario_e_operacao():
+    linha = "2026-10-19 10:00:00,100 WARN [org.jboss.security] (default task-3) Login failed user=ana IP=10.1.1.1"
+    log = ParserLogs().processar_linhas([linha])[0]
+    assert (log["usuario"], log["operacao"], log["status"]) == ("ana", "LOGIN", "FAILED")
+
+
+def test_falhas_de_login_no_monitoramento_geram_alertas_de_correlacao(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("2026-10-19 09:59:59,000 [srv1] [INFO] [c] - inicio\n")
+    motor.caminho_logs = str(arquivo)
+    motor.coleta_config["intervalo_s"] = 0.1
+    motor.alertas_config["acessos_suspeitos"] = False
+    alertas = []
+    motor.ouvintes_alerta.append(alertas.append)
+
+    motor.iniciar_monitoramento()
+    try:
+        # A primeira leitura só registra o tamanho atual do arquivo
+        assert aguardar(lambda: motor.coletor is not None and motor.estatisticas_coleta())
+        time.sleep(0.5)
+
+        linhas = []
+        for i in range(25):
+            # Um IP tentando 25 usuários (formato 2 e linha fora dos formatos conhecidos)
+            if i % 2:
+                linhas.append(f"2026-10-19 10:00:{i:02d},{i:03d} [srv1] [ERROR] [c] - Failed login user=u{i} IP=6.6.6.6")
+            else:
+                linhas.append(f"2026-10-19 10:00:{i:02d},{i:03d} WARN [auth] (default task-1) "
+                              f"Login failed user=u{i} IP=6.6.6.6")
+        for i in range(12):
+            # Um usuário atacado de 12 IPs
+            linhas.append(f"2026-10-19 10:01:{i:02d},500 [srv2] [ERROR] [c] - Failed login user=admin IP=10.9.0.{i + 1}")
+        with open(arquivo, "a") as f:
+            f.write("\n".join(linhas) + "\n")
+
+        tipos = lambda: {alerta["tipo"] for alerta in alertas}
+        assert aguardar(lambda: {"varredura_usuarios", "forca_bruta_distribuida"} <= tipos()), alertas
+    finally:
+        motor.parar_monitoramento()
+
+    varredura = next(alerta for alerta in alertas if alerta["tipo"] == "varredura_usuarios")
+    assert varredura["ip"] == "6.6.6.6"
+    forca_bruta = next(alerta for alerta in alertas if alerta["tipo"] == "forca_bruta_distribuida")
+    assert forca_bruta["usuario"] == "admin"
@@ -0,0 +1,77 @@
+from motor_monitoramento import DETECCAO_PADRAO, DetectorAnomalias, EsbocoContagemMinima, hash_distinto
+
+# Início de um minuto (epoch ms)
+T0 = 1_760_000_000_000 - 1_760_000_000_000 % 60000
+MINUTO = 60000
+
+
+def config(**alteracoes):
+    valores = dict(DETECCAO_PADRAO)
+    valores.update(alteracoes)
+    return valores
+
+
+def ritmo_constante(detector, valor, minutos, por_minuto, inicio=T0):
+    alertas = []
+    for minuto in range(minutos):
+        for i in range(por_minuto):
+            resultado = detector.registrar("ip", valor, inicio + minuto * MINUTO + i * 1000)
+            if resultado is not None:
+                alertas.append(resultado)
+    return alertas
+
+
+def test_anomalia_sem_alerta_em_ritmo_normal():
+    detector = DetectorAnomalias(config())
+    assert ritmo_constante(detector, "10.0.0.1", 60, 3) == []
+    assert ritmo_constante(detector, "10.0.0.2", 1, 59) == []
+
+    # Ritmo alto e constante: só o primeiro minuto (sem linha de base) passa do mínimo
+    alertas = ritmo_constante(detector, "10.0.0.3", 30, 80)
+    assert alertas == [(60, 2.0)]
+
+
+def test_anomalia_dispara_no_limite_uma_vez_por_minuto():
+    detector = DetectorAnomalias(config())
+    assert ritmo_constante(detector, "10.0.0.1", 30, 3) == []
+
+    # Base 3/min x fator 20 = 60 (igual ao mínimo): o 60º evento do minuto dispara
+    inicio = T0 + 30 * MINUTO
+    resultados = [detector.registrar("ip", "10.0.0.1", inicio + i * 100) for i in range(200)]
+    disparos = [(i + 1, r) for i, r in enumerate(resultados) if r is not None]
+    assert len(disparos) == 1
+    posicao, (contagem, base) = disparos[0]
+    assert posicao == contagem == 60
+    assert base == 3.0
+
+
+def test_anomalia_respeita_o_minimo_para_entidades_novas():
+    detector = DetectorAnomalias(config(minimo_anomalia=100))
+    resultados = [detector.registrar("usuario", "ana", T0 + i * 10) for i in range(150)]
+    assert [i + 1 for i, r in enumerate(resultados) if r is not None] == [100]
+
+
+def test_anomalia_limita_entidades_e_promove_cauda_movimentada():
+    detector = DetectorAnomalias(config(max_entidades=100, promocao_cauda=10))
+    for i in range(1000):
+        detector.registrar("ip", f"10.1.{i // 256}.{i % 256}", T0 + i)
+    assert len(detector.entidades) == 100
+
+    for i in range(10):
+        detector.registrar("ip", "172.16.0.1", T0 + 2000 + i)
+    assert len(detector.entidades) == 100
+    assert ("ip", "172.16.0.1") in detector.entidades
+    assert detector.entidades[("ip", "172.16.0.1")].contagem == 10
+
+
+def test_contagem_minima_nunca_subestima():
+    esboco = EsbocoContagemMinima(largura=256, profundidade=4)
+    contagens = {f"ip{i}": (i % 7) + 1 for i in range(2000)}
+    for valor, contagem in contagens.items():
+        esboco.adicionar_hash(hash_distinto(valor), contagem)
+
+    erros = [esboco.estimar_hash(hash_distinto(valor)) - contagem for valor, contagem in contagens.items()]
+    assert min(erros) >= 0
+
+    esboco.limpar()
+    assert esboco.estimar_hash(hash_distinto("ip1")) == 0
@@ -0,0 +1,68 @@
+import collections
+
+import numpy as np
+
+from benchmark_monitoramento import comparar_suite, escrever_logs_sinteticos
+from motor_monitoramento import ParserLogs, hora_do_dia
+
+FIM = 1792400000.0
+
+
+def test_gerador_reprodutivel(tmp_path):
+    primeiro, segundo, outro = tmp_path / "a.log", tmp_path / "b.log", tmp_path / "c.log"
+    resumo = escrever_logs_sinteticos(str(primeiro), 3000, fim=FIM, semente=7)
+    assert escrever_logs_sinteticos(str(segundo), 3000, fim=FIM, semente=7) == resumo
+    assert primeiro.read_bytes() == segundo.read_bytes()
+
+    escrever_logs_sinteticos(str(outro), 3000, fim=FIM, semente=8)
+    assert outro.read_bytes() != primeiro.read_bytes()
+
+
+def test_gerador_respeita_parametros(tmp_path):
+    arquivo = tmp_path / "server.log"
+    resumo = escrever_logs_sinteticos(str(arquivo), 5000, usuarios=20, ips=50, rajadas=4, tamanho_rajada=25,
+                                      fim=FIM)
+    linhas = arquivo.read_text().splitlines()
+    assert len(linhas) == resumo["linhas"] == 5000
+    assert resumo["eventos"] + resumo["linhas_stack"] == 5000
+    assert resumo["linhas_ataque"] == 100
+    assert [rajada["tipo"] for rajada in resumo["rajadas"]] == ["forca_bruta", "credential_stuffing"] * 2
+
+    # Todos os eventos (nos três formatos) são reconhecidos; stack traces são descartados
+    logs = ParserLogs().processar_linhas(linhas)
+    assert len(logs) == resumo["eventos"]
+    normais = [log for log in logs if not log.ip.startswith("203.0.113.")]
+    assert len({log.usuario for log in normais}) <= 20
+    assert len({log.ip for log in normais}) <= 50
+
+    ataques = collections.Counter(log.ip for log in logs if log.ip.startswith("203.0.113."))
+    assert sorted(ataques.values()) == [25] * 4
+    forca_bruta = resumo["rajadas"][0]
+    assert {log.usuario for log in logs if log.ip == forca_bruta["ip"]} == {forca_bruta["usuario"]}
+
+
+def test_comparacao_aponta_regressoes():
+    anterior = {"parse": {"linhas_por_s": 100000}, "alertas": {"p50_ms": 1.0, "p95_ms": 2.0},
+                "pico_rss_mb": 200}
+    atual = {"parse": {"linhas_por_s": 85000}, "alertas": {"p50_ms": 1.05, "p95_ms": 3.0}, "pico_rss_mb": 150}
+    assert comparar_suite(atual, anterior) == ["parse.linhas_por_s", "alertas.p95_ms"]
+
+
+def test_hora_do_dia():
+    valores = ["00:00:00", "09:15:00", "23:59:59", "desconhecido", "7:00:00"]
+    assert hora_do_dia(valores).tolist() == [0, 9, 23, 24, 7]
+
+
+def test_dados_do_dashboard(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    escrever_logs_sinteticos(str(arquivo), 2000, fim=FIM)
+    logs = ParserLogs().processar_linhas(arquivo.read_text().splitlines())
+    motor.substituir_logs_memoria(logs)
+
+    dados = motor.dados_dashboard(top_usuarios=3)
+    horas = collections.Counter(int(log.hora[:2]) for log in logs)
+    assert dados["total_acessos"] == len(logs)
+    assert dados["total_ips"] == len({log.ip for log in logs})
+    assert np.array_equal(dados["acessos_por_hora"].to_numpy(), [horas[hora] for hora in range(24)])
+    assert dados["top_usuarios"].tolist() == [total for _, total in
+                                              collections.Counter(log.usuario for log in logs).most_common(3)]
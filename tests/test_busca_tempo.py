@@ -0,0 +1,83 @@
+import datetime
+import mmap
+
+import pytest
+
+from motor_monitoramento import (buscar_offset_ts, calcular_ts_evento, construir_indice_tempo, converter_para_ts,
+                                 trecho_do_intervalo)
+
+INICIO = datetime.datetime(2026, 10, 19, 0, 0, 0)
+
+
+def gerar_log(caminho, segundos=30000):
+    """Um log por segundo; a cada 7 logs, um stack trace sem data"""
+    partes = []
+    for i in range(segundos):
+        momento = INICIO + datetime.timedelta(seconds=i)
+        partes.append(f"{momento:%Y-%m-%d %H:%M:%S},000 [srv1] [INFO] [c] - acesso {i} user=ana IP=10.0.0.1\n")
+        if i % 7 == 0:
+            partes.append("java.lang.IllegalStateException: falha\n\tat com.app.Servico.executar(Servico.java:42)\n")
+    caminho.write_text("".join(partes))
+
+
+def ts(segundos):
+    return int((INICIO + datetime.timedelta(seconds=segundos)).timestamp() * 1000)
+
+
+def offset_linear(dados, ts_alvo):
+    posicao = 0
+    for linha in dados.split(b"\n"):
+        if linha[:4].isdigit() and calcular_ts_evento(linha[:10].decode(), linha[11:19].decode()) >= ts_alvo:
+            return posicao
+        posicao += len(linha) + 1
+    return len(dados)
+
+
+@pytest.fixture
+def mapa(tmp_path):
+    arquivo = tmp_path / "server.log"
+    gerar_log(arquivo)
+    with open(arquivo, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        yield mapa
+
+
+def test_converter_para_ts():
+    assert converter_para_ts(None) is None
+    assert converter_para_ts(123) == 123
+    assert converter_para_ts(INICIO) == ts(0)
+    assert converter_para_ts("2026-10-19") == ts(0)
+    assert converter_para_ts("2026-10-19", fim=True) == ts(24 * 3600) - 1
+    assert converter_para_ts("2026-10-19 01:30") == ts(5400)
+    assert converter_para_ts("2026-10-19T01:30:15") == ts(5415)
+
+
+@pytest.mark.parametrize("segundos", [-10, 0, 1, 6999, 7000, 15001, 29999, 40000])
+def test_busca_binaria_confere_com_varredura(mapa, segundos):
+    dados = mapa[:]
+    esperado = offset_linear(dados, ts(segundos))
+    obtido = buscar_offset_ts(mapa, ts(segundos))
+
+    # Pode parar antes de stack traces que precedem a linha, nunca depois dela
+    assert obtido <= esperado
+    assert all(not linha[:4].isdigit() for linha in dados[obtido:esperado].split(b"\n") if linha)
+
+
+def test_indice_esparso_nao_muda_o_trecho(mapa):
+    indice = construir_indice_tempo(mapa, passo=64 * 1024)
+    assert len(indice) > 10
+    assert [ts_ponto for _, ts_ponto in indice] == sorted(ts_ponto for _, ts_ponto in indice)
+
+    for inicio, fim in ((ts(100), ts(200)), (ts(20000), None), (None, ts(50))):
+        assert trecho_do_intervalo(mapa, inicio, fim, indice) == trecho_do_intervalo(mapa, inicio, fim)
+
+
+def test_carga_do_intervalo_le_so_o_trecho(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    gerar_log(arquivo)
+
+    # Duas vezes: a segunda usa o índice tempo -> byte gravado no banco
+    for _ in range(2):
+        logs = motor.processar_arquivo_log(str(arquivo), ts(10000), ts(10099))
+        valores = sorted(int(valor) for valor in (logs["ts_evento"] if hasattr(logs, "columns")
+                                                  else [log["ts_evento"] for log in logs]))
+        assert valores == [ts(i) for i in range(10000, 10100)]
@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+from motor_monitoramento import CacheConsultas, ParserLogs, PoolLeitura, normalizar_filtros
+
+
+def linhas(inicio, quantidade, usuario="ana"):
+    return [f"2026-10-19 10:{i // 60:02d}:{i % 60:02d},000 [srv1] [INFO] [c] - Login success user={usuario} "
+            f"IP=10.0.0.1" for i in range(inicio, inicio + quantidade)]
+
+
+def consultas(motor):
+    return {nome: total for nome, total in motor.metricas.instantaneo()["contadores"].items()
+            if nome.startswith("consultas")}
+
+
+def test_filtros_normalizados():
+    assert normalizar_filtros(None) == normalizar_filtros({}) == ()
+    assert normalizar_filtros({"usuario": "ana", "ip": "", "nivel": "TODOS", "status": None}) == (("usuario", "ana"),)
+    assert normalizar_filtros({"ip": "10.0.0.1", "usuario": "ana"}) == normalizar_filtros({"usuario": "ana",
+                                                                                            "ip": "10.0.0.1"})
+    # Com data, o intervalo não muda a consulta
+    assert normalizar_filtros({"data": "2026-10-19", "ts_inicio": 1, "ts_fim": 2}) == (("data", "2026-10-19"),)
+    assert normalizar_filtros({"ts_inicio": 1}) == (("ts_inicio", 1),)
+
+
+def test_cache_lru_limitado_e_invalidado_pela_marca():
+    cache = CacheConsultas(capacidade=2, max_linhas=10)
+    assert cache.obter(1, "a") == (False, None)
+    cache.guardar(1, "a", "A", 3)
+    cache.guardar(1, "b", "B", 3)
+    assert cache.obter(1, "a") == (True, "A")
+    cache.guardar(1, "c", "C", 3)  # "b" é o menos usado
+    assert cache.obter(1, "b") == (False, None)
+    cache.guardar(1, "d", "D", 6)  # Ultrapassa max_linhas: sai "a"
+    assert list(cache.itens) == ["c", "d"] and cache.linhas == 9
+    cache.guardar(1, "grande", "G", 11)
+    assert "grande" not in cache.itens
+
+    # Gravação no banco: tudo descartado, e resultados calculados antes dela não entram
+    assert cache.obter(2, "d") == (False, None)
+    cache.guardar(1, "e", "E", 1)
+    assert cache.obter(2, "e") == (False, None)
+
+
+def test_pool_somente_leitura_reaproveita_conexoes(tmp_path):
+    db_path = str(tmp_path / "logs.db")
+    gravador = sqlite3.connect(db_path)
+    gravador.execute("PRAGMA journal_mode=WAL")
+    gravador.execute("CREATE TABLE t (x)")
+    gravador.commit()
+
+    pool = PoolLeitura(db_path, tamanho=2)
+    try:
+        with pool.conexao() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO t VALUES (1)")
+        with pool.conexao() as outra:
+            assert outra is conn
+
+        # Conexão com erro na consulta não volta ao pool
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.conexao() as conn:
+                conn.execute("SELECT * FROM inexistente")
+        with pool.conexao() as nova:
+            assert nova is not conn
+
+        marca = pool.marca_dagua()
+        assert pool.marca_dagua() == marca
+        gravador.execute("INSERT INTO t VALUES (1)")
+        gravador.commit()
+        assert pool.marca_dagua() != marca
+    finally:
+        pool.fechar()
+        gravador.close()
+
+
+def test_consultas_repetidas_vem_do_cache_ate_a_proxima_gravacao(motor):
+    motor.salvar_logs_db(ParserLogs().processar_linhas(linhas(0, 20)))
+    filtros = {"usuario": "ana", "nivel": "TODOS"}
+
+    primeiro = motor.carregar_logs_db(filtros)
+    primeiro.loc[0, "usuario"] = "alterado"  # Cópia: não afeta o cache
+    segundo = motor.carregar_logs_db({"usuario": "ana", "ip": ""})
+    assert len(segundo) == 20 and set(segundo["usuario"]) == {"ana"}
+    assert consultas(motor) == {"consultas[falha]": 1, "consultas[acerto]": 1}
+
+    motor.salvar_logs_db(ParserLogs().processar_linhas(linhas(20, 5)))
+    assert len(motor.carregar_logs_db(filtros)) == 25
+    assert consultas(motor)["consultas[falha]"] == 2
+
+    # Gravação por outra conexão (ex.: daemon em outro processo) também invalida
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        conn.execute("DELETE FROM logs WHERE hora >= '10:00:10'")
+        conn.commit()
+    finally:
+        conn.close()
+    assert len(motor.carregar_logs_db(filtros)) == 10
+
+
+def test_busca_textual_usa_o_cache(motor):
+    if not motor.fts_disponivel:
+        pytest.skip("SQLite sem FTS5")
+    motor.salvar_logs_db(ParserLogs().processar_linhas(linhas(0, 5) + linhas(5, 5, usuario="bruno")))
+
+    df, total = motor.buscar_logs("bruno")
+    df.drop(df.index, inplace=True)
+    assert motor.buscar_logs("bruno")[1] == total == 5
+    assert len(motor.buscar_logs("bruno")[0]) == 5
+    assert consultas(motor) == {"consultas[falha]": 1, "consultas[acerto]": 2}
@@ -0,0 +1,95 @@
+import queue
+import threading
+import time
+
+import motor_monitoramento
+from motor_monitoramento import ColetorLogs, ler_novas_linhas
+
+LINHA = "2026-10-19 10:00:00,000 [srv1] [INFO] [c] - acesso user=ana IP=10.0.0.1"
+
+
+def acrescentar(arquivo, texto):
+    with open(arquivo, "a") as f:
+        f.write(texto)
+
+
+def test_le_so_linhas_completas_acrescentadas(tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text(LINHA + "\n")
+    posicoes = {}
+
+    # Primeira leitura só marca o fim do arquivo
+    assert ler_novas_linhas(str(arquivo), posicoes, 1 << 20) == ([], 0, 0)
+
+    inicio = len(LINHA) + 1
+    acrescentar(arquivo, f"{LINHA} a\n{LINHA} parcial")
+    linhas, lidos, pendentes = ler_novas_linhas(str(arquivo), posicoes, 1 << 20)
+    assert linhas == [("server.log", inicio, f"{LINHA} a")]
+    assert lidos == len(LINHA) + 3
+    assert pendentes == len(LINHA) + 8
+
+    # A linha parcial sai inteira quando a quebra chega
+    acrescentar(arquivo, " fim\n")
+    linhas, _, pendentes = ler_novas_linhas(str(arquivo), posicoes, 1 << 20)
+    assert linhas == [("server.log", inicio + lidos, f"{LINHA} parcial fim")]
+    assert pendentes == 0
+
+
+def test_limite_de_bytes_e_truncamento(tmp_path):
+    diretorio = tmp_path / "logs"
+    diretorio.mkdir()
+    arquivo = diretorio / "server.log"
+    arquivo.write_text("")
+    (diretorio / "ignorado.txt").write_text(LINHA + "\n")
+    posicoes = {}
+    ler_novas_linhas(str(diretorio), posicoes, 1 << 20)
+
+    acrescentar(arquivo, "".join(f"{LINHA} {i}\n" for i in range(10)))
+    linhas, lidos, pendentes = ler_novas_linhas(str(diretorio), posicoes, 3 * (len(LINHA) + 3))
+    assert [texto for _, _, texto in linhas] == [f"{LINHA} {i}" for i in range(3)]
+    assert pendentes == 7 * (len(LINHA) + 3)
+
+    # Arquivo rotacionado/truncado: a leitura recomeça do início
+    arquivo.write_text(f"{LINHA} novo\n")
+    linhas, _, _ = ler_novas_linhas(str(diretorio), posicoes, 1 << 20)
+    assert linhas == [("server.log", 0, f"{LINHA} novo")]
+
+
+def test_fonte_lenta_nao_atrasa_as_demais(tmp_path, monkeypatch):
+    rapido = tmp_path / "rapido.log"
+    rapido.write_text("")
+    lento = tmp_path / "lento.log"
+    lento.write_text("")
+
+    # Montagem NFS travada: a leitura da fonte lenta não retorna enquanto o teste roda
+    liberar = threading.Event()
+    original = motor_monitoramento.ler_novas_linhas
+
+    def ler_com_montagem_lenta(caminho, posicoes, max_bytes):
+        if caminho == str(lento):
+            liberar.wait(10)
+        return original(caminho, posicoes, max_bytes)
+
+    monkeypatch.setattr(motor_monitoramento, "ler_novas_linhas", ler_com_montagem_lenta)
+
+    fila = queue.Queue(maxsize=8)
+    coletor = ColetorLogs(fila, {"intervalo_s": 0.05})
+    coletor.iniciar([str(lento), str(rapido)])
+    try:
+        time.sleep(0.2)
+        acrescentar(rapido, LINHA + "\n")
+
+        fonte, linhas, _ = fila.get(timeout=5)
+        assert fonte == str(rapido)
+        assert [texto for _, _, texto in linhas] == [LINHA]
+
+        # O encaminhador conta o lote logo depois de entregá-lo
+        limite = time.time() + 5
+        while coletor.estatisticas()[str(rapido)]["linhas"] == 0 and time.time() < limite:
+            time.sleep(0.01)
+        estatisticas = coletor.estatisticas()
+        assert estatisticas[str(rapido)]["linhas"] == 1
+        assert estatisticas[str(lento)]["linhas"] == 0
+    finally:
+        liberar.set()
+        coletor.parar()
@@ -0,0 +1,183 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from motor_monitoramento import indice_trigrama_disponivel, montar_consulta_fts, montar_consulta_logs
+
+
+LINHAS = (
+    "2026-10-19 10:00:00,000 [srv1] [INFO] [c] - Login success user=joao.silva IP=192.10.0.5\n"
+    "2026-10-19 10:00:01,000 [srv1] [INFO] [c] - Login success user=maria IP=172.16.3.4\n"
+)
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("falha", '"falha"'),
+    ("falha timeout", '"falha" AND "timeout"'),
+    ("adm*", '"adm"*'),
+    ('"login failed"', '"login failed"'),
+    ('"api admin"*', '"api admin"*'),
+    ("usuario:joao.silva", 'usuario : "joao.silva"'),
+    ('url:"api admin"* erro', 'url : "api admin"* AND "erro"'),
+    ("ip:192.10.0.5", 'ip : "192.10.0.5"'),
+    # Operadores e pontuação do FTS5 não passam para a consulta
+    ("falha OR (x) NEAR", '"falha" AND "OR" AND "x" AND "NEAR"'),
+    ('a"b', '"a b"'),
+    # Coluna desconhecida vira parte da frase, não um filtro de coluna
+    ("coluna:valor", '"coluna valor"'),
+    ("", None),
+    ("()*:", None),
+    (None, None),
+])
+def test_montar_consulta_fts(texto, esperado):
+    assert montar_consulta_fts(texto) == esperado
+
+
+def test_consulta_fts_montada_e_aceita_pelo_sqlite(motor_com_logs):
+    for texto in ("login", "usuario:joao.silva", "ip:192.10*", '"login success"', "OR AND NOT", 'x"y*'):
+        df, _ = motor_com_logs.buscar_logs(texto)
+        assert df is not None, texto
+
+
+@pytest.fixture
+def motor_com_logs(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text(LINHAS)
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    return motor
+
+
+@pytest.mark.parametrize("filtros, usuarios", [
+    ({"usuario": "silva"}, ["joao.silva"]),
+    ({"usuario": "joao"}, ["joao.silva"]),
+    ({"ip": "10.0"}, ["joao.silva"]),
+    ({"ip": "16.3"}, ["maria"]),
+    ({"usuario": "ar"}, ["maria"]),
+])
+def test_filtros_estruturados_casam_em_qualquer_posicao(motor_com_logs, filtros, usuarios):
+    df = motor_com_logs.carregar_logs_db(filtros)
+    assert df is not None
+    assert sorted(df["usuario"]) == usuarios
+
+
+def test_texto_livre_usa_fts_e_campos_estruturados_usam_like():
+    query, params = montar_consulta_logs({"usuario": "silva", "texto": "login"}, fts_disponivel=True)
+    assert "usuario LIKE ?" in query
+    assert "logs_fts MATCH ?" in query
+    assert params[:2] == ["%silva%", '"login"']
+
+    query, params = montar_consulta_logs({"texto": "login"}, fts_disponivel=False)
+    assert "MATCH" not in query
+    assert params[0] == "%login%"
+
+
+def test_busca_normaliza_relevancia_por_origem(motor, tmp_path):
+    hoje = datetime.date.today().isoformat()
+    antigo = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
+    arquivo = tmp_path / "server.log"
+    # Partição pequena em que o termo é raro: BM25 bruto bem melhor que o do banco principal,
+    # onde "erro" aparece em quase todas as linhas
+    arquivo.write_text(
+        "".join(f"{antigo} 10:00:0{i},000 [srv1] [INFO] [c] - requisicao atendida {i}\n" for i in range(6)) +
+        f"{antigo} 10:00:09,000 [srv1] [ERROR] [c] - erro ao processar a requisicao\n" +
+        f"{hoje} 00:00:00,000 [srv1] [ERROR] [c] - erro erro erro\n" +
+        "".join(f"{hoje} 00:00:1{i},000 [srv1] [ERROR] [c] - erro ao processar a requisicao {i} do cliente "
+                f"com tempo limite excedido no servidor de aplicacao\n" for i in range(4)) +
+        f"{hoje} 00:00:20,000 [srv1] [INFO] [c] - requisicao atendida\n")
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    motor.selar_particoes()
+
+    df, total = motor.buscar_logs("erro", pagina=1, por_pagina=2)
+    assert total == 6
+    # O melhor resultado de cada origem vale -1; empates vão para o mais recente
+    assert list(df["relevancia"]) == [-1.0, -1.0]
+    assert list(df["mensagem"]) == ["erro erro erro", "erro ao processar a requisicao"]
+    assert list(df["data"]) == [hoje, antigo]
+
+    df, _ = motor.buscar_logs("erro", pagina=2, por_pagina=2)
+    assert list(df["data"]) == [hoje] * 2
+
+    df, _ = motor.buscar_logs("erro", pagina=1, por_pagina=10)
+    assert len(df) == 6
+    assert list(df["relevancia"]) == sorted(df["relevancia"])
+    assert all(-1.0 < relevancia < 0 for relevancia in df["relevancia"].iloc[2:])
+
+
+def test_filtros_estruturados_usam_indice_trigrama(motor_com_logs):
+    with motor_com_logs.pool_leitura.conexao() as conn:
+        assert indice_trigrama_disponivel(conn)
+        for campo, valor in (("usuario", "silva"), ("ip", "10.0"), ("url", "/api")):
+            query, params = montar_consulta_logs({campo: valor}, trigrama_disponivel=True)
+            plano = " ".join(str(linha[-1]) for linha in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+            assert "logs_trigrama VIRTUAL TABLE" in plano
+
+    # Termos curtos não formam um trigrama: LIKE direto na tabela
+    query, params = montar_consulta_logs({"usuario": "ar"}, trigrama_disponivel=True)
+    assert "usuario LIKE ?" in query and "logs_trigrama" not in query
+
+
+def test_filtros_em_particao_selada(motor, tmp_path):
+    antigo = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text(LINHAS.replace("2026-10-19", antigo))
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    motor.selar_particoes()
+
+    df = motor.carregar_logs_db({"usuario": "silva"})
+    assert list(df["usuario"]) == ["joao.silva"]
+
+    # Partição selada antes do índice trigrama: indexada pela manutenção, com o mesmo resultado
+    with motor.pool_leitura.conexao() as conn:
+        caminho = conn.execute("SELECT caminho FROM particoes").fetchone()[0]
+    conn = sqlite3.connect(caminho)
+    conn.execute("DROP TABLE logs_trigrama")
+    conn.commit()
+    conn.close()
+    assert list(motor.carregar_logs_db({"ip": "10.0", "data": antigo})["usuario"]) == ["joao.silva"]
+
+    motor.indexar_trigrama_particoes()
+    conn = sqlite3.connect(caminho)
+    assert indice_trigrama_disponivel(conn)
+    conn.close()
+    assert list(motor.carregar_logs_db({"ip": "192.10", "data": antigo})["usuario"]) == ["joao.silva"]
+
+
+def test_busca_respeita_o_intervalo(motor, tmp_path):
+    hoje = datetime.date.today()
+    antigo = (hoje - datetime.timedelta(days=10)).isoformat()
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(f"{antigo} {h:02d}:00:00,000 [srv1] [ERROR] [c] - erro {h}\n" for h in range(0, 24, 6)) +
+                       "".join(f"{hoje.isoformat()} 00:00:0{i},000 [srv1] [ERROR] [c] - erro hoje {i}\n" for i in range(3)))
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    motor.selar_particoes()
+
+    # Intervalo dentro do dia selado: nem o banco principal nem as horas fora dele entram
+    inicio = int(datetime.datetime.fromisoformat(f"{antigo} 05:00").timestamp() * 1000)
+    fim = int(datetime.datetime.fromisoformat(f"{antigo} 13:00").timestamp() * 1000)
+    df, total = motor.buscar_logs("erro", {"ts_inicio": inicio, "ts_fim": fim})
+    assert total == 2
+    assert sorted(df["hora"]) == ["06:00:00", "12:00:00"]
+
+    df, total = motor.buscar_logs("erro", {"data": hoje.isoformat()})
+    assert total == 3
+    assert set(df["data"]) == {hoje.isoformat()}
+
+
+def test_linhas_antigas_no_banco_principal_nao_escondem_particoes_mais_novas(motor, tmp_path):
+    hoje = datetime.date.today()
+    selado = (hoje - datetime.timedelta(days=10)).isoformat()
+    atrasado = (hoje - datetime.timedelta(days=20)).isoformat()
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(f"{selado} 10:00:0{i},000 [srv1] [INFO] [c] - selado {i}\n" for i in range(3)))
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    motor.selar_particoes()
+
+    # Carga posterior de um arquivo mais antigo: fica no banco principal até a próxima manutenção
+    antigo = tmp_path / "server.log.1"
+    antigo.write_text("".join(f"{atrasado} 10:00:0{i},000 [srv1] [INFO] [c] - atrasado {i}\n" for i in range(3)))
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(antigo)))
+
+    df = motor.carregar_logs_db(limite=3)
+    assert list(df["data"]) == [selado] * 3
+    assert list(df["ts_evento"]) == sorted(df["ts_evento"], reverse=True)
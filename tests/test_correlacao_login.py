@@ -0,0 +1,109 @@
+import math
+
+import pytest
+
+from motor_monitoramento import (ContadorDistintos, DETECCAO_PADRAO, DetectorCorrelacaoLogin, HyperLogLog,
+                                 LIMITE_DISTINTOS_EXATOS, estimar_uniao_distintos, hash_distinto)
+
+# Início de um minuto (epoch ms)
+T0 = 1_760_000_000_000 - 1_760_000_000_000 % 60000
+MINUTO = 60000
+
+
+def config(**alteracoes):
+    valores = dict(DETECCAO_PADRAO)
+    valores.update(alteracoes)
+    return valores
+
+
+# Três erros padrão do HyperLogLog com a precisão padrão (2^10 registradores)
+TOLERANCIA_HLL = 3 * 1.04 / math.sqrt(1 << 10)
+
+
+@pytest.mark.parametrize("n", [1000, 10000, 100000])
+def test_hyperloglog_dentro_do_erro_padrao(n):
+    hll = HyperLogLog()
+    for i in range(n):
+        hll.adicionar_hash(hash_distinto(f"10.0.{i // 256}.{i % 256}"))
+    assert abs(hll.estimar() - n) <= TOLERANCIA_HLL * n
+
+
+def test_hyperloglog_ignora_repetidos():
+    hll = HyperLogLog()
+    for _ in range(5):
+        for i in range(2000):
+            hll.adicionar_hash(hash_distinto(i))
+    assert abs(hll.estimar() - 2000) <= TOLERANCIA_HLL * 2000
+
+
+def test_contador_distintos_exato_ate_o_limite():
+    contador = ContadorDistintos()
+    for i in range(LIMITE_DISTINTOS_EXATOS):
+        assert contador.adicionar_hash(hash_distinto(f"u{i}"))
+        assert not contador.adicionar_hash(hash_distinto(f"u{i}"))
+        assert contador.estimar() == i + 1
+    assert contador.hll is None
+
+
+@pytest.mark.parametrize("n", [LIMITE_DISTINTOS_EXATOS + 1, 1000, 20000])
+def test_contador_distintos_aproximado_acima_do_limite(n):
+    contador = ContadorDistintos()
+    for i in range(n):
+        contador.adicionar_hash(hash_distinto(f"u{i}"))
+    assert contador.hll is not None
+    assert abs(contador.estimar() - n) <= TOLERANCIA_HLL * n
+
+
+def test_uniao_de_contadores():
+    exatos = [ContadorDistintos() for _ in range(3)]
+    for i in range(30):
+        exatos[i % 3].adicionar_hash(hash_distinto(i))
+        exatos[(i + 1) % 3].adicionar_hash(hash_distinto(i))
+    assert estimar_uniao_distintos(exatos) == 30
+
+    mistos = [ContadorDistintos() for _ in range(2)]
+    for i in range(5000):
+        mistos[0].adicionar_hash(hash_distinto(i))
+    for i in range(4990, 5010):
+        mistos[1].adicionar_hash(hash_distinto(i))
+    assert abs(estimar_uniao_distintos(mistos) - 5010) <= TOLERANCIA_HLL * 5010
+
+
+def test_correlacao_usuarios_por_ip_no_limite():
+    detector = DetectorCorrelacaoLogin(config())
+    resultados = [detector.registrar_falha("ip", "10.0.0.1", f"usuario{i}", T0 + i * 1000) for i in range(40)]
+    disparos = [(i + 1, r) for i, r in enumerate(resultados) if r is not None]
+    assert disparos == [(20, 20)]
+
+
+def test_correlacao_ips_por_usuario_no_limite():
+    detector = DetectorCorrelacaoLogin(config())
+    resultados = [detector.registrar_falha("usuario", "ana", f"10.0.0.{i}", T0 + i * 1000) for i in range(15)]
+    assert [(i + 1, r) for i, r in enumerate(resultados) if r is not None] == [(10, 10)]
+
+
+def test_correlacao_repeticoes_nao_contam_como_distintos():
+    detector = DetectorCorrelacaoLogin(config())
+    for i in range(200):
+        assert detector.registrar_falha("ip", "10.0.0.1", f"usuario{i % 5}", T0 + i * 1000) is None
+
+
+def test_correlacao_gotejamento_lento_fica_abaixo_da_janela():
+    # Um usuário novo a cada 3 minutos: nunca mais que ~4 distintos na janela de 10 minutos
+    detector = DetectorCorrelacaoLogin(config())
+    for i in range(200):
+        assert detector.registrar_falha("ip", "10.0.0.1", f"usuario{i}", T0 + i * 3 * MINUTO) is None
+
+
+def test_correlacao_limita_chaves_acompanhadas():
+    detector = DetectorCorrelacaoLogin(config(max_chaves_correlacao=50))
+    for i in range(500):
+        detector.registrar_falha("ip", f"10.0.{i // 256}.{i % 256}", "ana", T0 + i)
+        detector.registrar_falha("usuario", f"usuario{i}", "10.0.0.1", T0 + i)
+    assert len(detector.usuarios_por_ip) == 50
+    assert len(detector.ips_por_usuario) == 50
+
+    # Cap reduzido em tempo de execução também é respeitado
+    detector.config["max_chaves_correlacao"] = 10
+    detector.registrar_falha("ip", "192.168.0.1", "ana", T0 + 1000)
+    assert len(detector.usuarios_por_ip) == 10
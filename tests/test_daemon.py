@@ -0,0 +1,104 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+
+from motor_monitoramento import MotorMonitoramento
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINHA = "2026-10-19 10:00:{:02d},000 [srv1] [INFO] [c] - Login success user=ana IP=10.0.0.1"
+
+
+def aguardar(condicao, limite=30):
+    fim = time.time() + limite
+    while time.time() < fim:
+        if condicao():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def contar_logs(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_motor_nao_importa_tkinter():
+    codigo = "import sys, motor_monitoramento; print('tkinter' in sys.modules, 'matplotlib' in sys.modules)"
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert saida.stdout.split() == ["False", "False"]
+
+
+def test_heartbeat_de_outro_processo(motor):
+    assert not motor.daemon_ativo()
+
+    # O próprio processo não conta como daemon
+    motor.registrar_heartbeat()
+    assert not motor.daemon_ativo()
+
+    conn = sqlite3.connect(motor.db_path)
+    conn.execute("UPDATE estado_daemon SET valor = '1' WHERE chave = 'pid'")
+    conn.commit()
+    assert motor.daemon_ativo()
+
+    # Heartbeat antigo: daemon encerrado sem limpar o registro
+    conn.execute("UPDATE estado_daemon SET valor = ? WHERE chave = 'heartbeat'", (str(time.time() - 3600),))
+    conn.commit()
+    conn.close()
+    assert not motor.daemon_ativo()
+
+    motor.limpar_heartbeat()
+    assert not motor.daemon_ativo()
+
+
+def test_modo_cliente_acompanha_o_banco(motor, tmp_path):
+    cliente = MotorMonitoramento(db_path=motor.db_path)
+    try:
+        cliente.parar_manutencao()
+        cliente.iniciar_modo_cliente()
+
+        arquivo = tmp_path / "server.log"
+        arquivo.write_text("".join(LINHA.format(i) + "\n" for i in range(5)))
+        motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+
+        assert aguardar(lambda: cliente.logs_data is not None and len(cliente.logs_data) == 5)
+    finally:
+        cliente.parar_monitoramento()
+        cliente.pool_leitura.fechar()
+
+
+def test_daemon_ingere_e_encerra_com_sigterm(tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(LINHA.format(i) + "\n" for i in range(3)))
+    db_path = str(tmp_path / "logs.db")
+
+    processo = subprocess.Popen([sys.executable, os.path.join(RAIZ, "motor_monitoramento.py"), "--daemon",
+                                 "--db", db_path, "--caminho", str(arquivo), "--carga-inicial"],
+                                cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        observador = MotorMonitoramento(db_path=db_path)
+        observador.parar_manutencao()
+        try:
+            assert aguardar(observador.daemon_ativo)
+            assert aguardar(lambda: contar_logs(db_path) == 3)
+
+            # Linhas novas no arquivo monitorado também chegam ao banco
+            with open(arquivo, "a") as f:
+                f.write(LINHA.format(30) + "\n")
+            assert aguardar(lambda: contar_logs(db_path) == 4)
+
+            processo.send_signal(signal.SIGTERM)
+            assert processo.wait(30) == 0
+            assert not observador.daemon_ativo()
+        finally:
+            observador.pool_leitura.fechar()
+    finally:
+        if processo.poll() is None:
+            processo.kill()
+        processo.communicate()
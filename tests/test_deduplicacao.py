@@ -0,0 +1,132 @@
+import gzip
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+from motor_monitoramento import MotorMonitoramento, ParserLogs, calcular_chave_dedup, chave_dedup_linha, ler_novas_linhas, origem_log
+
+LINHA = "2026-10-19 10:00:00,100 [srv1] [ERROR] [c] - Failed login user=bob IP=10.0.0.1"
+
+
+def contar_logs(motor):
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_chave_da_linha_considera_milissegundos_e_posicao():
+    outra = LINHA.replace(",100", ",900")
+    assert chave_dedup_linha(LINHA, "server.log", 0) != chave_dedup_linha(outra, "server.log", 0)
+    assert chave_dedup_linha(LINHA, "server.log", 0) != chave_dedup_linha(LINHA, "server.log", 82)
+    assert chave_dedup_linha(LINHA, "server.log", 0) == chave_dedup_linha(LINHA, "server.log", 0)
+
+
+def test_chave_por_campos_continua_estavel():
+    log = {"data": "2026-10-19", "hora": "10:00:00", "servidor": "srv1", "thread": "t", "mensagem": "m"}
+    assert calcular_chave_dedup(log) == calcular_chave_dedup(dict(log))
+    assert calcular_chave_dedup(log) != calcular_chave_dedup(dict(log, mensagem="n"))
+
+
+def test_origem_ignora_diretorio_compressao_e_rotacao():
+    assert origem_log("/var/log/jboss/server.log") == "server.log"
+    assert origem_log("server.log.1.gz") == "server.log"
+    assert origem_log("server.log.2026-10-01") == "server.log"
+
+
+@pytest.mark.parametrize("vetorizado", [False, True])
+def test_parser_gera_chaves_distintas_no_mesmo_segundo(vetorizado):
+    if vetorizado:
+        pytest.importorskip("pyarrow")
+    linhas = [("server.log", 0, LINHA), ("server.log", 82, LINHA.replace(",100", ",900"))]
+    logs = ParserLogs(vetorizado).interpretar(linhas)
+    chaves = list(logs["chave_dedup"]) if vetorizado else [log.chave_dedup for log in logs]
+    assert len(set(chaves)) == 2
+
+
+@pytest.mark.parametrize("vetorizado", [False, True])
+def test_recarga_nao_duplica_e_rajada_no_mesmo_segundo_e_gravada(motor, tmp_path, vetorizado):
+    if vetorizado:
+        pytest.importorskip("pyarrow")
+    motor.parser.vetorizado = vetorizado
+    arquivo = tmp_path / "server.log"
+    # Três eventos no mesmo segundo: dois com o mesmo texto e milissegundos (posições diferentes)
+    arquivo.write_text(f"{LINHA}\n{LINHA.replace(',100', ',900')}\n{LINHA}\n")
+
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    assert contar_logs(motor) == 3
+
+    # Recarga do mesmo arquivo e do arquivo rotacionado e compactado
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    rotacionado = tmp_path / "server.log.1.gz"
+    with open(arquivo, "rb") as origem, gzip.open(rotacionado, "wb") as destino:
+        shutil.copyfileobj(origem, destino)
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(rotacionado)))
+    assert contar_logs(motor) == 3
+
+
+def test_linhas_do_monitoramento_tem_as_posicoes_da_carga(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text(f"{LINHA}\n{LINHA}\n")
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+
+    linhas, _, _ = ler_novas_linhas(str(arquivo), {str(arquivo): 0}, 1 << 20)
+    assert [posicao for _, posicao, _ in linhas] == [0, len(LINHA) + 1]
+    motor.salvar_logs_db(motor.parser.processar_linhas(linhas))
+    assert contar_logs(motor) == 2
+
+
+def abrir_motor(db_path):
+    motor = MotorMonitoramento(db_path=str(db_path))
+    limite = time.time() + 30
+    while not motor.schema_tipado and time.time() < limite:
+        time.sleep(0.05)
+    motor.parar_manutencao()
+    return motor
+
+
+def fechar_motor(motor):
+    motor.parar_monitoramento()
+    motor.pool_leitura.fechar()
+
+
+def test_migracao_mantem_eventos_do_mesmo_segundo_e_reconhece_a_recarga(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    # Quatro eventos no mesmo segundo; três só diferem nos milissegundos, que o banco antigo não guardava
+    arquivo.write_text(f"{LINHA}\n{LINHA.replace(',100', ',500')}\n{LINHA.replace(',100', ',900')}\n"
+                       f"{LINHA.replace('bob', 'ana')}\n")
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+    assert contar_logs(motor) == 4
+    fechar_motor(motor)
+
+    # Banco da versão 1: linhas sem chave de deduplicação
+    conn = sqlite3.connect(motor.db_path)
+    conn.execute("UPDATE logs SET chave_dedup = NULL")
+    conn.execute("DELETE FROM chaves_legado")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    migrado = abrir_motor(motor.db_path)
+    try:
+        assert contar_logs(migrado) == 4
+        conn = sqlite3.connect(migrado.db_path)
+        chaves = [chave for (chave,) in conn.execute("SELECT chave_dedup FROM logs")]
+        conn.close()
+        assert None not in chaves and len(set(chaves)) == 4
+        assert migrado.faixa_chaves_legado is not None
+
+        # Recarga do mesmo arquivo após a atualização: nada é gravado de novo
+        migrado.salvar_logs_db(migrado.processar_arquivo_log(str(arquivo)))
+        assert contar_logs(migrado) == 4
+
+        # Linha nova no mesmo segundo também é gravada
+        with open(arquivo, "a") as f:
+            f.write(LINHA.replace("Failed login", "Login success") + "\n")
+        migrado.salvar_logs_db(migrado.processar_arquivo_log(str(arquivo)))
+        assert contar_logs(migrado) == 5
+    finally:
+        fechar_motor(migrado)
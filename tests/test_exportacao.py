@@ -0,0 +1,54 @@
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from motor_monitoramento import exportar_logs_streaming
+
+
+def preencher(motor, tmp_path, linhas=20):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(f"2026-10-19 10:00:{i:02d},000 [srv1] [INFO] [c] - acesso user=u{i} IP=10.0.0.1\n"
+                               for i in range(linhas)))
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+
+
+def test_exporta_ndjson_gz_em_ordem(motor, tmp_path):
+    preencher(motor, tmp_path)
+    destino = str(tmp_path / "saida.ndjson.gz")
+    conn = sqlite3.connect(motor.db_path)
+    escritas = exportar_logs_streaming(conn, destino, tamanho_lote=7, progresso=lambda feitos, total: None)
+    conn.close()
+
+    with gzip.open(destino, "rt", encoding="utf-8") as f:
+        registros = [json.loads(linha) for linha in f]
+    assert escritas == len(registros) == 20
+    assert [registro["ts_evento"] for registro in registros] == sorted(registro["ts_evento"] for registro in registros)
+
+
+def test_erro_na_contagem_nao_deixa_parcial(motor, tmp_path, monkeypatch):
+    preencher(motor, tmp_path)
+    destino = tmp_path / "saida.csv"
+
+    class ConexaoComFalha:
+        """Falha na contagem prévia do progresso (banco bloqueado, filtro inválido...)"""
+
+        def __init__(self, conn):
+            self.conn = conn
+
+        def execute(self, query, params=()):
+            if query.startswith("SELECT COUNT(*)"):
+                raise sqlite3.OperationalError("database is locked")
+            return self.conn.execute(query, params)
+
+        def cursor(self):
+            return self.conn.cursor()
+
+    conn = sqlite3.connect(motor.db_path)
+    with pytest.raises(sqlite3.OperationalError):
+        exportar_logs_streaming(ConexaoComFalha(conn), str(destino), progresso=lambda feitos, total: None)
+    conn.close()
+
+    assert not destino.exists()
+    assert not (tmp_path / "saida.csv.parcial").exists()
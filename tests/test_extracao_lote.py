@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from motor_monitoramento import COLUNAS_LOTE, ParserLogs, tabela_logs
+
+pytest.importorskip("pyarrow")
+
+LINHAS = [
+    "2026-10-19 10:00:00,123 [srv1] [INFO] [org.jboss.security] - User admin logged in successfully from IP=10.0.0.1",
+    "2026-10-19 10:00:01,500 [srv2] [ERROR] [org.jboss.security] - Failed login user='bob' address: 192.168.0.7",
+    "2026-10-19 10:00:02,000 [srv1] [WARN] [web] - GET request uri=/api/admin/users status 403 user=carla",
+    "2026-10-19 10:00:03,000 [srv1] [INFO] [web] - User ana.pereira updated data at URL=/app/settings from IP=10.0.0.9",
+    "[2026-10-19] [10:00:04] [INFO] [auth] User maria LOGOUT ok user=maria",
+    "[31/01/2023] [02:30 PM] [DEBUG] [jdbc] select executed path=/db/query",
+    "  2026-10-19 10:00:05,000 [srv1] [INFO] [web] - DELETE remove item user:joao IP: 10.1.2.3",
+    "qualquer texto 2026-10-19 perto de 10:00:06 vindo de 172.16.0.1 em /app/reports/mensal",
+    "linha sem data nem formato conhecido",
+    "2026-10-19 10:00:07,000 [srv3] [ERROR] [ejb] - NullPointerException durante authenticate",
+    "",
+]
+
+
+def comparar(linhas):
+    esperado = tabela_logs(ParserLogs().processar_linhas(linhas))
+    obtido = ParserLogs().processar_lote(linhas)
+
+    assert list(obtido.columns) == list(COLUNAS_LOTE) + ["chave_dedup"]
+    assert len(obtido) == len(esperado)
+    for coluna in obtido.columns:
+        valores_esperados = [None if valor is None or valor != valor else valor for valor in esperado[coluna]]
+        valores_obtidos = [None if valor is None or valor != valor else valor for valor in obtido[coluna]]
+        assert valores_obtidos == valores_esperados, coluna
+
+
+def test_lote_igual_ao_parser_linha_a_linha():
+    comparar(LINHAS)
+
+
+def test_lote_com_posicoes_igual_ao_parser_linha_a_linha():
+    posicao, linhas = 0, []
+    for linha in LINHAS:
+        linhas.append(("server.log", posicao, linha))
+        posicao += len(linha) + 1
+    comparar(linhas)
+
+
+def test_lote_sintetico_grande():
+    aleatorio = random.Random(3)
+    usuarios = ["admin", "bob", "ana.pereira", "c@d.com"]
+    acoes = ["logged in successfully", "Failed login", "GET page", "POST form failed with 500", "logout"]
+    linhas = [f"2026-10-{aleatorio.randint(1, 28):02d} {aleatorio.randint(0, 23):02d}:{aleatorio.randint(0, 59):02d}:"
+              f"{aleatorio.randint(0, 59):02d},{aleatorio.randint(0, 999):03d} [srv{aleatorio.randint(1, 3)}] [INFO] "
+              f"[web] - {aleatorio.choice(acoes)} user={aleatorio.choice(usuarios)} "
+              f"IP=10.0.{aleatorio.randint(0, 255)}.{aleatorio.randint(0, 255)} URL=/app/p{aleatorio.randint(1, 50)}"
+              for _ in range(5000)]
+    comparar(linhas)
@@ -0,0 +1,83 @@
+import datetime
+import time
+
+from motor_monitoramento import DETECCAO_PADRAO, DetectorFalhasLogin, JANELA_FALHAS_LOGIN_MS
+
+AGORA_MS = int(time.time() * 1000)
+
+
+def config(**alteracoes):
+    valores = dict(DETECCAO_PADRAO, falhas_login=3)
+    valores.update(alteracoes)
+    return valores
+
+
+def test_falhas_login_dispara_a_partir_do_limite_por_par():
+    detector = DetectorFalhasLogin(config())
+    resultados = [detector.registrar_falha("bob", "10.0.0.1", AGORA_MS - 1000 + i, AGORA_MS) for i in range(5)]
+    assert resultados == [None, None, 3, 4, 5]
+    # Outro IP do mesmo usuário é outro par
+    assert detector.registrar_falha("bob", "10.0.0.2", AGORA_MS, AGORA_MS) is None
+
+
+def test_falhas_login_ignora_falhas_fora_das_24_horas():
+    detector = DetectorFalhasLogin(config())
+    antigo = AGORA_MS - JANELA_FALHAS_LOGIN_MS - 1000
+    assert [detector.registrar_falha("bob", "10.0.0.1", antigo, AGORA_MS) for _ in range(5)] == [None] * 5
+    assert not detector.pares
+
+    # Falhas espalhadas por mais de um dia de tempo de evento saem da janela
+    detector = DetectorFalhasLogin(config())
+    inicio = AGORA_MS - JANELA_FALHAS_LOGIN_MS + 3600000
+    assert detector.registrar_falha("bob", "10.0.0.1", inicio, inicio + 1) is None
+    assert detector.registrar_falha("bob", "10.0.0.1", inicio + 1000, inicio + 1000) is None
+    assert detector.registrar_falha("bob", "10.0.0.1", inicio + JANELA_FALHAS_LOGIN_MS + 3600000,
+                                    inicio + JANELA_FALHAS_LOGIN_MS + 3600000) is None
+
+
+def test_falhas_login_desligada_e_pares_limitados():
+    assert DetectorFalhasLogin(config(falhas_login=None)).registrar_falha("bob", "10.0.0.1", AGORA_MS, AGORA_MS) is None
+
+    detector = DetectorFalhasLogin(config(max_chaves_falhas_login=10))
+    for i in range(100):
+        detector.registrar_falha(f"usuario{i}", "10.0.0.1", AGORA_MS, AGORA_MS)
+    assert len(detector.pares) == 10
+
+
+def linhas_falhas():
+    agora = datetime.datetime.now()
+    linhas = []
+    for i in range(12):
+        instante = (agora - datetime.timedelta(seconds=60 - i)).strftime("%Y-%m-%d %H:%M:%S")
+        # bob falha sempre do mesmo IP; os demais usuários, cada um de um IP
+        usuario, ip = ("bob", "10.0.0.1") if i % 2 else (f"u{i}", f"10.0.1.{i}")
+        linhas.append(f"{instante},{i:03d} [srv1] [WARN] [c] - Login failed user={usuario} IP={ip}")
+    return linhas
+
+
+def alertas_do_lote(motor, processos):
+    motor.deteccao_config["processos_alertas"] = processos
+    motor.alertas_config["acessos_suspeitos"] = False
+    alertas = []
+    motor.ouvintes_alerta.append(alertas.append)
+    motor.processar_lote_logs(motor.parser.processar_linhas(linhas_falhas()))
+    motor.fechar_fragmentos_alertas()
+    return [(alerta["tipo"], alerta["usuario"], alerta["ip"], alerta["mensagem"]) for alerta in alertas]
+
+
+def test_falhas_login_iguais_na_thread_e_nos_fragmentos(motor, tmp_path):
+    inline = alertas_do_lote(motor, 0)
+    assert ("falha_login", "bob", "10.0.0.1",
+            "Múltiplas falhas de login (3) para o usuário bob do IP 10.0.0.1") in inline
+
+    from motor_monitoramento import MotorMonitoramento
+    outro = MotorMonitoramento(db_path=str(tmp_path / "fragmentos.db"))
+    try:
+        limite = time.time() + 30
+        while not outro.schema_tipado and time.time() < limite:
+            time.sleep(0.05)
+        outro.parar_manutencao()
+        assert alertas_do_lote(outro, 2) == inline
+    finally:
+        outro.parar_monitoramento()
+        outro.pool_leitura.fechar()
@@ -0,0 +1,44 @@
+import random
+from collections import Counter
+
+from motor_monitoramento import IndiceURLs
+
+
+def test_top_nao_descarta_ramo_com_total_grande_e_caminhos_pequenos():
+    # /a tem o maior total (100), mas nenhum caminho abaixo dele passa de 1 acesso
+    indice = IndiceURLs()
+    for i in range(100):
+        indice.adicionar_log(f"/a/p{i}", False, "ana", None)
+    for _ in range(50):
+        indice.adicionar_log("/b/x", False, "ana", None)
+
+    assert [linha["url"] for linha in indice.top(1)] == ["/b/x"]
+    top = indice.top(3)
+    assert [(linha["url"], linha["acessos"]) for linha in top][0] == ("/b/x", 50)
+    assert [linha["acessos"] for linha in top[1:]] == [1, 1]
+
+
+def test_top_confere_com_contagem_exata():
+    aleatorio = random.Random(7)
+    indice = IndiceURLs()
+    acessos, falhas = Counter(), Counter()
+    for _ in range(20000):
+        profundidade = aleatorio.randint(1, 4)
+        url = "/" + "/".join(f"s{aleatorio.randint(0, int(aleatorio.paretovariate(1.2)))}" for _ in range(profundidade))
+        falhou = aleatorio.random() < 0.1
+        indice.adicionar_log(url, falhou, f"u{aleatorio.randint(1, 30)}", None)
+        acessos[url] += 1
+        falhas[url] += falhou
+
+    for criterio, contagem in (("acessos", acessos), ("falhas", falhas)):
+        esperado = sorted(contagem.values(), reverse=True)[:15]
+        assert [linha[criterio] for linha in indice.top(15, criterio=criterio)] == esperado
+
+
+def test_top_sob_prefixo():
+    indice = IndiceURLs()
+    for url, vezes in (("/api/a", 3), ("/api/b/c", 5), ("/app/x", 9)):
+        for _ in range(vezes):
+            indice.adicionar_log(url, False, "ana", None)
+
+    assert [linha["url"] for linha in indice.top(5, prefixo="/api")] == ["/api/b/c", "/api/a"]
@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from motor_monitoramento import ler_linhas_mmap, origem_log
+
+LINHAS = [
+    b"2026-10-01 14:00:00,123 INFO [com.app] (default task-1) User ana logged in from IP=10.0.0.1",
+    b"\tat com.app.Servico.executar(Servico.java:42)",
+    b"[2026-10-01] [14:00:01] ERROR falha ao processar",
+    b"",
+    b"Caused by: java.lang.NullPointerException",
+    b"  2026-10-01 14:00:02,000 WARN linha indentada",
+    b"continuacao com data 2026-10-01 no meio",
+    b"2026-10-01 14:00:03,000 INFO caractere inv\xe1lido\r",
+    b"   \t sem prefixo",
+    b"2026-10-01 14:00:04,000 DEBUG " + b"x" * 300,
+    b"... 12 more",
+    b"9 linha que comeca com digito",
+]
+
+
+def candidata(linha):
+    # Mesmas regras do pré-filtro: prefixo de log, data em qualquer ponto ou prefixo após espaços
+    return bool(re.match(rb"[\[0-9]", linha) or re.search(rb"\d{4}-\d{2}-\d{2}", linha)
+                or re.match(rb"[ \t\r]+[\[0-9]", linha))
+
+
+def esperado(conteudo):
+    posicao, resultado = 0, []
+    for linha in conteudo.split(b"\n"):
+        if candidata(linha):
+            resultado.append((posicao, linha.decode("utf-8", errors="ignore")))
+        posicao += len(linha) + 1
+    return resultado
+
+
+@pytest.mark.parametrize("final", [b"\n", b""])
+@pytest.mark.parametrize("tamanho_bloco", [16, 100, 4 * 1024 * 1024])
+def test_linhas_e_posicoes_conferem_com_leitura_simples(tmp_path, final, tamanho_bloco):
+    conteudo = b"\n".join(LINHAS * 20) + final
+    arquivo = tmp_path / "server.log"
+    arquivo.write_bytes(conteudo)
+
+    linhas = list(ler_linhas_mmap(str(arquivo), tamanho_bloco=tamanho_bloco, com_posicao=True))
+
+    origem = origem_log(str(arquivo))
+    assert linhas == [(origem, posicao, texto) for posicao, texto in esperado(conteudo)]
+    assert list(ler_linhas_mmap(str(arquivo), tamanho_bloco=tamanho_bloco)) == [texto for _, _, texto in linhas]
+
+
+def test_trecho_inicio_fim(tmp_path):
+    conteudo = b"\n".join(LINHAS * 5) + b"\n"
+    arquivo = tmp_path / "server.log"
+    arquivo.write_bytes(conteudo)
+
+    # Trecho começando e terminando em início de linha
+    inicio = conteudo.index(b"\n", 200) + 1
+    fim = conteudo.index(b"\n", 700) + 1
+    linhas = list(ler_linhas_mmap(str(arquivo), tamanho_bloco=64, inicio=inicio, fim=fim, com_posicao=True))
+
+    assert [(posicao, texto) for _, posicao, texto in linhas] == [
+        (inicio + posicao, texto) for posicao, texto in esperado(conteudo[inicio:fim])
+    ]
+
+
+def test_arquivo_vazio(tmp_path):
+    arquivo = tmp_path / "vazio.log"
+    arquivo.write_bytes(b"")
+    assert list(ler_linhas_mmap(str(arquivo))) == []
@@ -0,0 +1,64 @@
+import bz2
+import gzip
+import lzma
+import sqlite3
+
+import pytest
+
+from motor_monitoramento import eh_arquivo_log, iterar_linhas_log
+
+LINHA = "2026-10-{dia} 10:00:{segundo:02d},000 [srv1] [INFO] [c] - acesso user=ana IP=10.0.0.1"
+COMPRESSORES = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+def conteudo(dia, linhas=5):
+    return "".join(LINHA.format(dia=dia, segundo=i) + "\n" for i in range(linhas)).encode()
+
+
+def contar_logs(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_nomes_de_logs_rotacionados():
+    for nome in ("server.log", "server.log.1", "server.log.2026-10-01", "server.log.1.gz", "server.log.3.xz"):
+        assert eh_arquivo_log(nome)
+    for nome in ("server.txt", "catalog.xml", "logs.tar"):
+        assert not eh_arquivo_log(nome)
+
+
+@pytest.mark.parametrize("extensao", sorted(COMPRESSORES))
+def test_descompacta_em_streaming_com_posicoes_do_original(tmp_path, extensao):
+    dados = conteudo(19)
+    simples = tmp_path / "server.log"
+    simples.write_bytes(dados)
+    compactado = tmp_path / f"server.log.1{extensao}"
+    compactado.write_bytes(COMPRESSORES[extensao].compress(dados))
+
+    assert [linha.rstrip("\n") for linha in iterar_linhas_log(str(compactado))] == dados.decode().splitlines()
+
+    # Mesma origem e posições que o arquivo antes da rotação: a recarga não duplica logs
+    esperado = [(origem, posicao, texto.rstrip("\n")) for origem, posicao, texto in
+                iterar_linhas_log(str(simples), com_posicao=True)]
+    obtido = [(origem, posicao, texto.rstrip("\n")) for origem, posicao, texto in
+              iterar_linhas_log(str(compactado), com_posicao=True)]
+    assert obtido == esperado
+
+
+def test_importa_arvore_em_processos_sem_duplicar(motor, tmp_path):
+    raiz = tmp_path / "logs"
+    (raiz / "no2").mkdir(parents=True)
+    (raiz / "server.log").write_bytes(conteudo(19))
+    (raiz / "server.log.1.gz").write_bytes(gzip.compress(conteudo(18)))
+    (raiz / "no2" / "server.log.2.bz2").write_bytes(bz2.compress(conteudo(17)))
+    (raiz / "no2" / "server.log.3.xz").write_bytes(lzma.compress(conteudo(16)))
+    (raiz / "leiame.txt").write_bytes(conteudo(15))
+
+    assert motor.importar_historico(str(raiz), processos=2) == 20
+    assert contar_logs(motor.db_path) == 20
+
+    motor.importar_historico(str(raiz), processos=1)
+    assert contar_logs(motor.db_path) == 20
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from motor_monitoramento import (IP_DESCONHECIDO, TS_DESCONHECIDO, calcular_ts_evento, compactar_logs,
+                                 concatenar_logs_compactos, int_para_ip, ip_para_int)
+
+LINHA = "2026-10-19 10:00:{:02d},000 [srv1] [INFO] [c] - Login success user={} IP=10.0.0.{}"
+
+
+def test_ip_em_uint32_e_de_volta():
+    assert ip_para_int("10.0.0.1") == 10 << 24 | 1
+    assert int_para_ip(ip_para_int("192.168.1.254")) == "192.168.1.254"
+    for invalido in ("desconhecido", "300.1.1.1", "1.2.3", None):
+        assert ip_para_int(invalido) == IP_DESCONHECIDO
+    assert int_para_ip(IP_DESCONHECIDO) == "desconhecido"
+
+
+def test_compactar_converte_tipos_e_e_idempotente():
+    logs = pd.DataFrame({
+        "data": ["2026-10-19", "2026-10-19", "data ruim"],
+        "hora": ["10:00:00", "10:00:01", "?"],
+        "usuario": ["ana", "bob", "ana"],
+        "ip": ["10.0.0.1", "desconhecido", "10.0.0.1"],
+        "mensagem": ["a", "b", "c"],
+        "chave_dedup": [1, 2, 3],
+    })
+    compacto = compactar_logs(logs)
+
+    assert "chave_dedup" not in compacto.columns
+    assert compacto["ip"].dtype == np.uint32
+    assert list(compacto["ip"]) == [ip_para_int("10.0.0.1"), IP_DESCONHECIDO, ip_para_int("10.0.0.1")]
+    # ts_evento ausente é calculado de data e hora
+    assert compacto["ts_evento"].dtype == np.int64
+    assert list(compacto["ts_evento"]) == [calcular_ts_evento("2026-10-19", "10:00:00"),
+                                           calcular_ts_evento("2026-10-19", "10:00:01"), TS_DESCONHECIDO]
+    assert isinstance(compacto["usuario"].dtype, pd.CategoricalDtype)
+    assert list(compacto["usuario"].cat.categories) == ["ana", "bob"]
+
+    pd.testing.assert_frame_equal(compactar_logs(compacto), compacto)
+
+
+def test_concatenar_une_categorias_de_tipos_diferentes():
+    # Tabelas vindas do Arrow trazem categorias object; as montadas pelo pandas, str
+    arrow = pd.DataFrame({"usuario": pd.Categorical(pd.Series(["ana", "bob"], dtype=object))})
+    pandas = pd.DataFrame({"usuario": pd.Categorical(pd.Series(["carla", "ana"], dtype="str"))})
+
+    logs = concatenar_logs_compactos([pandas, arrow])
+
+    assert isinstance(logs["usuario"].dtype, pd.CategoricalDtype)
+    assert list(logs["usuario"]) == ["carla", "ana", "ana", "bob"]
+    assert list(logs["usuario"].cat.categories) == ["ana", "bob", "carla"]
+
+
+def test_logs_novos_se_juntam_aos_carregados_do_arquivo(motor, tmp_path):
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(LINHA.format(i, "ana", 1) + "\n" for i in range(3)))
+    motor.caminho_logs = str(arquivo)
+    motor.carregar_dados_logs()
+
+    novos = motor.parser.processar_linhas([(str(arquivo), 1000, LINHA.format(30, "bob", 2))])
+    motor.acrescentar_logs_memoria(novos)
+
+    logs = motor.logs_completos
+    assert len(logs) == 4
+    assert sorted(logs["usuario"].astype(str)) == ["ana", "ana", "ana", "bob"]
+    assert isinstance(logs["usuario"].dtype, pd.CategoricalDtype)
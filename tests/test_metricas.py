@@ -0,0 +1,72 @@
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+from motor_monitoramento import MetricasPipeline, ParserLogs, formatar_rotulos
+
+
+def test_histograma_e_percentis():
+    metricas = MetricasPipeline(limites=(0.001, 0.01, 0.1))
+    for segundos in [0.0005] * 50 + [0.005] * 45 + [0.05] * 4 + [2.0]:
+        metricas.observar("parse", segundos)
+    with metricas.medir("banco"):
+        pass
+    metricas.incrementar("erros", etapa="banco")
+    metricas.incrementar("erros", 2, etapa="banco")
+
+    instantaneo = metricas.instantaneo()
+    parse = instantaneo["etapas"]["parse"]
+    assert parse["eventos"] == 100
+    assert (parse["p50_ms"], parse["p95_ms"], parse["max_ms"]) == (1.0, 10.0, 2000.0)
+    assert list(instantaneo["etapas"]) == ["parse", "banco"]
+    assert instantaneo["contadores"] == {"erros[banco]": 3}
+
+
+def test_formato_prometheus():
+    metricas = MetricasPipeline(limites=(0.01, 0.1))
+    metricas.observar("parse", 0.005)
+    metricas.observar("parse", 0.05)
+    metricas.observar("parse", 5.0)
+    metricas.incrementar("alertas_gerados", tipo="login_falhas")
+    texto = metricas.formato_prometheus([("logs_memoria", "gauge", "Logs em memória", [({}, 7)])])
+
+    assert 'monitor_alertas_gerados_total{tipo="login_falhas"} 1' in texto
+    assert 'monitor_etapa_duracao_segundos_bucket{etapa="parse",le="0.01"} 1' in texto
+    assert 'monitor_etapa_duracao_segundos_bucket{etapa="parse",le="0.1"} 2' in texto
+    assert 'monitor_etapa_duracao_segundos_bucket{etapa="parse",le="+Inf"} 3' in texto
+    assert 'monitor_etapa_duracao_segundos_count{etapa="parse"} 3' in texto
+    assert "# TYPE monitor_logs_memoria gauge\nmonitor_logs_memoria 7" in texto
+    assert formatar_rotulos({"fonte": 'a"b\\c\nd'}) == '{fonte="a\\"b\\\\c\\nd"}'
+
+
+def test_lote_do_pipeline_registra_etapas(motor):
+    linhas = [f"2026-10-19 10:00:{i:02d},000 [srv1] [ERROR] [c] - Failed login user=ana IP=10.0.0.1"
+              for i in range(10)]
+    motor.processar_lote_logs(ParserLogs().processar_linhas(linhas))
+
+    diagnostico = motor.diagnostico()
+    assert {"memoria", "banco", "alertas"} <= set(diagnostico["etapas"])
+    assert diagnostico["etapas"]["alertas"]["eventos"] == 10
+    assert diagnostico["contadores"]["logs_avaliados"] == 10
+    assert diagnostico["logs_memoria"] == 10
+    assert diagnostico["fila_pipeline"] == 0 and diagnostico["endpoint"] is None
+
+
+def test_endpoint_de_metricas(motor):
+    motor.diagnostico_config["porta_metricas"] = 0
+    motor.iniciar_servidor_metricas()
+    try:
+        endereco = motor.endereco_metricas()
+        assert re.fullmatch(r"http://127\.0\.0\.1:\d+/metrics", endereco)
+        with urllib.request.urlopen(endereco, timeout=5) as resposta:
+            assert resposta.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "monitor_logs_memoria 0" in resposta.read().decode()
+
+        with pytest.raises(urllib.error.HTTPError) as erro:
+            urllib.request.urlopen(endereco.replace("/metrics", "/outro"), timeout=5)
+        assert erro.value.code == 404
+    finally:
+        motor.parar_servidor_metricas()
+    assert motor.endereco_metricas() is None
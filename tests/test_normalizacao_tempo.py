@@ -0,0 +1,62 @@
+import datetime
+import random
+import time
+
+import pytest
+
+from motor_monitoramento import ParserLogs, calcular_ts_evento, epoch_minuto_local
+
+
+@pytest.mark.parametrize("data", ["2023-01-31", "31/01/2023", "31-01-2023", "31.01.2023", "Jan 31, 2023",
+                                  "31 Jan 2023"])
+def test_formatos_de_data(data):
+    assert ParserLogs().formatar_data(data) == "2023-01-31"
+
+
+@pytest.mark.parametrize("hora, esperado", [("14:30:45", "14:30:45"), ("14:30:45,123", "14:30:45"),
+                                            ("02:30:45 PM", "14:30:45"), ("14:30", "14:30:00"),
+                                            ("02:30 PM", "14:30:00")])
+def test_formatos_de_hora(hora, esperado):
+    assert ParserLogs().formatar_hora(hora) == esperado
+
+
+def test_valores_desconhecidos_sao_mantidos_e_formato_e_lembrado():
+    parser = ParserLogs()
+    assert parser.formatar_data("ontem") == "ontem"
+    assert parser.formatar_hora("meio-dia") == "meio-dia"
+
+    assert parser.formatar_hora("02:30 PM") == "14:30:00"
+    assert parser.formato_hora == "%I:%M %p"
+    assert parser.normalizar_tempo("31/01/2023", "02:31 PM") == (
+        "2023-01-31", "14:31:00", calcular_ts_evento("2023-01-31", "14:31:00"))
+
+
+@pytest.fixture
+def fuso(monkeypatch):
+    """Troca o fuso do processo; o cache de epoch_minuto_local depende dele"""
+    def trocar(nome):
+        monkeypatch.setenv("TZ", nome)
+        time.tzset()
+        epoch_minuto_local.cache_clear()
+
+    yield trocar
+    monkeypatch.undo()
+    time.tzset()
+    epoch_minuto_local.cache_clear()
+
+
+@pytest.mark.parametrize("nome", ["UTC", "America/Sao_Paulo", "Europe/Berlin", "Australia/Lord_Howe"])
+def test_epoch_igual_ao_strptime_inclusive_no_horario_de_verao(fuso, nome):
+    fuso(nome)
+    aleatorio = random.Random(nome)
+    base = datetime.datetime(2018, 1, 1)
+    # Instantes aleatórios e as horas em volta das transições de horário de verão desses fusos
+    instantes = [base + datetime.timedelta(seconds=aleatorio.randrange(3 * 365 * 86400)) for _ in range(2000)]
+    for dia in ("2018-02-18", "2018-03-25", "2018-04-01", "2018-10-07", "2018-10-28", "2018-11-04"):
+        inicio = datetime.datetime.fromisoformat(dia)
+        instantes += [inicio + datetime.timedelta(minutes=minutos) for minutos in range(0, 4 * 60, 7)]
+
+    for momento in instantes:
+        data, hora = momento.strftime("%Y-%m-%d"), momento.strftime("%H:%M:%S")
+        esperado = int(datetime.datetime.strptime(f"{data} {hora}", "%Y-%m-%d %H:%M:%S").timestamp() * 1000)
+        assert calcular_ts_evento(data, hora) == esperado, (data, hora)
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+
+def preencher(motor, tmp_path):
+    # Três dias; em cada um, duas falhas de login e um acesso com sucesso
+    linhas = []
+    for dia in ("17", "18", "19"):
+        linhas += [f"2026-10-{dia} 10:00:00,000 [srv1] [ERROR] [c] - Failed login user=bob IP=10.0.0.1",
+                   f"2026-10-{dia} 10:00:01,000 [srv1] [ERROR] [c] - Failed login user=ana IP=10.0.0.2",
+                   f"2026-10-{dia} 10:00:02,000 [srv1] [INFO] [c] - Login success user=ana IP=10.0.0.2"]
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("\n".join(linhas) + "\n")
+    motor.salvar_logs_db(motor.processar_arquivo_log(str(arquivo)))
+
+
+def test_exporta_um_diretorio_por_dia(motor, tmp_path):
+    preencher(motor, tmp_path)
+    destino = tmp_path / "parquet"
+
+    assert motor.exportar_parquet(str(destino)) == 9
+    assert sorted(os.listdir(destino)) == ["dia=2026-10-17", "dia=2026-10-18", "dia=2026-10-19"]
+
+    # Exportar o mesmo dia de novo substitui o arquivo em vez de duplicar as linhas
+    assert motor.exportar_parquet(str(destino), "2026-10-18", "2026-10-18") == 3
+    df = motor.carregar_logs_historico(origem=str(destino))
+    assert len(df) == 9
+
+
+def test_leitura_poda_dias_colunas_e_filtros(motor, tmp_path):
+    preencher(motor, tmp_path)
+    destino = str(tmp_path / "parquet")
+    motor.exportar_parquet(destino)
+
+    df = motor.carregar_logs_historico(colunas=["usuario", "status", "ts_evento"], data_inicio="2026-10-18",
+                                       data_fim="2026-10-19", filtros={"status": "FAILED"}, origem=destino)
+    assert list(df.columns) == ["usuario", "status", "ts_evento"]
+    assert sorted(df["usuario"]) == ["ana", "ana", "bob", "bob"]
+    assert set(df["status"]) == {"FAILED"}
+    assert str(df["usuario"].dtype) == "category"
+
+    # Fora do intervalo exportado, ou sem diretório, não há logs
+    assert motor.carregar_logs_historico(data_inicio="2026-11-01", origem=destino) is None
+    assert motor.carregar_logs_historico(origem=str(tmp_path / "inexistente")) is None
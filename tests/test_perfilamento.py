@@ -0,0 +1,119 @@
+import os
+import pstats
+import threading
+import time
+
+import pytest
+
+from motor_monitoramento import DIAGNOSTICO_PADRAO, Perfilador
+
+
+@pytest.fixture
+def config(tmp_path):
+    return dict(DIAGNOSTICO_PADRAO, diretorio_perfis=str(tmp_path / "perfis"))
+
+
+def lentas(config):
+    caminho = os.path.join(config["diretorio_perfis"], "operacoes_lentas.log")
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [linha.split()[2] for linha in f]
+
+
+def calcular(x):
+    return sum(range(x))
+
+
+def test_desligado_so_repassa(config):
+    envolvida = Perfilador(config).envolver("calcular", calcular)
+    assert envolvida(10) == 45 and envolvida.__name__ == "calcular"
+    assert not os.path.exists(config["diretorio_perfis"])
+
+
+def test_operacoes_lentas_sem_perfilamento(config):
+    config.update(registrar_operacoes_lentas=True, limite_lento_ms=50)
+    perfilador = Perfilador(config)
+    rapida = perfilador.envolver("rapida", calcular)
+    lenta = perfilador.envolver("lenta", lambda: time.sleep(0.06))
+    rapida(10)
+    lenta()
+    assert lentas(config) == ["lenta"]
+    assert not perfilador.perfis
+
+
+def test_cprofile_grava_e_rotaciona(config):
+    config.update(perfilamento=True, intervalo_dump_s=0, max_dumps=2, limite_lento_ms=0)
+    perfilador = Perfilador(config)
+    interna = perfilador.envolver("interna", calcular)
+    externa = perfilador.envolver("externa", lambda: interna(1000))
+    for _ in range(4):
+        assert externa() == 499500
+        time.sleep(0.001)
+
+    perfis = sorted(nome for nome in os.listdir(config["diretorio_perfis"]) if nome.endswith(".prof"))
+    assert len(perfis) == 2
+    funcoes = {funcao for _, _, funcao in pstats.Stats(os.path.join(config["diretorio_perfis"], perfis[-1])).stats}
+    assert "calcular" in funcoes
+    # Chamadas aninhadas ficam no perfil (e na duração) da externa
+    assert lentas(config) == ["externa"] * 4
+
+
+def test_desligar_em_execucao_grava_perfil_pendente(config):
+    config.update(perfilamento=True)
+    perfilador = Perfilador(config)
+    envolvida = perfilador.envolver("calcular", calcular)
+    envolvida(10)
+    assert perfilador.perfis and not os.path.exists(config["diretorio_perfis"])
+
+    config["perfilamento"] = False
+    envolvida(10)
+    assert not perfilador.perfis
+    assert [nome for nome in os.listdir(config["diretorio_perfis"]) if nome.endswith(".prof")]
+
+
+def test_amostragem_grava_pilhas_folded(config):
+    config.update(perfilamento=True, modo_perfilamento="amostragem", intervalo_amostragem_ms=5)
+    perfilador = Perfilador(config)
+
+    def esperar_um_pouco():
+        time.sleep(0.3)
+
+    perfilador.envolver("ponto", esperar_um_pouco)()
+    config["perfilamento"] = False
+    perfilador.thread_amostragem.join(5)
+
+    arquivos = [nome for nome in os.listdir(config["diretorio_perfis"]) if nome.startswith("amostras-")]
+    assert len(arquivos) == 1
+    with open(os.path.join(config["diretorio_perfis"], arquivos[0]), encoding="utf-8") as f:
+        pilhas = [linha.rsplit(" ", 1) for linha in f.read().splitlines()]
+    assert pilhas and all(pilha.startswith("ponto;") and int(contagem) > 0 for pilha, contagem in pilhas)
+    assert any("esperar_um_pouco" in pilha for pilha, _ in pilhas)
+
+
+def test_pontos_de_entrada_do_motor(motor, tmp_path):
+    motor.diagnostico_config.update(diretorio_perfis=str(tmp_path / "perfis"), limite_lento_ms=0)
+    motor.definir_perfilamento(True, "cprofile")
+    linha = "2026-10-19 10:00:00,000 [srv1] [ERROR] [c] - Failed login user=ana IP=10.0.0.1"
+    thread = threading.Thread(target=lambda: motor.processar_lote_logs(
+        motor.parser.processar_linhas([linha])), name="pipeline")
+    thread.start()
+    thread.join()
+    motor.definir_perfilamento(False)
+    assert motor.diagnostico_config["perfilamento"] is False
+    assert lentas(motor.diagnostico_config) == ["processar_lote_logs"]
+
+
+def test_callbacks_do_tk_cronometrados(config):
+    interface = pytest.importorskip("sistema_monitoramento_producao")
+    import tkinter
+
+    assert tkinter.CallWrapper is interface.ChamadaTkCronometrada
+    config.update(registrar_operacoes_lentas=True, limite_lento_ms=0)
+    try:
+        interface.ChamadaTkCronometrada.perfilador = Perfilador(config)
+        assert interface.ChamadaTkCronometrada(calcular, None, None)(10) == 45
+    finally:
+        interface.ChamadaTkCronometrada.perfilador = None
+    assert lentas(config) == ["tk:calcular"]
+    assert interface.ChamadaTkCronometrada(calcular, None, None)(10) == 45
@@ -0,0 +1,66 @@
+import datetime
+import queue
+import socket
+
+from motor_monitoramento import ColetorLogs, normalizar_syslog, separar_mensagens
+
+LINHA = "2026-10-19 10:00:00,000 [srv1] [INFO] [c] - acesso user=ana IP=10.0.0.1"
+
+
+def test_contagem_de_octetos_e_linhas():
+    mensagem = f"<14>1 2026-10-19T10:00:00Z host app - - - {LINHA}".encode()
+    buffer = f"{len(mensagem)} ".encode() + mensagem + b"<14>outra por linha\n" + b"12 incomple"
+
+    mensagens, resto = separar_mensagens(buffer, syslog=True)
+    assert mensagens == [mensagem, b"<14>outra por linha"]
+    assert resto == b"12 incomple"
+
+    # Mensagem dividida entre pacotes TCP
+    mensagens, resto = separar_mensagens(resto + b"to!", syslog=True)
+    assert mensagens == [] and resto == b"12 incompleto!"
+    mensagens, resto = separar_mensagens(resto + b"!5 outra", syslog=True)
+    assert mensagens == [b"incompleto!!", b"outra"] and resto == b""
+
+    # Sem syslog, um número no início da linha não é contagem de octetos
+    assert separar_mensagens(b"12 abc\n3", syslog=False) == ([b"12 abc"], b"3")
+
+
+def test_cabecalho_syslog_removido_e_data_garantida():
+    assert normalizar_syslog(f"<14>1 2026-10-19T10:00:00Z host jboss 1 - - {LINHA}") == LINHA
+    assert normalizar_syslog(f"<14>Oct 19 10:00:00 host jboss[12]: {LINHA}") == LINHA
+
+    # MSG sem data: usa o TIMESTAMP do RFC 5424 ou, no RFC 3164, o horário de recebimento
+    local = datetime.datetime(2026, 10, 19, 10, 0, 0).astimezone()
+    assert normalizar_syslog(f"<14>1 {local.isoformat()} host jboss - - - falha") == "2026-10-19 10:00:00 falha"
+    recebido = datetime.datetime(2026, 10, 19, 11, 30, 0)
+    assert normalizar_syslog("<14>Oct 19 10:00:00 host jboss: falha", recebido) == "2026-10-19 11:30:00 falha"
+
+
+def receber_linhas(fila, quantidade):
+    linhas = []
+    while len(linhas) < quantidade:
+        fonte, lote, _ = fila.get(timeout=5)
+        linhas += [(fonte.split(":")[0], linha) for linha in lote]
+    return linhas
+
+
+def test_receptores_tcp_e_udp_entregam_ao_pipeline():
+    fila = queue.Queue()
+    coletor = ColetorLogs(fila, {"endereco_receptor": "127.0.0.1", "syslog_udp": 0, "syslog_tcp": 0, "tcp_linhas": 0})
+    coletor.iniciar([])
+    try:
+        with socket.create_connection(("127.0.0.1", coletor.portas["tcp_linhas"])) as conexao:
+            conexao.sendall(f"{LINHA} 1\n{LINHA} 2\n".encode())
+        assert sorted(receber_linhas(fila, 2)) == [("tcp-linhas", f"{LINHA} 1"), ("tcp-linhas", f"{LINHA} 2")]
+
+        mensagem = f"<14>1 2026-10-19T10:00:00Z host jboss - - - {LINHA} 3".encode()
+        with socket.create_connection(("127.0.0.1", coletor.portas["syslog_tcp"])) as conexao:
+            conexao.sendall(f"{len(mensagem)} ".encode() + mensagem)
+        assert receber_linhas(fila, 1) == [("syslog-tcp", f"{LINHA} 3")]
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp:
+            udp.sendto(f"<14>Oct 19 10:00:00 host jboss: {LINHA} 4".encode(),
+                       ("127.0.0.1", coletor.portas["syslog_udp"]))
+        assert receber_linhas(fila, 1) == [("syslog-udp", f"{LINHA} 4")]
+    finally:
+        coletor.parar()
@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+import motor_monitoramento
+from motor_monitoramento import CAMPOS_REGISTRO, COLUNAS_LOTE, ParserLogs, RegistroLog, tabela_logs
+
+LINHAS = [
+    "2026-10-19 10:00:00,100 [srv1] [ERROR] [org.jboss.security] - Failed login user=bob IP=10.0.0.1 URL=/app/login",
+    "2026-10-19 10:00:01,200 [srv1] [ERROR] [org.jboss.security] - Failed login user=bob IP=10.0.0.1 URL=/app/login",
+    "qualquer texto 2026-10-19 perto de 10:00:02 vindo de 10.0.0.1 em /app/login",
+]
+
+
+def test_registro_aceita_acesso_de_dict():
+    registro = RegistroLog("2026-10-19", "10:00:00", "INFO", "mensagem", ts_evento=1)
+    assert not hasattr(registro, "__dict__")
+    assert registro["nivel"] == "INFO" and registro.get("usuario") == "desconhecido"
+    assert registro.get("inexistente", "x") == "x"
+    assert "ip" in registro and "inexistente" not in registro
+    with pytest.raises(KeyError):
+        registro["inexistente"]
+
+    registro["usuario"] = "ana"
+    assert registro.usuario == "ana"
+    assert list(registro.como_dict()) == list(CAMPOS_REGISTRO)
+    assert registro.valores() == tuple(registro.como_dict()[campo] for campo in COLUNAS_LOTE)
+
+
+def test_parser_compartilha_valores_repetidos():
+    primeiro, segundo, simples = ParserLogs().processar_linhas(LINHAS)
+    assert isinstance(primeiro, RegistroLog)
+    for campo in ("data", "nivel", "categoria", "servidor", "usuario", "ip", "url"):
+        assert primeiro[campo] is segundo[campo], campo
+    assert simples.ip is primeiro.ip and simples.data is primeiro.data
+
+
+def test_tabela_de_internados_limitada(monkeypatch):
+    monkeypatch.setattr(motor_monitoramento, "LIMITE_INTERNADOS", 3)
+    parser = ParserLogs()
+    for i in range(10):
+        parser.internar(f"valor{i}")
+        assert len(parser.internados) <= 3
+    assert parser.internar("valor9") is parser.internados["valor9"]
+
+
+def test_tabela_de_registros_igual_a_de_dicts():
+    registros = ParserLogs().processar_linhas(LINHAS)
+    obtido = tabela_logs(registros)
+    esperado = tabela_logs([registro.como_dict() for registro in registros])
+    assert list(obtido.columns) == list(COLUNAS_LOTE) + ["chave_dedup"]
+    assert obtido.equals(esperado[obtido.columns])
+
+
+def test_registros_gravados_no_banco(motor):
+    registros = ParserLogs().processar_linhas(LINHAS)
+    motor.salvar_logs_db(registros)
+
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        gravados = conn.execute("SELECT usuario, ip, url, ts_evento FROM logs ORDER BY ts_evento").fetchall()
+    finally:
+        conn.close()
+    assert gravados == [(registro.usuario, registro.ip, registro.url, registro.ts_evento) for registro in registros]
@@ -0,0 +1,114 @@
+import collections
+import sqlite3
+import threading
+
+import pytest
+
+from motor_monitoramento import ParserLogs, TarefaSegundoPlano, dias_do_intervalo, intervalo_dia_ms
+
+DIAS = ["2026-10-17", "2026-10-18", "2026-10-19"]
+
+
+def gerar_linhas(dia, quantidade, inicio=0):
+    linhas = []
+    for i in range(inicio, inicio + quantidade):
+        nivel, acao = ("ERROR", "Failed login") if i % 4 == 0 else ("INFO", "Login success")
+        linhas.append(f"{dia} {i % 24:02d}:{i % 60:02d}:00,000 [srv1] [{nivel}] [c] - {acao} user=u{i % 3} "
+                      f"IP=10.0.0.{i % 5 + 1}")
+    return linhas
+
+
+def esperado_usuarios(logs):
+    totais = collections.defaultdict(lambda: [0, 0, 0])
+    for log in logs:
+        soma = totais[log.usuario]
+        soma[0] += 1
+        soma[1] += log.status == "FAILED"
+        soma[2] += log.nivel == "ERROR"
+    return {usuario: tuple(valores) for usuario, valores in totais.items()}
+
+
+def obtido(tarefa):
+    assert tarefa.aguardar(60) and tarefa.estado == "concluida", tarefa.erro
+    df = tarefa.resultado()
+    return {linha.chave: (linha.acessos, linha.falhas, linha.erros) for linha in df.itertuples()}
+
+
+@pytest.fixture
+def logs_gravados(motor):
+    logs = []
+    for numero, dia in enumerate(DIAS):
+        logs_dia = ParserLogs().processar_linhas(gerar_linhas(dia, 20 + 10 * numero))
+        motor.salvar_logs_db(logs_dia)
+        logs += logs_dia
+    return logs
+
+
+def test_dias_do_intervalo():
+    dias = dias_do_intervalo("2026-10-30", "2026-11-01")
+    assert [dia for dia, _, _ in dias] == ["2026-10-30", "2026-10-31", "2026-11-01"]
+    assert dias[1][1:] == intervalo_dia_ms("2026-10-31")
+    assert [dia for dia, _, _ in dias_do_intervalo("2026-10-19")] == ["2026-10-19"]
+
+
+def test_tarefa_em_segundo_plano():
+    def executar(progresso, cancelar):
+        progresso(1, 4)
+        liberar.wait(5)
+        return None if cancelar.is_set() else 4
+
+    liberar = threading.Event()
+    tarefa = TarefaSegundoPlano(executar).iniciar()
+    tarefa.cancelar()
+    liberar.set()
+    assert tarefa.aguardar(5) and tarefa.estado == "cancelada" and tarefa.progresso() == 0.25
+
+    def falhar(progresso, cancelar):
+        raise ValueError("falhou")
+
+    tarefa = TarefaSegundoPlano(falhar).iniciar()
+    assert tarefa.aguardar(5) and (tarefa.estado, tarefa.erro) == ("erro", "falhou")
+
+
+def test_relatorio_por_dia_com_cache(motor, logs_gravados):
+    assert motor.gerar_relatorio("inexistente", DIAS[0]) is None
+    assert motor.gerar_relatorio("usuarios", "19/10/2026") is None
+
+    tarefa = motor.gerar_relatorio("usuarios", DIAS[0], DIAS[-1], processos=1)
+    assert obtido(tarefa) == esperado_usuarios(logs_gravados)
+    assert (tarefa.dias_em_cache, tarefa.feitos, tarefa.total) == (0, 3, 3)
+    assert tarefa.resultado()["acessos"].is_monotonic_decreasing
+
+    # Reabrir: todos os dias vêm do cache
+    tarefa = motor.gerar_relatorio("usuarios", DIAS[0], DIAS[-1], processos=1)
+    assert obtido(tarefa) == esperado_usuarios(logs_gravados) and tarefa.dias_em_cache == 3
+
+    # Logs novos em um dia: só ele é recalculado
+    novos = ParserLogs().processar_linhas(gerar_linhas(DIAS[-1], 8, inicio=100))
+    motor.salvar_logs_db(novos)
+    tarefa = motor.gerar_relatorio("usuarios", DIAS[0], DIAS[-1], processos=1)
+    assert obtido(tarefa) == esperado_usuarios(logs_gravados + novos) and tarefa.dias_em_cache == 2
+
+
+def test_relatorio_em_processos_igual_ao_sequencial(motor, logs_gravados):
+    paralelo = motor.gerar_relatorio("ips", DIAS[0], DIAS[-1], processos=2)
+    resultado = obtido(paralelo)
+    assert paralelo.dias_em_cache == 0
+    assert sum(acessos for acessos, _, _ in resultado.values()) == len(logs_gravados)
+
+    # Sem o cache, a agregação sequencial chega ao mesmo resultado
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        conn.execute("DELETE FROM relatorios_cache")
+        conn.commit()
+    finally:
+        conn.close()
+    sequencial = motor.gerar_relatorio("ips", DIAS[0], DIAS[-1], processos=1)
+    assert obtido(sequencial) == resultado and sequencial.dias_em_cache == 0
+
+
+def test_relatorio_por_hora_ordenado_pela_chave(motor, logs_gravados):
+    tarefa = motor.gerar_relatorio("horas", DIAS[1], processos=1)
+    resultado = obtido(tarefa)
+    assert list(resultado) == sorted(resultado)
+    assert resultado["00"] == (2, 2, 2)
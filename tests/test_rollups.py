@@ -0,0 +1,60 @@
+import datetime
+import sqlite3
+
+import pytest
+
+
+def total_rollup_dia(motor):
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        return conn.execute("SELECT COALESCE(SUM(total), 0) FROM rollup_dia WHERE dimensao = 'total'").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def contar(motor, tabela):
+    conn = sqlite3.connect(motor.db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def arquivo_antigo(tmp_path):
+    # Dia fora da janela quente (7 dias) e dentro da retenção (90)
+    dia = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
+    arquivo = tmp_path / "server.log"
+    arquivo.write_text("".join(f"{dia} 10:00:{i:02d},{i:03d} [srv1] [INFO] [c] - acesso user=u{i} IP=10.0.0.{i + 1}\n"
+                               for i in range(5)))
+    return str(arquivo)
+
+
+def test_recarga_nao_conta_duas_vezes_no_rollup(motor, arquivo_antigo):
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    assert total_rollup_dia(motor) == 5
+    assert contar(motor, "logs") == 5
+
+
+def test_recarga_de_dia_selado_nao_conta_duas_vezes(motor, arquivo_antigo):
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    motor.selar_particoes()
+    assert contar(motor, "logs") == 0
+    assert contar(motor, "particoes") == 1
+
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    assert total_rollup_dia(motor) == 5
+    assert contar(motor, "logs") == 0
+
+
+def test_recarga_de_dia_arquivado_em_parquet_nao_conta_duas_vezes(motor, arquivo_antigo):
+    pytest.importorskip("pyarrow")
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    motor.selar_particoes()
+    motor.armazenamento_config["dias_arquivo"] = 5
+    motor.arquivar_particoes()
+
+    motor.salvar_logs_db(motor.processar_arquivo_log(arquivo_antigo))
+    assert total_rollup_dia(motor) == 5
+    assert contar(motor, "logs") == 0
@@ -0,0 +1,88 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from motor_monitoramento import (VERSAO_SCHEMA, calcular_ts_evento, intervalo_dia_ms, migrar_schema_logs,
+                                 montar_consulta_logs)
+
+# Tabela logs anterior ao schema tipado (só colunas de texto)
+SCHEMA_LEGADO = '''
+CREATE TABLE logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT, hora TEXT, nivel TEXT, categoria TEXT, servidor TEXT, thread TEXT, mensagem TEXT,
+    usuario TEXT, ip TEXT, url TEXT, operacao TEXT, status TEXT, timestamp TEXT
+)
+'''
+
+LINHAS = [
+    ("2026-10-18", "23:59:59", "INFO", "srv1", "SUCCESS"),
+    ("2026-10-19", "08:00:00", "ERROR", "srv1", "FAILED"),
+    ("2026-10-19", "09:30:00", "INFO", "srv2", "SUCCESS"),
+    ("2026-10-19", "12:00:00", "ERROR", "srv2", "FAILED"),
+    ("2026-10-20", "00:00:00", "ERROR", "srv1", "FAILED"),
+]
+
+
+def test_ts_evento_em_milissegundos_locais():
+    esperado = int(datetime.datetime(2026, 10, 19, 10, 0, 5).timestamp() * 1000)
+    assert calcular_ts_evento("2026-10-19", "10:00:05") == esperado
+
+    for data, hora in (("2026-13-01", "10:00:00"), ("2026-10-19", "25:00:00"), ("2026-10-19", "10:00:60"),
+                       ("ontem", "10:00"), (None, None)):
+        assert calcular_ts_evento(data, hora) is None
+
+
+def test_intervalo_do_dia_e_semiaberto():
+    inicio, fim = intervalo_dia_ms("2026-10-19")
+    assert inicio == calcular_ts_evento("2026-10-19", "00:00:00")
+    assert fim == calcular_ts_evento("2026-10-20", "00:00:00")
+    assert intervalo_dia_ms("19/10/2026") == (None, None)
+
+
+@pytest.fixture
+def banco_legado(tmp_path):
+    conn = sqlite3.connect(tmp_path / "legado.db")
+    conn.execute(SCHEMA_LEGADO)
+    conn.executemany("INSERT INTO logs (data, hora, nivel, servidor, status, mensagem, operacao) "
+                     "VALUES (?, ?, ?, ?, ?, 'm', 'LOGIN')", LINHAS)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_migracao_preenche_colunas_tipadas_e_indices(banco_legado):
+    # Lotes menores que a tabela: a migração continua de onde o lote anterior parou
+    assert migrar_schema_logs(banco_legado, tamanho_lote=2)
+    assert banco_legado.execute("PRAGMA user_version").fetchone()[0] == VERSAO_SCHEMA
+
+    linhas = banco_legado.execute('''
+    SELECT l.data, l.hora, l.ts_evento, n.valor, s.valor
+    FROM logs l
+    JOIN dicionario n ON n.id = l.nivel_id
+    JOIN dicionario s ON s.id = l.status_id
+    ORDER BY l.id
+    ''').fetchall()
+    assert [(data, hora, nivel, status) for data, hora, _, nivel, status in linhas] == [
+        (data, hora, nivel, status) for data, hora, nivel, _, status in LINHAS
+    ]
+    assert [ts for _, _, ts, _, _ in linhas] == [calcular_ts_evento(data, hora) for data, hora, *_ in LINHAS]
+
+    indices = {nome for (nome,) in banco_legado.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_logs_ts_cobertura", "idx_logs_nivel_ts", "idx_logs_status_ts"} <= indices
+
+    # Migração já aplicada: nada a fazer
+    assert migrar_schema_logs(banco_legado)
+
+
+def test_consulta_tipada_filtra_dia_por_intervalo_e_nivel_por_id(banco_legado):
+    migrar_schema_logs(banco_legado)
+
+    query, params = montar_consulta_logs({"data": "2026-10-19", "nivel": "ERROR"}, schema_tipado=True,
+                                         fts_disponivel=False)
+    assert "ts_evento >= ?" in query and "nivel_id" in query
+    horas = [hora for (hora,) in banco_legado.execute(query.replace("SELECT *", "SELECT hora"), params)]
+    assert horas == ["12:00:00", "08:00:00"]
+
+    plano = " ".join(linha[-1] for linha in banco_legado.execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert "USING INDEX" in plano